@@ -17,6 +17,10 @@ from dataclasses import dataclass, field
 from typing import List, Optional, Dict, Any
 from math import log1p
 
+import numpy as np
+
+from services.roll_engine import ChainTable
+
 
 # ──────────────────────────────────────────────────────────────────────────────
 # Constants
@@ -276,6 +280,87 @@ def rank_candidates(
     return sorted(candidates, key=lambda c: (c.score, c.strike), reverse=True)
 
 
+def rank_call_chain(
+    calls: List[Dict],
+    state: PositionState,
+) -> List[OptionCandidate]:
+    """
+    Vectorized equivalent of rank_candidates(build_valid_call_candidates(...)).
+
+    The chain is loaded once into a roll_engine.ChainTable and every gate and
+    score component is evaluated as an array op; only the surviving rows are
+    materialised as OptionCandidate objects. Ordering is identical to
+    rank_candidates (score desc, strike desc, then chain order).
+    """
+    t = ChainTable.from_calls(calls)
+    if len(t) == 0:
+        return []
+
+    cp   = state.current_price
+    be   = state.break_even
+    mode = state.strategy_mode
+    w    = _MODE_WEIGHTS[mode]
+
+    # ── Gates (same rules as build_valid_call_candidates) ────────────────────
+    mid = np.where(t.ask > 0, (t.bid + t.ask) / 2, t.bid)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        wide = (mid > 0) & ((t.ask - t.bid) / np.where(mid > 0, mid, 1.0) > MAX_SPREAD_PCT)
+    liquid = (t.bid >= MIN_BID) & (t.oi >= MIN_OI) & ~wide
+
+    is_weekly = t.dte <= WEEKLY_MAX_DTE
+    roi = t.bid / cp if cp > 0 else np.zeros(len(t))
+    min_roi = np.where(is_weekly, MIN_WEEKLY_ROI, MIN_MONTHLY_ROI)
+
+    mask = (t.strike > cp) & liquid & (roi >= min_roi)
+    if mode == "CAPITAL_PROTECTION":
+        mask &= t.strike >= be
+    if mode == "BALANCED" and state.drawdown_flag in ("moderate", "severe"):
+        mask &= t.strike >= be * 0.90
+
+    idx = np.flatnonzero(mask)
+    if idx.size == 0:
+        return []
+    strike, oi, roi_pct = t.strike[idx], t.oi[idx], roi[idx] * 100
+
+    # ── Scores (same components as _score_candidate) ─────────────────────────
+    roi_score = np.minimum(roi_pct / 5.0, 1.0)
+    strike_score = np.clip((strike - cp) / (cp * 0.10 + 1e-9), 0.0, 1.0)
+    if be > 0:
+        be_score = np.where(
+            strike >= be,
+            np.maximum(0.0, np.minimum((strike - be) / (be * 0.05 + 1e-9), 1.0)),
+            np.maximum(0.0, 1.0 + (strike - be) / be),
+        )
+        recovery_score = np.clip((strike - be) / be + 0.5, 0.0, 1.0) if cp > 0 else np.full(idx.size, 0.5)
+    else:
+        be_score = np.full(idx.size, 0.5)
+        recovery_score = np.full(idx.size, 0.5)
+    liq_score = np.minimum(np.log1p(oi) / log1p(1000), 1.0)
+
+    total = (
+        w["roi"]            * roi_score
+        + w["strike_quality"] * strike_score
+        + w["be_protection"]  * be_score
+        + w["liquidity"]      * liq_score
+        + w["recovery"]       * recovery_score
+    )
+    scores = np.array([round(float(x), 4) for x in total])
+
+    # Stable sort: score desc, strike desc, chain order for full ties
+    order = np.lexsort((-strike, -scores))
+    ranked = []
+    for j in order:
+        i = idx[j]
+        ranked.append(OptionCandidate(
+            strike=float(t.strike[i]), expiry=t.expiry[i],
+            dte=int(t.dte[i]), bid=float(t.bid[i]), ask=float(t.ask[i]),
+            oi=int(t.oi[i]), volume=int(t.volume[i]), iv=float(t.iv[i]),
+            roi_pct=float(roi_pct[j]), is_weekly=bool(is_weekly[i]),
+            score=float(scores[j]),
+        ))
+    return ranked
+
+
 # ──────────────────────────────────────────────────────────────────────────────
 # DCA Averaging Check
 # ──────────────────────────────────────────────────────────────────────────────
@@ -466,8 +551,7 @@ def generate_cc_decision(
     # ── DTE ≤ 0: option has expired — determine next action ──────────────────
     # Non-negotiable: do not end here. Must choose a forward-looking action.
 
-    candidates = build_valid_call_candidates(all_calls, state)
-    ranked     = rank_candidates(candidates, state)
+    ranked = rank_call_chain(all_calls, state)
 
     if ranked:
         best = ranked[0]
@@ -13,7 +13,7 @@ These endpoints replace the legacy /api/snapshots/* endpoints
 for snapshot-based modules.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, Query, BackgroundTasks, Body
+from fastapi import APIRouter, Depends, HTTPException, Query, BackgroundTasks, Body, Header
 from typing import List, Optional
 import logging
 import os
@@ -25,6 +25,7 @@ from services.eod_ingestion_service import (
     EODPriceNotFoundError,
     EODOptionsNotFoundError
 )
+from services import job_queue
 from utils.auth import get_current_user
 from database import db
 
@@ -178,19 +179,31 @@ async def ingest_eod_full(
     }
 
 
+async def _run_eod_ingest_job(job: "job_queue.JobContext"):
+    service = get_eod_ingestion_service()
+    params = job.params
+    return await service.ingest_all_eod(
+        params["symbols"], params.get("trade_date"), params.get("override", False), progress=job.progress
+    )
+
+
+job_queue.register_handler("eod_ingest", _run_eod_ingest_job, max_concurrency=1)
+
+
 @eod_router.post("/ingest/batch")
 async def ingest_eod_batch(
     symbols: List[str] = Body(None, embed=True),
     use_defaults: bool = Query(False, description="Use default symbol list"),
     trade_date: str = Query(None, description="Trading day (YYYY-MM-DD)"),
     override: bool = Query(False, description="Override existing final data"),
-    background_tasks: BackgroundTasks = None,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
     user: dict = Depends(get_current_user)
 ):
     """
     Batch ingest EOD data for multiple symbols.
     
-    For large batches (>10 symbols), runs in background.
+    For large batches (>10 symbols), runs as a background job -
+    poll GET /api/jobs/{job_id} for progress.
     """
     if not user.get("is_admin"):
         raise HTTPException(status_code=403, detail="Admin access required")
@@ -200,21 +213,25 @@ async def ingest_eod_batch(
     if not target_symbols:
         raise HTTPException(status_code=400, detail="No symbols provided")
     
-    service = get_eod_ingestion_service()
-    
-    # Large batches run in background
-    if len(target_symbols) > 10 and background_tasks:
-        background_tasks.add_task(service.ingest_all_eod, target_symbols, trade_date, override)
+    # Large batches run as a job
+    if len(target_symbols) > 10:
+        job = await job_queue.enqueue(
+            db, "eod_ingest", user.get("id"),
+            params={"symbols": target_symbols, "trade_date": trade_date, "override": override},
+            idempotency_key=idempotency_key
+        )
         return {
             "status": "STARTED",
             "message": f"Ingesting {len(target_symbols)} symbols in background",
             "symbols_count": len(target_symbols),
             "trade_date": trade_date or "LTD",
             "triggered_at": datetime.now(timezone.utc).isoformat(),
-            "triggered_by": user.get("email")
+            "triggered_by": user.get("email"),
+            "job_id": job["id"]
         }
     
     # Small batches run synchronously
+    service = get_eod_ingestion_service()
     result = await service.ingest_all_eod(target_symbols, trade_date, override)
     return result
 
@@ -4,7 +4,7 @@ EOD Pipeline Routes
 Admin endpoints for running and monitoring the EOD pipeline.
 Also provides read-only endpoints for pre-computed scan results.
 """
-from fastapi import APIRouter, Depends, Query, HTTPException
+from fastapi import APIRouter, Depends, Query, HTTPException, Header
 from typing import Optional
 from datetime import datetime, timezone
 import logging
@@ -20,12 +20,14 @@ from utils.auth import get_current_user, get_admin_user
 from services.eod_pipeline import (
     run_eod_pipeline,
     is_manual_run_allowed,
-    get_latest_scan_run,
     get_precomputed_cc_results,
     get_precomputed_pmcc_results,
     EODPipelineResult
 )
 from services.db_indexes import create_all_indexes
+from services import job_queue
+from services.retention_manager import apply_retention, policy_summary
+from services.run_registry import latest_completed_run
 
 logger = logging.getLogger(__name__)
 
@@ -40,6 +42,7 @@ eod_pipeline_router = APIRouter(prefix="/eod-pipeline", tags=["EOD Pipeline"])
 async def get_cc_opportunities(
     limit: int = Query(50, ge=1, le=200),
     run_id: Optional[str] = Query(None, description="Specific run ID or latest"),
+    latest_run: Optional[dict] = Depends(latest_completed_run),
     user: dict = Depends(get_current_user)
 ):
     """
@@ -50,10 +53,9 @@ async def get_cc_opportunities(
     
     Returns the latest scan results by default, or results from a specific run_id.
     """
-    results = await get_precomputed_cc_results(db, run_id=run_id, limit=limit)
+    results = await get_precomputed_cc_results(db, run_id=run_id or (latest_run or {}).get("run_id"), limit=limit)
     
-    # Get run metadata
-    latest_run = await get_latest_scan_run(db)
+    # Run metadata
     run_info = None
     if latest_run:
         run_info = {
@@ -79,6 +81,7 @@ async def get_cc_opportunities(
 async def get_pmcc_opportunities(
     limit: int = Query(50, ge=1, le=200),
     run_id: Optional[str] = Query(None, description="Specific run ID or latest"),
+    latest_run: Optional[dict] = Depends(latest_completed_run),
     user: dict = Depends(get_current_user)
 ):
     """
@@ -87,10 +90,9 @@ async def get_pmcc_opportunities(
     This endpoint serves data pre-computed by the EOD pipeline.
     It does NOT make any live API calls.
     """
-    results = await get_precomputed_pmcc_results(db, run_id=run_id, limit=limit)
+    results = await get_precomputed_pmcc_results(db, run_id=run_id or (latest_run or {}).get("run_id"), limit=limit)
     
-    # Get run metadata
-    latest_run = await get_latest_scan_run(db)
+    # Run metadata
     run_info = None
     if latest_run:
         run_info = {
@@ -112,10 +114,10 @@ async def get_pmcc_opportunities(
 
 @eod_pipeline_router.get("/latest-run")
 async def get_latest_run_info(
+    latest_run: Optional[dict] = Depends(latest_completed_run),
     user: dict = Depends(get_current_user)
 ):
     """Get information about the latest completed EOD pipeline run."""
-    latest_run = await get_latest_scan_run(db)
     
     if not latest_run:
         return {
@@ -307,3 +309,39 @@ async def get_current_universe(
         },
         "target_size": 1500
     }
+
+
+# ============================================================
+# RETENTION
+# ============================================================
+
+async def _run_retention_job(job: "job_queue.JobContext"):
+    return await apply_retention(db, dry_run=job.params.get("dry_run", False), progress=job.progress)
+
+
+job_queue.register_handler("eod_retention", _run_retention_job, max_concurrency=1)
+
+
+@eod_pipeline_router.get("/retention")
+async def get_retention_policies(
+    admin: dict = Depends(get_admin_user)
+):
+    """Retention tiers and per-collection policies for the per-run EOD collections."""
+    return policy_summary()
+
+
+@eod_pipeline_router.post("/retention")
+async def run_retention(
+    dry_run: bool = Query(False, description="Report what would be compacted/deleted without writing"),
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
+    admin: dict = Depends(get_admin_user)
+):
+    """
+    Compact warm runs and delete expired runs of symbol_snapshot, scan_results_cc,
+    scan_results_pmcc and scan_universe_audit. Reports reclaimed bytes.
+    Background job - poll GET /api/jobs/{job_id}.
+    """
+    job = await job_queue.enqueue(
+        db, "eod_retention", admin["id"], params={"dry_run": dry_run}, idempotency_key=idempotency_key
+    )
+    return {"message": "Retention pass queued", "job_id": job["id"], "job": job}
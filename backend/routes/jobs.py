@@ -0,0 +1,55 @@
+"""
+Background Job Routes
+=====================
+Status polling and cancellation for jobs started by heavy endpoints
+(see services/job_queue.py).
+
+Endpoints:
+- GET  /api/jobs              - Recent jobs for the current user
+- GET  /api/jobs/{job_id}     - Job status, progress and result
+- POST /api/jobs/{job_id}/cancel - Request cancellation
+"""
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from typing import Optional
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from database import db
+from utils.auth import get_current_user
+from services import job_queue
+
+jobs_router = APIRouter(prefix="/jobs", tags=["Jobs"])
+
+
+@jobs_router.get("")
+async def list_jobs(
+    job_type: Optional[str] = Query(None),
+    limit: int = Query(20, ge=1, le=100),
+    user: dict = Depends(get_current_user)
+):
+    """Most recent jobs for the current user, newest first."""
+    jobs = await job_queue.list_jobs(db, user["id"], job_type=job_type, limit=limit)
+    return {"jobs": jobs, "count": len(jobs)}
+
+
+@jobs_router.get("/{job_id}")
+async def get_job(job_id: str, user: dict = Depends(get_current_user)):
+    """Poll a job's status / progress / result."""
+    job = await job_queue.get_job(db, job_id, user["id"])
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+@jobs_router.post("/{job_id}/cancel")
+async def cancel_job(job_id: str, user: dict = Depends(get_current_user)):
+    """Cancel a queued job, or ask a running job to stop at its next checkpoint."""
+    job = await job_queue.get_job(db, job_id, user["id"])
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job["status"] in job_queue.FINAL_STATUSES:
+        return job
+    return await job_queue.cancel_job(db, job_id, user["id"])
@@ -217,25 +217,12 @@ async def get_options_chain(
             if expiry:
                 option_chain = [opt for opt in option_chain if opt.get("expiry") == expiry]
             
-            # Transform options with Greeks calculation
+            # Transform options (greeks and IV were stamped when the snapshot was stored)
             transformed: List[Dict[str, Any]] = []
             for opt in option_chain:
                 dte = int(opt.get("dte", 30) or 30)
                 strike = float(opt.get("strike", 0) or 0)
                 
-                iv_raw = opt.get("implied_volatility", 0)
-                iv_data = normalize_iv_fields(iv_raw)
-                
-                T = max(dte, 1) / 365.0
-                
-                greeks_result = calculate_greeks(
-                    S=underlying_price,
-                    K=strike,
-                    T=T,
-                    sigma=iv_data["iv"] if iv_data["iv"] > 0 else None,
-                    option_type="call"
-                )
-                
                 bid = float(opt.get("bid", 0) or 0)
                 ask = float(opt.get("ask", 0) or 0)
                 mid = (bid + ask) / 2.0 if (bid > 0 and ask > 0) else 0.0
@@ -251,13 +238,13 @@ async def get_options_chain(
                     "ask": ask,
                     "mid": mid,
                     "last": float(opt.get("close", 0) or 0),
-                    "delta": greeks_result.delta,
-                    "delta_source": greeks_result.delta_source,
-                    "gamma": greeks_result.gamma,
-                    "theta": greeks_result.theta,
-                    "vega": greeks_result.vega,
-                    "iv": iv_data["iv"],
-                    "iv_pct": iv_data["iv_pct"],
+                    "delta": opt.get("delta", 0.0),
+                    "delta_source": opt.get("delta_source", "UNKNOWN"),
+                    "gamma": opt.get("gamma", 0.0),
+                    "theta": opt.get("theta", 0.0),
+                    "vega": opt.get("vega", 0.0),
+                    "iv": opt.get("iv", 0.0),
+                    "iv_pct": opt.get("iv_pct", 0.0),
                     "iv_rank": 50.0,  # Default when serving from snapshot
                     "iv_percentile": 50.0,
                     "iv_rank_source": "SNAPSHOT_DEFAULT",
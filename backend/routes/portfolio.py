@@ -6,7 +6,7 @@ PHASE 1 REFACTOR (December 2025):
 - fetch_stock_quote now imports from data_provider.py instead of server.py
 - This ensures portfolio uses the same data source as other pages
 """
-from fastapi import APIRouter, Depends, Query, HTTPException, File, UploadFile
+from fastapi import APIRouter, Depends, Query, HTTPException, File, UploadFile, Header
 from pydantic import BaseModel, Field
 from typing import Optional, Dict
 from datetime import datetime, timezone, date
@@ -24,19 +24,42 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from database import db
 from utils.auth import get_current_user
 from services.data_provider import fetch_stock_quote
+from services import job_queue
+from services.snapshot_repository import get_snapshot_repository
+from services.run_registry import get_latest_run
 
 portfolio_router = APIRouter(tags=["Portfolio"])
 
 
 # ==================== PRECOMPUTED CALL CANDIDATE HELPERS ====================
 
+async def _get_latest_run() -> Optional[dict]:
+    """Return the latest completed EOD run (run_id, as_of) from the run registry."""
+    return await get_latest_run(db)
+
+
 async def _get_latest_run_id() -> Optional[str]:
     """Return the latest completed EOD run_id from scan_runs."""
-    for status in ("COMPLETED", "completed"):
-        doc = await db.scan_runs.find_one({"status": status}, sort=[("completed_at", -1)])
-        if doc:
-            return doc["run_id"]
-    return None
+    run = await _get_latest_run()
+    return run["run_id"] if run else None
+
+
+def _snapshot_dte_range(run: dict, today: date, min_dte: int, max_dte: int) -> tuple:
+    """
+    Stored-DTE window matching [min_dte, max_dte] from today: snapshot DTE runs
+    ahead of today's by the days since the run, so the slice can happen in Mongo.
+    """
+    as_of = run.get("as_of")
+    try:
+        run_day = as_of.date() if isinstance(as_of, datetime) else date.fromisoformat(str(as_of)[:10])
+        elapsed = max(0, (today - run_day).days)
+    except (TypeError, ValueError):
+        return None  # unknown run date: read every expiry, filter on recalculated DTE
+    return (min_dte + elapsed, max_dte + elapsed)
+
+
+# Call fields _snapshot_option_to_call_dict needs (snapshot repository names)
+SNAPSHOT_CALL_FIELDS = ("strike", "bid", "ask", "open_interest", "volume", "iv")
 
 
 def _snapshot_option_to_call_dict(opt: dict, today: date) -> Optional[dict]:
@@ -77,7 +100,8 @@ async def _get_call_candidates(symbol: str, min_dte: int = 1, max_dte: int = 60)
     Return (candidates: list, source: str) for the given symbol.
 
     Priority:
-      1. symbol_snapshot.option_chain — full chain from EOD pipeline, DTE recalculated
+      1. symbol_snapshot chain        — EOD pipeline chain (dict or columnar), DTE window sliced
+                                        in Mongo, DTE recalculated
       2. scan_results_cc              — fallback if snapshot missing (only best picks)
       3. Live Yahoo                   — single-symbol fallback, bounded 12s timeout
 
@@ -85,18 +109,18 @@ async def _get_call_candidates(symbol: str, min_dte: int = 1, max_dte: int = 60)
     """
     today = datetime.now(timezone.utc).date()
 
-    # ── 1. Full option chain from symbol_snapshot (primary) ───────────────────
-    run_id = await _get_latest_run_id()
+    # ── 1. Option chain from symbol_snapshot (primary), DTE window sliced in Mongo ──
+    run = await _get_latest_run()
+    run_id = run["run_id"] if run else None
     if run_id:
-        snap = await db.symbol_snapshot.find_one(
-            {"run_id": run_id, "symbol": symbol.upper()},
-            {"_id": 0, "option_chain": 1},
+        chains = await get_snapshot_repository(db).get_chains(
+            [symbol], run_id, fields=SNAPSHOT_CALL_FIELDS, sides=("calls",),
+            dte_range=_snapshot_dte_range(run, today, min_dte, max_dte)
         )
-        if snap and snap.get("option_chain"):
+        snap = chains.get(symbol.upper())
+        if snap:
             calls = []
-            for opt in snap["option_chain"]:
-                if opt.get("type", "call").lower() != "call":
-                    continue
+            for opt in snap["calls"]:
                 c = _snapshot_option_to_call_dict(opt, today)
                 if c and min_dte <= c["dte"] <= max_dte:
                     calls.append(c)
@@ -361,14 +385,12 @@ async def import_csv(file: UploadFile = File(...), user: dict = Depends(get_curr
 
 
 # ==================== IBKR IMPORT ====================
-@portfolio_router.post("/import-ibkr")
-async def import_ibkr_csv(file: UploadFile = File(...), user: dict = Depends(get_current_user)):
-    """Import and parse IBKR transaction history CSV - overwrites existing data for same accounts"""
+async def _import_ibkr_for_user(user_id: str, decoded: str, job: Optional["job_queue.JobContext"] = None) -> Dict:
+    """Parse an IBKR CSV and replace the user's data for the accounts it contains."""
     from services.ibkr_parser import parse_ibkr_csv
     
-    content = await file.read()
-    decoded = content.decode('utf-8')
-    
+    if job:
+        await job.progress(10, "Parsing IBKR CSV")
     result = parse_ibkr_csv(decoded)
     imported_accounts = result.get('accounts', [])
     raw_transactions = result.get('raw_transactions', [])
@@ -381,23 +403,28 @@ async def import_ibkr_csv(file: UploadFile = File(...), user: dict = Depends(get
     # Build all docs in memory first — only clear old data after successful parse
     tx_docs = []
     for tx in raw_transactions:
-        tx['user_id'] = user['id']
+        tx['user_id'] = user_id
         tx_docs.append(tx)
 
     trade_docs = []
     for trade in trades:
-        trade['user_id'] = user['id']
+        trade['user_id'] = user_id
         trade_doc = {k: v for k, v in trade.items() if k != 'transactions'}
         trade_doc['transaction_ids'] = [t['id'] for t in trade.get('transactions', [])]
         trade_docs.append(trade_doc)
 
+    # Last cancellation point — everything below replaces existing data
+    if job:
+        await job.check_cancelled()
+        await job.progress(60, "Replacing account data", total=len(trade_docs))
+
     # Now safe to clear existing data (parse succeeded)
     await db.ibkr_transactions.delete_many({
-        "user_id": user['id'],
+        "user_id": user_id,
         "account": {"$in": imported_accounts}
     })
     await db.ibkr_trades.delete_many({
-        "user_id": user['id'],
+        "user_id": user_id,
         "account": {"$in": imported_accounts}
     })
 
@@ -415,6 +442,32 @@ async def import_ibkr_csv(file: UploadFile = File(...), user: dict = Depends(get
     }
 
 
+async def _run_ibkr_import_job(job: "job_queue.JobContext") -> Dict:
+    return await _import_ibkr_for_user(job.user_id, job.params["csv"], job)
+
+
+job_queue.register_handler("ibkr_import", _run_ibkr_import_job, max_concurrency=2)
+
+
+@portfolio_router.post("/import-ibkr")
+async def import_ibkr_csv(
+    file: UploadFile = File(...),
+    background: bool = Query(False, description="Run as a background job and return its job_id"),
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
+    user: dict = Depends(get_current_user)
+):
+    """Import and parse IBKR transaction history CSV - overwrites existing data for same accounts"""
+    content = await file.read()
+    decoded = content.decode('utf-8')
+    
+    if background:
+        job = await job_queue.enqueue(
+            db, "ibkr_import", user["id"], params={"csv": decoded}, idempotency_key=idempotency_key
+        )
+        return {"message": "IBKR import queued", "job_id": job["id"], "job": job}
+    return await _import_ibkr_for_user(user["id"], decoded)
+
+
 @portfolio_router.get("/ibkr/accounts")
 async def get_ibkr_accounts(user: dict = Depends(get_current_user)):
     """Get list of broker accounts from imported data"""
@@ -1093,14 +1146,7 @@ P&L:
 Apply the DTE decision engine and output in the required format."""
 
 
-@portfolio_router.post("/ibkr/generate-suggestions")
-async def generate_all_suggestions(user: dict = Depends(get_current_user)):
-    """Generate AI suggestions for all open trades (uses AI tokens - one per trade)"""
-    import os
-    from ai_wallet.ai_service import AIExecutionService
-    from ai_wallet.wallet_service import WalletService
-    from ai_wallet.config import AI_ACTION_COSTS
-
+def _require_ai_configured():
     # Pre-flight: require at least one AI key
     if not os.environ.get("GEMINI_API_KEY") and not os.environ.get("OPENAI_API_KEY") and not os.environ.get("EMERGENT_LLM_KEY"):
         raise HTTPException(
@@ -1108,6 +1154,13 @@ async def generate_all_suggestions(user: dict = Depends(get_current_user)):
             detail="AI service is not configured on this server. Please contact support."
         )
 
+
+async def _generate_suggestions_for_user(user: dict, job: Optional["job_queue.JobContext"] = None) -> Dict:
+    """Generate AI suggestions for all of the user's open IBKR trades."""
+    from ai_wallet.ai_service import AIExecutionService
+    from ai_wallet.wallet_service import WalletService
+    from ai_wallet.config import AI_ACTION_COSTS
+
     logging.info(f"Generating suggestions for user {user['id']}")
     
     open_trades = await db.ibkr_trades.find(
@@ -1154,24 +1207,21 @@ async def generate_all_suggestions(user: dict = Depends(get_current_user)):
     unique_symbols = list({sym for (sym, _) in symbol_groups.keys()})
 
     # Query precomputed data for ALL symbols at once (single MongoDB query)
-    run_id = await _get_latest_run_id()
+    run = await _get_latest_run()
+    run_id = run["run_id"] if run else None
     options_cache_bulk: dict = {sym: [] for sym in unique_symbols}
     candidates_source_map: dict = {sym: "none" for sym in unique_symbols}
 
     today_bulk = datetime.now(timezone.utc).date()
     if run_id:
-        # Read full option chain from symbol_snapshot for all symbols at once
-        snaps = await db.symbol_snapshot.find(
-            {"run_id": run_id, "symbol": {"$in": [s.upper() for s in unique_symbols]}},
-            {"_id": 0, "symbol": 1, "option_chain": 1},
-        ).to_list(len(unique_symbols) + 10)
-
-        for snap in snaps:
-            sym = snap.get("symbol", "")
-            chain = snap.get("option_chain") or []
-            for opt in chain:
-                if opt.get("type", "call").lower() != "call":
-                    continue
+        # Full symbol_snapshot call chains for all symbols at once (shared snapshot repository LRU)
+        chains = await get_snapshot_repository(db).get_chains(
+            unique_symbols, run_id, fields=SNAPSHOT_CALL_FIELDS, sides=("calls",),
+            dte_range=_snapshot_dte_range(run, today_bulk, 1, 60)
+        )
+
+        for sym, snap in chains.items():
+            for opt in snap["calls"]:
                 c = _snapshot_option_to_call_dict(opt, today_bulk)
                 if c and 1 <= c["dte"] <= 60:
                     options_cache_bulk.setdefault(sym, []).append(c)
@@ -1258,6 +1308,9 @@ async def generate_all_suggestions(user: dict = Depends(get_current_user)):
         else:
             pending_groups.append((sym, acct, group, primary))
 
+    if job:
+        await job.progress(30, "Fetching live prices", total=len(pending_groups))
+
     # ── Fetch all live prices in parallel ────────────────────────────────────
     async def _fetch_price(sym):
         try:
@@ -1306,6 +1359,11 @@ async def generate_all_suggestions(user: dict = Depends(get_current_user)):
             logging.warning(f"[bulk scan] {sym}: prep error: {_prep_err}")
             errors.append(f"{sym}: prep error")
 
+    # Last cancellation point before tokens are spent
+    if job:
+        await job.check_cancelled()
+        await job.progress(50, "Generating AI suggestions", total=len(work_items))
+
     # ── Fire all AI calls in parallel ────────────────────────────────────────
     async def _run_one(sym, group, trade_context, engine_decision):
         if engine_decision:
@@ -1385,6 +1443,27 @@ async def generate_all_suggestions(user: dict = Depends(get_current_user)):
     }
 
 
+async def _run_generate_suggestions_job(job: "job_queue.JobContext") -> Dict:
+    return await _generate_suggestions_for_user({"id": job.user_id}, job)
+
+
+job_queue.register_handler("ibkr_generate_suggestions", _run_generate_suggestions_job, max_concurrency=2)
+
+
+@portfolio_router.post("/ibkr/generate-suggestions")
+async def generate_all_suggestions(
+    background: bool = Query(False, description="Run as a background job and return its job_id"),
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
+    user: dict = Depends(get_current_user)
+):
+    """Generate AI suggestions for all open trades (uses AI tokens - one per trade)"""
+    _require_ai_configured()
+    if background:
+        job = await job_queue.enqueue(db, "ibkr_generate_suggestions", user["id"], idempotency_key=idempotency_key)
+        return {"message": "Suggestion generation queued", "job_id": job["id"], "job": job}
+    return await _generate_suggestions_for_user(user)
+
+
 # ==================== MANUAL TRADE ENTRY ====================
 @portfolio_router.post("/manual-trade")
 async def add_manual_trade(trade: ManualTradeEntry, user: dict = Depends(get_current_user)):
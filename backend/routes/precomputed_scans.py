@@ -16,6 +16,7 @@ Endpoints:
 - GET /api/scans/available - List all available scans with metadata
 - GET /api/scans/covered-call/{risk_profile} - Get CC scan results from EOD
 - GET /api/scans/pmcc/{risk_profile} - Get PMCC scan results from EOD
+- GET /api/scans/stored/{strategy}/{risk_profile} - Page through nightly precomputed results
 - POST /api/scans/trigger/{strategy}/{risk_profile} - Manually trigger scan (admin)
 - POST /api/scans/trigger-all - Trigger all scans (admin)
 """
@@ -33,6 +34,7 @@ from datetime import datetime, timezone
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from database import db
+from services.run_registry import get_latest_run_id
 from utils.auth import get_current_user, get_admin_user
 
 # Import pricing utilities for stabilization (MASTER PATCH)
@@ -62,22 +64,10 @@ def sanitize_response(data: Dict) -> Dict:
 
 async def _get_latest_eod_run_id() -> Optional[str]:
     """Get the latest EOD pipeline run_id."""
-    # Try COMPLETED (uppercase) first — EOD pipeline stores this casing
-    latest_run = await db.scan_runs.find_one(
-        {"status": "COMPLETED"},
-        {"run_id": 1, "_id": 0},
-        sort=[("completed_at", -1)]
-    )
-    if latest_run and latest_run.get("run_id"):
-        return latest_run.get("run_id")
-    # Fallback: lowercase
-    latest_run = await db.scan_runs.find_one(
-        {"status": "completed"},
-        {"run_id": 1, "_id": 0},
-        sort=[("completed_at", -1)]
-    )
-    if latest_run and latest_run.get("run_id"):
-        return latest_run.get("run_id")
+    # Latest COMPLETED run (either casing), cached in process by the run registry
+    run_id = await get_latest_run_id(db)
+    if run_id:
+        return run_id
     # Last resort: get run_id from most recent scan_results_pmcc or scan_results_cc entry
     latest_pmcc = await db.scan_results_pmcc.find_one(
         {}, {"run_id": 1, "_id": 0}, sort=[("created_at", -1)]
@@ -757,6 +747,53 @@ async def get_pmcc_scan(
     })
 
 
+@scans_router.get("/stored/{strategy}/{risk_profile}")
+async def get_stored_scan(
+    strategy: str,
+    risk_profile: str,
+    limit: int = Query(50, ge=1, le=500),
+    offset: int = Query(0, ge=0),
+    sort_by: str = Query("score"),
+    sort_dir: str = Query("desc", regex="^(asc|desc)$"),
+    min_score: float = Query(0, ge=0),
+    min_dte: Optional[int] = Query(None, ge=0),
+    max_dte: Optional[int] = Query(None, ge=0),
+    symbols: Optional[str] = Query(None, description="Comma-separated symbols"),
+    scan_id: Optional[str] = Query(None, description="Pin a scan version while paging"),
+    user: dict = Depends(get_current_user)
+):
+    """
+    One page of the nightly precomputed_scans results for a profile.
+
+    Filtering, sorting and pagination run in MongoDB against
+    precomputed_scan_rows, so the response scales with `limit`.
+    `total` is the filtered row count; pass `scan_id` back to keep
+    paging the same version after a nightly refresh.
+    """
+    if strategy not in ["covered_call", "pmcc"]:
+        raise HTTPException(status_code=400, detail="Invalid strategy")
+
+    if risk_profile not in ["conservative", "balanced", "aggressive"]:
+        raise HTTPException(status_code=400, detail="Invalid risk_profile")
+
+    service = await get_scan_service()
+    symbol_list = [s.strip() for s in symbols.split(",") if s.strip()] if symbols else None
+    try:
+        page = await service.get_scan_results(
+            strategy, risk_profile, scan_id=scan_id,
+            min_score=min_score, min_dte=min_dte, max_dte=max_dte, symbols=symbol_list,
+            sort_by=sort_by, sort_dir=-1 if sort_dir == "desc" else 1,
+            offset=offset, limit=limit
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if not page:
+        raise HTTPException(status_code=404, detail="No stored results for this scan")
+
+    return sanitize_response(page)
+
+
 # ==================== ADMIN ENDPOINTS ====================
 
 @scans_router.post("/trigger/{strategy}/{risk_profile}")
@@ -57,9 +57,12 @@ from services.data_provider import (
 )
 # PHASE 2: Import chain validator
 from services.chain_validator import (
+    REASON_LABELS,
+    REASON_OK,
+    chain_table,
     get_validator,
     validate_chain_for_cc,
-    validate_cc_trade,
+    validate_cc_trades_batch,
     validate_pmcc_trade
 )
 # PHASE 6: Import market bias module
@@ -472,7 +475,13 @@ async def screen_covered_calls(
                     logging.debug(f"No options data for {symbol}")
                     continue
                 
-                for opt in options_results:
+                # PHASE 2: Trade structure for the whole chain in one vectorized pass
+                # (no ask column - validate_cc_trade was never given one)
+                cc_checks = validate_cc_trades_batch(
+                    underlying_price, chain_table(options_results, ("strike", "expiry", "bid", "dte"))
+                )
+                
+                for opt, cc_reason in zip(options_results, cc_checks.reasons):
                     strike = opt.get("strike", 0)
                     expiry = opt.get("expiry", "")
                     dte = opt.get("dte", 0)
@@ -533,22 +542,11 @@ async def screen_covered_calls(
                     premium = bid_price
                     premium_source = "bid"
                     
-                    # PHASE 2: Validate trade structure BEFORE scoring
-                    expiry = opt.get("expiry", "")
+                    # PHASE 2: Trade structure (validated above) BEFORE scoring
                     open_interest = opt.get("open_interest", 0) or 0
                     
-                    is_valid, rejection_reason = validate_cc_trade(
-                        symbol=symbol,
-                        stock_price=underlying_price,
-                        strike=strike,
-                        expiry=expiry,
-                        bid=bid_price,
-                        dte=dte,
-                        open_interest=open_interest
-                    )
-                    
-                    if not is_valid:
-                        logging.debug(f"CC trade rejected: {symbol} ${strike} - {rejection_reason}")
+                    if cc_reason != REASON_OK:
+                        logging.debug(f"CC trade rejected: {symbol} ${strike} - {REASON_LABELS[cc_reason]}")
                         continue
                     
                     # DATA QUALITY FILTER: Check for unrealistic premiums
@@ -1088,7 +1086,12 @@ async def get_dashboard_opportunities(
                     if not options_list:
                         continue
                     
-                    for opt in options_list:
+                    # Trade structure (Phase 2) for the whole list in one vectorized pass
+                    cc_valid = validate_cc_trades_batch(
+                        current_price, chain_table(options_list, ("strike", "expiry", "bid", "dte"))
+                    ).valid
+                    
+                    for opt, structure_valid in zip(options_list, cc_valid):
                         strike = opt.get("strike", 0)
                         dte = opt.get("dte", 0)
                         expiry = opt.get("expiry", "")
@@ -1104,17 +1107,7 @@ async def get_dashboard_opportunities(
                         premium = bid_price
                         
                         # Validate trade structure (Phase 2)
-                        is_valid, rejection_reason = validate_cc_trade(
-                            symbol=symbol,
-                            stock_price=current_price,
-                            strike=strike,
-                            expiry=expiry,
-                            bid=bid_price,
-                            dte=dte,
-                            open_interest=open_interest
-                        )
-                        
-                        if not is_valid:
+                        if not structure_valid:
                             continue
                         
                         # OTM filter: Must be 2-10% out of the money
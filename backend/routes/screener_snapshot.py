@@ -65,6 +65,7 @@ from services.iv_rank_service import (
 # NOTE: Enrichment is DB-only in scan paths (no live Yahoo calls)
 # Import quote cache for after-hours support
 from services.quote_cache_service import get_quote_cache
+from services.run_registry import get_latest_run, get_latest_run_id
 
 # Import SnapshotService for stock metadata (not for options)
 from services.snapshot_service import SnapshotService
@@ -440,7 +441,8 @@ def enrich_option_greeks(
     - All *_source fields added for transparency
     
     Computes:
-    - Delta via Black-Scholes (greeks_service.py)
+    - Delta via Black-Scholes (stored at ingestion; greeks_service.py stamps
+      contracts that were never stamped)
     - IV normalized to decimal and percentage
     - IV Rank/Percentile from historical data (or neutral fallback)
     - Gamma, Theta, Vega via Black-Scholes
@@ -454,48 +456,29 @@ def enrich_option_greeks(
     Returns:
         Enriched contract with Greeks, ROI, and source fields
     """
-    from services.greeks_service import calculate_greeks, normalize_iv_fields
+    from services.greeks_service import GREEK_FIELDS, stamp_contract_greeks
     
     enriched = contract.copy()
     
-    strike = contract.get("strike", 0)
     dte = contract.get("dte", 30)
-    iv_raw = contract.get("implied_volatility", 0)
-    option_type = contract.get("option_type", contract.get("type", "call"))
     premium = contract.get("bid", 0) or contract.get("premium", 0)
     ask = contract.get("ask", 0)
     
     # ==========================================================================
-    # STEP 1: Normalize IV to decimal and percentage
+    # STEPS 1-2: IV (decimal + percentage) and Black-Scholes Greeks
+    # Stored snapshot contracts carry both from ingestion; only a contract
+    # that was never stamped goes through the same ingest-time greeks stage
     # ==========================================================================
-    iv_data = normalize_iv_fields(iv_raw)
-    enriched["iv"] = iv_data["iv"]
-    enriched["iv_pct"] = iv_data["iv_pct"]
-    
-    # ==========================================================================
-    # STEP 2: Calculate Greeks via Black-Scholes
-    # (Removed moneyness-based delta fallback - accuracy and consistency)
-    # ==========================================================================
-    T = max(dte, 1) / 365.0  # Time in years
-    
-    greeks_result = calculate_greeks(
-        S=stock_price,
-        K=strike,
-        T=T,
-        sigma=iv_data["iv"] if iv_data["iv"] > 0 else None,
-        option_type=option_type
-    )
-    
-    enriched["delta"] = greeks_result.delta
-    enriched["delta_source"] = greeks_result.delta_source
-    enriched["gamma"] = greeks_result.gamma
-    enriched["theta"] = greeks_result.theta
-    enriched["vega"] = greeks_result.vega
+    if contract.get("delta_source") in (None, "UNKNOWN"):
+        enriched.setdefault("dte", dte)
+        stamp_contract_greeks([enriched], stock_price)
+    for name in GREEK_FIELDS:
+        enriched.setdefault(name, 0.0)
     
     # Legacy field names for backward compatibility
-    enriched["gamma_estimate"] = greeks_result.gamma
-    enriched["theta_estimate"] = greeks_result.theta
-    enriched["vega_estimate"] = greeks_result.vega
+    enriched["gamma_estimate"] = enriched["gamma"]
+    enriched["theta_estimate"] = enriched["theta"]
+    enriched["vega_estimate"] = enriched["vega"]
     
     # ==========================================================================
     # STEP 3: IV Rank and Percentile
@@ -736,8 +719,8 @@ async def validate_all_snapshots(symbols: List[str]) -> Dict[str, Any]:
             rejection_reasons.append(f"{symbol}: {stock_error}")
             continue
         
-        # Check option chain snapshot
-        chain, chain_error = await snapshot_service.get_option_chain_snapshot(symbol)
+        # Check option chain snapshot (metadata only; contract arrays stay in Mongo)
+        chain, chain_error = await snapshot_service.get_option_chain_snapshot(symbol, sides=())
         if chain_error:
             invalid_symbols.append(symbol)
             rejection_reasons.append(f"{symbol}: {chain_error}")
@@ -805,7 +788,7 @@ async def validate_eod_data(symbols: List[str], trade_date: str = None) -> Dict[
             price, stock_doc = await eod_contract.get_market_close_price(symbol, trade_date)
             
             # Get canonical EOD options chain
-            chain_doc = await eod_contract.get_options_chain(symbol, trade_date)
+            chain_doc = await eod_contract.get_options_chain(symbol, trade_date, sides=())
             
             valid_symbols.append({
                 "symbol": symbol,
@@ -861,21 +844,10 @@ async def validate_eod_data(symbols: List[str], trade_date: str = None) -> Dict[
 async def _get_latest_eod_run_id() -> Optional[str]:
     """Get the latest completed EOD run_id from scan_runs collection."""
     try:
-        # Try COMPLETED (uppercase) first — EOD pipeline stores this
-        latest = await db.scan_runs.find_one(
-            {"status": "COMPLETED"},
-            sort=[("completed_at", -1)]
-        )
-        if latest and latest.get("run_id"):
-            return latest["run_id"]
-
-        # Fallback: try lowercase "completed" (alternate pipeline versions)
-        latest = await db.scan_runs.find_one(
-            {"status": "completed"},
-            sort=[("completed_at", -1)]
-        )
-        if latest and latest.get("run_id"):
-            return latest["run_id"]
+        # Latest COMPLETED run (either casing), cached in process by the run registry
+        run_id = await get_latest_run_id(db)
+        if run_id:
+            return run_id
 
         # Last resort: get run_id directly from the most recent CC result
         latest_cc = await db.scan_results_cc.find_one(
@@ -2415,11 +2387,7 @@ async def get_admin_status(user: dict = Depends(get_current_user)):
     structure_valid_pct = round((structure_valid / total_symbols * 100), 1) if total_symbols > 0 else 0
     
     # Get last COMPLETED scan run time (not partial/failed runs)
-    last_completed_run = await db.scan_runs.find_one(
-        {"status": "COMPLETED"},
-        sort=[("as_of", -1)],
-        projection={"as_of": 1, "completed_at": 1}
-    )
+    last_completed_run = await get_latest_run(db)
     last_full_run_at = last_completed_run.get("completed_at") if last_completed_run else last_audit_at
     
     # ================================================================
@@ -2712,7 +2680,7 @@ async def get_snapshot_health():
     
     for symbol in SCAN_SYMBOLS:
         stock, _ = await snapshot_service.get_stock_snapshot(symbol)
-        chain, chain_error = await snapshot_service.get_option_chain_snapshot(symbol)
+        chain, chain_error = await snapshot_service.get_option_chain_snapshot(symbol, sides=())
         
         if stock:
             snapshots_found += 1
@@ -21,12 +21,15 @@ PMCC:
 
 CRITICAL RULE: ASSIGNED = CLOSED for analytics/reporting purposes
 """
-from fastapi import APIRouter, Depends, Query, HTTPException, Request
+from fastapi import APIRouter, Depends, Query, HTTPException, Request, Header
 from pydantic import BaseModel, ConfigDict
+from bson.errors import InvalidId
 from typing import Optional, Dict, Any, List
-from datetime import datetime, timezone, timedelta
+from datetime import date, datetime, timezone, timedelta
+import base64
 import logging
 import math
+import time
 import uuid
 
 import sys
@@ -46,7 +49,13 @@ from services.greeks_service import (
     get_risk_free_rate
 )
 # Import enrichment service for IV Rank and Analyst data
-from services.enrichment_service import enrich_row, strip_enrichment_debug
+from services.enrichment_service import enrich_rows_by_symbol, strip_enrichment_debug
+# Append-only trade history (events + compacted snapshots)
+from services import trade_events
+from services import equity_series
+# Background jobs for heavy operations (status polled via /api/jobs)
+from services import job_queue
+from services import profile_sweep
 # AI Trade Manager imports
 try:
     from services.wallet_service import debit_wallet, get_balance, MANAGE_COST_CREDITS, APPLY_COST_CREDITS, credit_wallet
@@ -216,6 +225,20 @@ class ApplyRecommendationRequest(BaseModel):
     current_price: float
 
 
+class ProfileSweepRequest(BaseModel):
+    start: date  # YYYY-MM-DD, first EOD run replayed
+    end: date    # YYYY-MM-DD, last EOD run replayed
+    grid: Dict[str, List[float]]  # RISK_PROFILES threshold -> values to try
+    base_profile: str = "balanced"
+    top: int = 20
+
+
+class SnapshotBacktestRequest(BaseModel):
+    start: date  # YYYY-MM-DD; validated so "2025-1-5" is rejected, not compared as text
+    end: date
+    top_n: int = 10  # new positions opened per strategy per day
+
+
 # ==================== HELPER FUNCTIONS ====================
 
 def _get_server_functions():
@@ -346,6 +369,12 @@ async def execute_rule_action(trade: dict, rule: dict, db) -> dict:
             {"id": trade["id"]},
             {"$set": update_doc}
         )
+        await trade_events.append_event(db, trade_events.build_event(trade, "closed", {
+            "final_pnl": update_doc["final_pnl"],
+            "close_price": current_price,
+            "close_reason": close_reason,
+            "rule_id": rule.get("id"),
+        }, ts=now.isoformat()))
         
         # Log the action
         await db.simulator_trades.update_one(
@@ -430,6 +459,12 @@ async def execute_rule_action(trade: dict, rule: dict, db) -> dict:
     log_entry["strategy_type"] = log_entry.get("strategy_type") or trade.get("strategy_type", "unknown")
     log_entry["read"] = False  # Unread until user dismisses login popup
     await db.simulator_action_logs.insert_one(log_entry)
+    if result["success"]:
+        await trade_events.append_event(db, trade_events.build_event(trade, "rule_action", {
+            "rule_id": rule.get("id"),
+            "action": action,
+            "message": result["message"],
+        }, ts=now.isoformat()))
     
     return result
 
@@ -465,6 +500,8 @@ async def evaluate_and_execute_rules(trade: dict, rules: list, db) -> list:
         if evaluate_rule(trade, rule):
             result = await execute_rule_action(trade, rule, db)
             results.append(result)
+            if result.get("success"):
+                invalidate_trade_count_cache(trade.get("user_id"))
             
             # If action was "close" and successful, stop processing more rules
             if rule.get("action") == "close" and result.get("success"):
@@ -641,6 +678,8 @@ async def add_simulator_trade(trade: SimulatorTradeEntry, user: dict = Depends(g
     }
     
     await db.simulator_trades.insert_one(trade_doc)
+    invalidate_trade_count_cache(user["id"])
+    await trade_events.append_event(db, trade_events.build_opened_event(trade_doc))
     
     # Remove MongoDB _id before returning
     trade_doc.pop("_id", None)
@@ -651,6 +690,65 @@ async def add_simulator_trade(trade: SimulatorTradeEntry, user: dict = Depends(g
     }
 
 
+# Slim projection for the trades table. Heavy / rarely-shown fields
+# (action_log, notes, rule history, ...) are opt-in via ?fields=; the detail
+# dialog loads them from GET /trades/{trade_id}.
+SIMULATOR_TRADE_LIST_FIELDS = (
+    "id", "symbol", "strategy_type", "status", "contracts",
+    "entry_date", "entry_underlying_price", "current_underlying_price",
+    "short_call_strike", "short_call_expiry", "short_call_premium",
+    "short_call_delta", "short_call_iv", "current_delta", "current_option_value",
+    "leaps_strike", "leaps_expiry", "leaps_premium",
+    "capital_deployed", "premium_received", "premium_received_total", "premium_collected",
+    "premium_capture_pct", "unrealized_pnl", "realized_pnl", "final_pnl", "roi_percent",
+    "dte_remaining", "days_held", "roll_count", "breakeven",
+    "iv_rank", "implied_volatility", "open_interest", "scan_parameters",
+    "close_date", "close_reason", "created_at", "updated_at",
+    # Scalars the trade detail dialog renders straight from the list row
+    "max_profit", "max_loss", "current_theta", "cumulative_premium", "iv",
+)
+
+# Cached per-user totals so paging does not pay a count_documents() per page.
+# Invalidated whenever trades are added, deleted or change status (close,
+# roll, rules, price updates); otherwise refreshed after the TTL.
+_trade_count_cache: Dict[str, Dict[str, Any]] = {}
+_TRADE_COUNT_CACHE_TTL = 60  # seconds
+
+
+def _encode_trades_cursor(trade: Dict[str, Any]) -> str:
+    """Opaque keyset cursor for (created_at, id) descending order."""
+    raw = f"{trade.get('created_at', '')}|{trade.get('id', '')}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def _decode_trades_cursor(cursor: str) -> tuple:
+    try:
+        created_at, trade_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|", 1)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return created_at, trade_id
+
+
+def invalidate_trade_count_cache(user_id: Optional[str] = None):
+    """Drop cached totals for one user, or for everyone (scheduled updates)."""
+    if user_id is None:
+        _trade_count_cache.clear()
+        return
+    for key in [k for k in _trade_count_cache if k.startswith(f"{user_id}|")]:
+        _trade_count_cache.pop(key, None)
+
+
+async def _get_cached_trade_count(user_id: str, query: Dict[str, Any]) -> tuple:
+    """Return (total, cached) for the query, using the in-process count cache."""
+    key = f"{user_id}|{query.get('status')}|{query.get('symbol')}|{query.get('strategy_type')}"
+    entry = _trade_count_cache.get(key)
+    if entry and (time.time() - entry["ts"]) < _TRADE_COUNT_CACHE_TTL:
+        return entry["total"], True
+    total = await db.simulator_trades.count_documents(query)
+    _trade_count_cache[key] = {"total": total, "ts": time.time()}
+    return total, False
+
+
 @simulator_router.get("/trades")
 async def get_simulator_trades(
     status: Optional[str] = Query(None, description="Filter by status: open, rolled, expired, assigned, closed"),
@@ -658,10 +756,21 @@ async def get_simulator_trades(
     strategy_type: Optional[str] = Query(None),
     limit: int = Query(100, ge=1, le=1000),
     skip: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None, description="Keyset cursor from a previous page's next_cursor (overrides skip)"),
+    fields: Optional[str] = Query(None, description="Comma-separated extra fields to include, or 'all' for full documents"),
     debug_enrichment: bool = Query(False, description="Include enrichment debug info"),
     user: dict = Depends(get_current_user)
 ):
-    """Get all simulator trades for the user with optional filters"""
+    """
+    Get simulator trades for the user with optional filters.
+
+    PAGINATION:
+    - Keyset on (created_at, id) descending: pass next_cursor back as ?cursor=
+      so deep pages cost the same as the first one.
+    - ?skip= is still honoured when no cursor is given (legacy clients).
+    - total comes from a short-lived per-user count cache (total_cached=True
+      when served from cache).
+    """
     
     query = {"user_id": user["id"]}
     if status:
@@ -671,12 +780,34 @@ async def get_simulator_trades(
     if strategy_type:
         query["strategy_type"] = strategy_type
     
-    trades = await db.simulator_trades.find(
-        query,
-        {"_id": 0}
-    ).sort("created_at", -1).skip(skip).limit(limit).to_list(limit)
-    
-    total = await db.simulator_trades.count_documents(query)
+    # Projection: slim list fields by default, opt-in detail fields on request
+    if fields and fields.strip().lower() == "all":
+        projection = {"_id": 0}
+    else:
+        projection = {f: 1 for f in SIMULATOR_TRADE_LIST_FIELDS}
+        if fields:
+            projection.update({f.strip(): 1 for f in fields.split(",") if f.strip()})
+        projection["_id"] = 0
+    
+    page_query = dict(query)
+    if cursor:
+        cursor_created_at, cursor_id = _decode_trades_cursor(cursor)
+        page_query["$or"] = [
+            {"created_at": {"$lt": cursor_created_at}},
+            {"created_at": cursor_created_at, "id": {"$lt": cursor_id}},
+        ]
+    
+    # Fetch one extra row to know whether another page exists
+    find_cursor = db.simulator_trades.find(page_query, projection).sort([("created_at", -1), ("id", -1)])
+    if not cursor and skip:
+        find_cursor = find_cursor.skip(skip)
+    trades = await find_cursor.limit(limit + 1).to_list(limit + 1)
+    
+    has_more = len(trades) > limit
+    trades = trades[:limit]
+    next_cursor = _encode_trades_cursor(trades[-1]) if has_more and trades else None
+    
+    total, total_cached = await _get_cached_trade_count(user["id"], query)
     
     # ========== UI FIELD ALIASES (normalize simulator doc shape for frontend) ==========
     for trade in trades:
@@ -694,30 +825,29 @@ async def get_simulator_trades(
         else:
             trade["p_l"] = trade.get("realized_pnl") or trade.get("final_pnl", 0)
 
-    # ========== ENRICHMENT: Only enrich OPEN trades, batch by unique symbol ==========
+    # ========== ENRICHMENT: Only enrich OPEN trades, one batched call per page ==========
     # Closed/assigned/expired trades don't need live enrichment (no current option data)
     open_trades = [t for t in trades if t.get("status") in ("open", "rolled", "active")]
     if open_trades:
-        seen_symbols = set()
+        enrich_rows_by_symbol(
+            open_trades,
+            stock_price_keys=("current_underlying_price", "entry_underlying_price"),
+            expiry_key="short_call_expiry",
+            iv_key="short_call_iv",
+            skip_iv_rank=True,   # IV rank not critical for simulator list view
+            skip_analyst=True    # Simulator table doesn't show analyst data — skip live fetch
+        )
         for trade in open_trades:
-            sym = trade.get("symbol", "")
-            if sym and sym not in seen_symbols:
-                seen_symbols.add(sym)
-                enrich_row(
-                    sym, trade,
-                    stock_price=trade.get("current_underlying_price") or trade.get("entry_underlying_price"),
-                    expiry=trade.get("short_call_expiry"),
-                    iv=trade.get("short_call_iv"),
-                    skip_iv_rank=True,   # IV rank not critical for simulator list view
-                    skip_analyst=True    # Simulator table doesn't show analyst data — skip live fetch
-                )
-                strip_enrichment_debug(trade, include_debug=debug_enrichment)
+            strip_enrichment_debug(trade, include_debug=debug_enrichment)
 
     return {
         "trades": trades,
         "total": total,
+        "total_cached": total_cached,
         "limit": limit,
-        "skip": skip
+        "skip": skip,
+        "next_cursor": next_cursor,
+        "has_more": has_more
     }
 
 
@@ -798,12 +928,56 @@ async def get_simulator_trade_detail(trade_id: str, user: dict = Depends(get_cur
     return trade
 
 
+@simulator_router.get("/trades/{trade_id}/events")
+async def get_simulator_trade_events(
+    trade_id: str,
+    event_type: Optional[str] = Query(None, description="Filter: opened, mark, roll, rule_action, closed, expired, assigned"),
+    after: Optional[str] = Query(None, description="Only events with ts after this ISO timestamp"),
+    after_id: Optional[str] = Query(None, description="With after: next_after_id of the previous page"),
+    limit: int = Query(500, ge=1, le=5000),
+    user: dict = Depends(get_current_user)
+):
+    """Append-only event history for a trade, oldest first."""
+    trade = await db.simulator_trades.find_one({"id": trade_id, "user_id": user["id"]}, {"_id": 0, "id": 1})
+    if not trade:
+        raise HTTPException(status_code=404, detail="Trade not found")
+    
+    try:
+        page = await trade_events.get_events_page(
+            db, trade_id, after_ts=after, after_id=after_id,
+            event_types=[event_type] if event_type else None, limit=limit
+        )
+    except InvalidId:
+        raise HTTPException(status_code=400, detail="after_id is not a valid event id")
+    
+    return {
+        "trade_id": trade_id,
+        "events": page["events"],
+        "count": len(page["events"]),
+        "next_after": page["next_after"],
+        "next_after_id": page["next_after_id"],
+    }
+
+
+@simulator_router.get("/trades/{trade_id}/pnl-path")
+async def get_simulator_trade_pnl_path(trade_id: str, user: dict = Depends(get_current_user)):
+    """P/L path and max drawdown for a trade, rebuilt by streaming its events."""
+    trade = await db.simulator_trades.find_one({"id": trade_id, "user_id": user["id"]}, {"_id": 0, "id": 1})
+    if not trade:
+        raise HTTPException(status_code=404, detail="Trade not found")
+    
+    path = await trade_events.get_pnl_path(db, trade_id)
+    state = await trade_events.load_trade_state(db, trade_id)
+    return {"trade_id": trade_id, **path, "state": state}
+
+
 @simulator_router.delete("/trades/{trade_id}")
 async def delete_simulator_trade(trade_id: str, user: dict = Depends(get_current_user)):
     """Delete a simulator trade"""
     result = await db.simulator_trades.delete_one({"id": trade_id, "user_id": user["id"]})
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Trade not found")
+    invalidate_trade_count_cache(user["id"])
     return {"message": "Trade deleted"}
 
 
@@ -861,6 +1035,13 @@ async def close_simulator_trade(
             }}
         }
     )
+    await trade_events.append_event(db, trade_events.build_event(trade, "closed", {
+        "final_pnl": update_doc["final_pnl"],
+        "close_price": final_price,
+        "close_reason": close_reason,
+    }, ts=now.isoformat()))
+    
+    invalidate_trade_count_cache(user["id"])
     
     return {
         "message": "Trade closed",
@@ -956,6 +1137,15 @@ async def roll_pmcc_short_call(
             }}
         }
     )
+    await trade_events.append_event(db, trade_events.build_event(trade, "roll", {
+        "old_strike": trade.get("short_call_strike"),
+        "short_call_strike": roll_request.new_strike,
+        "short_call_expiry": roll_request.new_expiry,
+        "short_call_premium": roll_request.new_premium,
+        "premium_captured": round(premium_captured, 2),
+        "premium_received": update_doc["premium_received"],
+    }, ts=now.isoformat()))
+    invalidate_trade_count_cache(user["id"])
     
     return {
         "message": f"PMCC short call rolled successfully (roll #{roll_count})",
@@ -980,6 +1170,9 @@ async def get_roll_suggestions(
     - Short call strike must be above LEAPS breakeven
     - Premium should offset LEAPS theta decay
     - Never increase downside risk
+    
+    `candidates` are concrete (expiry, strike) rolls from the EOD snapshot
+    chain, scored in one vectorized pass by services.roll_engine.
     """
     
     trade = await db.simulator_trades.find_one({"id": trade_id, "user_id": user["id"]}, {"_id": 0})
@@ -1015,6 +1208,24 @@ async def get_roll_suggestions(
         roll_urgency = "medium"
         roll_reason.append("Stock price approaching strike - monitor closely")
     
+    # Score every (expiry, strike) of the snapshot chain in one pass
+    from routes.portfolio import _get_call_candidates
+    from services.roll_engine import ChainTable, RollPosition, score_roll_candidates
+    candidates = []
+    candidates_source = "none"
+    try:
+        calls, candidates_source = await _get_call_candidates(trade.get("symbol", ""), min_dte=7, max_dte=60)
+        if calls:
+            scored = score_roll_candidates(
+                ChainTable.from_calls(calls),
+                RollPosition.from_simulator_trade(trade, current_price),
+                min_dte=7,
+                max_dte=60,
+            )
+            candidates = scored.top(5)
+    except Exception as e:
+        logging.warning(f"Roll candidate scoring failed for {trade.get('symbol')}: {e}")
+    
     # Suggest new strikes (roll up and out)
     suggestions = []
     
@@ -1057,6 +1268,8 @@ async def get_roll_suggestions(
         "roll_urgency": roll_urgency,
         "roll_reasons": roll_reason,
         "suggestions": suggestions,
+        "candidates": candidates,
+        "candidates_source": candidates_source,
         "warning": "In PMCC, short call assignment should be AVOIDED. Roll before the short call goes ITM!"
     }
 
@@ -1116,6 +1329,7 @@ async def update_simulator_prices(user: dict = Depends(get_current_user)):
     risk_free_rate = 0.05
 
     updated_count = 0
+    pending_events = []
 
     for trade in active_trades:
         symbol = trade["symbol"]
@@ -1256,8 +1470,23 @@ async def update_simulator_prices(user: dict = Depends(get_current_user)):
             cap = trade.get("capital_deployed", 0)
             update_doc["roi_percent"] = round((final / cap) * 100, 2) if cap and cap > 0 else 0
 
-        await db.simulator_trades.update_one({"id": trade["id"]}, {"$set": update_doc})
+        # History: one compact mark (+ terminal event) per trade, bulk-inserted below
+        pending_events.append(trade_events.build_mark_event(trade, update_doc, ts=now.isoformat()))
+        if update_doc.get("status") in trade_events.TERMINAL_EVENTS:
+            pending_events.append(trade_events.build_event(trade, update_doc["status"], {
+                "final_pnl": update_doc["final_pnl"],
+                "close_price": spot_mark,
+            }, ts=now.isoformat()))
+
+        update_ops = {"$inc": {"events_since_snapshot": 1}}
+        changed = trade_events.changed_fields(trade, update_doc)
+        if changed:
+            update_ops["$set"] = changed
+        await db.simulator_trades.update_one({"id": trade["id"]}, update_ops)
         updated_count += 1
+
+    await trade_events.append_events(db, pending_events)
+    await trade_events.compact_if_due(db, active_trades)
     
     # After price update, evaluate rules
     user_rules = await db.simulator_rules.find(
@@ -1283,6 +1512,9 @@ async def update_simulator_prices(user: dict = Depends(get_current_user)):
                         {"$inc": {"times_triggered": 1}}
                     )
     
+    await equity_series.record_equity_point(db, user["id"], now, intraday=True)
+    invalidate_trade_count_cache(user["id"])  # expiries / assignments / rule closes
+
     return {
         "message": f"Updated {updated_count} trades",
         "updated": updated_count,
@@ -1386,6 +1618,8 @@ async def get_simulator_summary(user: dict = Depends(get_current_user)):
 async def clear_simulator_data(user: dict = Depends(get_current_user)):
     """Clear all simulator trades for user"""
     result = await db.simulator_trades.delete_many({"user_id": user["id"]})
+    await db[equity_series.EQUITY_SERIES_COLLECTION].delete_many({"user_id": user["id"]})
+    invalidate_trade_count_cache(user["id"])
     return {"message": f"Deleted {result.deleted_count} trades"}
 
 
@@ -1410,20 +1644,30 @@ async def get_scheduler_status(user: dict = Depends(get_current_user)):
     }
 
 
+async def _run_scheduled_update_job(job: "job_queue.JobContext") -> Dict[str, Any]:
+    from server import scheduled_price_update
+    await job.progress(10, "Updating prices and evaluating rules")
+    await scheduled_price_update(progress=job.progress)
+    return {"message": "Scheduled update completed"}
+
+
+job_queue.register_handler("simulator_scheduled_update", _run_scheduled_update_job, max_concurrency=1)
+
+
 @simulator_router.post("/trigger-update")
-async def trigger_manual_update(user: dict = Depends(get_current_user)):
-    """Admin endpoint to manually trigger the scheduled update for all users"""
+async def trigger_manual_update(
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
+    user: dict = Depends(get_current_user)
+):
+    """
+    Admin endpoint to manually trigger the scheduled update for all users.
+    Runs as a background job - poll GET /api/jobs/{job_id}.
+    """
     if not user.get("is_admin"):
         raise HTTPException(status_code=403, detail="Admin access required")
     
-    from server import scheduled_price_update
-    
-    try:
-        await scheduled_price_update()
-        return {"message": "Scheduled update triggered successfully"}
-    except Exception as e:
-        logging.error(f"Error triggering manual update: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    job = await job_queue.enqueue(db, "simulator_scheduled_update", user["id"], idempotency_key=idempotency_key)
+    return {"message": "Scheduled update queued", "job_id": job["id"], "job": job}
 
 
 STRATEGY_MODE_DEFAULTS = {
@@ -2068,12 +2312,10 @@ async def create_rule_from_template(template_id: str, user: dict = Depends(get_c
     return await create_trade_rule(rule, user)
 
 
-@simulator_router.post("/rules/evaluate")
-async def evaluate_rules_now(user: dict = Depends(get_current_user)):
-    """Manually evaluate all rules against active trades"""
-    
+async def _evaluate_rules_for_user(user_id: str, job: Optional["job_queue.JobContext"] = None) -> Dict[str, Any]:
+    """Evaluate all enabled rules against the user's active trades."""
     user_rules = await db.simulator_rules.find(
-        {"user_id": user["id"], "is_enabled": True},
+        {"user_id": user_id, "is_enabled": True},
         {"_id": 0}
     ).to_list(100)
     
@@ -2081,7 +2323,7 @@ async def evaluate_rules_now(user: dict = Depends(get_current_user)):
         return {"message": "No active rules", "results": []}
     
     active_trades = await db.simulator_trades.find(
-        {"user_id": user["id"], "status": {"$in": ["open", "rolled"]}},
+        {"user_id": user_id, "status": {"$in": ["open", "rolled"]}},
         {"_id": 0}
     ).to_list(1000)
     
@@ -2089,7 +2331,10 @@ async def evaluate_rules_now(user: dict = Depends(get_current_user)):
         return {"message": "No active trades", "results": []}
     
     all_results = []
-    for trade in active_trades:
+    for i, trade in enumerate(active_trades):
+        if job:
+            await job.check_cancelled()
+            await job.progress(int(i / len(active_trades) * 100), "Evaluating rules", done=i, total=len(active_trades))
         results = await evaluate_and_execute_rules(trade, user_rules, db)
         all_results.extend(results)
         
@@ -2108,6 +2353,26 @@ async def evaluate_rules_now(user: dict = Depends(get_current_user)):
     }
 
 
+async def _run_rules_evaluate_job(job: "job_queue.JobContext") -> Dict[str, Any]:
+    return await _evaluate_rules_for_user(job.user_id, job)
+
+
+job_queue.register_handler("simulator_rules_evaluate", _run_rules_evaluate_job, max_concurrency=2)
+
+
+@simulator_router.post("/rules/evaluate")
+async def evaluate_rules_now(
+    background: bool = Query(False, description="Run as a background job and return its job_id"),
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
+    user: dict = Depends(get_current_user)
+):
+    """Manually evaluate all rules against active trades"""
+    if background:
+        job = await job_queue.enqueue(db, "simulator_rules_evaluate", user["id"], idempotency_key=idempotency_key)
+        return {"message": "Rule evaluation queued", "job_id": job["id"], "job": job}
+    return await _evaluate_rules_for_user(user["id"])
+
+
 @simulator_router.get("/rules/{rule_id}")
 async def get_rule_detail(rule_id: str, user: dict = Depends(get_current_user)):
     """Get details of a specific rule"""
@@ -2345,6 +2610,34 @@ async def get_pmcc_summary(user: dict = Depends(get_current_user)):
 
 # ==================== ANALYTICS ENDPOINTS ====================
 
+@simulator_router.get("/analytics/equity-curve")
+async def get_equity_curve(
+    start: Optional[str] = Query(None, description="YYYY-MM-DD (default: 1 year ago)"),
+    end: Optional[str] = Query(None, description="YYYY-MM-DD (default: today)"),
+    resolution: str = Query("daily", description="daily or intraday"),
+    max_points: Optional[int] = Query(None, ge=3, le=5000, description="Downsample (LTTB) to at most this many points"),
+    user: dict = Depends(get_current_user)
+):
+    """
+    Stored per-user equity / greeks series written by the price-update cycle.
+    Drawdown and Sharpe come from the series, not from rereading trades.
+    """
+    if resolution not in ("daily", "intraday"):
+        raise HTTPException(status_code=400, detail="resolution must be 'daily' or 'intraday'")
+    
+    today = datetime.now(timezone.utc).date()
+    end = end or today.isoformat()
+    start = start or (today - timedelta(days=365)).isoformat()
+    try:
+        datetime.strptime(start, "%Y-%m-%d")
+        datetime.strptime(end, "%Y-%m-%d")
+    except ValueError:
+        raise HTTPException(status_code=400, detail="start/end must be YYYY-MM-DD")
+    
+    series = await equity_series.get_equity_series(db, user["id"], start, end, resolution, max_points)
+    return {"start": start, "end": end, "resolution": resolution, **series}
+
+
 @simulator_router.get("/analytics/performance")
 async def get_performance_analytics(
     time_period: str = Query("all", description="all, 30d, 90d, 1y"),
@@ -3080,6 +3373,73 @@ async def get_scanner_comparison(user: dict = Depends(get_current_user)):
     }
 
 
+async def _run_profile_sweep_job(job: "job_queue.JobContext") -> Dict[str, Any]:
+    params = job.params
+    await job.progress(10, "Loading stored CC scans")
+    return await profile_sweep.run_profile_sweep(
+        db, params["start"], params["end"], params["grid"],
+        base_profile=params.get("base_profile", "balanced"), top=params.get("top", 20)
+    )
+
+
+job_queue.register_handler("profile_sweep", _run_profile_sweep_job, max_concurrency=1)
+
+
+@simulator_router.post("/analytics/optimal-settings/sweep")
+async def sweep_profile_settings(
+    request: ProfileSweepRequest,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
+    user: dict = Depends(get_current_user)
+):
+    """
+    Backtest a grid of screener profile thresholds against stored EOD CC scans.
+    Runs as a background job - poll GET /api/jobs/{job_id}.
+    """
+    if request.start > request.end:
+        raise HTTPException(status_code=400, detail="start must be on or before end")
+    if request.base_profile not in profile_sweep.RISK_PROFILES:
+        raise HTTPException(status_code=400, detail=f"Unknown profile: {request.base_profile}")
+    try:
+        grid_points = len(profile_sweep.build_grid(request.grid, profile_sweep.profile_params(request.base_profile)))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    job = await job_queue.enqueue(
+        db, "profile_sweep", user["id"], params=request.model_dump(mode="json"), idempotency_key=idempotency_key
+    )
+    return {"message": "Profile sweep queued", "grid_points": grid_points, "job_id": job["id"], "job": job}
+
+
+async def _run_snapshot_backtest_job(job: "job_queue.JobContext") -> Dict[str, Any]:
+    from services.snapshot_backtest import run_snapshot_backtest
+    params = job.params
+    return await run_snapshot_backtest(
+        db, params["start"], params["end"], top_n=params.get("top_n", 10), progress=job.progress
+    )
+
+
+job_queue.register_handler("snapshot_backtest", _run_snapshot_backtest_job, max_concurrency=1)
+
+
+@simulator_router.post("/analytics/backtest")
+async def backtest_stored_snapshots(
+    request: SnapshotBacktestRequest,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
+    user: dict = Depends(get_current_user)
+):
+    """
+    Replay stored EOD snapshots: CC / PMCC picks by score, marked to market with
+    later snapshots, per-strategy equity curves. Background job - poll GET /api/jobs/{job_id}.
+    """
+    if request.start > request.end:
+        raise HTTPException(status_code=400, detail="start must be on or before end")
+    if not 1 <= request.top_n <= 100:
+        raise HTTPException(status_code=400, detail="top_n must be between 1 and 100")
+    job = await job_queue.enqueue(
+        db, "snapshot_backtest", user["id"], params=request.model_dump(mode="json"), idempotency_key=idempotency_key
+    )
+    return {"message": "Snapshot backtest queued", "job_id": job["id"], "job": job}
+
+
 @simulator_router.get("/analytics/optimal-settings")
 async def get_optimal_settings(user: dict = Depends(get_current_user)):
     """Analyze trade outcomes to suggest optimal screener settings"""
@@ -3323,10 +3683,10 @@ async def manage_trade(
     if current_price <= 0:
         raise HTTPException(status_code=503, detail=f"Invalid price returned for {symbol}")
 
-    # ── 3. Fetch options chain ───────────────────────────────────────────────
+    # ── 3. Load options chain (EOD snapshot first, live Yahoo only as fallback) ─
+    from routes.portfolio import _get_call_candidates
     try:
-        expiry = trade.get("expiry_date", "")
-        chain  = await fetch_options_chain(symbol, expiry) if expiry else []
+        chain, _chain_source = await _get_call_candidates(symbol, min_dte=1, max_dte=60)
     except Exception:
         chain = []
 
@@ -3482,6 +3842,16 @@ async def apply_trade_recommendation(
         {"id": trade_id},
         {"$set": field_updates}
     )
+    applied_status = field_updates.get("status")
+    await trade_events.append_event(db, trade_events.build_event(
+        trade,
+        applied_status if applied_status in trade_events.TERMINAL_EVENTS else "rule_action",
+        {
+            "action": f"ai_apply:{recommendation['action']}",
+            "final_pnl": field_updates.get("final_pnl"),
+            "close_price": current_price,
+        }
+    ))
 
     # Log the apply action
     symbol = trade.get("symbol", "")
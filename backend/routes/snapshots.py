@@ -7,13 +7,14 @@ These endpoints manage the two-phase architecture:
 - Admin controls for data management
 """
 
-from fastapi import APIRouter, Depends, HTTPException, Query, BackgroundTasks, Body
+from fastapi import APIRouter, Depends, HTTPException, Query, Body, Header
 from typing import List, Optional
 import logging
 import os
 from datetime import datetime, timezone
 
 from services.snapshot_service import SnapshotService
+from services import job_queue
 
 logger = logging.getLogger(__name__)
 
@@ -164,17 +165,26 @@ async def ingest_full_snapshot(
     }
 
 
+async def _run_snapshot_ingest_job(job: "job_queue.JobContext"):
+    service = get_snapshot_service()
+    return await service.ingest_symbols(job.params["symbols"], progress=job.progress)
+
+
+job_queue.register_handler("snapshot_ingest", _run_snapshot_ingest_job, max_concurrency=1)
+
+
 @snapshot_router.post("/ingest/batch")
 async def ingest_batch_snapshots(
     symbols: List[str] = Body(None, embed=True),
     use_defaults: bool = Query(False, description="Use default CC symbol list"),
-    background_tasks: BackgroundTasks = None,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
     user: dict = Depends(get_current_user)
 ):
     """
     Batch ingest snapshots for multiple symbols.
     
     If use_defaults=True, uses the standard CC screening symbol list.
+    Batches over 10 symbols run as a background job - poll GET /api/jobs/{job_id}.
     """
     # Check admin role (allow None for backwards compatibility during testing)
     if user.get("role") and user.get("role") not in ["admin", "support"]:
@@ -185,46 +195,54 @@ async def ingest_batch_snapshots(
     if not target_symbols:
         raise HTTPException(status_code=400, detail="No symbols provided")
     
-    service = get_snapshot_service()
-    
-    # Run in background for large batches
-    if len(target_symbols) > 10 and background_tasks:
-        background_tasks.add_task(service.ingest_symbols, target_symbols)
+    # Run as a job for large batches
+    if len(target_symbols) > 10:
+        from server import db
+        job = await job_queue.enqueue(
+            db, "snapshot_ingest", user.get("id"),
+            params={"symbols": target_symbols}, idempotency_key=idempotency_key
+        )
         return {
             "status": "started",
             "message": f"Ingesting {len(target_symbols)} symbols in background",
             "symbols": target_symbols[:10],
-            "total": len(target_symbols)
+            "total": len(target_symbols),
+            "job_id": job["id"]
         }
     
     # Run synchronously for small batches
+    service = get_snapshot_service()
     result = await service.ingest_symbols(target_symbols)
     return result
 
 
 @snapshot_router.post("/ingest/all")
 async def ingest_all_default_symbols(
-    background_tasks: BackgroundTasks,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
     user: dict = Depends(get_current_user)
 ):
     """
     Trigger full ingestion of all default CC symbols.
     
     This should be called after market close (4:45 PM ET).
-    Runs in background.
+    Runs as a background job - poll GET /api/jobs/{job_id} for progress.
     """
     if user.get("role") != "admin":
         raise HTTPException(status_code=403, detail="Admin access required")
     
-    service = get_snapshot_service()
-    background_tasks.add_task(service.ingest_symbols, CC_SYMBOLS)
+    from server import db
+    job = await job_queue.enqueue(
+        db, "snapshot_ingest", user["id"],
+        params={"symbols": CC_SYMBOLS}, idempotency_key=idempotency_key
+    )
     
     return {
         "status": "started",
         "message": f"Full ingestion started for {len(CC_SYMBOLS)} symbols",
         "symbols_count": len(CC_SYMBOLS),
         "triggered_at": datetime.now(timezone.utc).isoformat(),
-        "triggered_by": user.get("email")
+        "triggered_by": user.get("email"),
+        "job_id": job["id"]
     }
 
 
@@ -414,6 +432,36 @@ async def cleanup_old_snapshots(
     }
 
 
+async def _run_greeks_backfill_job(job: "job_queue.JobContext"):
+    from server import db
+    from services.greeks_backfill import backfill_greeks
+    return await backfill_greeks(db, progress=job.progress)
+
+
+job_queue.register_handler("greeks_backfill", _run_greeks_backfill_job, max_concurrency=1)
+
+
+@snapshot_router.post("/greeks/backfill")
+async def backfill_snapshot_greeks(
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
+    user: dict = Depends(get_current_user)
+):
+    """
+    Stamp Black-Scholes greeks and normalized IV onto stored snapshot contracts
+    written before greeks were stored at ingestion. Already-stamped documents
+    are skipped. The scheduler also runs it after startup and daily; this
+    starts it now. Background job - poll GET /api/jobs/{job_id}.
+    
+    Admin only.
+    """
+    if user.get("role") != "admin":
+        raise HTTPException(status_code=403, detail="Admin access required")
+    
+    from server import db
+    job = await job_queue.enqueue(db, "greeks_backfill", user["id"], idempotency_key=idempotency_key)
+    return {"message": "Greeks backfill queued", "job_id": job["id"], "job": job}
+
+
 @snapshot_router.get("/calendar/trading-day")
 async def get_trading_day_info(
     user: dict = Depends(get_current_user)
@@ -35,6 +35,7 @@ from services.data_provider import (
 # CCE Volatility & Greeks Correctness - Use shared services
 from services.greeks_service import calculate_greeks, normalize_iv_fields
 from services.iv_rank_service import get_iv_metrics_for_symbol
+from services.run_registry import get_latest_run, get_latest_run_id
 # Import enrichment service for IV Rank and Analyst data
 from services.enrichment_service import enrich_row, enrich_rows_batch, strip_enrichment_debug
 
@@ -509,10 +510,7 @@ async def _get_eod_prices_for_symbols(symbols: List[str]) -> tuple:
     """
     try:
         # Get latest completed run
-        latest_run = await db.scan_runs.find_one(
-            {"status": "COMPLETED"},
-            sort=[("completed_at", -1)]
-        )
+        latest_run = await get_latest_run(db)
         
         if not latest_run:
             return {}, None
@@ -613,13 +611,9 @@ async def _get_best_opportunity_eod(symbol: str, run_id: str = None) -> dict:
     try:
         # Only fetch run_id if not provided (avoid N redundant lookups in bulk calls)
         if not run_id:
-            latest_run = await db.scan_runs.find_one(
-                {"status": "COMPLETED"},
-                sort=[("completed_at", -1)]
-            )
-            if not latest_run:
+            run_id = await get_latest_run_id(db)
+            if not run_id:
                 return None
-            run_id = latest_run.get("run_id")
 
         # Fetch cc opportunity and earnings snapshot in parallel
         cc_opp, snap = await asyncio.gather(
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Benchmark: CC/PMCC scan computation (eod_pipeline.evaluate_scan_symbol) on the
+event-loop thread versus the scan_compute process pool, on synthetic
+symbol_snapshot documents. Prints throughput per worker count (the scaling
+curve); the pool can only scale up to the machine's core count.
+
+Usage:
+    python -m scripts.bench_scan_compute [--symbols 400] [--workers 1,2,4,8] [--chunk 8] [--packed]
+
+--packed sends columnar option_chain_packed snapshots (decoded in the workers)
+instead of legacy option_chain lists.
+"""
+import argparse
+import asyncio
+import math
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from functools import partial
+from typing import Any, Dict, List
+
+# Ensure backend/ is on PYTHONPATH (Docker sets PYTHONPATH=/app/backend)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.chain_codec import PACKED_FIELD, encode_chains
+from services.eod_pipeline import (
+    SCAN_LEGACY_CALL_FIELDS, evaluate_scan_chunk, evaluate_scan_symbol
+)
+from services.process_pool import shutdown_pool
+from services.scan_compute import compact_snapshot, compute_pool, map_chunks
+
+AS_OF = datetime(2026, 10, 16, 20, tzinfo=timezone.utc)
+EXPIRY_DTES = (9, 16, 30, 37, 44, 51, 240, 430, 610)
+
+
+def _call_price(spot: float, strike: float, dte: int, iv: float) -> float:
+    t = max(dte, 1) / 365.0
+    d1 = (math.log(spot / strike) + 0.5 * iv * iv * t) / (iv * math.sqrt(t))
+    d2 = d1 - iv * math.sqrt(t)
+    cdf = lambda x: 0.5 * (1 + math.erf(x / math.sqrt(2)))
+    return spot * cdf(d1) - strike * cdf(d2)
+
+
+def synthetic_snapshots(n_symbols: int, strikes: int = 40, seed: int = 7,
+                        packed: bool = False) -> List[Dict[str, Any]]:
+    """Liquid, eligible snapshots with weekly, monthly and LEAP expiries."""
+    rng = random.Random(seed)
+    docs = []
+    for i in range(n_symbols):
+        spot = round(rng.uniform(25, 400), 2)
+        iv = rng.uniform(0.2, 0.6)
+        step = max(0.5, round(spot * 0.025, 1))
+        chains = []
+        for dte in EXPIRY_DTES:
+            expiry = (AS_OF + timedelta(days=dte)).strftime("%Y-%m-%d")
+            calls = []
+            for k in range(-strikes // 2, strikes // 2):
+                strike = round(spot + k * step, 2)
+                if strike <= 0:
+                    continue
+                mid = max(0.05, _call_price(spot, strike, dte, iv))
+                half = max(0.01, mid * rng.uniform(0.01, 0.06))
+                calls.append({
+                    "strike": strike,
+                    "bid": round(mid - half, 2),
+                    "ask": round(mid + half, 2),
+                    "lastPrice": rng.choice([0, round(mid, 2)]),
+                    "impliedVolatility": round(iv * rng.uniform(0.9, 1.1), 4),
+                    "openInterest": rng.choice([20, 120, 800, 4000]),
+                    "volume": rng.randrange(0, 500),
+                    "daysToExpiration": dte,
+                    "contractSymbol": f"S{i:04d}{expiry.replace('-', '')[2:]}C{int(strike * 1000):08d}",
+                })
+            chains.append({"expiry": expiry, "dte": dte, "calls": calls, "puts": []})
+        doc = {
+            "symbol": f"S{i:04d}",
+            "underlying_price": spot,
+            "avg_volume": 2_000_000,
+            "market_cap": 20_000_000_000,
+            "is_etf": False,
+            "has_leaps": True,
+            "option_chain": chains,
+        }
+        if packed:
+            doc[PACKED_FIELD] = encode_chains(doc.pop("option_chain"), "zlib")
+        docs.append(doc)
+    return docs
+
+
+async def _run(docs: List[Dict[str, Any]], workers: int, chunk: int) -> int:
+    async def items():
+        for doc in docs:
+            yield compact_snapshot(doc, SCAN_LEGACY_CALL_FIELDS)
+
+    pool = compute_pool(workers)
+    evaluated = 0
+    completed = False
+    try:
+        evaluate = partial(evaluate_scan_chunk, run_id="bench", as_of=AS_OF)
+        async for _chunk, results in map_chunks(items(), evaluate, pool, chunk_size=chunk,
+                                                max_in_flight=workers + 1):
+            evaluated += sum(1 for r in results if r is not None)
+        completed = True
+    finally:
+        await shutdown_pool(pool, cancel=not completed)
+    return evaluated
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--symbols", type=int, default=400)
+    parser.add_argument("--workers", default="1,2,4,8")
+    parser.add_argument("--chunk", type=int, default=8)
+    parser.add_argument("--packed", action="store_true")
+    args = parser.parse_args()
+
+    docs = synthetic_snapshots(args.symbols, packed=args.packed)
+    contracts = args.symbols * len(EXPIRY_DTES) * 40
+    print(f"{args.symbols} symbols / ~{contracts} calls, {'packed' if args.packed else 'legacy'} chains, "
+          f"{os.cpu_count()} cores")
+
+    start = time.perf_counter()
+    results = [evaluate_scan_symbol(d, "bench", AS_OF) for d in docs]
+    baseline = time.perf_counter() - start
+    cc = sum(len(r["cc"]) for r in results if r)
+    pmcc = sum(len(r["pmcc"]) for r in results if r)
+    print(f"  {'event loop':>10s}  {baseline:7.2f} s  {args.symbols / baseline:8.1f} symbols/s   "
+          f"({cc} CC rows, {pmcc} PMCC pairs)")
+
+    for workers in (int(w) for w in args.workers.split(",")):
+        start = time.perf_counter()
+        evaluated = asyncio.run(_run(docs, workers, args.chunk))
+        elapsed = time.perf_counter() - start
+        assert evaluated == sum(1 for r in results if r)
+        print(f"  {workers:>3d} worker{'s' if workers > 1 else ' '}  {elapsed:7.2f} s  "
+              f"{args.symbols / elapsed:8.1f} symbols/s   x{baseline / elapsed:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Benchmark: cross-profile dedupe / best option per symbol (services/scan_dedupe.py)
+versus the previous per-dict loops, on a synthetic night of candidates.
+Also times a NumPy column build of the same candidates for reference.
+
+Usage:
+    python -m scripts.bench_scan_dedupe [--candidates 10000] [--symbols 1500] [--repeat 5]
+
+The legacy_* functions are the loops PrecomputedScanService used before;
+tests/test_scan_dedupe.py uses them as the parity reference.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from typing import Dict, List
+
+# Ensure backend/ is on PYTHONPATH (Docker sets PYTHONPATH=/app/backend)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from services.scan_dedupe import PROFILES, assign_profiles, best_per_symbol
+
+
+def legacy_profile_fit(opp: Dict, profile: str) -> float:
+    fit_score = 0
+    atr_pct = opp.get("atr_pct", 3) or 3
+    market_cap = opp.get("market_cap", 0) or 0
+    eps = opp.get("eps_ttm", 0) or 0
+    delta = opp.get("delta", 0.35) or 0.35
+    dte = opp.get("dte", 30) or 30
+    if profile == "conservative":
+        if atr_pct <= 3:
+            fit_score += 20
+        elif atr_pct <= 4:
+            fit_score += 10
+        if market_cap >= 50_000_000_000:
+            fit_score += 20
+        elif market_cap >= 10_000_000_000:
+            fit_score += 10
+        if eps > 0:
+            fit_score += 15
+        if delta <= 0.30:
+            fit_score += 15
+        if dte >= 30:
+            fit_score += 10
+    elif profile == "balanced":
+        if 3 <= atr_pct <= 5:
+            fit_score += 20
+        elif atr_pct < 3:
+            fit_score += 10
+        if 5_000_000_000 <= market_cap <= 50_000_000_000:
+            fit_score += 15
+        if 0.30 <= delta <= 0.40:
+            fit_score += 15
+        if 20 <= dte <= 40:
+            fit_score += 10
+    elif profile == "aggressive":
+        if atr_pct >= 4:
+            fit_score += 25
+        elif atr_pct >= 3:
+            fit_score += 15
+        if delta >= 0.40:
+            fit_score += 20
+        if dte <= 21:
+            fit_score += 15
+        premium_yield = opp.get("premium_yield", 0) or 0
+        if premium_yield >= 1.5:
+            fit_score += 15
+        elif premium_yield >= 1.0:
+            fit_score += 10
+    return fit_score
+
+
+def legacy_assign_profiles(all_opportunities: Dict[str, List[Dict]]) -> Dict[str, List[Dict]]:
+    symbol_assignments = {}
+    for profile in PROFILES:
+        for opp in all_opportunities.get(profile, []):
+            symbol = opp["symbol"]
+            if symbol not in symbol_assignments:
+                symbol_assignments[symbol] = (profile, opp)
+            else:
+                existing_profile, existing_opp = symbol_assignments[symbol]
+                if legacy_profile_fit(opp, profile) > legacy_profile_fit(existing_opp, existing_profile):
+                    symbol_assignments[symbol] = (profile, opp)
+    deduped = {profile: [] for profile in PROFILES}
+    for symbol, (profile, opp) in symbol_assignments.items():
+        deduped[profile].append(opp)
+    for profile in deduped:
+        deduped[profile].sort(key=lambda x: x["score"], reverse=True)
+        deduped[profile] = deduped[profile][:50]
+    return deduped
+
+
+def legacy_best_per_symbol(opportunities: List[Dict]) -> List[Dict]:
+    symbol_best = {}
+    for opp in opportunities:
+        symbol = opp["symbol"]
+        if symbol not in symbol_best:
+            symbol_best[symbol] = opp
+            continue
+        cur = symbol_best[symbol]
+        if opp.get("score", 0) > cur.get("score", 0):
+            symbol_best[symbol] = opp
+        elif opp.get("score", 0) == cur.get("score", 0):
+            if opp.get("quality_score", 0) > cur.get("quality_score", 0):
+                symbol_best[symbol] = opp
+            elif opp.get("quality_score", 0) == cur.get("quality_score", 0):
+                if opp.get("roi_pct", 0) > cur.get("roi_pct", 0):
+                    symbol_best[symbol] = opp
+    return list(symbol_best.values())
+
+
+def synthetic_night(n_candidates: int, n_symbols: int, seed: int = 42) -> Dict[str, List[Dict]]:
+    """Candidates split across the three profiles, with coarse values so ties occur."""
+    rng = random.Random(seed)
+    by_profile: Dict[str, List[Dict]] = {p: [] for p in PROFILES}
+    for _ in range(n_candidates):
+        profile = rng.choice(PROFILES)
+        by_profile[profile].append({
+            "symbol": f"SYM{rng.randrange(n_symbols):05d}",
+            "score": float(rng.randrange(40, 100)),
+            "quality_score": float(rng.randrange(0, 5)),
+            "roi_pct": round(rng.uniform(0.2, 3.0), 1),
+            "premium_yield": round(rng.uniform(0.2, 3.0), 1),
+            "atr_pct": rng.choice([None, 0, 2.5, 3, 3.5, 4, 5, 6.2]),
+            "market_cap": rng.choice([None, 2e9, 5e9, 1e10, 3e10, 5e10, 2e11]),
+            "eps_ttm": rng.choice([None, -1.0, 0, 2.3]),
+            "delta": rng.choice([None, 0.2, 0.3, 0.35, 0.4, 0.45]),
+            "dte": rng.choice([None, 7, 14, 21, 30, 35, 45]),
+        })
+    return by_profile
+
+
+def numpy_columns(opportunities: List[Dict]) -> np.ndarray:
+    """Only the dict -> array conversion an array-backed dedupe would need first."""
+    fields = (("atr_pct", 3), ("market_cap", 0), ("eps_ttm", 0), ("delta", 0.35), ("dte", 30), ("premium_yield", 0))
+    return np.array(
+        [[o.get(f, d) or d for f, d in fields] + [o["score"]] for o in opportunities], dtype=np.float64
+    )
+
+
+def _time(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--candidates", type=int, default=10_000)
+    parser.add_argument("--symbols", type=int, default=1_500)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    night = synthetic_night(args.candidates, args.symbols)
+    flat = [o for p in PROFILES for o in night[p]]
+
+    assert assign_profiles(night) == legacy_assign_profiles(night)
+    assert best_per_symbol(flat) == legacy_best_per_symbol(flat)
+
+    rows = [
+        ("assign_profiles", lambda: legacy_assign_profiles(night), lambda: assign_profiles(night)),
+        ("best_per_symbol", lambda: legacy_best_per_symbol(flat), lambda: best_per_symbol(flat)),
+    ]
+    print(f"{args.candidates} candidates / {args.symbols} symbols (best of {args.repeat})")
+    for name, legacy, current in rows:
+        t_legacy, t_current = _time(legacy, args.repeat), _time(current, args.repeat)
+        print(f"  {name:16s} legacy {t_legacy * 1000:8.2f} ms   single-pass {t_current * 1000:8.2f} ms   "
+              f"x{t_legacy / t_current:.1f}")
+    t_columns = _time(lambda: numpy_columns(flat), args.repeat)
+    print(f"  {'numpy columns':16s} conversion alone {t_columns * 1000:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Benchmark: the six precomputed scan profiles (precomputed_scans.score_profile)
+over one partition, scored one after another on the event-loop thread versus
+fanned out to a process pool the way run_all_scans does. Prints the sum and
+max of the per-profile times and the pooled wall-clock per worker count
+(after a warm-up round that starts the workers); with six workers on six free
+cores the wall-clock approaches the slowest profile, plus pickling the
+partition to each worker.
+
+Usage:
+    python -m scripts.bench_scan_profiles [--symbols 200] [--workers 2,3,6]
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+from typing import Any, Dict, List, Tuple
+
+# Ensure backend/ is on PYTHONPATH (Docker sets PYTHONPATH=/app/backend); PMCC
+# scoring imports backend.services.pmcc_scoring, so the repo root is added too
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(1, os.path.dirname(BACKEND_DIR))
+
+from scripts.bench_scan_compute import synthetic_snapshots
+from services.greeks_service import stamp_chain_greeks
+from services.precomputed_scans import score_profile
+from services.process_pool import process_pool, shutdown_pool
+from services.scan_options_provider import chain_to_snapshot
+
+PROFILES = [
+    (strategy, profile)
+    for strategy in ("covered_call", "pmcc")
+    for profile in ("conservative", "balanced", "aggressive")
+]
+
+
+def synthetic_partition(n_symbols: int, seed: int = 11) -> Tuple[Dict[str, Dict], Dict[str, Dict]]:
+    """daily_snapshots-shaped chains and feature rows that pass most profile filters."""
+    rng = random.Random(seed)
+    snapshots: Dict[str, Dict] = {}
+    features: Dict[str, Dict] = {}
+    for doc in synthetic_snapshots(n_symbols, seed=seed):
+        price = doc["underlying_price"]
+        stamp_chain_greeks(doc["option_chain"], price)
+        snapshots[doc["symbol"]] = chain_to_snapshot(doc)
+        features[doc["symbol"]] = {
+            "technical": {
+                "close": price, "sma20": price * 0.98, "sma50": price * 0.95, "sma200": price * 0.9,
+                "rsi14": rng.uniform(45, 62), "atr_pct": rng.uniform(0.01, 0.035), "max_gap_10d": 0.01,
+            },
+            "fundamental": {
+                "market_cap": 50e9, "eps_ttm": 5.0, "roe": 0.2, "debt_to_equity": 0.5,
+                "revenue_growth": 0.12, "days_to_earnings": 40, "sector": "Technology",
+            },
+        }
+    return snapshots, features
+
+
+async def _run_pooled(snapshots: Dict[str, Dict], features: Dict[str, Dict],
+                      workers: int) -> Tuple[List[Any], float]:
+    pool = process_pool(workers)
+    loop = asyncio.get_running_loop()
+    symbols = list(snapshots)
+
+    def fan_out():
+        return asyncio.gather(*[
+            loop.run_in_executor(pool, score_profile, strategy, profile, snapshots, features, symbols)
+            for strategy, profile in PROFILES
+        ])
+
+    completed = False
+    try:
+        await fan_out()  # warm-up: worker start and imports
+        start = time.perf_counter()
+        runs = await fan_out()
+        elapsed = time.perf_counter() - start
+        completed = True
+    finally:
+        await shutdown_pool(pool, cancel=not completed)
+    return [opportunities for opportunities, _ in runs], elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--symbols", type=int, default=200)
+    parser.add_argument("--workers", default="2,3,6")
+    args = parser.parse_args()
+
+    snapshots, features = synthetic_partition(args.symbols)
+    symbols = list(snapshots)
+    print(f"{args.symbols} symbols, {len(PROFILES)} profiles, {os.cpu_count()} cores")
+
+    inline, times = [], []
+    for strategy, profile in PROFILES:
+        opportunities, elapsed = score_profile(strategy, profile, snapshots, features, symbols)
+        inline.append(opportunities)
+        times.append(elapsed)
+        print(f"  {strategy + '/' + profile:>24s}  {elapsed:7.3f} s  {len(opportunities):3d} opportunities")
+    total, slowest = sum(times), max(times)
+    print(f"  {'event loop (sum)':>24s}  {total:7.3f} s")
+    print(f"  {'slowest profile (max)':>24s}  {slowest:7.3f} s")
+
+    for workers in (int(w) for w in args.workers.split(",")):
+        pooled, elapsed = asyncio.run(_run_pooled(snapshots, features, workers))
+        assert pooled == inline
+        print(f"  {workers:>3d} worker{'s' if workers > 1 else ' '} {'':>12s}  {elapsed:7.3f} s  "
+              f"x{total / elapsed:.2f} vs sum, {elapsed / slowest:.2f} x max")
+
+
+if __name__ == "__main__":
+    main()
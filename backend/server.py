@@ -1,4 +1,4 @@
-from routes.simulator import calculate_greeks, evaluate_and_execute_rules
+from routes.simulator import calculate_greeks, evaluate_and_execute_rules, invalidate_trade_count_cache
 from routes.eod_pipeline import eod_pipeline_router
 from routes.paypal import paypal_router
 from ai_wallet.routes import ai_wallet_router
@@ -9,6 +9,7 @@ from routes.precomputed_scans import scans_router
 from routes.invitations import invitation_router
 from routes.support import support_router
 from routes.simulator import simulator_router
+from routes.jobs import jobs_router
 # Phase 2: Snapshot-only scanning
 from routes.screener_snapshot import screener_router
 from routes.portfolio import portfolio_router
@@ -23,6 +24,8 @@ from routes.news import news_router
 from routes.watchlist import watchlist_router
 from routes.auth import auth_router
 from utils.environment import allow_mock_data, check_mock_fallback, DataUnavailableError, ENVIRONMENT
+from services import trade_events
+from services import equity_series
 from fastapi import FastAPI, APIRouter, HTTPException, Depends, Query, UploadFile, File, Request
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from dotenv import load_dotenv
@@ -32,7 +35,7 @@ import os
 import logging
 from pathlib import Path
 from pydantic import BaseModel, Field, ConfigDict, EmailStr
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Awaitable, Callable
 import uuid
 from datetime import datetime, timezone, timedelta
 import jwt
@@ -1236,11 +1239,19 @@ async def scheduled_trial_lifecycle():
         logging.error(f"scheduled_trial_lifecycle failed: {e}")
 
 
-async def scheduled_price_update():
+async def scheduled_price_update(progress: Optional[Callable[..., Awaitable[None]]] = None):
     """
     Automated daily price update for all active simulator trades.
     Runs at market close (4:00 PM ET) on weekdays.
+
+    `progress(pct, stage, done=, total=)` is awaited inside each loop when the
+    update runs as a background job (JobContext.progress), keeping its
+    heartbeat fresh on long runs.
     """
+    async def report(pct, stage, done, total):
+        if progress is not None:
+            await progress(pct, stage, done=done, total=total)
+
     # Check if market is open today (skip weekends and NYSE holidays)
     from services.snapshot_service import SnapshotService
     snapshot_service = SnapshotService(db)
@@ -1266,7 +1277,8 @@ async def scheduled_price_update():
 
         # Fetch current prices
         price_cache = {}
-        for symbol in symbols:
+        for i, symbol in enumerate(symbols):
+            await report(10 + 30 * i // len(symbols), "Fetching prices", i, len(symbols))
             try:
                 quote = await fetch_stock_quote(symbol)
                 if quote and quote.get("price"):
@@ -1280,8 +1292,10 @@ async def scheduled_price_update():
         updated_count = 0
         expired_count = 0
         assigned_count = 0
+        pending_events = []
 
-        for trade in active_trades:
+        for i, trade in enumerate(active_trades):
+            await report(40 + 30 * i // len(active_trades), "Updating trades", i, len(active_trades))
             symbol = trade["symbol"]
             if symbol not in price_cache:
                 continue
@@ -1431,11 +1445,29 @@ async def scheduled_price_update():
                         }}}
                     )
 
-            await db.simulator_trades.update_one({"id": trade["id"]}, {"$set": update_doc})
+            # History: compact mark (+ terminal event), bulk-inserted after the loop
+            pending_events.append(trade_events.build_mark_event(trade, update_doc, ts=now.isoformat()))
+            if update_doc.get("status") in trade_events.TERMINAL_EVENTS:
+                pending_events.append(trade_events.build_event(trade, update_doc["status"], {
+                    "final_pnl": update_doc["final_pnl"],
+                    "close_price": current_price,
+                    "close_reason": update_doc.get("close_reason"),
+                }, ts=now.isoformat()))
+
+            update_ops = {"$inc": {"events_since_snapshot": 1}}
+            changed = trade_events.changed_fields(trade, update_doc)
+            if changed:
+                update_ops["$set"] = changed
+            await db.simulator_trades.update_one({"id": trade["id"]}, update_ops)
             updated_count += 1
 
+        await trade_events.append_events(db, pending_events)
+        compacted = await trade_events.compact_if_due(db, active_trades)
+
         logging.info(
-            f"Scheduled update complete: {updated_count} updated, {expired_count} expired, {assigned_count} assigned")
+            f"Scheduled update complete: {updated_count} updated, {expired_count} expired, {assigned_count} assigned, "
+            f"{len(pending_events)} events, {compacted} trades compacted")
+        invalidate_trade_count_cache()
 
         # Evaluate rules for all still-active trades
         logging.info("Evaluating trade management rules...")
@@ -1443,7 +1475,8 @@ async def scheduled_price_update():
             user_ids = list(set(t["user_id"] for t in active_trades))
 
             rules_triggered = 0
-            for user_id in user_ids:
+            for i, user_id in enumerate(user_ids):
+                await report(70 + 25 * i // len(user_ids), "Evaluating rules", i, len(user_ids))
                 user_rules = await db.simulator_rules.find(
                     {"user_id": user_id, "is_enabled": True},
                     {"_id": 0}
@@ -1474,6 +1507,10 @@ async def scheduled_price_update():
         except Exception as rule_error:
             logging.error(f"Error evaluating rules: {rule_error}")
 
+        # Per-user equity / greeks series (after rules so closes are reflected)
+        for user_id in set(t["user_id"] for t in active_trades):
+            await equity_series.record_equity_point(db, user_id, now, intraday=True)
+
     except Exception as e:
         logging.error(f"Error in scheduled price update: {e}")
 
@@ -1496,6 +1533,7 @@ api_router.include_router(simulator_router, prefix="/simulator")
 api_router.include_router(support_router)
 api_router.include_router(invitation_router)
 api_router.include_router(scans_router)  # Pre-computed scans
+api_router.include_router(jobs_router)  # Background job status / cancel
 # AI Wallet: Token purchases & balance
 api_router.include_router(ai_wallet_router)
 # PayPal Express Checkout
@@ -1604,6 +1642,35 @@ async def startup():
     from services.iv_rank_service import ensure_iv_history_indexes
     await ensure_iv_history_indexes(db)
 
+    # Simulator trade history: append-only events + compacted snapshots
+    from services.trade_events import ensure_trade_event_indexes
+    await ensure_trade_event_indexes(db)
+
+    # Per-user equity / greeks series (unique user / resolution / month)
+    from services.equity_series import ensure_equity_series_indexes
+    await ensure_equity_series_indexes(db)
+
+    # Symbol feature store (one row per symbol per night)
+    from services.feature_store import ensure_feature_indexes
+    await ensure_feature_indexes(db)
+
+    # Local daily-bar store (one doc per symbol per year)
+    from services.ohlcv_store import ensure_ohlcv_indexes
+    await ensure_ohlcv_indexes(db)
+
+    # Precomputed scan rows + version pointers
+    from services.scan_store import ensure_scan_store_indexes
+    await ensure_scan_store_indexes(db)
+
+    # Per-symbol liquidity index (scan universe selection)
+    from services.liquidity_index import ensure_liquidity_indexes
+    await ensure_liquidity_indexes(db)
+
+    # Background job queue: indexes, then resume queued / fail orphaned jobs
+    from services.job_queue import ensure_job_indexes, recover_jobs
+    await ensure_job_indexes(db)
+    await recover_jobs(db)
+
     # Create default admin if not exists (production only - credentials should be changed immediately)
     admin = await db.users.find_one({"is_admin": True})
     if not admin:
@@ -1667,6 +1734,10 @@ async def startup():
 
     asyncio.create_task(_auto_seed_if_empty())
 
+    # Latest-run pointer: drop the cached run whenever scan_runs changes
+    from services.run_registry import run_registry
+    app.state.run_registry_watch = asyncio.create_task(run_registry.watch(db))
+
     # EOD Pipeline Scheduler - runs at 5:00 PM ET (single snapshot per trading day)
     # Per Sanjoy's instruction: no Yahoo fetch at 4:05 PM - one snapshot at 5:00 PM only
     def scheduled_eod_pipeline():
@@ -1700,6 +1771,46 @@ async def startup():
         replace_existing=True
     )
 
+    # Retention pass for the per-run EOD collections - Saturdays, no pipeline running
+    async def scheduled_eod_retention():
+        try:
+            from services.retention_manager import apply_retention
+            report = await apply_retention(db)
+            logger.info(f"EOD retention completed: {report['bytes_reclaimed']} bytes reclaimed")
+        except Exception as e:
+            logger.error(f"Scheduled EOD retention failed: {e}")
+
+    scheduler.add_job(
+        scheduled_eod_retention,
+        CronTrigger(hour=6, minute=0, day_of_week='sat',
+                    timezone='America/New_York'),
+        id='eod_retention',
+        replace_existing=True
+    )
+
+    # Greeks backfill for snapshot documents stored before ingest-time greeks -
+    # shortly after startup, then daily; a count-only no-op once all are stamped.
+    # Runs on the job queue; the hourly idempotency key lets both API workers
+    # share one job.
+    async def scheduled_greeks_backfill():
+        try:
+            from services import job_queue
+            job = await job_queue.enqueue(
+                db, "greeks_backfill", None,
+                idempotency_key=f"scheduled-{datetime.now(timezone.utc):%Y-%m-%dT%H}"
+            )
+            logger.info(f"Greeks backfill job {job['id']} ({job['status']})")
+        except Exception as e:
+            logger.error(f"Scheduled greeks backfill failed: {e}")
+
+    scheduler.add_job(
+        scheduled_greeks_backfill,
+        CronTrigger(hour=5, minute=30, timezone='America/New_York'),
+        id='greeks_backfill',
+        replace_existing=True,
+        next_run_time=datetime.now(timezone.utc) + timedelta(minutes=2)
+    )
+
     # Auto-response scheduler - runs every 5 minutes to check for eligible tickets
     async def process_support_auto_responses():
         """Process pending auto-responses for support tickets"""
@@ -1956,6 +2067,10 @@ async def shutdown_db_client():
         scheduler.shutdown()
         logger.info("Simulator scheduler shut down")
 
+    watch = getattr(app.state, "run_registry_watch", None)
+    if watch:
+        watch.cancel()
+
     # Shutdown Yahoo Finance executor to prevent thread leaks
     from services.data_provider import shutdown_executor
     shutdown_executor()
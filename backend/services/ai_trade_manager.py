@@ -366,58 +366,54 @@ def _find_best_short_call(
     target_dte_days: int = 30,
     avoid_itm: bool = True
 ) -> Optional[dict]:
-    """Scan options chain for best short call meeting return and delta criteria."""
-    candidates = []
-    dte_window = 7  # wider window for better matches
-
-    for option in options_chain:
-        try:
-            strike      = float(option.get("strike", 0))
-            premium     = float(option.get("bid", option.get("ask", option.get("last", 0))))
-            delta       = abs(float(option.get("delta", 0)))
-            expiry_str  = option.get("expiration_date") or option.get("expiry", "")
-            option_type = option.get("option_type", option.get("type", "")).lower()
-        except (TypeError, ValueError):
-            continue
-
-        if option_type not in ("call", "c"):
-            continue
-        if strike <= 0 or premium <= 0:
-            continue
-        if avoid_itm and strike <= current_price:
-            continue
-
-        try:
-            expiry_dt = datetime.strptime(expiry_str[:10], "%Y-%m-%d")
-            dte = (expiry_dt - datetime.now()).days
-        except ValueError:
-            continue
-
-        if abs(dte - target_dte_days) > dte_window:
-            continue
-        if dte <= 0:
-            continue
-        if not (MIN_DELTA_SHORT_CALL <= delta <= MAX_DELTA_SHORT_CALL):
-            continue
-
-        weekly_return_pct = (premium / current_price) * (7 / dte) * 100
-        if weekly_return_pct < min_weekly_pct:
-            continue
-
-        candidates.append({
-            "strike":            strike,
-            "premium":           premium,
-            "delta":             delta,
-            "expiry":            expiry_str[:10],
-            "dte":               dte,
-            "weekly_return_pct": round(weekly_return_pct, 2),
-            "total_credit":      round(premium * 100 * contracts, 2)
-        })
+    """
+    Scan options chain for best short call meeting return and delta criteria.
+
+    All contracts are evaluated in one vectorized pass by services.roll_engine.
+    Since the chain moved to snapshot rows (which usually carry no greeks):
+    - rows without a stored delta get a Black-Scholes delta from their IV
+      instead of being rejected; a stored delta still takes precedence
+    - premium is the bid only (SELL rule); rows without a bid are rejected
+      rather than falling back to ask / last
+    """
+    from services.roll_engine import ChainTable, RollPosition, score_roll_candidates
 
+    table = ChainTable.from_calls(options_chain, today=datetime.now().date())
+    if len(table) == 0:
+        return None
+
+    position = RollPosition(
+        current_price=current_price,
+        short_strike=0.0,
+        close_cost=0.0,
+        break_even=0.0,
+        contracts=contracts,
+    )
+    scored = score_roll_candidates(
+        table, position,
+        min_dte=1,
+        max_dte=target_dte_days + 7,
+        target_dte=target_dte_days,
+        dte_window=7,  # wider window for better matches
+        otm_only=avoid_itm,
+        min_delta=MIN_DELTA_SHORT_CALL,
+        max_delta=MAX_DELTA_SHORT_CALL,
+        min_weekly_return_pct=min_weekly_pct,
+    )
+    candidates = scored.top(n=None, key="weekly_return_pct")
     if not candidates:
         return None
     candidates.sort(key=lambda x: (-x["weekly_return_pct"], abs(x["dte"] - target_dte_days)))
-    return candidates[0]
+    best = candidates[0]
+    return {
+        "strike":            best["strike"],
+        "premium":           best["premium"],
+        "delta":             best["delta"],
+        "expiry":            best["expiry"],
+        "dte":               best["dte"],
+        "weekly_return_pct": best["weekly_return_pct"],
+        "total_credit":      round(best["premium"] * 100 * contracts, 2)
+    }
 
 
 # ─── Apply Recommendation ─────────────────────────────────────────────────────
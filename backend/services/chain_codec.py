@@ -0,0 +1,287 @@
+"""
+Chain Codec - Columnar binary encoding of symbol_snapshot option chains
+=======================================================================
+
+symbol_snapshot.option_chain stores Yahoo's records as nested dicts, so every
+contract repeats ~15 key names (impliedVolatility, openInterest,
+daysToExpiration, contractSymbol, ...) and a document reaches 2-5 MB. With
+SNAPSHOT_CHAIN_FORMAT=columnar the EOD pipeline stores instead:
+
+    option_chain_packed: {
+        "v": 1,
+        "compression": "none" | "zlib" | "zstd",
+        "chains": [{
+            "expiry": "2026-01-16", "dte": 30,
+            "calls": {"n": 42, "cols": {"strike": <bin>, "bid": <bin>, ...}},
+            "puts":  {"n": 40, "cols": {...}},
+        }, ...]
+    }
+
+- Each column is a little-endian float32 / int32 array stored as BSON
+  binary, optionally compressed (SNAPSHOT_CHAIN_COMPRESSION=zstd|zlib|none).
+  zstd needs the optional `zstandard` package; without it zlib is used.
+- Missing ints are stored as -1 and decode to None; missing floats stay NaN.
+- Derivable fields are not stored: daysToExpiration (= chain dte),
+  contractSymbol (rebuilt from symbol/expiry/strike), contractSize, currency.
+
+Decoding is lazy: readers ask for the fields (and sides) they use, project
+only those columns with chain_projection(), and each column is decoded when
+its expiry is reached. snapshot_chains() yields the legacy expiry dicts for
+both formats, so readers work on old and new documents alike.
+"""
+
+import logging
+import os
+import zlib
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
+
+import numpy as np
+from bson import Binary
+
+try:
+    import zstandard
+    _ZSTD_AVAILABLE = True
+except ImportError:
+    zstandard = None
+    _ZSTD_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+CHAIN_FORMAT_ENV = "SNAPSHOT_CHAIN_FORMAT"
+CHAIN_COMPRESSION_ENV = "SNAPSHOT_CHAIN_COMPRESSION"
+
+PACKED_FIELD = "option_chain_packed"
+CODEC_VERSION = 1
+SIDES = ("calls", "puts")
+
+FLOAT_FIELDS = ("strike", "bid", "ask", "lastPrice", "change", "percentChange", "impliedVolatility",
+                "delta", "gamma", "theta", "vega")  # greeks: stamped at ingest (greeks_service.stamp_chain_greeks)
+INT_FIELDS = ("volume", "openInterest", "lastTradeDate", "inTheMoney")  # lastTradeDate: epoch seconds
+COLUMN_DTYPES = {**{f: np.dtype("<f4") for f in FLOAT_FIELDS}, **{f: np.dtype("<i4") for f in INT_FIELDS}}
+# Rebuilt on decode rather than stored
+DERIVED_FIELDS = ("daysToExpiration", "contractSymbol")
+MISSING_INT = -1
+
+
+def columnar_enabled() -> bool:
+    return os.environ.get(CHAIN_FORMAT_ENV, "dicts").lower() == "columnar"
+
+
+def resolve_compression(wanted: str) -> str:
+    """Usable compression for a requested one (zstd falls back to zlib without `zstandard`)."""
+    wanted = (wanted or "none").lower()
+    if wanted == "zstd" and not _ZSTD_AVAILABLE:
+        logger.warning("[CHAIN_CODEC] zstd requested but `zstandard` is not installed; using zlib")
+        return "zlib"
+    return wanted if wanted in ("zstd", "zlib") else "none"
+
+
+def _compression() -> str:
+    return resolve_compression(os.environ.get(CHAIN_COMPRESSION_ENV, "none"))
+
+
+def _compress(raw: bytes, compression: str) -> bytes:
+    if compression == "zstd":
+        return zstandard.ZstdCompressor().compress(raw)
+    if compression == "zlib":
+        return zlib.compress(raw, 6)
+    return raw
+
+
+# =============================================================================
+# ENCODE
+# =============================================================================
+
+def _int_value(field: str, value) -> int:
+    if value is None:
+        return MISSING_INT
+    if field == "lastTradeDate":
+        if isinstance(value, datetime):
+            if value.tzinfo is None:
+                value = value.replace(tzinfo=timezone.utc)
+            return int(value.timestamp())
+        return MISSING_INT
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return MISSING_INT
+    return int(value) if value == value else MISSING_INT
+
+
+def _float_value(value) -> float:
+    try:
+        return float(value) if value is not None else np.nan
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def encode_side(records: Sequence[Dict[str, Any]], compression: str = "none") -> Dict[str, Any]:
+    """One side (calls or puts) of one expiry as packed columns."""
+    cols = {}
+    for field, dtype in COLUMN_DTYPES.items():
+        if dtype.kind == "f":
+            values = np.array([_float_value(r.get(field)) for r in records], dtype=dtype)
+        else:
+            values = np.array([_int_value(field, r.get(field)) for r in records], dtype=dtype)
+        cols[field] = Binary(_compress(values.tobytes(), compression))
+    return {"n": len(records), "cols": cols}
+
+
+def encode_chains(chains: Iterable[Dict[str, Any]], compression: Optional[str] = None) -> Dict[str, Any]:
+    """Legacy option_chain list -> option_chain_packed document."""
+    compression = compression or _compression()
+    return {
+        "v": CODEC_VERSION,
+        "compression": compression,
+        "chains": [
+            {
+                "expiry": chain.get("expiry", ""),
+                "dte": chain.get("dte", 0),
+                **{side: encode_side(chain.get(side) or [], compression) for side in SIDES},
+            }
+            for chain in chains
+        ],
+    }
+
+
+def pack_snapshot(snapshot: Dict[str, Any]) -> Dict[str, Any]:
+    """Replace option_chain with option_chain_packed in place when SNAPSHOT_CHAIN_FORMAT=columnar."""
+    if columnar_enabled() and snapshot.get("option_chain") is not None:
+        snapshot[PACKED_FIELD] = encode_chains(snapshot.pop("option_chain"))
+        snapshot["option_chain_format"] = "columnar"
+    return snapshot
+
+
+# =============================================================================
+# DECODE
+# =============================================================================
+
+def chain_projection(fields: Optional[Sequence[str]] = None, sides: Sequence[str] = SIDES) -> Dict[str, int]:
+    """
+    Projection covering both formats for the given call/put fields (None = all).
+    Derived fields pull in what they are rebuilt from.
+    """
+    projection = {"option_chain.expiry": 1, "option_chain.dte": 1,
+                  f"{PACKED_FIELD}.v": 1, f"{PACKED_FIELD}.compression": 1,
+                  f"{PACKED_FIELD}.chains.expiry": 1, f"{PACKED_FIELD}.chains.dte": 1}
+    for side in sides:
+        if fields is None:
+            projection[f"option_chain.{side}"] = 1
+            projection[f"{PACKED_FIELD}.chains.{side}"] = 1
+            continue
+        projection[f"{PACKED_FIELD}.chains.{side}.n"] = 1
+        for field in fields:
+            projection[f"option_chain.{side}.{field}"] = 1
+            if field in COLUMN_DTYPES:
+                projection[f"{PACKED_FIELD}.chains.{side}.cols.{field}"] = 1
+        if "contractSymbol" in fields:
+            projection[f"{PACKED_FIELD}.chains.{side}.cols.strike"] = 1
+    return projection
+
+
+def decode_column(packed: Dict[str, Any], side: Dict[str, Any], field: str) -> np.ndarray:
+    """One stored column as a NumPy array (read-only view of the BSON bytes when uncompressed)."""
+    raw = side["cols"][field]
+    compression = packed.get("compression")
+    if compression == "zstd":
+        if not _ZSTD_AVAILABLE:
+            raise RuntimeError("option_chain_packed is zstd-compressed but `zstandard` is not installed")
+        raw = zstandard.ZstdDecompressor().decompress(raw)
+    elif compression == "zlib":
+        raw = zlib.decompress(raw)
+    return np.frombuffer(raw, dtype=COLUMN_DTYPES[field], count=side["n"])
+
+
+def side_arrays(packed: Dict[str, Any], side: Dict[str, Any], fields: Sequence[str]) -> Dict[str, np.ndarray]:
+    """Requested stored columns of one side (fields not stored are skipped)."""
+    cols = side.get("cols") or {}
+    return {f: decode_column(packed, side, f) for f in fields if f in cols}
+
+
+def float32_to_decimal(values: np.ndarray) -> np.ndarray:
+    """
+    float32 -> float64 rounded to 7 significant digits, so a stored 1.3 reads
+    back as 1.3 (not 1.2999999523) and threshold comparisons match the dicts.
+    """
+    x = values.astype(np.float64)
+    finite = np.isfinite(x) & (x != 0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        exponent = np.where(finite, 6 - np.floor(np.log10(np.abs(np.where(finite, x, 1.0)))), 0)
+        scale = 10.0 ** exponent
+        return np.where(finite, np.round(x * scale) / scale, x)
+
+
+def _contract_symbol(symbol: str, expiry: str, side: str, strike: float) -> str:
+    try:
+        exp = datetime.strptime(expiry, "%Y-%m-%d").strftime("%y%m%d")
+    except ValueError:
+        return f"{symbol}_{strike}_{expiry}"
+    return f"{symbol}{exp}{'C' if side == 'calls' else 'P'}{int(round(strike * 1000)):08d}"
+
+
+def decode_side(
+    packed: Dict[str, Any],
+    chain: Dict[str, Any],
+    side: str,
+    fields: Optional[Sequence[str]] = None,
+    symbol: str = "",
+) -> List[Dict[str, Any]]:
+    """One side of one packed expiry as legacy Yahoo-style records."""
+    block = chain.get(side) or {}
+    n = block.get("n", 0)
+    if not n:
+        return []
+    wanted = list(COLUMN_DTYPES) + list(DERIVED_FIELDS) if fields is None else list(fields)
+    stored = [f for f in wanted if f in COLUMN_DTYPES]
+    if "contractSymbol" in wanted and "strike" not in stored:
+        stored.append("strike")
+    arrays = side_arrays(packed, block, stored)
+
+    columns: Dict[str, list] = {}
+    for field, values in arrays.items():
+        if field == "lastTradeDate":
+            columns[field] = [datetime.fromtimestamp(v, tz=timezone.utc) if v != MISSING_INT else None
+                              for v in values.tolist()]
+        elif field == "inTheMoney":
+            columns[field] = [bool(v) if v != MISSING_INT else None for v in values.tolist()]
+        elif values.dtype.kind == "i":
+            columns[field] = [v if v != MISSING_INT else None for v in values.tolist()]
+        else:
+            columns[field] = float32_to_decimal(values).tolist()
+    if "daysToExpiration" in wanted:
+        columns["daysToExpiration"] = [chain.get("dte", 0)] * n
+    if "contractSymbol" in wanted:
+        strikes = columns.get("strike") or arrays["strike"].tolist()
+        columns["contractSymbol"] = [_contract_symbol(symbol, chain.get("expiry", ""), side, s) for s in strikes]
+        if "strike" not in wanted:
+            columns.pop("strike", None)
+
+    names = list(columns)
+    return [dict(zip(names, row)) for row in zip(*(columns[k] for k in names))]
+
+
+def snapshot_chains(
+    doc: Dict[str, Any],
+    fields: Optional[Sequence[str]] = None,
+    sides: Sequence[str] = SIDES,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Expiry groups {"expiry", "dte", "calls", "puts"} of a symbol_snapshot doc in
+    either format. Packed chains are decoded one expiry at a time, only for
+    `fields` (None = everything stored) and `sides`.
+    """
+    packed = doc.get(PACKED_FIELD)
+    if not packed:
+        yield from doc.get("option_chain") or []
+        return
+    for chain in packed.get("chains") or []:
+        group = {"expiry": chain.get("expiry", ""), "dte": chain.get("dte", 0)}
+        for side in sides:
+            group[side] = decode_side(packed, chain, side, fields, doc.get("symbol", ""))
+        yield group
+
+
+def has_chain(doc: Dict[str, Any]) -> bool:
+    packed = doc.get(PACKED_FIELD)
+    return bool(packed.get("chains")) if packed else bool(doc.get("option_chain"))
@@ -28,11 +28,23 @@ FAILURE BEHAVIOR:
 - Symbol INVISIBLE to all downstream layers
 - Do NOT score
 - Do NOT display
+
+BATCH MODE:
+validate_contracts_batch / validate_covered_calls_batch / validate_pmcc_batch
+apply the same rules to a whole chain table (columns of NumPy arrays, or a
+list of contract dicts via chain_table) with one vector mask per rule. Each
+row gets a uint8 reason code (REASON_OK when valid; the first failing rule,
+in the same order as the per-contract methods). Rejections are aggregated in
+rejection_counts instead of being logged per row.
 """
 
 import logging
+from collections import Counter, deque
+from dataclasses import dataclass
 from datetime import datetime, timezone, timedelta
-from typing import Dict, List, Optional, Tuple, Any
+from typing import Dict, List, Optional, Sequence, Tuple, Any, Union
+
+import numpy as np
 import pandas_market_calendars as mcal
 
 logger = logging.getLogger(__name__)
@@ -45,6 +57,61 @@ MAX_SPREAD_PCT = 10.0  # MANDATORY: 10%, not 50%
 MIN_STRIKES_REQUIRED = 3
 MIN_OI_FOR_LEAPS = 500
 
+# Symbol-level rejections kept for /validation-status (oldest dropped)
+REJECTION_LOG_SIZE = 1000
+
+# ==================== BATCH REASON CODES ====================
+REASON_OK = 0
+REASON_STRIKE_INVALID = 1
+REASON_EXPIRY_MISSING = 2
+REASON_BID_MISSING = 3
+REASON_ASK_MISSING = 4
+REASON_SPREAD_TOO_WIDE = 5
+REASON_STRIKE_OUT_OF_RANGE = 6
+REASON_DTE_EXPIRED = 7
+REASON_DTE_TOO_LONG = 8
+REASON_DEEP_ITM = 9
+REASON_LEAP_STRIKE_INVALID = 10
+REASON_LEAP_EXPIRY_MISSING = 11
+REASON_LEAP_ASK_MISSING = 12
+REASON_LEAP_SPREAD_TOO_WIDE = 13
+REASON_LEAP_DTE_TOO_SHORT = 14
+REASON_LEAP_DELTA_TOO_LOW = 15
+REASON_LEAP_OI_TOO_LOW = 16
+REASON_SHORT_STRIKE_INVALID = 17
+REASON_SHORT_EXPIRY_MISSING = 18
+REASON_SHORT_BID_MISSING = 19
+REASON_SHORT_SPREAD_TOO_WIDE = 20
+REASON_SHORT_DTE_OUT_OF_RANGE = 21
+REASON_NO_WIDTH = 22
+REASON_BELOW_BREAKEVEN = 23
+
+REASON_LABELS = {
+    REASON_STRIKE_INVALID: "Strike price missing or invalid",
+    REASON_EXPIRY_MISSING: "Expiry date missing",
+    REASON_BID_MISSING: "BID is zero or missing",
+    REASON_ASK_MISSING: "ASK is zero or missing",
+    REASON_SPREAD_TOO_WIDE: "Spread exceeds max",
+    REASON_STRIKE_OUT_OF_RANGE: "Strike outside 50%-200% of stock price",
+    REASON_DTE_EXPIRED: "Expired or expiring today",
+    REASON_DTE_TOO_LONG: "DTE too long for covered call (>60 days)",
+    REASON_DEEP_ITM: "Strike too deep ITM for covered call",
+    REASON_LEAP_STRIKE_INVALID: "LEAP: Invalid strike price",
+    REASON_LEAP_EXPIRY_MISSING: "LEAP: Missing expiry date",
+    REASON_LEAP_ASK_MISSING: "LEAP: ASK is zero or missing",
+    REASON_LEAP_SPREAD_TOO_WIDE: "LEAP: Spread exceeds max",
+    REASON_LEAP_DTE_TOO_SHORT: "LEAP: DTE less than 365",
+    REASON_LEAP_DELTA_TOO_LOW: "LEAP: Delta less than 0.70",
+    REASON_LEAP_OI_TOO_LOW: f"LEAP: Open Interest less than {MIN_OI_FOR_LEAPS}",
+    REASON_SHORT_STRIKE_INVALID: "Short Call: Invalid strike price",
+    REASON_SHORT_EXPIRY_MISSING: "Short Call: Missing expiry date",
+    REASON_SHORT_BID_MISSING: "Short Call: BID is zero or missing",
+    REASON_SHORT_SPREAD_TOO_WIDE: "Short Call: Spread exceeds max",
+    REASON_SHORT_DTE_OUT_OF_RANGE: "Short Call: DTE outside 14-45",
+    REASON_NO_WIDTH: "Short strike must be > LEAP strike",
+    REASON_BELOW_BREAKEVEN: "Short strike must be above LEAP breakeven",
+}
+
 
 class ChainValidationError(Exception):
     """Raised when option chain validation fails."""
@@ -54,6 +121,78 @@ class ChainValidationError(Exception):
         super().__init__(f"{symbol}: {reason}")
 
 
+# ==================== BATCH HELPERS ====================
+
+ChainTable = Dict[str, np.ndarray]
+
+
+def _float_column(values) -> np.ndarray:
+    """float64 column; None / non-numeric -> NaN (fails every > 0 rule, like a missing value)."""
+    if isinstance(values, np.ndarray) and values.dtype.kind in "fiu":
+        return values.astype(np.float64, copy=False)
+    out = np.full(len(values), np.nan)
+    for i, v in enumerate(values):
+        try:
+            out[i] = float(v) if v is not None else np.nan
+        except (TypeError, ValueError):
+            pass
+    return out
+
+
+def _present_column(values) -> np.ndarray:
+    """True where a value is truthy (expiry strings)."""
+    if isinstance(values, np.ndarray) and values.dtype == bool:
+        return values
+    return np.fromiter((bool(v) for v in values), dtype=bool, count=len(values))
+
+
+def chain_table(contracts: Sequence[Dict], fields: Sequence[str] = ("strike", "expiry", "bid", "ask", "dte")) -> ChainTable:
+    """Columnar table from contract dicts: numeric fields as float64 arrays, expiry as a presence mask."""
+    table = {}
+    for field in fields:
+        values = [c.get(field) for c in contracts]
+        table[field] = _present_column(values) if field == "expiry" else _float_column(values)
+    return table
+
+
+def _column(table: ChainTable, field: str, n: int) -> np.ndarray:
+    if field not in table:
+        return np.zeros(n, dtype=bool) if field == "expiry" else np.full(n, np.nan)
+    values = table[field]
+    return _present_column(values) if field == "expiry" else _float_column(values)
+
+
+def _first_failure(n: int, rules: Sequence[Tuple[int, np.ndarray]]) -> np.ndarray:
+    """Reason code per row: the first rule (in order) whose mask fails it."""
+    reasons = np.zeros(n, dtype=np.uint8)
+    for code, fails in rules:
+        reasons[(reasons == REASON_OK) & fails] = code
+    return reasons
+
+
+def _spread_pct(bid: np.ndarray, ask: np.ndarray) -> np.ndarray:
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return ((ask - bid) / ask) * 100
+
+
+@dataclass
+class BatchValidation:
+    """Per-row reason codes for one batch (REASON_OK = valid)."""
+    reasons: np.ndarray
+
+    @property
+    def valid(self) -> np.ndarray:
+        return self.reasons == REASON_OK
+
+    def counts(self) -> Dict[str, int]:
+        """Rejections per reason label."""
+        by_code = np.bincount(self.reasons, minlength=len(REASON_LABELS) + 1)
+        return {REASON_LABELS[code]: int(n) for code, n in enumerate(by_code) if code and n}
+
+    def labels(self) -> List[Optional[str]]:
+        return [REASON_LABELS.get(int(code)) for code in self.reasons]
+
+
 # ==================== CALENDAR VALIDATOR ====================
 
 class CalendarValidator:
@@ -264,6 +403,22 @@ class PricingValidator:
             return False, f"{contract_desc}: Spread {spread_pct:.1f}% exceeds maximum {self.max_spread_pct}%"
         
         return True, None
+    
+    def sell_leg_rules(
+        self, bid: np.ndarray, ask: np.ndarray,
+        bid_code: int = REASON_BID_MISSING, spread_code: int = REASON_SPREAD_TOO_WIDE
+    ) -> List[Tuple[int, np.ndarray]]:
+        """validate_sell_leg as vector masks: BID > 0, spread checked where ASK > 0."""
+        return [(bid_code, ~(bid > 0)),
+                (spread_code, (ask > 0) & (_spread_pct(bid, ask) > self.max_spread_pct))]
+    
+    def buy_leg_rules(
+        self, ask: np.ndarray, bid: np.ndarray,
+        ask_code: int = REASON_ASK_MISSING, spread_code: int = REASON_SPREAD_TOO_WIDE
+    ) -> List[Tuple[int, np.ndarray]]:
+        """validate_buy_leg as vector masks: ASK > 0, spread checked where BID > 0."""
+        return [(ask_code, ~(ask > 0)),
+                (spread_code, (bid > 0) & (_spread_pct(bid, ask) > self.max_spread_pct))]
 
 
 # ==================== OPTION CHAIN VALIDATOR ====================
@@ -302,7 +457,9 @@ class OptionChainValidator:
         """
         self.min_strikes_required = min_strikes_required
         self.max_spread_pct = max_spread_pct
-        self.rejection_log: List[Dict] = []
+        self.rejection_log: deque = deque(maxlen=REJECTION_LOG_SIZE)
+        # Batch rejections by reason label (counters only - no per-row entries)
+        self.rejection_counts: Counter = Counter()
         
         # Component validators
         self.pricing_validator = PricingValidator(max_spread_pct)
@@ -364,69 +521,52 @@ class OptionChainValidator:
             if require_puts and (not puts or len(puts) == 0):
                 return self._reject(symbol, "No put options available (required for strategy)")
             
-            # VALIDATION 6: Check strikes within ±20% of spot
-            min_strike = stock_price * 0.80
-            max_strike = stock_price * 1.20
+            # VALIDATION 6-9 run as vector masks over the call table
+            table = chain_table(calls, ("strike", "bid", "ask"))
+            strike, bid, ask = table["strike"], table["bid"], table["ask"]
             
-            valid_strikes = [
-                c for c in calls 
-                if c.get("strike") and min_strike <= c["strike"] <= max_strike
-            ]
+            # VALIDATION 6: Check strikes within ±20% of spot
+            in_band = (strike > 0) & (strike >= stock_price * 0.80) & (strike <= stock_price * 1.20)
+            found = int(in_band.sum())
             
-            if len(valid_strikes) < self.min_strikes_required:
+            if found < self.min_strikes_required:
                 return self._reject(
                     symbol, 
-                    f"Insufficient strikes within ±20% of spot (found {len(valid_strikes)}, need {self.min_strikes_required})"
+                    f"Insufficient strikes within ±20% of spot (found {found}, need {self.min_strikes_required})"
                 )
             
             # VALIDATION 7: Check BID prices (SELL legs require BID)
-            contracts_with_bid = [c for c in valid_strikes if c.get("bid", 0) > 0]
+            with_bid = in_band & (bid > 0)
+            found = int(with_bid.sum())
             
-            if len(contracts_with_bid) < self.min_strikes_required:
+            if found < self.min_strikes_required:
                 return self._reject(
                     symbol,
-                    f"Insufficient contracts with valid BID (found {len(contracts_with_bid)}, need {self.min_strikes_required})"
+                    f"Insufficient contracts with valid BID (found {found}, need {self.min_strikes_required})"
                 )
             
             # VALIDATION 8: Check ASK prices (for spread validation)
-            contracts_with_ask = [c for c in valid_strikes if c.get("ask", 0) > 0]
+            found = int((in_band & (ask > 0)).sum())
             
-            if len(contracts_with_ask) < self.min_strikes_required:
+            if found < self.min_strikes_required:
                 return self._reject(
                     symbol,
-                    f"Insufficient contracts with valid ASK (found {len(contracts_with_ask)}, need {self.min_strikes_required})"
+                    f"Insufficient contracts with valid ASK (found {found}, need {self.min_strikes_required})"
                 )
             
             # VALIDATION 9: Check bid-ask spread on valid contracts (10% MAX)
-            contracts_passing_spread = []
-            wide_spread_contracts = []
-            
-            for c in contracts_with_bid:
-                bid = c.get("bid", 0)
-                ask = c.get("ask", 0)
-                
-                if bid > 0 and ask > 0:
-                    spread_valid, _ = self.pricing_validator.validate_spread(
-                        bid, ask, f"${c.get('strike')}"
-                    )
-                    if spread_valid:
-                        contracts_passing_spread.append(c)
-                    else:
-                        spread_pct = ((ask - bid) / ask) * 100
-                        wide_spread_contracts.append({
-                            "strike": c.get("strike"),
-                            "spread_pct": round(spread_pct, 1)
-                        })
+            passing_spread = with_bid & (ask > 0) & ~(_spread_pct(bid, ask) > self.max_spread_pct)
+            found = int(passing_spread.sum())
             
             # Need at least min_strikes_required contracts passing spread check
-            if len(contracts_passing_spread) < self.min_strikes_required:
+            if found < self.min_strikes_required:
                 return self._reject(
                     symbol,
-                    f"Insufficient contracts with spread ≤{self.max_spread_pct}% (found {len(contracts_passing_spread)}, need {self.min_strikes_required})"
+                    f"Insufficient contracts with spread ≤{self.max_spread_pct}% (found {found}, need {self.min_strikes_required})"
                 )
             
             # Chain is valid
-            logger.info(f"[LAYER2] {symbol}: Chain validated - {len(contracts_passing_spread)} contracts pass spread check")
+            logger.info(f"[LAYER2] {symbol}: Chain validated - {found} contracts pass spread check")
             return True, None
             
         except Exception as e:
@@ -641,6 +781,91 @@ class OptionChainValidator:
         
         return True, None
     
+    # ==================== BATCH MODE ====================
+    
+    def _record(self, result: BatchValidation) -> BatchValidation:
+        self.rejection_counts.update(result.counts())
+        return result
+    
+    def validate_contracts_batch(
+        self,
+        table: ChainTable,
+        stock_price: Union[float, np.ndarray],
+        is_buy_leg: bool = False
+    ) -> BatchValidation:
+        """
+        validate_contract for every row of a chain table.
+        
+        Columns: strike, expiry (presence), bid, ask. stock_price may be a
+        scalar or a per-row array (multi-symbol tables).
+        """
+        n = len(next(iter(table.values()))) if table else 0
+        strike, bid, ask = (_column(table, f, n) for f in ("strike", "bid", "ask"))
+        price = np.broadcast_to(np.asarray(stock_price, dtype=np.float64), (n,))
+        if is_buy_leg:
+            pricing = self.pricing_validator.buy_leg_rules(ask, bid)
+        else:
+            pricing = self.pricing_validator.sell_leg_rules(bid, ask)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ratio = strike / price
+        return self._record(BatchValidation(_first_failure(n, [
+            (REASON_STRIKE_INVALID, ~(strike > 0)),
+            (REASON_EXPIRY_MISSING, ~_column(table, "expiry", n)),
+            *pricing,
+            (REASON_STRIKE_OUT_OF_RANGE, (price > 0) & ((ratio < 0.5) | (ratio > 2.0))),
+        ])))
+    
+    def validate_covered_calls_batch(
+        self,
+        table: ChainTable,
+        stock_price: Union[float, np.ndarray]
+    ) -> BatchValidation:
+        """validate_covered_call for every row. Columns: strike, expiry, bid, ask, dte."""
+        n = len(next(iter(table.values()))) if table else 0
+        strike, bid, ask, dte = (_column(table, f, n) for f in ("strike", "bid", "ask", "dte"))
+        price = np.broadcast_to(np.asarray(stock_price, dtype=np.float64), (n,))
+        return self._record(BatchValidation(_first_failure(n, [
+            (REASON_STRIKE_INVALID, ~(strike > 0)),
+            (REASON_EXPIRY_MISSING, ~_column(table, "expiry", n)),
+            *self.pricing_validator.sell_leg_rules(bid, ask),
+            (REASON_DTE_EXPIRED, ~(dte >= 1)),
+            (REASON_DTE_TOO_LONG, dte > 60),
+            (REASON_DEEP_ITM, (price > 0) & (strike < price * 0.95)),
+        ])))
+    
+    def validate_pmcc_batch(
+        self,
+        leaps: ChainTable,
+        shorts: ChainTable,
+        stock_price: Union[float, np.ndarray] = None
+    ) -> BatchValidation:
+        """
+        validate_pmcc_structure for row-aligned (LEAP, short call) pairs.
+        
+        LEAP columns: strike, expiry, ask, bid, dte, delta, open_interest.
+        Short columns: strike, expiry, bid, ask, dte.
+        """
+        n = len(next(iter(leaps.values()))) if leaps else 0
+        l_strike, l_ask, l_bid, l_dte, l_delta, l_oi = (
+            _column(leaps, f, n) for f in ("strike", "ask", "bid", "dte", "delta", "open_interest"))
+        s_strike, s_bid, s_ask, s_dte = (_column(shorts, f, n) for f in ("strike", "bid", "ask", "dte"))
+        return self._record(BatchValidation(_first_failure(n, [
+            (REASON_LEAP_STRIKE_INVALID, ~(l_strike > 0)),
+            (REASON_LEAP_EXPIRY_MISSING, ~_column(leaps, "expiry", n)),
+            *self.pricing_validator.buy_leg_rules(
+                l_ask, l_bid, REASON_LEAP_ASK_MISSING, REASON_LEAP_SPREAD_TOO_WIDE),
+            (REASON_LEAP_DTE_TOO_SHORT, ~(l_dte >= 365)),
+            (REASON_LEAP_DELTA_TOO_LOW, ~(l_delta >= 0.70)),
+            (REASON_LEAP_OI_TOO_LOW, ~(l_oi >= MIN_OI_FOR_LEAPS)),
+            (REASON_SHORT_STRIKE_INVALID, ~(s_strike > 0)),
+            (REASON_SHORT_EXPIRY_MISSING, ~_column(shorts, "expiry", n)),
+            *self.pricing_validator.sell_leg_rules(
+                s_bid, s_ask, REASON_SHORT_BID_MISSING, REASON_SHORT_SPREAD_TOO_WIDE),
+            (REASON_SHORT_DTE_OUT_OF_RANGE, ~((s_dte >= 14) & (s_dte <= 45))),
+            (REASON_NO_WIDTH, ~(s_strike > l_strike)),
+            (REASON_BELOW_BREAKEVEN, ~(s_strike > l_strike + l_ask)),
+        ])))
+    
     def _reject(self, symbol: str, reason: str) -> Tuple[bool, str]:
         """Log rejection and return failure."""
         rejection = {
@@ -653,12 +878,13 @@ class OptionChainValidator:
         return False, reason
     
     def get_rejection_log(self) -> List[Dict]:
-        """Get list of all rejections."""
-        return self.rejection_log
+        """Get list of recent rejections (last REJECTION_LOG_SIZE)."""
+        return list(self.rejection_log)
     
     def clear_rejection_log(self):
-        """Clear the rejection log."""
-        self.rejection_log = []
+        """Clear the rejection log and batch counters."""
+        self.rejection_log.clear()
+        self.rejection_counts.clear()
     
     def get_rejection_summary(self) -> Dict[str, Any]:
         """Get summary of rejections by reason."""
@@ -671,7 +897,8 @@ class OptionChainValidator:
         
         return {
             "total_rejections": len(self.rejection_log),
-            "by_reason": summary
+            "by_reason": summary,
+            "batch_rejections": dict(self.rejection_counts)
         }
 
 
@@ -810,6 +1037,20 @@ def validate_pmcc_trade(
     )
 
 
+def validate_cc_trades_batch(
+    stock_price: Union[float, np.ndarray],
+    contracts: Union[Sequence[Dict], ChainTable]
+) -> BatchValidation:
+    """
+    Batch form of validate_cc_trade over a list of contract dicts (strike,
+    expiry, bid, ask, dte) or a chain table.
+    
+    Returns: BatchValidation (.valid mask, .reasons codes, .counts())
+    """
+    table = contracts if isinstance(contracts, dict) else chain_table(contracts)
+    return get_validator().validate_covered_calls_batch(table, stock_price)
+
+
 def validate_sell_pricing(
     bid: float,
     ask: float = None,
@@ -37,6 +37,14 @@ async def create_all_indexes(db) -> Dict[str, Any]:
         results["symbol_snapshot"] = f"ERROR: {e}"
         logger.error(f"Index creation failed for symbol_snapshot: {e}")
     
+    # daily_snapshots (nightly precomputed scans read one snapshot_date per cursor)
+    try:
+        await db.daily_snapshots.create_index([("snapshot_date", 1), ("symbol", 1)], background=True)
+        results["daily_snapshots"] = "OK"
+    except Exception as e:
+        results["daily_snapshots"] = f"ERROR: {e}"
+        logger.error(f"Index creation failed for daily_snapshots: {e}")
+    
     # scan_results_cc
     try:
         await db.scan_results_cc.create_index([("run_id", 1), ("score", -1)])
@@ -103,6 +111,55 @@ async def create_all_indexes(db) -> Dict[str, Any]:
         results["eod_runs"] = f"ERROR: {e}"
         logger.error(f"Index creation failed for eod_runs: {e}")
 
+    # symbol_features (nightly technicals + fundamentals shared by scan profiles)
+    try:
+        await db.symbol_features.create_index([("symbol", 1), ("as_of", 1)], unique=True, background=True)
+        await db.symbol_features.create_index([("as_of", -1)], background=True)
+        results["symbol_features"] = "OK"
+    except Exception as e:
+        results["symbol_features"] = f"ERROR: {e}"
+        logger.error(f"Index creation failed for symbol_features: {e}")
+
+    # ohlcv_daily / ohlcv_symbols (local daily-bar store, appended nightly)
+    try:
+        await db.ohlcv_daily.create_index([("symbol", 1), ("year", 1)], unique=True, background=True)
+        await db.ohlcv_symbols.create_index([("symbol", 1)], unique=True, background=True)
+        results["ohlcv_daily"] = "OK"
+    except Exception as e:
+        results["ohlcv_daily"] = f"ERROR: {e}"
+        logger.error(f"Index creation failed for ohlcv_daily: {e}")
+
+    # precomputed_scans pointers + precomputed_scan_rows (one row per opportunity)
+    try:
+        await db.precomputed_scans.create_index(
+            [("strategy", 1), ("risk_profile", 1)],
+            unique=True,
+            partialFilterExpression={"strategy": {"$type": "string"}},
+            background=True
+        )
+        await db.precomputed_scan_rows.create_index([("scan_id", 1), ("score", -1), ("rank", 1)], background=True)
+        await db.precomputed_scan_rows.create_index([("scan_id", 1), ("symbol", 1)], background=True)
+        await db.precomputed_scan_rows.create_index([("scan_id", 1), ("dte", 1)], background=True)
+        await db.precomputed_scan_rows.create_index([("scan_id", 1), ("rank", 1)], background=True)
+        await db.precomputed_scan_rows.create_index(
+            [("strategy", 1), ("risk_profile", 1), ("scan_id", 1)], background=True
+        )
+        results["precomputed_scan_rows"] = "OK"
+    except Exception as e:
+        results["precomputed_scan_rows"] = f"ERROR: {e}"
+        logger.error(f"Index creation failed for precomputed_scan_rows: {e}")
+
+    # symbol_liquidity (per-symbol liquidity of the latest EOD run; scan universe selection)
+    try:
+        await db.symbol_liquidity.create_index("symbol", unique=True, background=True)
+        await db.symbol_liquidity.create_index([("liquidity_score", -1)], background=True)
+        await db.symbol_liquidity.create_index([("avg_volume", -1), ("price", 1)], background=True)
+        await db.symbol_liquidity.create_index([("run_id", 1)], background=True)
+        results["symbol_liquidity"] = "OK"
+    except Exception as e:
+        results["symbol_liquidity"] = f"ERROR: {e}"
+        logger.error(f"Index creation failed for symbol_liquidity: {e}")
+
     # us_symbol_master (for liquidity expansion queries)
     try:
         await db.us_symbol_master.create_index([
@@ -119,6 +176,8 @@ async def create_all_indexes(db) -> Dict[str, Any]:
     # simulator_trades (no indexes = full collection scan per user)
     try:
         await db.simulator_trades.create_index([("user_id", 1), ("created_at", -1)], background=True)
+        # Keyset pagination for GET /simulator/trades: (created_at, id) descending
+        await db.simulator_trades.create_index([("user_id", 1), ("created_at", -1), ("id", -1)], background=True)
         await db.simulator_trades.create_index([("user_id", 1), ("status", 1)], background=True)
         await db.simulator_trades.create_index([("user_id", 1), ("symbol", 1)], background=True)
         await db.simulator_trades.create_index([("user_id", 1), ("strategy_type", 1)], background=True)
@@ -127,6 +186,43 @@ async def create_all_indexes(db) -> Dict[str, Any]:
         results["simulator_trades"] = f"ERROR: {e}"
         logger.error(f"Index creation failed for simulator_trades: {e}")
 
+    # simulator trade history (append-only events + compacted snapshots)
+    try:
+        await db.simulator_trade_events.create_index([("trade_id", 1), ("ts", 1)], background=True)
+        await db.simulator_trade_events.create_index([("user_id", 1), ("ts", 1)], background=True)
+        await db.simulator_trade_snapshots.create_index([("trade_id", 1), ("through_ts", -1)], background=True)
+        results["simulator_trade_events"] = "OK"
+    except Exception as e:
+        results["simulator_trade_events"] = f"ERROR: {e}"
+        logger.error(f"Index creation failed for simulator_trade_events: {e}")
+
+    # simulator_equity_series (one columnar doc per user / resolution / month)
+    try:
+        await db.simulator_equity_series.create_index(
+            [("user_id", 1), ("resolution", 1), ("month", 1)], unique=True, background=True
+        )
+        results["simulator_equity_series"] = "OK"
+    except Exception as e:
+        results["simulator_equity_series"] = f"ERROR: {e}"
+        logger.error(f"Index creation failed for simulator_equity_series: {e}")
+
+    # jobs (background job queue; finished jobs expire via TTL)
+    try:
+        await db.jobs.create_index("id", unique=True, background=True)
+        await db.jobs.create_index([("user_id", 1), ("created_at", -1)], background=True)
+        await db.jobs.create_index([("user_id", 1), ("job_type", 1), ("status", 1)], background=True)
+        await db.jobs.create_index(
+            [("user_id", 1), ("job_type", 1), ("idempotency_key", 1)],
+            unique=True,
+            partialFilterExpression={"idempotency_key": {"$type": "string"}},
+            background=True
+        )
+        await db.jobs.create_index("expires_at", expireAfterSeconds=0, background=True)
+        results["jobs"] = "OK"
+    except Exception as e:
+        results["jobs"] = f"ERROR: {e}"
+        logger.error(f"Index creation failed for jobs: {e}")
+
     # simulator_rules + configs
     try:
         await db.simulator_rules.create_index([("user_id", 1), ("strategy_type", 1)], background=True)
@@ -349,6 +349,71 @@ async def enrich_rows_batch(
     return rows
 
 
+_ENRICHMENT_FIELDS = (
+    "analyst_rating",
+    "analyst_opinions",
+    "target_price_mean",
+    "target_price_high",
+    "target_price_low",
+    "iv_rank",
+)
+
+
+def enrich_rows_by_symbol(
+    rows: List[Dict[str, Any]],
+    *,
+    stock_price_keys: tuple = ("stock_price", "current_price", "price"),
+    expiry_key: str = "expiry",
+    iv_key: str = "iv",
+    skip_analyst: bool = False,
+    skip_iv_rank: bool = False
+) -> List[Dict[str, Any]]:
+    """
+    Enrich a page of rows with ONE enrichment call per unique symbol.
+
+    The first row of each symbol is enriched via enrich_row(); the resulting
+    analyst / IV rank values are then copied onto the remaining rows of the
+    same symbol (overwrite-only-if-missing, same rule as enrich_row).
+
+    Args:
+        rows: Rows to enrich (each must have 'symbol')
+        stock_price_keys: Row keys tried in order for the stock price
+        expiry_key: Row key holding the option expiry
+        iv_key: Row key holding the row IV (decimal)
+        skip_analyst: Skip analyst enrichment
+        skip_iv_rank: Skip IV rank enrichment
+
+    Returns:
+        The same list, enriched in place
+    """
+    by_symbol: Dict[str, List[Dict[str, Any]]] = {}
+    for row in rows:
+        symbol = row.get("symbol")
+        if symbol:
+            by_symbol.setdefault(symbol, []).append(row)
+
+    for symbol, group in by_symbol.items():
+        lead = group[0]
+        stock_price = next((lead.get(k) for k in stock_price_keys if lead.get(k)), None)
+        enrich_row(
+            symbol, lead,
+            stock_price=stock_price,
+            expiry=lead.get(expiry_key),
+            iv=lead.get(iv_key),
+            skip_analyst=skip_analyst,
+            skip_iv_rank=skip_iv_rank
+        )
+        meta = lead.get("_enrichment_meta")
+        for row in group[1:]:
+            for field in _ENRICHMENT_FIELDS:
+                if row.get(field) is None and lead.get(field) is not None:
+                    row[field] = lead[field]
+            if meta is not None:
+                row["_enrichment_meta"] = dict(meta)
+
+    return rows
+
+
 def strip_enrichment_debug(row: Dict[str, Any], include_debug: bool = False) -> Dict[str, Any]:
     """
     Remove or keep enrichment debug metadata based on flag.
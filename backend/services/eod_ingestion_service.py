@@ -30,6 +30,12 @@ import pandas_market_calendars as mcal
 import yfinance as yf
 import pytz
 from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import UpdateOne
+
+from services.greeks_backfill import backfill_greeks
+from services.greeks_service import GREEKS_STAMPED_FIELD, stamp_contract_greeks
+from services.ingest_pipeline import run_ingest_pipeline
+from services.snapshot_repository import slice_pipeline
 
 logger = logging.getLogger(__name__)
 
@@ -197,7 +203,34 @@ class EODIngestionService:
             else:
                 logger.warning(f"[EOD] {symbol} {trade_date}: Override requested, re-ingesting")
         
-        # Build document
+        data, error = None, None
+        try:
+            # Fetch EOD price using yfinance history
+            data = await self._fetch_eod_price_yahoo(symbol, trade_date)
+        except Exception as e:
+            error = str(e)
+        
+        doc = self._build_eod_stock_doc(symbol, trade_date, run_id, data, error, now)
+        
+        # Upsert to database
+        await self.db.eod_market_close.update_one(
+            {"symbol": symbol.upper(), "trade_date": trade_date},
+            {"$set": doc},
+            upsert=True
+        )
+        
+        return self._stock_result(doc, run_id)
+    
+    def _build_eod_stock_doc(
+        self,
+        symbol: str,
+        trade_date: str,
+        run_id: str,
+        data: Optional[Dict],
+        error: Optional[str],
+        now: datetime
+    ) -> Dict[str, Any]:
+        """eod_market_close document from a fetched close (final only with a price)."""
         doc = {
             "symbol": symbol.upper(),
             "trade_date": trade_date,
@@ -217,40 +250,32 @@ class EODIngestionService:
             "error": None
         }
         
-        try:
-            # Fetch EOD price using yfinance history
-            data = await self._fetch_eod_price_yahoo(symbol, trade_date)
+        if error:
+            doc["error"] = error
+            logger.error(f"[EOD] {symbol} {trade_date}: Error - {error}")
+        elif data and data.get("close_price"):
+            doc.update({
+                "market_close_price": data["close_price"],
+                "source": "yahoo",
+                "is_final": True,
+                "metadata": {
+                    "volume": data.get("volume"),
+                    "market_cap": data.get("market_cap"),
+                    "avg_volume": data.get("avg_volume"),
+                    "earnings_date": data.get("earnings_date"),
+                    "analyst_rating": data.get("analyst_rating")
+                }
+            })
             
-            if data and data.get("close_price"):
-                doc.update({
-                    "market_close_price": data["close_price"],
-                    "source": "yahoo",
-                    "is_final": True,
-                    "metadata": {
-                        "volume": data.get("volume"),
-                        "market_cap": data.get("market_cap"),
-                        "avg_volume": data.get("avg_volume"),
-                        "earnings_date": data.get("earnings_date"),
-                        "analyst_rating": data.get("analyst_rating")
-                    }
-                })
-                
-                logger.info(f"[EOD] {symbol} {trade_date}: Captured market_close_price=${data['close_price']:.2f}")
-            else:
-                doc["error"] = "Failed to fetch EOD price from Yahoo"
-                logger.error(f"[EOD] {symbol} {trade_date}: Failed to fetch price")
-        
-        except Exception as e:
-            doc["error"] = str(e)
-            logger.error(f"[EOD] {symbol} {trade_date}: Error - {e}")
-        
-        # Upsert to database
-        await self.db.eod_market_close.update_one(
-            {"symbol": symbol.upper(), "trade_date": trade_date},
-            {"$set": doc},
-            upsert=True
-        )
+            logger.info(f"[EOD] {symbol} {trade_date}: Captured market_close_price=${data['close_price']:.2f}")
+        else:
+            doc["error"] = "Failed to fetch EOD price from Yahoo"
+            logger.error(f"[EOD] {symbol} {trade_date}: Failed to fetch price")
         
+        return doc
+    
+    @staticmethod
+    def _stock_result(doc: Dict[str, Any], run_id: str) -> Dict[str, Any]:
         return {
             "symbol": doc["symbol"],
             "trade_date": doc["trade_date"],
@@ -407,10 +432,40 @@ class EODIngestionService:
         if abs(stock_eod["market_close_price"] - stock_price) > 0.01:
             logger.warning(f"[EOD OPTIONS] {symbol}: Price mismatch - provided ${stock_price:.2f} vs EOD ${stock_eod['market_close_price']:.2f}")
         
+        chain_data, error = None, None
+        try:
+            chain_data = await self._fetch_options_chain_yahoo(symbol, stock_eod["market_close_price"])
+        except Exception as e:
+            error = str(e)
+        
+        doc = self._build_eod_options_doc(
+            symbol, trade_date, run_id, stock_eod["market_close_price"], chain_data, error, now
+        )
+        
+        # Upsert
+        await self.db.eod_options_chain.update_one(
+            {"symbol": symbol.upper(), "trade_date": trade_date},
+            {"$set": doc},
+            upsert=True
+        )
+        
+        return self._options_result(doc, run_id)
+    
+    def _build_eod_options_doc(
+        self,
+        symbol: str,
+        trade_date: str,
+        run_id: str,
+        stock_price: float,
+        chain_data: Optional[Dict],
+        error: Optional[str],
+        now: datetime
+    ) -> Dict[str, Any]:
+        """eod_options_chain document from a fetched chain, greeks stamped."""
         doc = {
             "symbol": symbol.upper(),
             "trade_date": trade_date,
-            "stock_price": stock_eod["market_close_price"],  # Use canonical price
+            "stock_price": stock_price,  # Canonical market_close_price
             "market_close_timestamp": self.get_canonical_close_timestamp(trade_date),
             "ingestion_run_id": run_id,
             "is_final": False,
@@ -421,38 +476,35 @@ class EODIngestionService:
             "total_contracts": 0,
             "valid_contracts": 0,
             "source": None,
-            "error": None
+            "error": None,
+            GREEKS_STAMPED_FIELD: True
         }
         
-        try:
-            chain_data = await self._fetch_options_chain_yahoo(symbol, stock_eod["market_close_price"])
+        if error:
+            doc["error"] = error
+            logger.error(f"[EOD OPTIONS] {symbol} {trade_date}: Error - {error}")
+        elif chain_data:
+            # Greeks stage: Black-Scholes over the kept contracts in one vectorized pass
+            stamp_contract_greeks(chain_data.get("calls", []) + chain_data.get("puts", []), stock_price)
             
-            if chain_data:
-                doc.update({
-                    "source": "yahoo",
-                    "expiries": chain_data.get("expiries", []),
-                    "calls": chain_data.get("calls", []),
-                    "puts": chain_data.get("puts", []),
-                    "total_contracts": chain_data.get("total_contracts", 0),
-                    "valid_contracts": chain_data.get("valid_contracts", 0),
-                    "is_final": chain_data.get("valid_contracts", 0) >= 10  # Require min contracts
-                })
-                
-                logger.info(f"[EOD OPTIONS] {symbol} {trade_date}: {doc['valid_contracts']} valid contracts")
-            else:
-                doc["error"] = "Failed to fetch options chain"
-                
-        except Exception as e:
-            doc["error"] = str(e)
-            logger.error(f"[EOD OPTIONS] {symbol} {trade_date}: Error - {e}")
-        
-        # Upsert
-        await self.db.eod_options_chain.update_one(
-            {"symbol": symbol.upper(), "trade_date": trade_date},
-            {"$set": doc},
-            upsert=True
-        )
+            doc.update({
+                "source": "yahoo",
+                "expiries": chain_data.get("expiries", []),
+                "calls": chain_data.get("calls", []),
+                "puts": chain_data.get("puts", []),
+                "total_contracts": chain_data.get("total_contracts", 0),
+                "valid_contracts": chain_data.get("valid_contracts", 0),
+                "is_final": chain_data.get("valid_contracts", 0) >= 10  # Require min contracts
+            })
+            
+            logger.info(f"[EOD OPTIONS] {symbol} {trade_date}: {doc['valid_contracts']} valid contracts")
+        else:
+            doc["error"] = "Failed to fetch options chain"
         
+        return doc
+    
+    @staticmethod
+    def _options_result(doc: Dict[str, Any], run_id: str) -> Dict[str, Any]:
         return {
             "symbol": doc["symbol"],
             "trade_date": doc["trade_date"],
@@ -563,26 +615,9 @@ class EODIngestionService:
             "volume": int(volume),
             "open_interest": int(open_interest),
             "implied_volatility": float(implied_volatility),
-            "delta": 0.0,
             "valid": False
         }
         
-        # Estimate delta
-        if stock_price > 0 and strike > 0:
-            if option_type == "call":
-                moneyness = (stock_price - strike) / stock_price
-                if moneyness > 0:
-                    contract["delta"] = min(0.95, 0.50 + moneyness * 2)
-                else:
-                    contract["delta"] = max(0.05, 0.50 + moneyness * 2)
-            else:
-                moneyness = (strike - stock_price) / stock_price
-                if moneyness > 0:
-                    contract["delta"] = max(-0.95, -0.50 - moneyness * 2)
-                else:
-                    contract["delta"] = min(-0.05, -0.50 - moneyness * 2)
-            contract["delta"] = round(contract["delta"], 4)
-        
         # Validation
         if contract["bid"] <= 0:
             return contract
@@ -610,15 +645,22 @@ class EODIngestionService:
         self, 
         symbols: List[str], 
         trade_date: str = None,
-        override: bool = False
+        override: bool = False,
+        progress=None
     ) -> Dict[str, Any]:
         """
         Batch ingest EOD data for multiple symbols.
         
         ADR-001 COMPLIANT:
         - Single ingestion_run_id for the batch
-        - Stock ingested before options
+        - Stock ingested before options (same bulk flush, stock collection first)
         - Cross-validates all dates
+        
+        Runs on the staged ingest pipeline (services/ingest_pipeline.py):
+        already-final docs are looked up once for the whole batch, close price
+        and chain are fetched concurrently per symbol, docs are built (greeks
+        stamped) and bulk upserted. `progress` is a job progress callback;
+        per-stage throughput is returned under "metrics".
         """
         now = datetime.now(timezone.utc)
         
@@ -641,42 +683,86 @@ class EODIngestionService:
             "options_skipped": []
         }
         
-        for symbol in symbols:
-            # Ingest stock first
-            stock_result = await self.ingest_eod_stock_price(
-                symbol, trade_date, override, run_id
-            )
+        # Idempotency: one query per collection instead of a find_one per symbol
+        final_prices: Dict[str, float] = {}
+        final_options = set()
+        if not override:
+            upper = [symbol.upper() for symbol in symbols]
+            query = {"symbol": {"$in": upper}, "trade_date": trade_date, "is_final": True}
+            async for doc in self.db.eod_market_close.find(query, {"_id": 0, "symbol": 1, "market_close_price": 1}):
+                final_prices[doc["symbol"]] = doc.get("market_close_price")
+            async for doc in self.db.eod_options_chain.find(query, {"_id": 0, "symbol": 1}):
+                final_options.add(doc["symbol"])
+        
+        async def fetch(symbol: str) -> Dict[str, Any]:
+            raw = {"stock": None, "stock_error": None, "chain": None, "chain_error": None}
+            price = final_prices.get(symbol.upper())
+            if price is None:
+                try:
+                    raw["stock"] = await self._fetch_eod_price_yahoo(symbol, trade_date)
+                except Exception as e:
+                    raw["stock_error"] = str(e)
+                price = (raw["stock"] or {}).get("close_price") if not raw["stock_error"] else None
+            
+            if price and price > 0 and symbol.upper() not in final_options:
+                try:
+                    raw["chain"] = await self._fetch_options_chain_yahoo(symbol, price)
+                except Exception as e:
+                    raw["chain_error"] = str(e)
+            return raw
+        
+        def normalize(symbol: str, raw: Dict[str, Any]):
+            key = {"symbol": symbol.upper(), "trade_date": trade_date}
+            writes = []
+            outcome = []  # (results list, entry)
             
-            if stock_result["status"] == "ALREADY_FINAL":
-                results["stock_skipped"].append(symbol)
-            elif stock_result["status"] == "INGESTED":
-                results["stock_success"].append(symbol)
+            stock_price = final_prices.get(symbol.upper())
+            if stock_price is not None:
+                logger.info(f"[EOD] {symbol} {trade_date}: Already final, skipping (no override)")
+                outcome.append(("stock_skipped", symbol))
             else:
-                results["stock_failed"].append({
-                    "symbol": symbol,
-                    "error": stock_result.get("error")
-                })
-                continue  # Skip options if stock failed
+                stock_doc = self._build_eod_stock_doc(symbol, trade_date, run_id, raw["stock"], raw["stock_error"], now)
+                writes.append(("eod_market_close", UpdateOne(key, {"$set": stock_doc}, upsert=True)))
+                if not stock_doc["is_final"]:
+                    outcome.append(("stock_failed", {"symbol": symbol, "error": stock_doc.get("error")}))
+                    return writes, outcome  # Skip options if stock failed
+                outcome.append(("stock_success", symbol))
+                stock_price = stock_doc["market_close_price"]
             
-            # Ingest options
-            stock_price = stock_result.get("market_close_price", 0)
-            if stock_price > 0:
-                options_result = await self.ingest_eod_options_chain(
-                    symbol, stock_price, trade_date, override, run_id
-                )
-                
-                if options_result["status"] == "ALREADY_FINAL":
-                    results["options_skipped"].append(symbol)
-                elif options_result["status"] == "INGESTED":
-                    results["options_success"].append(symbol)
-                else:
-                    results["options_failed"].append({
-                        "symbol": symbol,
-                        "error": options_result.get("error")
-                    })
+            if not stock_price or stock_price <= 0:
+                return writes, outcome
+            if symbol.upper() in final_options:
+                logger.info(f"[EOD OPTIONS] {symbol} {trade_date}: Already final, skipping")
+                outcome.append(("options_skipped", symbol))
+                return writes, outcome
             
-            # Rate limiting
-            await asyncio.sleep(0.3)
+            options_doc = self._build_eod_options_doc(
+                symbol, trade_date, run_id, stock_price, raw["chain"], raw["chain_error"], now
+            )
+            writes.append(("eod_options_chain", UpdateOne(key, {"$set": options_doc}, upsert=True)))
+            if options_doc["is_final"]:
+                outcome.append(("options_success", symbol))
+            else:
+                outcome.append(("options_failed", {"symbol": symbol, "error": options_doc.get("error")}))
+            return writes, outcome
+        
+        def on_done(symbol: str, outcome, error) -> None:
+            if error is not None:
+                results["stock_failed"].append({"symbol": symbol, "error": str(error)})
+                return
+            for bucket, entry in outcome:
+                results[bucket].append(entry)
+        
+        results["metrics"] = await run_ingest_pipeline(
+            self.db, symbols, fetch, normalize, on_done, progress=progress, label="EOD_INGEST"
+        )
+        
+        # Report in input order, as the sequential loop did
+        order = {symbol: i for i, symbol in enumerate(symbols)}
+        for bucket in ("stock_success", "stock_failed", "stock_skipped",
+                       "options_success", "options_failed", "options_skipped"):
+            results[bucket].sort(key=lambda entry: order.get(
+                entry["symbol"] if isinstance(entry, dict) else entry, len(order)))
         
         results["completed_at"] = datetime.now(timezone.utc).isoformat()
         results["summary"] = {
@@ -747,7 +833,11 @@ class EODPriceContract:
     async def get_options_chain(
         self, 
         symbol: str, 
-        trade_date: str = None
+        trade_date: str = None,
+        dte_range: Optional[Tuple] = None,
+        strike_band: Optional[Tuple] = None,
+        sides: Tuple[str, ...] = ("calls", "puts"),
+        valid_only: bool = False
     ) -> Dict[str, Any]:
         """
         Get canonical options chain.
@@ -755,24 +845,38 @@ class EODPriceContract:
         Args:
             symbol: Stock ticker
             trade_date: Trading day (YYYY-MM-DD)
+            dte_range / strike_band / valid_only: slice `sides` inside Mongo
+                (strike_band as fractions of stock_price, either bound may be None)
+            sides: contract arrays to read; sides=() for metadata only
         
         Returns:
-            Full options chain document
+            Options chain document (full unless sliced)
         
         Raises:
             EODOptionsNotFoundError: If no canonical chain exists
         """
-        if trade_date is None:
+        query = {"symbol": symbol.upper(), "is_final": True}
+        if trade_date is not None:
+            query["trade_date"] = trade_date
+        
+        if dte_range is None and strike_band is None and not valid_only and tuple(sides) == ("calls", "puts"):
             doc = await self.db.eod_options_chain.find_one(
-                {"symbol": symbol.upper(), "is_final": True},
+                query,
                 {"_id": 0},
                 sort=[("trade_date", -1)]
             )
         else:
-            doc = await self.db.eod_options_chain.find_one(
-                {"symbol": symbol.upper(), "trade_date": trade_date, "is_final": True},
-                {"_id": 0}
-            )
+            docs = await self.db.eod_options_chain.aggregate(slice_pipeline(
+                query,
+                keep=list(sides),
+                drop=[side for side in ("calls", "puts") if side not in sides],
+                dte_range=dte_range,
+                strike_band=strike_band,
+                price_field="stock_price",
+                valid_only=valid_only,
+                sort={"trade_date": -1}
+            )).to_list(1)
+            doc = docs[0] if docs else None
         
         if not doc:
             raise EODOptionsNotFoundError(
@@ -780,6 +884,14 @@ class EODPriceContract:
                 (f" on {trade_date}" if trade_date else "")
             )
         
+        # Written before ingest-time greeks: stamp and store it once, then read it again
+        if not doc.get(GREEKS_STAMPED_FIELD) and doc.get("trade_date"):
+            match = {"symbol": symbol.upper(), "trade_date": doc["trade_date"], "is_final": True}
+            stamped = await backfill_greeks(self.db, ("eod_options_chain",), match=match)
+            if stamped["documents"]:
+                return await self.get_options_chain(
+                    symbol, doc["trade_date"], dte_range, strike_band, sides, valid_only)
+        
         return doc
     
     async def get_valid_calls_for_scan(
@@ -797,7 +909,13 @@ class EODPriceContract:
         
         Returns BID price as premium (SELL leg).
         """
-        chain = await self.get_options_chain(symbol, trade_date)
+        chain = await self.get_options_chain(
+            symbol, trade_date,
+            dte_range=(min_dte, max_dte),
+            strike_band=(min_strike_pct, max_strike_pct),
+            sides=("calls",),
+            valid_only=True
+        )
         stock_price = chain["stock_price"]
         calls = chain.get("calls", [])
         
@@ -850,7 +968,13 @@ class EODPriceContract:
         
         Returns ASK price as premium (BUY leg).
         """
-        chain = await self.get_options_chain(symbol, trade_date)
+        chain = await self.get_options_chain(
+            symbol, trade_date,
+            dte_range=(min_dte, max_dte),
+            strike_band=(None, 1.0),
+            sides=("calls",),
+            valid_only=True
+        )
         stock_price = chain["stock_price"]
         calls = chain.get("calls", [])
         
@@ -5,7 +5,7 @@ Runs at 4:10 PM ET (Mon-Fri) to:
 1. Load latest universe version (1500 symbols)
 2. Fetch underlying prices (previousClose)
 3. Fetch option chains (including LEAPS for PMCC)
-4. Compute CC and PMCC results
+4. Compute CC and PMCC results (per-symbol work on a scan_compute process pool)
 5. Write to DB collections
 
 Reliability Controls:
@@ -25,14 +25,15 @@ import logging
 import uuid
 import time
 import random
+from functools import partial
 from math import log1p
 from datetime import datetime, timezone, timedelta
 from typing import List, Dict, Optional, Tuple, Any
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from backend.services.iv_rank_service import get_iv_metrics_for_symbol
 
 import yfinance as yf
 import pandas as pd
+from pymongo.errors import BulkWriteError
 
 from services.universe_builder import (
     build_universe,
@@ -55,7 +56,21 @@ from services.yf_pricing import (
     get_underlying_prices_bulk_yf
 )
 from services.data_provider import get_market_state
-from services.iv_rank_service import backfill_iv_history_from_snapshots, get_iv_metrics_quick
+from services.iv_rank_service import (
+    backfill_iv_history_from_snapshots,
+    compute_iv_atm_proxy,
+    get_iv_metrics_quick,
+    get_trading_date_eastern,
+    upsert_iv_history
+)
+from services.liquidity_index import rebuild_liquidity_index
+from services.chain_codec import pack_snapshot, snapshot_chains
+from services.greeks_service import GREEKS_STAMPED_FIELD, stamp_chain_greeks
+from services.process_pool import shutdown_pool
+from services.run_registry import run_registry
+from services.scan_compute import (
+    SCAN_COMPUTE_CHUNK, SCAN_COMPUTE_WORKERS, compact_snapshot, compute_pool, map_chunks
+)
 
 logger = logging.getLogger(__name__)
 
@@ -989,7 +1004,11 @@ async def _run_eod_pipeline_inner(db, force_build_universe: bool = False, run_id
                     "has_long_dated_calls": has_long_dated_calls,
                     "included": True
                 }
-                batch_snapshots.append(snapshot)
+                # Greeks are stored with the chain so readers never recompute them
+                stamp_chain_greeks(snapshot["option_chain"], quote_result["price"])
+                snapshot[GREEKS_STAMPED_FIELD] = True
+                # Columnar option_chain_packed when SNAPSHOT_CHAIN_FORMAT=columnar
+                batch_snapshots.append(pack_snapshot(snapshot))
 
                 # Audit: included
                 audit_records.append({
@@ -1268,9 +1287,17 @@ async def _run_eod_pipeline_inner(db, force_build_universe: bool = False, run_id
             upsert=True
         )
         logger.info("[EOD_PIPELINE] Persisted scan_runs (atomic publish)")
+        run_registry.publish(scan_run_doc, getattr(db, "name", None))
     except Exception as e:
         logger.error(f"[EOD_PIPELINE] Failed to persist scan_runs: {e}")
 
+    # Refresh the liquidity index the precomputed scans select their universe from
+    if final_status == "COMPLETED":
+        try:
+            await rebuild_liquidity_index(db, run_id)
+        except Exception as e:
+            logger.error(f"[EOD_PIPELINE] Failed to rebuild liquidity index: {e}")
+
     logger.info(
         f"[EOD_PIPELINE] Completed run_id={run_id} in {result.duration_seconds:.1f}s: "
         f"included={result.chain_success}, excluded={result.symbols_total - result.chain_success}"
@@ -1330,6 +1357,12 @@ PMCC_MAX_SHORT_SPREAD_PCT = 15.0 # Max mid-based spread %
 PMCC_MIN_SHORT_OTM_PCT = 0.01    # Short strike must be >= 1% OTM
 PMCC_MIN_SHORT_BID = 0.20        # Minimum short bid (prevents penny trades)
 
+# Call fields compute_scan_results reads from symbol_snapshot chains
+SCAN_CALL_FIELDS = ("daysToExpiration", "strike", "bid", "ask", "lastPrice",
+                    "impliedVolatility", "openInterest", "volume")
+# Legacy option_chain records also carry a previous close (sent to scan workers)
+SCAN_LEGACY_CALL_FIELDS = SCAN_CALL_FIELDS + ("previousClose", "prevClose")
+
 # Structure constraints
 PMCC_MIN_IV = 0.05               # Min 5% IV
 PMCC_MAX_IV = 3.0                # Max 300% IV
@@ -1667,665 +1700,751 @@ def calculate_cc_score(trade_data: Dict[str, Any]) -> float:
     return round(min(100.0, max(0.0, score)), 1)
 
 
-async def compute_scan_results(
-    db,
-    run_id: str,
-    as_of: datetime
-) -> Tuple[List[Dict], List[Dict]]:
+def evaluate_scan_symbol(snapshot: Dict[str, Any], run_id: str, as_of: datetime) -> Optional[Dict[str, Any]]:
     """
-    Compute CC and PMCC opportunities from symbol snapshots stored in DB.
+    CC and PMCC opportunities of one symbol_snapshot document - pure CPU, no
+    I/O, so it runs in scan_compute worker processes.
+
+    Returns None for symbols that are skipped (no price, not CC-eligible), else
+    {"symbol", "cc": best weekly/monthly CC rows, "pmcc": every valid PMCC pair,
+    "has_long_dated_calls", "iv_proxy": (iv, meta) to store in IV history, or None}.
+    Enrichment fields (analyst_rating, sector, iv_rank*) are left None and
+    filled in by compute_scan_results.
+    """
+    symbol = snapshot.get("symbol")
+    stock_price = snapshot.get("underlying_price", 0)
+    avg_volume = snapshot.get("avg_volume", 0)
+    market_cap = snapshot.get("market_cap", 0)
+    option_chains = list(snapshot_chains(snapshot, SCAN_CALL_FIELDS, sides=("calls",)))
+    symbol_is_etf = snapshot.get("is_etf", False)
+    has_leaps = snapshot.get("has_leaps", False)
+    has_long_dated_calls = snapshot.get("has_long_dated_calls", has_leaps)
+
+    if not symbol or stock_price <= 0:
+        return None
 
-    Reads symbol_snapshot documents by run_id from MongoDB so the full
-    option chain data is never held in the API process memory all at once.
+    # Check CC eligibility
+    is_eligible, reason = check_cc_eligibility(
+        symbol, stock_price, market_cap, avg_volume, symbol_is_etf
+    )
 
-    Args:
-        db: MongoDB database instance
-        run_id: EOD pipeline run ID
-        as_of: Timestamp of the scan
+    if not is_eligible:
+        return None
 
-    Returns:
-        Tuple of (cc_opportunities, pmcc_opportunities)
+    symbol_cc_opps = []
+    iv_history_due = False  # IV proxy stored once a contract reaches scoring
 
-    PMCC SAFEGUARD (Feb 2026):
-    - Only evaluates symbols with has_leaps=True in snapshot
-    - Tracks symbols_without_leaps for audit
-    """
-    cc_written_count = 0       # CC results streamed to DB per symbol — never held in full
-    pmcc_opportunities = []    # PMCC: best-per-symbol dict, then sorted — small (~991 items)
-    pmcc_by_symbol = {}
-    symbols_without_leaps = []
-    total_snapshots_count = 0
+    # Filled in by the caller (symbol_enrichment / iv_history reads)
+    analyst_rating = None
+    symbol_sector = None
+    iv_rank_metrics = {}
 
-    # batch_size(5): each fetch from MongoDB is only 5 docs at a time.
-    # Default batch is 101 docs × ~2-5MB option chains = 200-500MB spike.
-    # 5 docs × ~5MB = ~25MB per batch — safe for low-memory servers.
-    snapshot_cursor = db.symbol_snapshot.find({"run_id": run_id}).batch_size(5)
-    async for snapshot in snapshot_cursor:
-        total_snapshots_count += 1
-        symbol = snapshot.get("symbol")
-        stock_price = snapshot.get("underlying_price", 0)
-        avg_volume = snapshot.get("avg_volume", 0)
-        market_cap = snapshot.get("market_cap", 0)
-        option_chains = snapshot.get("option_chain", [])
-        symbol_is_etf = snapshot.get("is_etf", False)
-        has_leaps = snapshot.get("has_leaps", False)
-        has_long_dated_calls = snapshot.get("has_long_dated_calls", has_leaps)
-
-        if not symbol or stock_price <= 0:
-            continue
-
-        # Check CC eligibility
-        is_eligible, reason = check_cc_eligibility(
-            symbol, stock_price, market_cap, avg_volume, symbol_is_etf
-        )
+    # Process option chains for CC opportunities
+    for chain in option_chains:
+        expiry = chain.get("expiry", "")
+        calls = chain.get("calls", [])
 
-        if not is_eligible:
-            continue
+        for call in calls:
+            dte = call.get("daysToExpiration", 0)
+            if not dte:
+                try:
+                    exp_dt = datetime.strptime(expiry, "%Y-%m-%d")
+                    dte = (exp_dt - datetime.now()).days
+                except Exception:
+                    continue
 
-        symbol_cc_opps = []  # collect CC opps for this symbol, write to DB then discard
+            strike = call.get("strike", 0)
+            bid = call.get("bid", 0)
+            ask = call.get("ask", 0)
+            last_price = call.get("lastPrice", 0) or 0
+            prev_close = call.get("previousClose", 0) or call.get(
+                "prevClose", 0) or 0
+            iv = call.get("impliedVolatility", 0) or 0
+            oi = call.get("openInterest", 0) or 0
+            volume = call.get("volume", 0) or 0
+
+            # ============================================================
+            # OPTION PARITY MODEL: Compute display_price for Yahoo parity
+            # ============================================================
+            mid = round((bid + ask) / 2,
+                        2) if bid > 0 and ask > 0 else None
+
+            # Determine display_price (what Yahoo shows)
+            if last_price and last_price > 0:
+                display_price = round(last_price, 2)
+                display_price_source = "LAST"
+            elif mid is not None:
+                display_price = mid
+                display_price_source = "MID"
+            elif prev_close and prev_close > 0:
+                display_price = round(prev_close, 2)
+                display_price_source = "PREV_CLOSE"
+            else:
+                display_price = None
+                display_price_source = "NONE"
+
+            # ============================================================
+            # QUALITY FLAGS (expanded)
+            # ============================================================
+            # VALIDATE CC OPTION (HARD RULES)
+            is_valid, quality_flags = validate_cc_option(
+                strike=strike,
+                stock_price=stock_price,
+                bid=bid,
+                iv=iv,
+                oi=oi,
+                dte=dte,
+                ask=ask
+            )
 
-        # Fetch analyst enrichment and sector from symbol_enrichment collection
-        analyst_data = None
-        analyst_rating = None
-        symbol_sector = None
-        if db is not None:
-            try:
-                analyst_data = await db.symbol_enrichment.find_one(
-                    {"symbol": symbol},
-                    {"_id": 0, "analyst_rating_label": 1, "analyst_rating_value": 1, "sector": 1}
-                )
-                analyst_rating = analyst_data.get(
-                    "analyst_rating_label") if analyst_data else None
-                symbol_sector = analyst_data.get("sector") if analyst_data else None
-            except Exception:
-                pass
+            if not is_valid:
+                continue
 
-        # Fetch IV rank metrics from stored history (once per symbol)
-        iv_rank_metrics = {}
-        if db is not None:
+            # SOFT FLAGS (for transparency, don't reject)
+            # Mid-based spread as ratio (0-1) for score formula
+            if ask and ask > 0 and bid > 0:
+                _mid = (bid + ask) / 2
+                spread_pct = ((ask - bid) / _mid) if _mid > 0 else 1.0
+            else:
+                spread_pct = 1.0
+            if spread_pct > 0.15:
+                quality_flags.append("WIDE_SPREAD")
+            if oi < 50:
+                quality_flags.append("LOW_OI")
+            if not last_price or last_price <= 0:
+                quality_flags.append("NO_LAST")
+
+            # PRICING RULE: SELL leg uses BID price
+            premium_bid = bid
+            premium_ask_val = ask if ask and ask > 0 else None
+            premium_used = premium_bid  # SELL rule: use BID
+
+            # Calculate metrics using safe_divide (prevents NaN/inf)
+            premium_yield = safe_divide(
+                premium_bid, stock_price, 0) * 100 if stock_price else None
+            otm_pct = safe_divide(
+                strike - stock_price, stock_price, 0) * 100 if stock_price else None
+
+            # Apply filters (skip if calculation failed)
+            if premium_yield is None or otm_pct is None:
+                continue
+            if premium_yield < CC_MIN_PREMIUM_YIELD or premium_yield > CC_MAX_PREMIUM_YIELD:
+                continue
+            if otm_pct < CC_MIN_OTM_PCT or otm_pct > CC_MAX_OTM_PCT:
+                continue
+
+            # Calculate Greeks
+            greeks = calculate_greeks_simple(
+                stock_price, strike, dte, iv if iv > 0 else 0.30)
+
+            # Yield calculation: basis = stock_price (cost of owning shares)
+            cycle_yield = (premium_bid / stock_price) if stock_price > 0 else 0
+            annual_yield = min(cycle_yield * (365 / max(dte, 1)), 1.5)
+
+            # Legacy roi fields (keep for backward compat)
+            roi_pct = cycle_yield * 100
+            roi_annualized = annual_yield * 100
+
+            if cycle_yield <= 0:
+                continue
+
+            # Calculate score
+            trade_data = {
+                "cycle_yield": cycle_yield,
+                "delta": greeks["delta"],
+                "open_interest": oi,
+                "spread_pct": spread_pct  # mid-based ratio 0-1
+            }
+            score = calculate_cc_score(trade_data)
+
+            # Build contract symbol
             try:
-                iv_rank_metrics = await get_iv_metrics_quick(db, symbol)
-            except Exception as e:
-                logger.warning(f"IV rank fetch failed for {symbol}: {e}")
-
-        # Process option chains for CC opportunities
-        for chain in option_chains:
-            expiry = chain.get("expiry", "")
-            calls = chain.get("calls", [])
-
-            for call in calls:
-                dte = call.get("daysToExpiration", 0)
-                if not dte:
-                    try:
-                        exp_dt = datetime.strptime(expiry, "%Y-%m-%d")
-                        dte = (exp_dt - datetime.now()).days
-                    except Exception:
-                        continue
+                exp_formatted = datetime.strptime(
+                    expiry, "%Y-%m-%d").strftime("%y%m%d")
+                contract_symbol = f"{symbol}{exp_formatted}C{int(strike * 1000):08d}"
+            except Exception:
+                contract_symbol = f"{symbol}_{strike}_{expiry}"
 
-                strike = call.get("strike", 0)
-                bid = call.get("bid", 0)
-                ask = call.get("ask", 0)
-                last_price = call.get("lastPrice", 0) or 0
-                prev_close = call.get("previousClose", 0) or call.get(
-                    "prevClose", 0) or 0
-                iv = call.get("impliedVolatility", 0) or 0
-                oi = call.get("openInterest", 0) or 0
-                volume = call.get("volume", 0) or 0
-
-                # ============================================================
-                # OPTION PARITY MODEL: Compute display_price for Yahoo parity
-                # ============================================================
-                mid = round((bid + ask) / 2,
-                            2) if bid > 0 and ask > 0 else None
-
-                # Determine display_price (what Yahoo shows)
-                if last_price and last_price > 0:
-                    display_price = round(last_price, 2)
-                    display_price_source = "LAST"
-                elif mid is not None:
-                    display_price = mid
-                    display_price_source = "MID"
-                elif prev_close and prev_close > 0:
-                    display_price = round(prev_close, 2)
-                    display_price_source = "PREV_CLOSE"
-                else:
-                    display_price = None
-                    display_price_source = "NONE"
-
-                # ============================================================
-                # QUALITY FLAGS (expanded)
-                # ============================================================
-                # VALIDATE CC OPTION (HARD RULES)
-                is_valid, quality_flags = validate_cc_option(
-                    strike=strike,
-                    stock_price=stock_price,
-                    bid=bid,
-                    iv=iv,
-                    oi=oi,
-                    dte=dte,
-                    ask=ask
-                )
-
-                if not is_valid:
-                    continue
+                # IV validation: store as decimal (0.65) and percent (65.0)
+            iv_decimal = round(iv, 4) if iv and iv > 0 else 0.0
+            iv_percent = round(iv * 100, 1) if iv and iv > 0 else 0.0
 
-                # SOFT FLAGS (for transparency, don't reject)
-                # Mid-based spread as ratio (0-1) for score formula
-                if ask and ask > 0 and bid > 0:
-                    _mid = (bid + ask) / 2
-                    spread_pct = ((ask - bid) / _mid) if _mid > 0 else 1.0
-                else:
-                    spread_pct = 1.0
-                if spread_pct > 0.15:
-                    quality_flags.append("WIDE_SPREAD")
-                if oi < 50:
-                    quality_flags.append("LOW_OI")
-                if not last_price or last_price <= 0:
-                    quality_flags.append("NO_LAST")
-
-                # PRICING RULE: SELL leg uses BID price
-                premium_bid = bid
-                premium_ask_val = ask if ask and ask > 0 else None
-                premium_used = premium_bid  # SELL rule: use BID
-
-                # Calculate metrics using safe_divide (prevents NaN/inf)
-                premium_yield = safe_divide(
-                    premium_bid, stock_price, 0) * 100 if stock_price else None
-                otm_pct = safe_divide(
-                    strike - stock_price, stock_price, 0) * 100 if stock_price else None
-
-                # Apply filters (skip if calculation failed)
-                if premium_yield is None or otm_pct is None:
-                    continue
-                if premium_yield < CC_MIN_PREMIUM_YIELD or premium_yield > CC_MAX_PREMIUM_YIELD:
-                    continue
-                if otm_pct < CC_MIN_OTM_PCT or otm_pct > CC_MAX_OTM_PCT:
-                    continue
+            iv_history_due = True
 
-                # Calculate Greeks
-                greeks = calculate_greeks_simple(
-                    stock_price, strike, dte, iv if iv > 0 else 0.30)
+            # === CC Opportunity ===
+            cc_opp = {
+                "run_id": run_id,
+                "as_of": as_of,
+                "created_at": datetime.now(timezone.utc),
 
-                # Yield calculation: basis = stock_price (cost of owning shares)
-                cycle_yield = (premium_bid / stock_price) if stock_price > 0 else 0
-                annual_yield = min(cycle_yield * (365 / max(dte, 1)), 1.5)
+                "symbol": symbol,
+                "stock_price": round(stock_price, 2),
+
+                "stock_price_source": snapshot.get("stock_price_source", "SESSION_CLOSE"),
+                "session_close_price": snapshot.get("session_close_price"),
+                "prior_close_price": snapshot.get("prior_close_price"),
+                "market_status": snapshot.get("market_status", "UNKNOWN"),
+
+                "is_etf": symbol_is_etf,
+                "instrument_type": "ETF" if symbol_is_etf else "STOCK",
+                "market_cap": market_cap,
+                "avg_volume": avg_volume,
+
+                "contract_symbol": contract_symbol,
+                "strike": strike,
+                "expiry": expiry,
+                "dte": dte,
+                "dte_category": "weekly" if dte <= 14 else "monthly",
+
+                "premium_bid": round(premium_bid, 2),
+                "premium_ask": round(premium_ask_val, 2) if premium_ask_val else None,
+                "premium_mid": mid,
+                "premium_last": round(last_price, 2) if last_price and last_price > 0 else None,
+                "premium_prev_close": round(prev_close, 2) if prev_close and prev_close > 0 else None,
+                "premium_used": round(premium_used, 2),
+                "pricing_rule": "SELL_BID",
+                "premium_display": display_price,
+                "premium_display_source": display_price_source,
+                "premium": round(premium_bid, 2),
+
+                "premium_yield": round(premium_yield, 2),
+                "otm_pct": round(otm_pct, 2),
+                "cycle_yield": round(cycle_yield, 6),
+                "annual_yield": round(annual_yield, 4),
+                "roi_pct": round(roi_pct, 2),
+                "roi_annualized": round(roi_annualized, 1) if roi_annualized else None,
+                "max_profit": round(premium_bid * 100, 2),
+                "breakeven": round(stock_price - premium_bid, 2),
+
+                "delta": greeks["delta"],
+                "delta_source": "BLACK_SCHOLES_APPROX",
+                "gamma": greeks["gamma"],
+                "theta": greeks["theta"],
+                "vega": greeks["vega"],
+
+                # IV (explicit units)
+                "iv": iv_decimal,           # Decimal (0.65)
+                "iv_pct": iv_percent,       # Percent (65.0)
+                "iv_rank": iv_rank_metrics.get("iv_rank"),
+                "iv_percentile": iv_rank_metrics.get("iv_percentile"),
+                "iv_rank_source": iv_rank_metrics.get("iv_rank_source"),
+                "iv_rank_confidence": iv_rank_metrics.get("iv_rank_confidence"),
+
+                "open_interest": oi,
+                "volume": volume,
+                "spread_pct": round(spread_pct * 100, 2),  # stored as % for readability
+
+                "quality_flags": quality_flags,
+                "analyst_rating": analyst_rating,
+                "sector": symbol_sector,
+
+                "score": round(score, 1)
+            }
 
-                # Legacy roi fields (keep for backward compat)
-                roi_pct = cycle_yield * 100
-                roi_annualized = annual_yield * 100
+            symbol_cc_opps.append(cc_opp)
+
+    # Store best WEEKLY (7-14 DTE) and best MONTHLY (21-45 DTE) separately per symbol
+    # so the dashboard can populate both buckets independently.
+    to_insert = []
+    if symbol_cc_opps:
+        weekly_opps_sym = [o for o in symbol_cc_opps if 7 <= o["dte"] <= 14]
+        monthly_opps_sym = [o for o in symbol_cc_opps if 21 <= o["dte"] <= 45]
+        if weekly_opps_sym:
+            to_insert.append(max(weekly_opps_sym, key=lambda x: x["score"]))
+        if monthly_opps_sym:
+            to_insert.append(max(monthly_opps_sym, key=lambda x: x["score"]))
+        # If neither weekly nor monthly (edge DTE), keep overall best
+        if not to_insert:
+            to_insert.append(max(symbol_cc_opps, key=lambda x: x["score"]))
+
+    result = {
+        "symbol": symbol,
+        "cc": to_insert,
+        "pmcc": [],
+        "has_long_dated_calls": bool(has_long_dated_calls),
+        "iv_proxy": None,
+    }
+    if iv_history_due:
+        flat_options = [dict(c, expiry=chain.get("expiry", ""), dte=chain.get("dte", 0),
+                             implied_volatility=c.get("impliedVolatility", 0))
+                        for chain in option_chains for c in chain.get("calls", [])]
+        iv_proxy, proxy_meta = compute_iv_atm_proxy(flat_options, stock_price)
+        if iv_proxy is not None:
+            result["iv_proxy"] = (iv_proxy, proxy_meta)
+
+    # PMCC opportunities - only evaluate if symbol has 180+ DTE options
+    if not has_long_dated_calls:
+        return result
 
-                if cycle_yield <= 0:
-                    continue
+    # Find LEAPS (365-730 DTE)
+    leaps_candidates = []
+    short_candidates = []
 
-                # Calculate score
-                trade_data = {
-                    "cycle_yield": cycle_yield,
-                    "delta": greeks["delta"],
-                    "open_interest": oi,
-                    "spread_pct": spread_pct  # mid-based ratio 0-1
-                }
-                score = calculate_cc_score(trade_data)
+    for chain in option_chains:
+        expiry = chain.get("expiry", "")
+        calls = chain.get("calls", [])
 
-                # Build contract symbol
+        for call in calls:
+            dte = call.get("daysToExpiration", 0)
+            if not dte:
                 try:
-                    exp_formatted = datetime.strptime(
-                        expiry, "%Y-%m-%d").strftime("%y%m%d")
-                    contract_symbol = f"{symbol}{exp_formatted}C{int(strike * 1000):08d}"
+                    exp_dt = datetime.strptime(expiry, "%Y-%m-%d")
+                    dte = (exp_dt - datetime.now()).days
                 except Exception:
-                    contract_symbol = f"{symbol}_{strike}_{expiry}"
+                    continue
 
-                    # IV validation: store as decimal (0.65) and percent (65.0)
-                iv_decimal = round(iv, 4) if iv and iv > 0 else 0.0
-                iv_percent = round(iv * 100, 1) if iv and iv > 0 else 0.0
+            strike = call.get("strike", 0)
+            bid = call.get("bid", 0)
+            ask = call.get("ask", 0)
+            last_price = call.get("lastPrice", 0) or 0
+            prev_close = call.get("previousClose", 0) or call.get(
+                "prevClose", 0) or 0
+            iv = call.get("impliedVolatility", 0) or 0
+            oi = call.get("openInterest", 0) or 0
+
+            # Compute display price for Yahoo parity
+            mid = round((bid + ask) / 2,
+                        2) if bid > 0 and ask > 0 else None
+            if last_price and last_price > 0:
+                display_price = round(last_price, 2)
+                display_source = "LAST"
+            elif mid is not None:
+                display_price = mid
+                display_source = "MID"
+            elif prev_close and prev_close > 0:
+                display_price = round(prev_close, 2)
+                display_source = "PREV_CLOSE"
+            else:
+                display_price = None
+                display_source = "NONE"
+
+            # Compute quality flags for this option
+            option_quality_flags = []
+            spread_pct = ((ask - bid) / bid * 100) if bid > 0 else 0
+            if spread_pct > 10:
+                option_quality_flags.append("WIDE_SPREAD")
+            if oi < 50:
+                option_quality_flags.append("LOW_OI")
+            if not last_price or last_price <= 0:
+                option_quality_flags.append("NO_LAST")
+
+            # LEAP candidate (180-1095 DTE, ITM)
+            if PMCC_MIN_LEAP_DTE <= dte <= PMCC_MAX_LEAP_DTE and strike < stock_price:
+                if ask and ask > 0:
+                    greeks = calculate_greeks_simple(
+                        stock_price, strike, dte, iv if iv > 0 else 0.30)
+
+                    if greeks["delta"] < PMCC_MIN_LEAP_DELTA:
+                        continue
+                    if oi < PMCC_MIN_LEAP_OI:
+                        continue
 
-                # Fetch IV Rank safely
-                iv_rank = None
-                iv_percentile = None
-                iv_rank_source = None
+                    # Mid-based spread check (filter gate only).
+                    # At EOD, LEAP bids are often 0 (market makers retract).
+                    # Use prev_close as bid proxy so the FILTER is meaningful,
+                    # but store actual-bid-based spread_pct for score calculation
+                    # (prevents negative spread_pct from inflating scores to 100).
+                    effective_bid = bid if bid > 0 else (prev_close * 0.90 if prev_close > 0 else 0)
+                    leap_mid_filter = (ask + effective_bid) / 2 if effective_bid > 0 else ask
+                    leap_spread_pct_filter = ((ask - effective_bid) / leap_mid_filter * 100) if leap_mid_filter > 0 else 100.0
+                    if leap_spread_pct_filter > PMCC_MAX_LEAP_SPREAD_PCT:
+                        continue
 
-                try:
-                    flat_options = [dict(c, expiry=chain.get("expiry",""), dte=chain.get("dte", 0), implied_volatility=c.get("impliedVolatility", 0)) for chain in option_chains for c in chain.get("calls", [])]
-                    metrics = await get_iv_metrics_for_symbol(db, symbol, flat_options, stock_price, store_history=True)
-                    if metrics:
-                        iv_rank = metrics.iv_rank
-                        iv_percentile = metrics.iv_percentile
-                        iv_rank_source = metrics.iv_rank_source
-                except Exception:
-                    pass
+                    # Score spread_pct: use actual bid (0 if EOD retracted → neutral for score)
+                    if bid > 0 and ask > 0:
+                        leap_mid_score = (ask + bid) / 2
+                        leap_spread_pct_score = ((ask - bid) / leap_mid_score * 100) if leap_mid_score > 0 else 0.0
+                    else:
+                        leap_spread_pct_score = 0.0  # EOD bid=0: no spread data, neutral
+
+                    leaps_candidates.append({
+                        "strike": strike,
+                        "expiry": expiry,
+                        "dte": dte,
+                        "ask": ask,
+                        "bid": bid,
+                        "mid": mid,
+                        "last": last_price if last_price > 0 else None,
+                        "prev_close": prev_close if prev_close > 0 else None,
+                        "display_price": display_price,
+                        "display_source": display_source,
+                        "delta": greeks["delta"],
+                        "iv": iv,
+                        "oi": oi,
+                        "spread_pct": round(leap_spread_pct_score, 2),
+                        "quality_flags": option_quality_flags
+                    })
+
+            # Short call candidate (21-60 DTE, OTM)
+            if PMCC_MIN_SHORT_DTE <= dte <= PMCC_MAX_SHORT_DTE:
+                if bid and bid >= PMCC_MIN_SHORT_BID:
+                    short_greeks = calculate_greeks_simple(
+                        stock_price, strike, dte, iv if iv > 0 else 0.30)
+                    short_delta = short_greeks["delta"]
+
+                    if short_delta < PMCC_MIN_SHORT_DELTA or short_delta > PMCC_MAX_SHORT_DELTA:
+                        continue
+                    if oi < PMCC_MIN_SHORT_OI:
+                        continue
 
-                # === CC Opportunity ===
-                cc_opp = {
-                    "run_id": run_id,
-                    "as_of": as_of,
-                    "created_at": datetime.now(timezone.utc),
+                    # Mid-based spread check
+                    short_mid_val = (ask + bid) / 2 if ask and ask > 0 else bid
+                    short_spread_pct = ((ask - bid) / short_mid_val * 100) if ask and short_mid_val > 0 else 100.0
+                    if short_spread_pct > PMCC_MAX_SHORT_SPREAD_PCT:
+                        continue
 
-                    "symbol": symbol,
-                    "stock_price": round(stock_price, 2),
+                    short_candidates.append({
+                        "strike": strike,
+                        "expiry": expiry,
+                        "dte": dte,
+                        "bid": bid,
+                        "ask": ask,
+                        "mid": mid,
+                        "last": last_price if last_price > 0 else None,
+                        "prev_close": prev_close if prev_close > 0 else None,
+                        "display_price": display_price,
+                        "display_source": display_source,
+                        "iv": iv,
+                        "oi": oi,
+                        "spread_pct": round(short_spread_pct, 2),
+                        "quality_flags": option_quality_flags,
+                        "delta": short_delta
+                    })
+
+    # Match LEAPS with short calls
+    for leap in leaps_candidates[:3]:  # Limit LEAPS per symbol
+        for short in short_candidates:
+            # VALIDATE PMCC STRUCTURE (STRICT INSTITUTIONAL RULES)
+            is_valid, pmcc_quality_flags = validate_pmcc_structure(
+                stock_price=stock_price,
+                leap_strike=leap["strike"],
+                leap_ask=leap["ask"],
+                leap_bid=leap.get("bid", 0),
+                leap_delta=leap["delta"],
+                leap_dte=leap["dte"],
+                leap_oi=leap.get("oi", 0),
+                short_strike=short["strike"],
+                short_bid=short["bid"],
+                short_ask=short.get("ask", 0),
+                short_delta=short.get("delta", 0.25),  # Use stored delta
+                short_dte=short["dte"],
+                short_iv=short.get("iv", 0),
+                short_oi=short.get("oi", 0)
+            )
 
-                    "stock_price_source": snapshot.get("stock_price_source", "SESSION_CLOSE"),
-                    "session_close_price": snapshot.get("session_close_price"),
-                    "prior_close_price": snapshot.get("prior_close_price"),
-                    "market_status": snapshot.get("market_status", "UNKNOWN"),
+            if not is_valid:
+                continue
 
-                    "is_etf": symbol_is_etf,
-                    "instrument_type": "ETF" if symbol_is_etf else "STOCK",
-                    "market_cap": market_cap,
-                    "avg_volume": avg_volume,
+            # PRICING RULES:
+            # - LEAP BUY: use ASK price
+            # - Short SELL: use BID price
+            leap_ask = leap["ask"]
+            leap_bid = leap.get("bid", 0)
+            short_bid = short["bid"]
+            short_ask = short.get("ask", 0)
 
-                    "contract_symbol": contract_symbol,
-                    "strike": strike,
-                    "expiry": expiry,
-                    "dte": dte,
-                    "dte_category": "weekly" if dte <= 14 else "monthly",
-
-                    "premium_bid": round(premium_bid, 2),
-                    "premium_ask": round(premium_ask_val, 2) if premium_ask_val else None,
-                    "premium_mid": mid,
-                    "premium_last": round(last_price, 2) if last_price and last_price > 0 else None,
-                    "premium_prev_close": round(prev_close, 2) if prev_close and prev_close > 0 else None,
-                    "premium_used": round(premium_used, 2),
-                    "pricing_rule": "SELL_BID",
-                    "premium_display": display_price,
-                    "premium_display_source": display_price_source,
-                    "premium": round(premium_bid, 2),
-
-                    "premium_yield": round(premium_yield, 2),
-                    "otm_pct": round(otm_pct, 2),
-                    "cycle_yield": round(cycle_yield, 6),
-                    "annual_yield": round(annual_yield, 4),
-                    "roi_pct": round(roi_pct, 2),
-                    "roi_annualized": round(roi_annualized, 1) if roi_annualized else None,
-                    "max_profit": round(premium_bid * 100, 2),
-                    "breakeven": round(stock_price - premium_bid, 2),
-
-                    "delta": greeks["delta"],
-                    "delta_source": "BLACK_SCHOLES_APPROX",
-                    "gamma": greeks["gamma"],
-                    "theta": greeks["theta"],
-                    "vega": greeks["vega"],
-
-                    # IV (explicit units)
-                    "iv": iv_decimal,           # Decimal (0.65)
-                    "iv_pct": iv_percent,       # Percent (65.0)
-                    "iv_rank": iv_rank_metrics.get("iv_rank"),
-                    "iv_percentile": iv_rank_metrics.get("iv_percentile"),
-                    "iv_rank_source": iv_rank_metrics.get("iv_rank_source"),
-                    "iv_rank_confidence": iv_rank_metrics.get("iv_rank_confidence"),
-
-                    "open_interest": oi,
-                    "volume": volume,
-                    "spread_pct": round(spread_pct * 100, 2),  # stored as % for readability
-
-                    "quality_flags": quality_flags,
-                    "analyst_rating": analyst_rating,
-                    "sector": symbol_sector,
-
-                    "score": round(score, 1)
-                }
+            leap_used = leap_ask  # BUY rule
+            short_used = short_bid  # SELL rule
 
-                symbol_cc_opps.append(cc_opp)
-
-        # Store best WEEKLY (7-14 DTE) and best MONTHLY (21-45 DTE) separately per symbol
-        # so the dashboard can populate both buckets independently.
-        if symbol_cc_opps:
-            weekly_opps_sym = [o for o in symbol_cc_opps if 7 <= o["dte"] <= 14]
-            monthly_opps_sym = [o for o in symbol_cc_opps if 21 <= o["dte"] <= 45]
-            to_insert = []
-            if weekly_opps_sym:
-                to_insert.append(max(weekly_opps_sym, key=lambda x: x["score"]))
-            if monthly_opps_sym:
-                to_insert.append(max(monthly_opps_sym, key=lambda x: x["score"]))
-            # If neither weekly nor monthly (edge DTE), keep overall best
-            if not to_insert:
-                to_insert.append(max(symbol_cc_opps, key=lambda x: x["score"]))
-            for best_cc in to_insert:
-                try:
-                    await db.scan_results_cc.insert_one(best_cc)
-                    cc_written_count += 1
-                except Exception as _cc_err:
-                    logger.error(f"[EOD] CC insert error for {symbol}: {_cc_err}")
-            symbol_cc_opps = []  # free memory
-
-        # PMCC opportunities - only evaluate if symbol has 180+ DTE options
-        if not has_long_dated_calls:
-            symbols_without_leaps.append(symbol)
-            continue  # Skip PMCC evaluation for this symbol
-
-        # Find LEAPS (365-730 DTE)
-        leaps_candidates = []
-        short_candidates = []
-
-        for chain in option_chains:
-            expiry = chain.get("expiry", "")
-            calls = chain.get("calls", [])
-
-            for call in calls:
-                dte = call.get("daysToExpiration", 0)
-                if not dte:
-                    try:
-                        exp_dt = datetime.strptime(expiry, "%Y-%m-%d")
-                        dte = (exp_dt - datetime.now()).days
-                    except Exception:
-                        continue
+            net_debit = leap_ask - short_bid
+            width = short["strike"] - leap["strike"]
+            max_profit = width - net_debit
 
-                strike = call.get("strike", 0)
-                bid = call.get("bid", 0)
-                ask = call.get("ask", 0)
-                last_price = call.get("lastPrice", 0) or 0
-                prev_close = call.get("previousClose", 0) or call.get(
-                    "prevClose", 0) or 0
-                iv = call.get("impliedVolatility", 0) or 0
-                oi = call.get("openInterest", 0) or 0
-
-                # Compute display price for Yahoo parity
-                mid = round((bid + ask) / 2,
-                            2) if bid > 0 and ask > 0 else None
-                if last_price and last_price > 0:
-                    display_price = round(last_price, 2)
-                    display_source = "LAST"
-                elif mid is not None:
-                    display_price = mid
-                    display_source = "MID"
-                elif prev_close and prev_close > 0:
-                    display_price = round(prev_close, 2)
-                    display_source = "PREV_CLOSE"
-                else:
-                    display_price = None
-                    display_source = "NONE"
-
-                # Compute quality flags for this option
-                option_quality_flags = []
-                spread_pct = ((ask - bid) / bid * 100) if bid > 0 else 0
-                if spread_pct > 10:
-                    option_quality_flags.append("WIDE_SPREAD")
-                if oi < 50:
-                    option_quality_flags.append("LOW_OI")
-                if not last_price or last_price <= 0:
-                    option_quality_flags.append("NO_LAST")
-
-                # LEAP candidate (180-1095 DTE, ITM)
-                if PMCC_MIN_LEAP_DTE <= dte <= PMCC_MAX_LEAP_DTE and strike < stock_price:
-                    if ask and ask > 0:
-                        greeks = calculate_greeks_simple(
-                            stock_price, strike, dte, iv if iv > 0 else 0.30)
-
-                        if greeks["delta"] < PMCC_MIN_LEAP_DELTA:
-                            continue
-                        if oi < PMCC_MIN_LEAP_OI:
-                            continue
-
-                        # Mid-based spread check (filter gate only).
-                        # At EOD, LEAP bids are often 0 (market makers retract).
-                        # Use prev_close as bid proxy so the FILTER is meaningful,
-                        # but store actual-bid-based spread_pct for score calculation
-                        # (prevents negative spread_pct from inflating scores to 100).
-                        effective_bid = bid if bid > 0 else (prev_close * 0.90 if prev_close > 0 else 0)
-                        leap_mid_filter = (ask + effective_bid) / 2 if effective_bid > 0 else ask
-                        leap_spread_pct_filter = ((ask - effective_bid) / leap_mid_filter * 100) if leap_mid_filter > 0 else 100.0
-                        if leap_spread_pct_filter > PMCC_MAX_LEAP_SPREAD_PCT:
-                            continue
-
-                        # Score spread_pct: use actual bid (0 if EOD retracted → neutral for score)
-                        if bid > 0 and ask > 0:
-                            leap_mid_score = (ask + bid) / 2
-                            leap_spread_pct_score = ((ask - bid) / leap_mid_score * 100) if leap_mid_score > 0 else 0.0
-                        else:
-                            leap_spread_pct_score = 0.0  # EOD bid=0: no spread data, neutral
-
-                        leaps_candidates.append({
-                            "strike": strike,
-                            "expiry": expiry,
-                            "dte": dte,
-                            "ask": ask,
-                            "bid": bid,
-                            "mid": mid,
-                            "last": last_price if last_price > 0 else None,
-                            "prev_close": prev_close if prev_close > 0 else None,
-                            "display_price": display_price,
-                            "display_source": display_source,
-                            "delta": greeks["delta"],
-                            "iv": iv,
-                            "oi": oi,
-                            "spread_pct": round(leap_spread_pct_score, 2),
-                            "quality_flags": option_quality_flags
-                        })
-
-                # Short call candidate (21-60 DTE, OTM)
-                if PMCC_MIN_SHORT_DTE <= dte <= PMCC_MAX_SHORT_DTE:
-                    if bid and bid >= PMCC_MIN_SHORT_BID:
-                        short_greeks = calculate_greeks_simple(
-                            stock_price, strike, dte, iv if iv > 0 else 0.30)
-                        short_delta = short_greeks["delta"]
-
-                        if short_delta < PMCC_MIN_SHORT_DELTA or short_delta > PMCC_MAX_SHORT_DELTA:
-                            continue
-                        if oi < PMCC_MIN_SHORT_OI:
-                            continue
-
-                        # Mid-based spread check
-                        short_mid_val = (ask + bid) / 2 if ask and ask > 0 else bid
-                        short_spread_pct = ((ask - bid) / short_mid_val * 100) if ask and short_mid_val > 0 else 100.0
-                        if short_spread_pct > PMCC_MAX_SHORT_SPREAD_PCT:
-                            continue
-
-                        short_candidates.append({
-                            "strike": strike,
-                            "expiry": expiry,
-                            "dte": dte,
-                            "bid": bid,
-                            "ask": ask,
-                            "mid": mid,
-                            "last": last_price if last_price > 0 else None,
-                            "prev_close": prev_close if prev_close > 0 else None,
-                            "display_price": display_price,
-                            "display_source": display_source,
-                            "iv": iv,
-                            "oi": oi,
-                            "spread_pct": round(short_spread_pct, 2),
-                            "quality_flags": option_quality_flags,
-                            "delta": short_delta
-                        })
-
-        # Match LEAPS with short calls
-        for leap in leaps_candidates[:3]:  # Limit LEAPS per symbol
-            for short in short_candidates:
-                # VALIDATE PMCC STRUCTURE (STRICT INSTITUTIONAL RULES)
-                is_valid, pmcc_quality_flags = validate_pmcc_structure(
-                    stock_price=stock_price,
-                    leap_strike=leap["strike"],
-                    leap_ask=leap["ask"],
-                    leap_bid=leap.get("bid", 0),
-                    leap_delta=leap["delta"],
-                    leap_dte=leap["dte"],
-                    leap_oi=leap.get("oi", 0),
-                    short_strike=short["strike"],
-                    short_bid=short["bid"],
-                    short_ask=short.get("ask", 0),
-                    short_delta=short.get("delta", 0.25),  # Use stored delta
-                    short_dte=short["dte"],
-                    short_iv=short.get("iv", 0),
-                    short_oi=short.get("oi", 0)
-                )
-
-                if not is_valid:
-                    continue
+            # Synthetic premium % — cost of replicating stock via LEAPS vs owning stock
+            synthetic_cost = leap["strike"] + leap_ask
+            synthetic_premium_pct = ((synthetic_cost - stock_price) / stock_price * 100) if stock_price > 0 else 0
 
-                # PRICING RULES:
-                # - LEAP BUY: use ASK price
-                # - Short SELL: use BID price
-                leap_ask = leap["ask"]
-                leap_bid = leap.get("bid", 0)
-                short_bid = short["bid"]
-                short_ask = short.get("ask", 0)
+            # Exclude trades where synthetic premium > 7% (misleading high-ROI filter)
+            if synthetic_premium_pct > 7.0:
+                continue
 
-                leap_used = leap_ask  # BUY rule
-                short_used = short_bid  # SELL rule
+            # Sanity: negative synth% means LEAPS priced below intrinsic — bad data
+            if synthetic_premium_pct < -5.0:
+                continue
 
-                net_debit = leap_ask - short_bid
-                width = short["strike"] - leap["strike"]
-                max_profit = width - net_debit
+            # Sanity: short strike must be within 2x of stock price — filters bad Yahoo data
+            if short["strike"] > stock_price * 2.0:
+                continue
 
-                # Synthetic premium % — cost of replicating stock via LEAPS vs owning stock
-                synthetic_cost = leap["strike"] + leap_ask
-                synthetic_premium_pct = ((synthetic_cost - stock_price) / stock_price * 100) if stock_price > 0 else 0
+            # Sanity: max return cap — anything over 300% indicates bad data
+            max_profit_check = (short["strike"] - leap["strike"]) - net_debit
+            if net_debit > 0 and (max_profit_check / net_debit * 100) > 300:
+                continue
 
-                # Exclude trades where synthetic premium > 7% (misleading high-ROI filter)
-                if synthetic_premium_pct > 7.0:
-                    continue
+            # ROI basis = net_debit (capital at risk), not leap_ask
+            roi_per_cycle = (short_bid / net_debit * 100) if net_debit > 0 else 0
+            roi_annualized = min(
+                roi_per_cycle * (365 / max(short["dte"], 1)), 150.0
+            ) if roi_per_cycle else 0
 
-                # Sanity: negative synth% means LEAPS priced below intrinsic — bad data
-                if synthetic_premium_pct < -5.0:
-                    continue
+            # Build contract symbols
+            try:
+                leap_exp_fmt = datetime.strptime(
+                    leap["expiry"], "%Y-%m-%d").strftime("%y%m%d")
+                leap_symbol_str = f"{symbol}{leap_exp_fmt}C{int(leap['strike'] * 1000):08d}"
+            except Exception:
+                leap_symbol_str = f"{symbol}_LEAP_{leap['strike']}_{leap['expiry']}"
 
-                # Sanity: short strike must be within 2x of stock price — filters bad Yahoo data
-                if short["strike"] > stock_price * 2.0:
-                    continue
+            try:
+                short_exp_fmt = datetime.strptime(
+                    short["expiry"], "%Y-%m-%d").strftime("%y%m%d")
+                short_symbol_str = f"{symbol}{short_exp_fmt}C{int(short['strike'] * 1000):08d}"
+            except Exception:
+                short_symbol_str = f"{symbol}_SHORT_{short['strike']}_{short['expiry']}"
 
-                # Sanity: max return cap — anything over 300% indicates bad data
-                max_profit_check = (short["strike"] - leap["strike"]) - net_debit
-                if net_debit > 0 and (max_profit_check / net_debit * 100) > 300:
-                    continue
+            # IV from short leg (more relevant for premium decay)
+            short_iv = short.get("iv", 0) or 0
+            iv_decimal = round(short_iv, 4) if short_iv > 0 else 0.0
+            iv_percent = round(short_iv * 100, 1) if short_iv > 0 else 0.0
 
-                # ROI basis = net_debit (capital at risk), not leap_ask
-                roi_per_cycle = (short_bid / net_debit * 100) if net_debit > 0 else 0
-                roi_annualized = min(
-                    roi_per_cycle * (365 / max(short["dte"], 1)), 150.0
-                ) if roi_per_cycle else 0
+            # Combine quality flags from both legs
+            combined_quality_flags = list(set(
+                pmcc_quality_flags + leap.get("quality_flags", []) + short.get("quality_flags", [])))
 
-                # Build contract symbols
-                try:
-                    leap_exp_fmt = datetime.strptime(
-                        leap["expiry"], "%Y-%m-%d").strftime("%y%m%d")
-                    leap_symbol_str = f"{symbol}{leap_exp_fmt}C{int(leap['strike'] * 1000):08d}"
-                except Exception:
-                    leap_symbol_str = f"{symbol}_LEAP_{leap['strike']}_{leap['expiry']}"
+            # === EXPLICIT PMCC SCHEMA (Feb 2026) ===
+            # WITH MANDATORY MARKET CONTEXT FIELDS + OPTION PARITY MODEL
+            pmcc_opp = {
+                # Run metadata
+                "run_id": run_id,
+                "as_of": as_of,
+                "created_at": datetime.now(timezone.utc),
 
-                try:
-                    short_exp_fmt = datetime.strptime(
-                        short["expiry"], "%Y-%m-%d").strftime("%y%m%d")
-                    short_symbol_str = f"{symbol}{short_exp_fmt}C{int(short['strike'] * 1000):08d}"
-                except Exception:
-                    short_symbol_str = f"{symbol}_SHORT_{short['strike']}_{short['expiry']}"
+                # Underlying
+                "symbol": symbol,
+                "stock_price": round(stock_price, 2),
+
+                # MANDATORY MARKET CONTEXT FIELDS
+                "stock_price_source": snapshot.get("stock_price_source", "SESSION_CLOSE"),
+                "session_close_price": snapshot.get("session_close_price"),
+                "prior_close_price": snapshot.get("prior_close_price"),
+                "market_status": snapshot.get("market_status", "UNKNOWN"),
+
+                "is_etf": symbol_is_etf,
+                "instrument_type": "ETF" if symbol_is_etf else "STOCK",
+
+                # LEAP (Long leg - BUY)
+                "leap_symbol": leap_symbol_str,
+                "leap_strike": leap["strike"],
+                "leap_expiry": leap["expiry"],
+                "leap_dte": leap["dte"],
+                "leap_bid": round(leap_bid, 2) if leap_bid else None,
+                "leap_ask": round(leap_ask, 2),
+                "leap_mid": leap.get("mid"),
+                "leap_last": leap.get("last"),
+                "leap_prev_close": leap.get("prev_close"),
+                "leap_used": round(leap_used, 2),  # = leap_ask (BUY rule)
+                "leap_display": leap.get("display_price"),
+                "leap_display_source": leap.get("display_source"),
+                "leap_delta": leap["delta"],
+
+                # Short leg (SELL)
+                "short_symbol": short_symbol_str,
+                "short_strike": short["strike"],
+                "short_expiry": short["expiry"],
+                "short_dte": short["dte"],
+                "short_bid": round(short_bid, 2),
+                "short_ask": round(short_ask, 2) if short_ask else None,
+                "short_mid": short.get("mid"),
+                "short_last": short.get("last"),
+                "short_prev_close": short.get("prev_close"),
+                # = short_bid (SELL rule)
+                "short_used": round(short_used, 2),
+                "short_display": short.get("display_price"),
+                "short_display_source": short.get("display_source"),
+                # For institutional verification
+                "short_delta": short.get("delta"),
+
+                # Liquidity (for transparency)
+                "leap_oi": leap.get("oi", 0),
+                "short_oi": short.get("oi", 0),
+
+                # Pricing rule
+                "pricing_rule": "BUY_ASK_SELL_BID",
+
+                # Legacy fields for backward compatibility
+                # Alias for short_bid
+                "short_premium": round(short_bid, 2),
+                "leaps_ask": round(leap_ask, 2),       # Alias for leap_ask
+
+                # Economics
+                "net_debit": round(net_debit, 2),
+                "net_debit_total": round(net_debit * 100, 2),
+                "synthetic_cost": round(synthetic_cost, 2),
+                "synthetic_premium_pct": round(synthetic_premium_pct, 2),
+                "width": round(width, 2),
+                "max_profit": round(max_profit, 2),
+                "max_profit_total": round(max_profit * 100, 2),
+                "breakeven": round(leap["strike"] + net_debit, 2),
+                "roi_cycle": round(roi_per_cycle, 2),      # Per cycle
+                "roi_per_cycle": round(roi_per_cycle, 2),  # Alias
+                "roi_annualized": round(roi_annualized, 1),
+
+                # Greeks (from LEAP)
+                "delta": leap["delta"],
+                "delta_source": "BLACK_SCHOLES_APPROX",
+
+                # IV (from short leg)
+                "iv": iv_decimal,           # Decimal (0.65)
+                "iv_pct": iv_percent,       # Percent (65.0)
+                "iv_rank": iv_rank_metrics.get("iv_rank"),
+                "iv_percentile": iv_rank_metrics.get("iv_percentile"),
+                "iv_rank_source": iv_rank_metrics.get("iv_rank_source"),
+                "iv_rank_confidence": iv_rank_metrics.get("iv_rank_confidence"),
+
+                # Quality flags (combined from validation + soft flags)
+                "quality_flags": combined_quality_flags,
+
+                # Analyst and sector (from enrichment)
+                "analyst_rating": analyst_rating,
+                "sector": symbol_sector,
+
+                # Risk-aware score: rewards ROI + liquidity, penalises high delta + wide spreads
+                "score": round(max(0.0, min(100.0,
+                    50
+                    + (roi_per_cycle * 2)
+                    + min(20, 5 * log1p(min(leap.get("oi", 0), short.get("oi", 0))))
+                    - max(0, short["delta"] - 0.30) * 100
+                    - (short.get("spread_pct", 50.0) + leap.get("spread_pct", 50.0)) * 0.5
+                )), 1)
+            }
 
-                # IV from short leg (more relevant for premium decay)
-                short_iv = short.get("iv", 0) or 0
-                iv_decimal = round(short_iv, 4) if short_iv > 0 else 0.0
-                iv_percent = round(short_iv * 100, 1) if short_iv > 0 else 0.0
+            result["pmcc"].append(pmcc_opp)
 
-                # Combine quality flags from both legs
-                combined_quality_flags = list(set(
-                    pmcc_quality_flags + leap.get("quality_flags", []) + short.get("quality_flags", [])))
+    return result
 
-                # === EXPLICIT PMCC SCHEMA (Feb 2026) ===
-                # WITH MANDATORY MARKET CONTEXT FIELDS + OPTION PARITY MODEL
-                pmcc_opp = {
-                    # Run metadata
-                    "run_id": run_id,
-                    "as_of": as_of,
-                    "created_at": datetime.now(timezone.utc),
 
-                    # Underlying
-                    "symbol": symbol,
-                    "stock_price": round(stock_price, 2),
-
-                    # MANDATORY MARKET CONTEXT FIELDS
-                    "stock_price_source": snapshot.get("stock_price_source", "SESSION_CLOSE"),
-                    "session_close_price": snapshot.get("session_close_price"),
-                    "prior_close_price": snapshot.get("prior_close_price"),
-                    "market_status": snapshot.get("market_status", "UNKNOWN"),
-
-                    "is_etf": symbol_is_etf,
-                    "instrument_type": "ETF" if symbol_is_etf else "STOCK",
-
-                    # LEAP (Long leg - BUY)
-                    "leap_symbol": leap_symbol_str,
-                    "leap_strike": leap["strike"],
-                    "leap_expiry": leap["expiry"],
-                    "leap_dte": leap["dte"],
-                    "leap_bid": round(leap_bid, 2) if leap_bid else None,
-                    "leap_ask": round(leap_ask, 2),
-                    "leap_mid": leap.get("mid"),
-                    "leap_last": leap.get("last"),
-                    "leap_prev_close": leap.get("prev_close"),
-                    "leap_used": round(leap_used, 2),  # = leap_ask (BUY rule)
-                    "leap_display": leap.get("display_price"),
-                    "leap_display_source": leap.get("display_source"),
-                    "leap_delta": leap["delta"],
-
-                    # Short leg (SELL)
-                    "short_symbol": short_symbol_str,
-                    "short_strike": short["strike"],
-                    "short_expiry": short["expiry"],
-                    "short_dte": short["dte"],
-                    "short_bid": round(short_bid, 2),
-                    "short_ask": round(short_ask, 2) if short_ask else None,
-                    "short_mid": short.get("mid"),
-                    "short_last": short.get("last"),
-                    "short_prev_close": short.get("prev_close"),
-                    # = short_bid (SELL rule)
-                    "short_used": round(short_used, 2),
-                    "short_display": short.get("display_price"),
-                    "short_display_source": short.get("display_source"),
-                    # For institutional verification
-                    "short_delta": short.get("delta"),
-
-                    # Liquidity (for transparency)
-                    "leap_oi": leap.get("oi", 0),
-                    "short_oi": short.get("oi", 0),
-
-                    # Pricing rule
-                    "pricing_rule": "BUY_ASK_SELL_BID",
-
-                    # Legacy fields for backward compatibility
-                    # Alias for short_bid
-                    "short_premium": round(short_bid, 2),
-                    "leaps_ask": round(leap_ask, 2),       # Alias for leap_ask
-
-                    # Economics
-                    "net_debit": round(net_debit, 2),
-                    "net_debit_total": round(net_debit * 100, 2),
-                    "synthetic_cost": round(synthetic_cost, 2),
-                    "synthetic_premium_pct": round(synthetic_premium_pct, 2),
-                    "width": round(width, 2),
-                    "max_profit": round(max_profit, 2),
-                    "max_profit_total": round(max_profit * 100, 2),
-                    "breakeven": round(leap["strike"] + net_debit, 2),
-                    "roi_cycle": round(roi_per_cycle, 2),      # Per cycle
-                    "roi_per_cycle": round(roi_per_cycle, 2),  # Alias
-                    "roi_annualized": round(roi_annualized, 1),
-
-                    # Greeks (from LEAP)
-                    "delta": leap["delta"],
-                    "delta_source": "BLACK_SCHOLES_APPROX",
-
-                    # IV (from short leg)
-                    "iv": iv_decimal,           # Decimal (0.65)
-                    "iv_pct": iv_percent,       # Percent (65.0)
-                    "iv_rank": iv_rank_metrics.get("iv_rank"),
-                    "iv_percentile": iv_rank_metrics.get("iv_percentile"),
-                    "iv_rank_source": iv_rank_metrics.get("iv_rank_source"),
-                    "iv_rank_confidence": iv_rank_metrics.get("iv_rank_confidence"),
-
-                    # Quality flags (combined from validation + soft flags)
-                    "quality_flags": combined_quality_flags,
-
-                    # Analyst and sector (from enrichment)
-                    "analyst_rating": analyst_rating,
-                    "sector": symbol_sector,
-
-                    # Risk-aware score: rewards ROI + liquidity, penalises high delta + wide spreads
-                    "score": round(max(0.0, min(100.0,
-                        50
-                        + (roi_per_cycle * 2)
-                        + min(20, 5 * log1p(min(leap.get("oi", 0), short.get("oi", 0))))
-                        - max(0, short["delta"] - 0.30) * 100
-                        - (short.get("spread_pct", 50.0) + leap.get("spread_pct", 50.0)) * 0.5
-                    )), 1)
-                }
+def evaluate_scan_chunk(snapshots: List[Dict[str, Any]], run_id: str, as_of: datetime) -> List[Optional[Dict[str, Any]]]:
+    """scan_compute worker entry point: evaluate_scan_symbol over one chunk of snapshots."""
+    return [evaluate_scan_symbol(s, run_id, as_of) for s in snapshots]
+
+
+async def _scan_symbol_context(db, symbols: List[str]) -> Dict[str, Dict[str, Any]]:
+    """Per-symbol enrichment fields of CC/PMCC rows: analyst rating, sector, stored IV rank."""
+    enrichment = {}
+    try:
+        cursor = db.symbol_enrichment.find(
+            {"symbol": {"$in": symbols}},
+            {"_id": 0, "symbol": 1, "analyst_rating_label": 1, "analyst_rating_value": 1, "sector": 1}
+        )
+        async for doc in cursor:
+            enrichment[doc["symbol"]] = doc
+    except Exception:
+        pass
 
-                pmcc_opportunities.append(pmcc_opp)
+    context = {}
+    for symbol in symbols:
+        iv_rank_metrics = {}
+        try:
+            iv_rank_metrics = await get_iv_metrics_quick(db, symbol)
+        except Exception as e:
+            logger.warning(f"IV rank fetch failed for {symbol}: {e}")
+        analyst_data = enrichment.get(symbol)
+        context[symbol] = {
+            "iv_rank": iv_rank_metrics.get("iv_rank"),
+            "iv_percentile": iv_rank_metrics.get("iv_percentile"),
+            "iv_rank_source": iv_rank_metrics.get("iv_rank_source"),
+            "iv_rank_confidence": iv_rank_metrics.get("iv_rank_confidence"),
+            "analyst_rating": analyst_data.get("analyst_rating_label") if analyst_data else None,
+            "sector": analyst_data.get("sector") if analyst_data else None,
+        }
+    return context
+
+
+async def compute_scan_results(
+    db,
+    run_id: str,
+    as_of: datetime,
+    max_workers: int = None,
+    chunk_size: int = SCAN_COMPUTE_CHUNK,
+) -> Tuple[int, List[Dict]]:
+    """
+    Compute CC and PMCC opportunities from symbol snapshots stored in DB.
+
+    Reads symbol_snapshot documents by run_id from MongoDB so the full
+    option chain data is never held in the API process memory all at once.
+    The per-symbol computation (evaluate_scan_symbol) runs in a
+    scan_compute process pool, chunk_size symbols per task; this coroutine
+    only does the reads and writes.
+
+    Args:
+        db: MongoDB database instance
+        run_id: EOD pipeline run ID
+        as_of: Timestamp of the scan
+        max_workers: Worker processes (default SCAN_COMPUTE_WORKERS)
+        chunk_size: Symbols per worker task
+
+    Returns:
+        Tuple of (cc_written_count, pmcc_opportunities)
+
+    PMCC SAFEGUARD (Feb 2026):
+    - Only evaluates symbols with has_leaps=True in snapshot
+    - Tracks symbols_without_leaps for audit
+    """
+    max_workers = SCAN_COMPUTE_WORKERS if max_workers is None else max_workers
+    cc_written_count = 0       # CC results written per chunk — never held in full
+    pmcc_opportunities = []    # PMCC: best-per-symbol dict, then sorted — small (~991 items)
+    symbols_without_leaps = []
+    total_snapshots_count = 0
+    trading_date = get_trading_date_eastern()
+
+    # batch_size(5): each fetch from MongoDB is only 5 docs at a time.
+    # Default batch is 101 docs × ~2-5MB option chains = 200-500MB spike.
+    # 5 docs × ~5MB = ~25MB per batch — safe for low-memory servers.
+    # Puts are never read here; packed chains are decoded in the worker for SCAN_CALL_FIELDS only.
+    snapshot_cursor = db.symbol_snapshot.find(
+        {"run_id": run_id},
+        {"option_chain.puts": 0, "option_chain_packed.chains.puts": 0, "raw_prices": 0}
+    ).batch_size(5)
+
+    async def snapshots():
+        nonlocal total_snapshots_count
+        async for snapshot in snapshot_cursor:
+            total_snapshots_count += 1
+            yield compact_snapshot(snapshot, SCAN_LEGACY_CALL_FIELDS)
+
+    started = time.monotonic()
+    pool = compute_pool(max_workers)
+    completed = False
+    try:
+        evaluate = partial(evaluate_scan_chunk, run_id=run_id, as_of=as_of)
+        async for _chunk, results in map_chunks(snapshots(), evaluate, pool, chunk_size=chunk_size,
+                                                max_in_flight=max(1, max_workers) + 1):
+            evaluated = [r for r in results if r is not None]
+            context = await _scan_symbol_context(db, [r["symbol"] for r in evaluated])
+
+            cc_rows = []
+            for result in evaluated:
+                symbol = result["symbol"]
+                for opp in result["cc"] + result["pmcc"]:
+                    opp.update(context[symbol])
+                cc_rows.extend(result["cc"])
+                pmcc_opportunities.extend(result["pmcc"])
+                if result["iv_proxy"] is not None:
+                    iv_proxy, proxy_meta = result["iv_proxy"]
+                    await upsert_iv_history(db, symbol, trading_date, iv_proxy, proxy_meta)
+                if not result["has_long_dated_calls"]:
+                    symbols_without_leaps.append(symbol)
+
+            # Store best WEEKLY and best MONTHLY per symbol (picked in evaluate_scan_symbol)
+            if cc_rows:
+                try:
+                    await db.scan_results_cc.insert_many(cc_rows, ordered=False)
+                    cc_written_count += len(cc_rows)
+                except BulkWriteError as _cc_err:
+                    cc_written_count += _cc_err.details.get("nInserted", 0)
+                    logger.error(f"[EOD] CC insert errors: {_cc_err.details.get('writeErrors', [])[:3]}")
+                except Exception as _cc_err:
+                    logger.error(f"[EOD] CC insert error: {_cc_err}")
+        completed = True
+    finally:
+        await shutdown_pool(pool, cancel=not completed)
 
-    # CC results were already stream-written per symbol above (cc_written_count tracks total)
+    elapsed = time.monotonic() - started
+    logger.info(
+        f"[EOD_PIPELINE] Computed {total_snapshots_count} snapshots in {elapsed:.1f}s "
+        f"({max(1, max_workers)} workers, {chunk_size} symbols per task)")
+
+    # CC results were already written per chunk above (cc_written_count tracks total)
     logger.info(f"[EOD_PIPELINE] Persisted {cc_written_count} CC opportunities (1 per symbol)")
 
     # Group all PMCC candidates per symbol, keep top 3, attach alternatives to best
@@ -2374,12 +2493,9 @@ async def compute_scan_results(
 
 
 async def get_latest_scan_run(db) -> Optional[Dict]:
-    """Get the latest completed scan run."""
+    """Get the latest completed scan run (cached in process by the run registry)."""
     try:
-        return await db.scan_runs.find_one(
-            {"status": "COMPLETED"},
-            sort=[("completed_at", -1)]
-        )
+        return await run_registry.latest_run(db)
     except Exception as e:
         logger.error(f"Failed to get latest scan run: {e}")
         return None
@@ -32,6 +32,8 @@ from typing import Dict, List, Any, Optional, Tuple
 from zoneinfo import ZoneInfo
 from motor.motor_asyncio import AsyncIOMotorDatabase
 
+from services.greeks_backfill import backfill_greeks
+from services.greeks_service import GREEKS_STAMPED_FIELD, stamp_contract_greeks
 from utils.market_state import (
     get_system_mode,
     get_last_trading_day,
@@ -181,6 +183,9 @@ class EODMarketSnapshotService:
                     results["symbols_failed"] += 1
                     continue
                 
+                # Greeks are stored with the chain; readers do not recompute them
+                stamp_contract_greeks(valid_contracts, underlying_price)
+                
                 # Create snapshot document
                 snapshot_doc = {
                     "run_id": run_id,
@@ -190,6 +195,7 @@ class EODMarketSnapshotService:
                     "option_chain_raw_count": len(option_chain),
                     "option_chain_valid_count": len(valid_contracts),
                     "pricing_rule_used": "BID_ONLY_SELL_LEG",
+                    GREEKS_STAMPED_FIELD: True,
                     "as_of": canonical_timestamp,
                     "trade_date": trade_date,
                     "is_final": True,
@@ -301,6 +307,13 @@ class EODMarketSnapshotService:
                 reason="No finalized EOD snapshot exists for this symbol and date"
             )
         
+        # Written before ingest-time greeks: stamp and store it once, then read it again
+        if not snapshot.get(GREEKS_STAMPED_FIELD):
+            match = {"symbol": snapshot["symbol"], "trade_date": snapshot["trade_date"], "is_final": True}
+            stamped = await backfill_greeks(self.db, (EOD_SNAPSHOT_COLLECTION,), match=match)
+            if stamped["documents"]:
+                snapshot = await self.get_snapshot(symbol, trade_date) or snapshot
+        
         metadata = {
             "symbol": symbol,
             "underlying_price": snapshot.get("underlying_price", 0),
@@ -0,0 +1,314 @@
+"""
+Simulator Equity Series - Per-user equity / greeks time series
+==============================================================
+
+Stores a per-user portfolio time series for the simulator, written as part
+of the price-update cycle, so drawdown, Sharpe and exposure over time come
+from a stored series instead of being re-derived from trade documents.
+
+STORAGE (columnar, one document per user per month per resolution):
+- Collection: simulator_equity_series
+- Key: (user_id, resolution, month "YYYY-MM"), unique
+- daily    : fixed 31-slot arrays indexed by day-of-month. Writing a day is a
+             single positional $set, so re-running an update on the same day
+             overwrites that day's point (last mark of the day wins).
+- intraday : append-only arrays ($push), only when SIMULATOR_EQUITY_INTRADAY=1
+
+SERIES FIELDS (per point):
+- equity       : realized + unrealized simulator P/L (USD, starts at 0)
+- realized     : cumulative realized P/L of completed trades
+- unrealized   : mark-to-market P/L of open trades
+- capital      : capital deployed in open trades
+- delta        : net share-equivalent delta
+- delta_dollars, gamma, theta, vega : net position greeks (short call negated)
+- open_trades  : number of open/rolled trades
+"""
+
+import logging
+import math
+import os
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from pymongo.errors import DuplicateKeyError
+
+logger = logging.getLogger(__name__)
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+EQUITY_SERIES_COLLECTION = "simulator_equity_series"
+
+SERIES_FIELDS = (
+    "equity", "realized", "unrealized", "capital",
+    "delta", "delta_dollars", "gamma", "theta", "vega", "open_trades",
+)
+
+DAYS_PER_MONTH_SLOTS = 31
+TRADING_DAYS_PER_YEAR = 252
+
+INTRADAY_ENABLED = os.environ.get("SIMULATOR_EQUITY_INTRADAY", "0").lower() in ("1", "true", "yes")
+
+ACTIVE_STATUSES = ("open", "rolled")
+COMPLETED_STATUSES = ("expired", "assigned", "closed")
+
+# Fields needed to compute a portfolio point (keeps the per-user read slim)
+POINT_PROJECTION = {
+    "_id": 0, "status": 1, "strategy_type": 1, "contracts": 1,
+    "current_underlying_price": 1, "capital_deployed": 1,
+    "unrealized_pnl": 1, "total_pl": 1, "realized_pnl": 1, "final_pnl": 1,
+    "current_delta": 1, "current_gamma": 1, "current_theta": 1, "current_vega": 1,
+    "leaps_delta": 1,
+}
+
+
+# =============================================================================
+# POINT COMPUTATION
+# =============================================================================
+
+def compute_portfolio_point(trades: List[Dict[str, Any]]) -> Dict[str, float]:
+    """
+    Aggregate one user's simulator trades into a single series point.
+
+    Position greeks: a covered call is +100 shares and -1 call per contract;
+    a PMCC is +1 LEAPS (entry delta) and -1 short call. Short-call greeks
+    stored on the trade are per-share, so they are negated and scaled by 100.
+    """
+    point = {field: 0.0 for field in SERIES_FIELDS}
+
+    for t in trades:
+        status = t.get("status")
+        if status in COMPLETED_STATUSES:
+            point["realized"] += float(t.get("realized_pnl") or t.get("final_pnl") or 0)
+            continue
+        if status not in ACTIVE_STATUSES:
+            continue
+
+        contracts = int(t.get("contracts") or 1)
+        multiplier = 100 * contracts
+        pnl = t.get("total_pl")
+        if pnl is None:
+            pnl = t.get("unrealized_pnl") or 0
+        point["unrealized"] += float(pnl)
+        point["capital"] += float(t.get("capital_deployed") or 0)
+        point["open_trades"] += 1
+
+        short_delta = float(t.get("current_delta") or 0)
+        long_delta = float(t.get("leaps_delta") or 0) if t.get("strategy_type") == "pmcc" else 1.0
+        delta = (long_delta - short_delta) * multiplier
+        point["delta"] += delta
+        point["delta_dollars"] += delta * float(t.get("current_underlying_price") or 0)
+        point["gamma"] -= float(t.get("current_gamma") or 0) * multiplier
+        point["theta"] -= float(t.get("current_theta") or 0) * multiplier
+        point["vega"] -= float(t.get("current_vega") or 0) * multiplier
+
+    point["equity"] = point["realized"] + point["unrealized"]
+    return {k: round(v, 4) for k, v in point.items()}
+
+
+# =============================================================================
+# WRITE PATH
+# =============================================================================
+
+def _empty_month_doc(user_id: str, resolution: str, month: str) -> Dict[str, Any]:
+    doc = {"user_id": user_id, "resolution": resolution, "month": month}
+    if resolution == "daily":
+        doc["ts"] = [None] * DAYS_PER_MONTH_SLOTS
+        for field in SERIES_FIELDS:
+            doc[field] = [None] * DAYS_PER_MONTH_SLOTS
+    else:
+        doc["ts"] = []
+        for field in SERIES_FIELDS:
+            doc[field] = []
+    return doc
+
+
+async def _write_daily_slot(db, user_id: str, when: datetime, point: Dict[str, float]) -> None:
+    month = when.strftime("%Y-%m")
+    slot = when.day - 1
+    key = {"user_id": user_id, "resolution": "daily", "month": month}
+    slot_set = {f"ts.{slot}": when.isoformat()}
+    slot_set.update({f"{field}.{slot}": point[field] for field in SERIES_FIELDS})
+
+    result = await db[EQUITY_SERIES_COLLECTION].update_one(key, {"$set": slot_set})
+    if result.matched_count:
+        return
+
+    doc = _empty_month_doc(user_id, "daily", month)
+    doc["ts"][slot] = when.isoformat()
+    for field in SERIES_FIELDS:
+        doc[field][slot] = point[field]
+    try:
+        await db[EQUITY_SERIES_COLLECTION].insert_one(doc)
+    except DuplicateKeyError:
+        # Another writer created the month first - fall back to the slot update
+        await db[EQUITY_SERIES_COLLECTION].update_one(key, {"$set": slot_set})
+
+
+async def _append_intraday(db, user_id: str, when: datetime, point: Dict[str, float]) -> None:
+    push = {"ts": when.isoformat()}
+    push.update({field: point[field] for field in SERIES_FIELDS})
+    await db[EQUITY_SERIES_COLLECTION].update_one(
+        {"user_id": user_id, "resolution": "intraday", "month": when.strftime("%Y-%m")},
+        {"$push": push},
+        upsert=True
+    )
+
+
+async def record_equity_point(
+    db,
+    user_id: str,
+    when: Optional[datetime] = None,
+    intraday: bool = False
+) -> Optional[Dict[str, float]]:
+    """
+    Compute the user's current portfolio point and store it.
+    Never raises - the series must not break the price update.
+    """
+    when = when or datetime.now(timezone.utc)
+    try:
+        trades = await db.simulator_trades.find({"user_id": user_id}, POINT_PROJECTION).to_list(10000)
+        point = compute_portfolio_point(trades)
+        await _write_daily_slot(db, user_id, when, point)
+        if intraday and INTRADAY_ENABLED:
+            await _append_intraday(db, user_id, when, point)
+        return point
+    except Exception as e:
+        logger.warning(f"[EQUITY_SERIES] failed to record point for {user_id}: {e}")
+        return None
+
+
+# =============================================================================
+# READ PATH
+# =============================================================================
+
+def _month_range(start: str, end: str) -> List[str]:
+    y, m = int(start[:4]), int(start[5:7])
+    end_y, end_m = int(end[:4]), int(end[5:7])
+    months = []
+    while (y, m) <= (end_y, end_m):
+        months.append(f"{y:04d}-{m:02d}")
+        y, m = (y + 1, 1) if m == 12 else (y, m + 1)
+    return months
+
+
+def downsample_lttb(points: List[Dict[str, Any]], threshold: int, key: str = "equity") -> List[Dict[str, Any]]:
+    """
+    Largest-Triangle-Three-Buckets downsampling on `key`.
+    Keeps first/last points and the visually significant extremes.
+    """
+    n = len(points)
+    if threshold >= n or threshold < 3:
+        return points
+
+    sampled = [points[0]]
+    bucket_size = (n - 2) / (threshold - 2)
+    a = 0
+    for i in range(threshold - 2):
+        start = int(math.floor(i * bucket_size)) + 1
+        end = int(math.floor((i + 1) * bucket_size)) + 1
+        next_start = end
+        next_end = min(int(math.floor((i + 2) * bucket_size)) + 1, n)
+
+        # Average of the next bucket (x = index)
+        next_bucket = points[next_start:next_end] or [points[-1]]
+        avg_x = (next_start + next_start + len(next_bucket) - 1) / 2
+        avg_y = sum(p[key] for p in next_bucket) / len(next_bucket)
+
+        ax, ay = a, points[a][key]
+        best_area, best_idx = -1.0, start
+        for j in range(start, min(end, n - 1)):
+            area = abs((ax - avg_x) * (points[j][key] - ay) - (ax - j) * (avg_y - ay))
+            if area > best_area:
+                best_area, best_idx = area, j
+        sampled.append(points[best_idx])
+        a = best_idx
+
+    sampled.append(points[-1])
+    return sampled
+
+
+def series_stats(
+    points: List[Dict[str, Any]],
+    periods_per_year: Optional[float] = TRADING_DAYS_PER_YEAR
+) -> Dict[str, Any]:
+    """
+    Max drawdown, annualized Sharpe (on capital-normalised P/L changes) and peak
+    exposure. Sharpe is None when `periods_per_year` is None (irregularly
+    spaced points, e.g. the intraday series).
+    """
+    if not points:
+        return {"max_drawdown": 0.0, "sharpe": None, "peak_capital": 0.0, "points": 0}
+
+    peak, max_dd = None, 0.0
+    for p in points:
+        peak = p["equity"] if peak is None else max(peak, p["equity"])
+        max_dd = max(max_dd, peak - p["equity"])
+
+    returns = []
+    for prev, cur in zip(points, points[1:]):
+        base = prev.get("capital") or 0
+        if base > 0:
+            returns.append((cur["equity"] - prev["equity"]) / base)
+    sharpe = None
+    if len(returns) >= 2 and periods_per_year:
+        mean = sum(returns) / len(returns)
+        var = sum((r - mean) ** 2 for r in returns) / (len(returns) - 1)
+        if var > 0:
+            sharpe = round(mean / math.sqrt(var) * math.sqrt(periods_per_year), 3)
+
+    return {
+        "max_drawdown": round(max_dd, 2),
+        "sharpe": sharpe,
+        "peak_capital": round(max((p.get("capital") or 0) for p in points), 2),
+        "points": len(points),
+    }
+
+
+async def get_equity_series(
+    db,
+    user_id: str,
+    start: str,
+    end: str,
+    resolution: str = "daily",
+    max_points: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Read the user's series for [start, end] (YYYY-MM-DD), flatten the monthly
+    columns into points, and optionally downsample for charting.
+    """
+    months = _month_range(start, end)
+    cursor = db[EQUITY_SERIES_COLLECTION].find(
+        {"user_id": user_id, "resolution": resolution, "month": {"$in": months}},
+        {"_id": 0}
+    ).sort("month", 1)
+
+    points = []
+    async for doc in cursor:
+        ts_col = doc.get("ts") or []
+        for i, ts in enumerate(ts_col):
+            if not ts or not (start <= ts[:10] <= end):
+                continue
+            point = {"ts": ts}
+            for field in SERIES_FIELDS:
+                col = doc.get(field) or []
+                point[field] = col[i] if i < len(col) else None
+            if point["equity"] is not None:
+                points.append(point)
+
+    # Intraday points are one per price update, not a fixed period: no annualized Sharpe
+    stats = series_stats(points, TRADING_DAYS_PER_YEAR if resolution == "daily" else None)
+    if max_points:
+        points = downsample_lttb(points, max_points)
+    return {"points": points, "stats": stats, "downsampled": stats["points"] != len(points)}
+
+
+async def ensure_equity_series_indexes(db) -> None:
+    """Unique (user_id, resolution, month) index for the monthly column documents."""
+    try:
+        await db[EQUITY_SERIES_COLLECTION].create_index(
+            [("user_id", 1), ("resolution", 1), ("month", 1)], unique=True, background=True
+        )
+    except Exception as e:
+        logger.warning(f"[EQUITY_SERIES] index creation failed: {e}")
@@ -0,0 +1,93 @@
+"""
+Symbol Feature Store - Nightly per-symbol technicals + fundamentals
+===================================================================
+
+The six precomputed scan profiles (CC and PMCC x conservative / balanced /
+aggressive) all need the same per-symbol inputs: technicals
+(fetch_technical_data) and fundamentals (fetch_fundamental_data). This store
+computes them ONCE per symbol per night and persists them, so every profile
+is a pure in-memory filter/scorer over the same feature table.
+
+DATABASE:
+- Collection: symbol_features
+- Key: (symbol, as_of) unique, as_of = "YYYY-MM-DD" (same key as daily_snapshots.snapshot_date)
+- Doc: {symbol, as_of, is_etf, technical, fundamental, computed_at}
+  - technical   : fetch_technical_data() output, or None on fetch failure
+  - fundamental : fetch_fundamental_data() output, ETF placeholder, or None on failure
+
+Failed fetches are stored too (as None) so a rerun of a single profile the
+same night does not hammer Yahoo again for symbols that already failed;
+use refresh=True to force a refetch.
+"""
+
+import logging
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional
+
+from pymongo import UpdateOne
+
+logger = logging.getLogger(__name__)
+
+FEATURES_COLLECTION = "symbol_features"
+
+
+def etf_fundamentals(symbol: str) -> Dict[str, Any]:
+    """Placeholder fundamentals for ETFs (no market cap / P/E / EPS to fetch)."""
+    return {"symbol": symbol, "is_etf": True, "fundamentals_skipped": True}
+
+
+def today_as_of() -> str:
+    return datetime.now(timezone.utc).strftime("%Y-%m-%d")
+
+
+def build_feature_doc(
+    symbol: str,
+    as_of: str,
+    technical: Optional[Dict[str, Any]],
+    fundamental: Optional[Dict[str, Any]],
+    is_etf: bool
+) -> Dict[str, Any]:
+    return {
+        "symbol": symbol,
+        "as_of": as_of,
+        "is_etf": is_etf,
+        "technical": technical,
+        "fundamental": fundamental,
+        "computed_at": datetime.now(timezone.utc).isoformat(),
+    }
+
+
+async def load_features(db, symbols: Iterable[str], as_of: str) -> Dict[str, Dict[str, Any]]:
+    """Feature rows already stored for `as_of`, keyed by symbol."""
+    symbols = list(symbols)
+    if not symbols:
+        return {}
+    docs = await db[FEATURES_COLLECTION].find(
+        {"as_of": as_of, "symbol": {"$in": symbols}},
+        {"_id": 0}
+    ).to_list(length=len(symbols) + 10)
+    return {d["symbol"]: d for d in docs}
+
+
+async def save_features(db, rows: List[Dict[str, Any]]) -> int:
+    """Upsert feature rows (one bulk write)."""
+    if not rows:
+        return 0
+    ops = [
+        UpdateOne({"symbol": r["symbol"], "as_of": r["as_of"]}, {"$set": r}, upsert=True)
+        for r in rows
+    ]
+    try:
+        result = await db[FEATURES_COLLECTION].bulk_write(ops, ordered=False)
+        return result.upserted_count + result.modified_count
+    except Exception as e:
+        logger.warning(f"[FEATURE_STORE] failed to persist {len(rows)} feature rows: {e}")
+        return 0
+
+
+async def ensure_feature_indexes(db) -> None:
+    try:
+        await db[FEATURES_COLLECTION].create_index([("symbol", 1), ("as_of", 1)], unique=True, background=True)
+        await db[FEATURES_COLLECTION].create_index([("as_of", -1)], background=True)
+    except Exception as e:
+        logger.warning(f"[FEATURE_STORE] index creation failed: {e}")
@@ -0,0 +1,130 @@
+"""
+Greeks Backfill - Stamp stored snapshot contracts with greeks and normalized IV
+==============================================================================
+
+New snapshots are stamped at ingestion (greeks_service.stamp_contract_greeks /
+stamp_chain_greeks), so read paths use the stored delta / gamma / theta / vega
+and iv / iv_pct instead of running Black-Scholes per request. Documents written
+before that carry moneyness deltas, delta_source "UNKNOWN" or no greeks at all;
+backfill_greeks() stamps them:
+
+    option_chain_snapshots  calls / puts                          stock_price
+    eod_options_chain       calls / puts                          stock_price
+    eod_market_snapshot     option_chain (flat, `type` per row)   underlying_price
+    symbol_snapshot         option_chain groups or option_chain_packed   underlying_price
+
+Each document gets one vectorized Black-Scholes pass (with the snapshot's own
+price and dte) and is written back with unordered bulk UpdateOnes. Stamped
+documents carry greeks_stamped: true, so the job is idempotent and resumes
+where an interrupted run stopped. daily_snapshots already store delta.
+
+Runs as the "greeks_backfill" background job: daily and once after startup
+(server.py scheduler), or on demand via POST /api/snapshots/greeks/backfill.
+Readers that meet an unstamped document before then call
+backfill_greeks(db, (collection,), match=...) for just that document and read
+it again, so greeks are computed once and stored, never per request.
+"""
+
+import logging
+import os
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, Optional, Sequence
+
+from pymongo import UpdateOne
+
+from .chain_codec import PACKED_FIELD, encode_chains, snapshot_chains
+from .greeks_service import GREEKS_STAMPED_FIELD, stamp_chain_greeks, stamp_contract_greeks
+from .snapshot_repository import CHAIN_SOURCES, SIDES, ChainSource
+
+logger = logging.getLogger(__name__)
+
+BACKFILL_BATCH_SIZE = int(os.environ.get("GREEKS_BACKFILL_BATCH_SIZE", "100"))  # documents per bulk write
+BACKFILL_SOURCES = ("option_chain_snapshots", "eod_options_chain", "eod_market_snapshot", "symbol_snapshot")
+
+ProgressFn = Callable[..., Awaitable[None]]
+
+
+def _containers(source: ChainSource) -> Sequence[str]:
+    return list(dict.fromkeys(c for side in SIDES for c in source.containers[side]))
+
+
+def backfill_projection(source: ChainSource) -> Dict[str, int]:
+    projection = {"_id": 1, "symbol": 1, source.price_field: 1}
+    if source.grouped:
+        projection.update({"option_chain": 1, PACKED_FIELD: 1})
+    else:
+        projection.update({container: 1 for container in _containers(source)})
+    return projection
+
+
+def stamp_document(source: ChainSource, doc: Dict[str, Any]) -> Dict[str, Any]:
+    """The $set that stamps one stored snapshot document."""
+    try:
+        price = float(doc.get(source.price_field) or 0)
+    except (TypeError, ValueError):
+        price = 0.0
+
+    update: Dict[str, Any] = {GREEKS_STAMPED_FIELD: True}
+    if source.grouped:
+        packed = doc.get(PACKED_FIELD)
+        if packed:
+            chains = list(snapshot_chains(doc))
+            stamp_chain_greeks(chains, price)
+            update[PACKED_FIELD] = encode_chains(chains, packed.get("compression") or "none")
+        elif doc.get("option_chain"):
+            stamp_chain_greeks(doc["option_chain"], price)
+            update["option_chain"] = doc["option_chain"]
+        return update
+
+    for container in _containers(source):
+        contracts = doc.get(container)
+        if contracts:
+            stamp_contract_greeks(contracts, price, option_type="put" if container == "puts" else "call")
+            update[container] = contracts
+    return update
+
+
+async def backfill_greeks(
+    db,
+    sources: Sequence[str] = BACKFILL_SOURCES,
+    batch_size: int = BACKFILL_BATCH_SIZE,
+    progress: Optional[ProgressFn] = None,
+    match: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """Stamp every not-yet-stamped snapshot document in `sources` (matching `match`)."""
+    started = datetime.now(timezone.utc)
+    query = {**(match or {}), GREEKS_STAMPED_FIELD: {"$ne": True}}
+    stamped: Dict[str, int] = {}
+
+    for index, name in enumerate(sources):
+        source = CHAIN_SOURCES[name]
+        collection = db[name]
+        total = await collection.count_documents(query)
+        done = 0
+        ops = []
+
+        async def flush():
+            nonlocal done, ops
+            await collection.bulk_write(ops, ordered=False)
+            done += len(ops)
+            ops = []
+            if progress is not None:
+                pct = int((index + (done / total if total else 1)) / len(sources) * 100)
+                await progress(min(pct, 99), stage=name, done=done, total=total)
+
+        cursor = collection.find(query, backfill_projection(source)).batch_size(batch_size)
+        async for doc in cursor:
+            ops.append(UpdateOne({"_id": doc["_id"]}, {"$set": stamp_document(source, doc)}))
+            if len(ops) >= batch_size:
+                await flush()
+        if ops:
+            await flush()
+
+        stamped[name] = done
+        logger.info(f"[GREEKS_BACKFILL] {name}: {done} documents stamped")
+
+    elapsed = (datetime.now(timezone.utc) - started).total_seconds()
+    if progress is not None:
+        await progress(100, stage="done")
+    logger.info(f"[GREEKS_BACKFILL] {sum(stamped.values())} documents stamped in {elapsed:.1f}s")
+    return {"stamped": stamped, "documents": sum(stamped.values()), "elapsed_seconds": round(elapsed, 1)}
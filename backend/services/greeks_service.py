@@ -10,6 +10,8 @@ HARD CONSTRAINTS:
 - If IV is missing, use sigma proxy (0.35) but mark delta_source="BS_PROXY_SIGMA"
 - Never use linear moneyness fallback
 - All functions handle edge cases gracefully (no NaN, no crashes)
+- Snapshot contracts are stamped once at ingest (stamp_contract_greeks /
+  stamp_chain_greeks, vectorized); read paths use the stored greeks
 
 ENV VAR:
 - RISK_FREE_RATE: Default 0.045 (4.5%), bounds [0.001, 0.20]
@@ -18,9 +20,11 @@ ENV VAR:
 import math
 import os
 import logging
-from typing import Dict, Any, Optional, Tuple
+from typing import Dict, Any, Iterable, List, Optional, Tuple
 from dataclasses import dataclass
 
+import numpy as np
+
 logger = logging.getLogger(__name__)
 
 # =============================================================================
@@ -356,6 +360,189 @@ def normalize_iv_fields(iv_raw: float) -> Dict[str, Any]:
     }
 
 
+# =============================================================================
+# VECTORIZED GREEKS (ingest stage / backfill)
+# =============================================================================
+#
+# Snapshot contracts get their greeks once, when a chain is stored (or by the
+# greeks_backfill job for older documents); read paths use the stored values.
+# These are calculate_greeks() / normalize_iv_fields() over whole arrays, with
+# the same fallback rules, clipping and rounding.
+
+GREEK_FIELDS = ("delta", "gamma", "theta", "vega")
+# Set on snapshot documents whose contracts carry stored greeks
+GREEKS_STAMPED_FIELD = "greeks_stamped"
+
+# numpy has no erf and scipy is not a dependency; math.erf keeps results
+# identical to the scalar path
+_erf = np.frompyfunc(math.erf, 1, 1)
+
+
+def norm_cdf_array(x: np.ndarray) -> np.ndarray:
+    return (1.0 + _erf(x / math.sqrt(2.0)).astype(np.float64)) / 2.0
+
+
+def norm_pdf_array(x: np.ndarray) -> np.ndarray:
+    return np.exp(-0.5 * x ** 2) / math.sqrt(2 * math.pi)
+
+
+def _float_array(values: Iterable[Any]) -> np.ndarray:
+    """Floats with None / non-numeric as NaN."""
+    out = []
+    for value in values:
+        try:
+            out.append(float(value) if value is not None else np.nan)
+        except (TypeError, ValueError):
+            out.append(np.nan)
+    return np.array(out, dtype=np.float64)
+
+
+def normalize_iv_array(iv_raw) -> Tuple[np.ndarray, np.ndarray]:
+    """normalize_iv_fields() over an array: (iv decimal, iv_pct), 0.0 where invalid."""
+    iv = np.asarray(iv_raw, dtype=np.float64)
+    iv = np.where(iv > 5.0, iv / 100.0, iv)
+    valid = (iv >= 0.01) & (iv <= 5.0)  # NaN compares False
+    iv = np.where(valid, iv, 0.0)
+    return np.round(iv, 4), np.round(iv * 100, 1)
+
+
+def calculate_greeks_vectorized(
+    S,
+    K,
+    T,
+    sigma,
+    option_type="call",
+    r: float = None
+) -> Dict[str, np.ndarray]:
+    """
+    calculate_greeks() for arrays of contracts.
+
+    Args broadcast against each other; sigma NaN means missing IV (proxy),
+    option_type is "call"/"put" or an array of them.
+
+    Returns:
+        {"delta", "gamma", "theta", "vega": float arrays, "delta_source": object array}
+    """
+    if r is None:
+        r = get_risk_free_rate()
+
+    S, K, T, sigma = np.broadcast_arrays(*(np.asarray(v, dtype=np.float64) for v in (S, K, T, sigma)))
+    is_call = np.broadcast_to(np.asarray(option_type) == "call", S.shape)
+
+    proxy = ~((sigma > 0.01) & (sigma <= 5.0))
+    sig = np.where(proxy, SIGMA_PROXY_DEFAULT, sigma)
+    missing = ~((S > 0) & (K > 0))
+    expired = ~missing & ~(T > 0)
+    live = ~missing & ~expired
+
+    # Dead rows get harmless inputs; their values are replaced below
+    S_ = np.where(live, S, 1.0)
+    K_ = np.where(live, K, 1.0)
+    T_ = np.where(live, T, 1.0)
+    with np.errstate(all="ignore"):
+        sqrt_t = np.sqrt(T_)
+        d1 = (np.log(S_ / K_) + (r + 0.5 * sig ** 2) * T_) / (sig * sqrt_t)
+        d2 = d1 - sig * sqrt_t
+        pdf = norm_pdf_array(d1)
+        cdf_d1 = norm_cdf_array(d1)
+
+        delta = np.where(is_call, np.clip(cdf_d1, 0.0, 1.0), np.clip(cdf_d1 - 1.0, -1.0, 0.0))
+        gamma = pdf / (S_ * sig * sqrt_t)
+        decay = -(S_ * pdf * sig) / (2 * sqrt_t)
+        carry = r * K_ * np.exp(-r * T_)
+        theta = np.where(is_call,
+                         (decay - carry * norm_cdf_array(d2)) / 365,
+                         (decay + carry * norm_cdf_array(-d2)) / 365)
+        vega = S_ * sqrt_t * pdf / 100
+
+    failed = live & (np.isnan(delta) | np.isnan(gamma) | np.isnan(theta) | np.isnan(vega))
+    neutral = np.where(is_call, 0.5, -0.5)
+    at_expiry = np.where(is_call, (S > K).astype(np.float64), -(S < K).astype(np.float64))
+
+    delta = np.where(failed, neutral, np.where(expired, at_expiry, np.where(missing, 0.0, delta)))
+    flat = failed | expired | missing
+    gamma, theta, vega = (np.where(flat, 0.0, g) for g in (gamma, theta, vega))
+
+    delta_source = np.where(proxy, "BS_PROXY_SIGMA", "BS").astype(object)
+    delta_source[expired] = "EXPIRY"
+    delta_source[missing | failed] = "MISSING"
+
+    return {
+        "delta": np.round(delta, 4),
+        "gamma": np.round(gamma, 6),
+        "theta": np.round(theta, 4),
+        "vega": np.round(vega, 4),
+        "delta_source": delta_source,
+    }
+
+
+def stamp_contract_greeks(
+    contracts: List[Dict[str, Any]],
+    stock_price: float,
+    r: float = None,
+    option_type: str = "call"
+) -> List[Dict[str, Any]]:
+    """
+    Set iv, iv_pct, delta, delta_source, gamma, theta, vega on snapshot
+    contracts (strike, dte, option_type or type, implied_volatility) in place,
+    in one vectorized pass. T = max(dte, 1) / 365 as at ingestion;
+    `option_type` is used for contracts that carry neither type field.
+    """
+    if not contracts:
+        return contracts
+
+    iv, iv_pct = normalize_iv_array(
+        _float_array(c.get("implied_volatility") or c.get("iv") or 0 for c in contracts))
+    strikes = _float_array(c.get("strike") for c in contracts)
+    dte = np.nan_to_num(_float_array(c.get("dte") for c in contracts), nan=0.0)
+    greeks = calculate_greeks_vectorized(
+        stock_price or 0.0, strikes, np.maximum(dte, 1) / 365.0,
+        np.where(iv > 0, iv, np.nan),
+        np.array([c.get("option_type") or c.get("type") or option_type for c in contracts]),
+        r,
+    )
+
+    columns = {"iv": iv.tolist(), "iv_pct": iv_pct.tolist(),
+               **{name: greeks[name].tolist() for name in (*GREEK_FIELDS, "delta_source")}}
+    for i, contract in enumerate(contracts):
+        for name, values in columns.items():
+            contract[name] = values[i]
+    return contracts
+
+
+def stamp_chain_greeks(option_chain: List[Dict[str, Any]], stock_price: float, r: float = None) -> int:
+    """
+    Set delta, gamma, theta, vega on Yahoo-style records in expiry groups
+    ({"expiry", "dte", "calls", "puts"}, as in symbol_snapshot.option_chain)
+    in place. impliedVolatility is left raw. Returns the number of records.
+    """
+    records, dte, option_type = [], [], []
+    for group in option_chain or []:
+        for side, kind in (("calls", "call"), ("puts", "put")):
+            side_records = group.get(side) or []
+            records.extend(side_records)
+            dte.extend([group.get("dte") or 0] * len(side_records))
+            option_type.extend([kind] * len(side_records))
+    if not records:
+        return 0
+
+    iv, _ = normalize_iv_array(_float_array(rec.get("impliedVolatility") for rec in records))
+    greeks = calculate_greeks_vectorized(
+        stock_price or 0.0,
+        _float_array(rec.get("strike") for rec in records),
+        np.maximum(np.array(dte, dtype=np.float64), 1) / 365.0,
+        np.where(iv > 0, iv, np.nan),
+        np.array(option_type),
+        r,
+    )
+
+    columns = {name: greeks[name].tolist() for name in GREEK_FIELDS}
+    for i, rec in enumerate(records):
+        for name, values in columns.items():
+            rec[name] = values[i]
+    return len(records)
+
+
 # =============================================================================
 # SANITY CHECK HELPERS
 # =============================================================================
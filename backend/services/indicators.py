@@ -0,0 +1,326 @@
+"""
+Technical Indicators - Vectorized + incremental (SMA / EMA / RSI / MACD / ATR / ADX)
+===================================================================================
+
+One indicator implementation shared by both scan paths:
+- services/precomputed_scans.fetch_technical_data (SMA20/50/200, RSI14, ATR14)
+- services/symbol_enrichment (RSI, MACD signal, ADX)
+
+All batch functions take NumPy arrays (oldest first), run in O(n) and
+return full series (NaN where the window is not yet filled) so callers read
+`[-1]`. Definitions are identical to the previous implementations:
+- sma / rsi_sma / atr_sma : simple rolling means (pandas .rolling().mean())
+- ema                     : seeded with the first value, k = 2 / (n + 1)
+- rsi (enrichment)        : simple average of the last `period` changes,
+                            loss floored at 0.001, rounded to 1 dp
+- macd_signal_direction   : MACD(12, 26) vs a 9-EMA of the last 9 MACD values
+- adx                     : Wilder smoothing, seeded with the mean of the first `period` DX
+
+IndicatorState keeps the minimum rolling state to update every indicator
+with ONE new bar (O(1) per bar) and round-trips through to_dict()/from_dict()
+so it can be persisted next to the OHLCV store.
+"""
+
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+import numpy as np
+
+MACD_FAST = 12
+MACD_SLOW = 26
+MACD_SIGNAL = 9
+RSI_LOSS_FLOOR = 0.001
+
+
+def _as_array(x) -> np.ndarray:
+    return np.ascontiguousarray(x, dtype=np.float64)
+
+
+# =============================================================================
+# BATCH (vectorized) INDICATORS
+# =============================================================================
+
+def sma(values, period: int) -> np.ndarray:
+    """Simple moving average via cumulative sums; NaN until `period` values."""
+    x = _as_array(values)
+    out = np.full(x.shape, np.nan)
+    if period <= 0 or len(x) < period:
+        return out
+    csum = np.cumsum(np.insert(x, 0, 0.0))
+    out[period - 1:] = (csum[period:] - csum[:-period]) / period
+    return out
+
+
+def ema(values, period: int) -> np.ndarray:
+    """EMA seeded with the first value (k = 2 / (period + 1)). Single O(n) pass."""
+    x = _as_array(values)
+    out = np.empty_like(x)
+    if not len(x):
+        return out
+    k = 2.0 / (period + 1)
+    acc = x[0]
+    for i, v in enumerate(x):
+        if i:
+            acc = v * k + acc * (1 - k)
+        out[i] = acc
+    return out
+
+
+def true_range(high, low, close) -> np.ndarray:
+    """True range; the first bar (no previous close) is high - low."""
+    h, l, c = _as_array(high), _as_array(low), _as_array(close)
+    tr = h - l
+    if len(c) > 1:
+        prev = c[:-1]
+        tr[1:] = np.maximum.reduce([h[1:] - l[1:], np.abs(h[1:] - prev), np.abs(l[1:] - prev)])
+    return tr
+
+
+def atr_sma(high, low, close, period: int = 14) -> np.ndarray:
+    """ATR as a simple rolling mean of true range (scan definition)."""
+    return sma(true_range(high, low, close), period)
+
+
+def rsi_sma(close, period: int = 14) -> np.ndarray:
+    """
+    RSI from simple rolling means of gains / losses (scan definition).
+    The first bar counts as a zero change (as pandas .diff().where() did).
+    Zero average loss gives 100, zero gain and loss gives NaN.
+    """
+    c = _as_array(close)
+    if not len(c):
+        return np.full(c.shape, np.nan)
+    delta = np.diff(c, prepend=c[0])
+    avg_gain = sma(np.where(delta > 0, delta, 0.0), period)
+    avg_loss = sma(np.where(delta < 0, -delta, 0.0), period)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return 100 - (100 / (1 + avg_gain / avg_loss))
+
+
+def rsi(close, period: int = 14) -> Optional[float]:
+    """Latest RSI (enrichment definition): last `period` changes, loss floored, 1 dp."""
+    c = _as_array(close)
+    if len(c) < period + 1:
+        return None
+    recent = np.diff(c[-(period + 1):])
+    avg_gain = recent[recent > 0].sum() / period
+    avg_loss = (-recent[recent < 0]).sum() / period or RSI_LOSS_FLOOR
+    return round(float(100 - (100 / (1 + avg_gain / avg_loss))), 1)
+
+
+def macd_line(close) -> np.ndarray:
+    c = _as_array(close)
+    return ema(c, MACD_FAST) - ema(c, MACD_SLOW)
+
+
+def _signal_direction(macd_values: np.ndarray) -> Optional[str]:
+    if len(macd_values) < 2:
+        return None
+    signal = ema(macd_values, MACD_SIGNAL)[-1]
+    return "bullish" if macd_values[-1] > signal else "bearish"
+
+
+def macd_signal_direction(close) -> Optional[str]:
+    """Bullish/bearish: last MACD vs a 9-EMA seeded at the first of the last 9 MACD values."""
+    c = _as_array(close)
+    if len(c) < 35:
+        return None
+    start = max(MACD_SLOW, len(c) - MACD_SIGNAL)
+    return _signal_direction(macd_line(c)[start:])
+
+
+def _dm(high: np.ndarray, low: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    up = high[1:] - high[:-1]
+    down = low[:-1] - low[1:]
+    plus_dm = np.where((up > down) & (up > 0), up, 0.0)
+    minus_dm = np.where((down > up) & (down > 0), down, 0.0)
+    return plus_dm, minus_dm
+
+
+def _dx(atr: float, spdm: float, smdm: float) -> float:
+    pdi = 100 * spdm / atr if atr > 0 else 0
+    mdi = 100 * smdm / atr if atr > 0 else 0
+    di_sum = pdi + mdi
+    return 100 * abs(pdi - mdi) / di_sum if di_sum > 0 else 0
+
+
+def adx_label(value: float) -> str:
+    return "strong" if value > 25 else "moderate" if value >= 15 else "weak"
+
+
+def adx(high, low, close, period: int = 14) -> Tuple[Optional[float], Optional[str]]:
+    """ADX with Wilder smoothing. Returns (adx rounded to 1 dp, trend strength label)."""
+    h, l, c = _as_array(high), _as_array(low), _as_array(close)
+    if len(c) < period * 2 + 1:
+        return None, None
+    state = IndicatorState(adx_period=period)
+    state._seed_adx(h, l, c)
+    if state.adx_value is None:
+        return None, None
+    value = round(state.adx_value, 1)
+    return value, adx_label(value)
+
+
+# =============================================================================
+# INCREMENTAL STATE (one new bar per update)
+# =============================================================================
+
+@dataclass
+class IndicatorState:
+    """
+    Rolling state for updating all indicators with one new bar.
+
+    Build with IndicatorState.from_arrays(high, low, close, volume), then call
+    update(high, low, close, volume) per new daily bar. values() returns the
+    same numbers the batch functions give for the full series.
+    """
+    sma_periods: Tuple[int, ...] = (20, 50, 200)
+    rsi_period: int = 14
+    atr_period: int = 14
+    adx_period: int = 14
+
+    closes: Deque[float] = field(default_factory=deque)
+    volumes: Deque[float] = field(default_factory=lambda: deque(maxlen=20))
+    true_ranges: Deque[float] = field(default_factory=deque)
+    last_high: Optional[float] = None
+    last_low: Optional[float] = None
+    last_close: Optional[float] = None
+    n_bars: int = 0
+
+    ema_fast: Optional[float] = None
+    ema_slow: Optional[float] = None
+    macd_tail: Deque[float] = field(default_factory=lambda: deque(maxlen=MACD_SIGNAL))
+
+    # Wilder ADX: sums seeded over the first `adx_period` moves, then smoothed
+    adx_atr: float = 0.0
+    adx_spdm: float = 0.0
+    adx_smdm: float = 0.0
+    adx_moves: int = 0
+    adx_seed_dx: List[float] = field(default_factory=list)
+    adx_value: Optional[float] = None
+
+    def __post_init__(self):
+        window = max(max(self.sma_periods), self.rsi_period + 1)
+        self.closes = deque(self.closes, maxlen=window)
+        self.volumes = deque(self.volumes, maxlen=20)
+        self.true_ranges = deque(self.true_ranges, maxlen=self.atr_period)
+        self.macd_tail = deque(self.macd_tail, maxlen=MACD_SIGNAL)
+
+    @classmethod
+    def from_arrays(cls, high, low, close, volume=None, **kwargs) -> "IndicatorState":
+        h, l, c = _as_array(high), _as_array(low), _as_array(close)
+        v = _as_array(volume) if volume is not None else np.zeros(len(c))
+        state = cls(**kwargs)
+        for i in range(len(c)):
+            state.update(h[i], l[i], c[i], v[i])
+        return state
+
+    def _seed_adx(self, h: np.ndarray, l: np.ndarray, c: np.ndarray) -> None:
+        # Vectorized true range / DM, then the O(n) Wilder recursion
+        tr = true_range(h, l, c)[1:]
+        plus_dm, minus_dm = _dm(h, l)
+        for i in range(len(tr)):
+            self._adx_step(tr[i], plus_dm[i], minus_dm[i])
+
+    def _adx_step(self, tr: float, pdm: float, mdm: float) -> None:
+        p = self.adx_period
+        if self.adx_moves < p:
+            self.adx_atr += tr
+            self.adx_spdm += pdm
+            self.adx_smdm += mdm
+            self.adx_moves += 1
+            return
+        self.adx_atr = self.adx_atr - self.adx_atr / p + tr
+        self.adx_spdm = self.adx_spdm - self.adx_spdm / p + pdm
+        self.adx_smdm = self.adx_smdm - self.adx_smdm / p + mdm
+        self.adx_moves += 1
+        dx = _dx(self.adx_atr, self.adx_spdm, self.adx_smdm)
+        if len(self.adx_seed_dx) < p:
+            self.adx_seed_dx.append(dx)
+            # Until `period` DX values exist, ADX is their plain mean
+            self.adx_value = sum(self.adx_seed_dx) / len(self.adx_seed_dx)
+        else:
+            self.adx_value = (self.adx_value * (p - 1) + dx) / p
+
+    def update(self, high: float, low: float, close: float, volume: float = 0.0) -> "IndicatorState":
+        high, low, close = float(high), float(low), float(close)
+        if self.last_close is None:
+            tr = high - low
+        else:
+            tr = max(high - low, abs(high - self.last_close), abs(low - self.last_close))
+            up = high - self.last_high
+            down = self.last_low - low
+            pdm = up if up > down and up > 0 else 0.0
+            mdm = down if down > up and down > 0 else 0.0
+            self._adx_step(tr, pdm, mdm)
+
+        self.true_ranges.append(tr)
+        self.closes.append(close)
+        self.volumes.append(float(volume))
+
+        k_fast, k_slow = 2.0 / (MACD_FAST + 1), 2.0 / (MACD_SLOW + 1)
+        self.ema_fast = close if self.ema_fast is None else close * k_fast + self.ema_fast * (1 - k_fast)
+        self.ema_slow = close if self.ema_slow is None else close * k_slow + self.ema_slow * (1 - k_slow)
+        self.n_bars += 1
+        if self.n_bars > MACD_SLOW:
+            self.macd_tail.append(self.ema_fast - self.ema_slow)
+
+        self.last_high, self.last_low, self.last_close = high, low, close
+        return self
+
+    def values(self) -> Dict[str, Any]:
+        closes = np.fromiter(self.closes, dtype=np.float64)
+        out: Dict[str, Any] = {}
+        for p in self.sma_periods:
+            out[f"sma{p}"] = float(closes[-p:].mean()) if len(closes) >= p else None
+
+        rsi_window = closes[-(self.rsi_period + 1):] if self.n_bars > self.rsi_period else closes
+        rsi_series = rsi_sma(rsi_window, self.rsi_period)
+        out[f"rsi{self.rsi_period}"] = float(rsi_series[-1]) if len(rsi_series) and not np.isnan(rsi_series[-1]) else None
+        out["rsi"] = rsi(closes, self.rsi_period)
+
+        out[f"atr{self.atr_period}"] = (
+            float(np.mean(self.true_ranges)) if len(self.true_ranges) >= self.atr_period else None
+        )
+        out["avg_volume_20d"] = float(np.mean(self.volumes)) if self.volumes else None
+
+        macd_values = np.fromiter(self.macd_tail, dtype=np.float64)
+        out["macd_signal"] = _signal_direction(macd_values) if self.n_bars >= 35 else None
+
+        if self.n_bars >= self.adx_period * 2 + 1 and self.adx_value is not None:
+            value = round(self.adx_value, 1)
+            out["adx"], out["trend_strength"] = value, adx_label(value)
+        else:
+            out["adx"], out["trend_strength"] = None, None
+        return out
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "sma_periods": list(self.sma_periods),
+            "rsi_period": self.rsi_period,
+            "atr_period": self.atr_period,
+            "adx_period": self.adx_period,
+            "closes": list(self.closes),
+            "volumes": list(self.volumes),
+            "true_ranges": list(self.true_ranges),
+            "last_high": self.last_high,
+            "last_low": self.last_low,
+            "last_close": self.last_close,
+            "n_bars": self.n_bars,
+            "ema_fast": self.ema_fast,
+            "ema_slow": self.ema_slow,
+            "macd_tail": list(self.macd_tail),
+            "adx_atr": self.adx_atr,
+            "adx_spdm": self.adx_spdm,
+            "adx_smdm": self.adx_smdm,
+            "adx_moves": self.adx_moves,
+            "adx_seed_dx": list(self.adx_seed_dx),
+            "adx_value": self.adx_value,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "IndicatorState":
+        data = dict(data)
+        data["sma_periods"] = tuple(data.get("sma_periods", (20, 50, 200)))
+        return cls(**data)
@@ -0,0 +1,256 @@
+"""
+Ingest Pipeline - Bounded-concurrency staged ingestion
+======================================================
+
+Batch ingestors (SnapshotService.ingest_symbols, EODIngestionService.ingest_all_eod)
+used to walk their symbol list one at a time: stock fetch, chain fetch, two
+upserts, sleep, next symbol. run_ingest_pipeline() overlaps that work in three
+stages connected by bounded asyncio queues:
+
+    fetch      INGEST_FETCH_CONCURRENCY workers; network I/O per key
+    normalize  one worker; builds the documents to store (CPU, no I/O)
+    write      one worker; unordered bulk UpdateOnes, up to INGEST_WRITE_BATCH
+               keys per flush, collections written in first-seen order
+
+The queues are bounded (INGEST_QUEUE_SIZE), so a slow write stage throttles
+fetching instead of buffering the whole universe in memory.
+
+Provider rate limit: fetch starts are spaced at least INGEST_FETCH_DELAY_SECONDS
+apart across all fetch workers of a run (one shared pacer), so the request
+rate stays at or below the old sleep-per-symbol loops' (<= 1 / delay per
+second) however many workers there are; concurrency only overlaps latency.
+
+A key's outcome is reported through on_done(key, outcome, error) only after
+its writes are persisted; a fetch, normalize or write failure reports the
+exception instead and never stops the other keys.
+
+Returned metrics (also logged as [<label>_METRICS]):
+    {"keys", "wall_seconds",
+     "stages": {"fetch" | "normalize" | "write": {"items", "errors",
+                "busy_seconds", "items_per_second"}},
+     "bulk_writes", "documents_written"}
+"""
+
+import asyncio
+import logging
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+from pymongo import UpdateOne
+
+logger = logging.getLogger(__name__)
+
+FETCH_CONCURRENCY = int(os.environ.get("INGEST_FETCH_CONCURRENCY", "8"))
+WRITE_BATCH = int(os.environ.get("INGEST_WRITE_BATCH", "50"))  # keys per bulk flush
+QUEUE_SIZE = int(os.environ.get("INGEST_QUEUE_SIZE", "32"))
+FETCH_DELAY_SECONDS = float(os.environ.get("INGEST_FETCH_DELAY_SECONDS", "0.5"))
+
+# (collection name, write) pairs produced by normalize for one key
+Writes = List[Tuple[str, UpdateOne]]
+FetchFn = Callable[[str], Awaitable[Any]]
+NormalizeFn = Callable[[str, Any], Tuple[Writes, Any]]
+DoneFn = Callable[[str, Any, Optional[BaseException]], None]
+ProgressFn = Callable[..., Awaitable[None]]
+
+_STOP = object()
+
+
+@dataclass
+class StageMetrics:
+    name: str
+    items: int = 0
+    errors: int = 0
+    busy_seconds: float = 0.0
+
+    def to_dict(self, wall_seconds: float) -> Dict[str, Any]:
+        return {
+            "items": self.items,
+            "errors": self.errors,
+            "busy_seconds": round(self.busy_seconds, 3),
+            "items_per_second": round(self.items / wall_seconds, 2) if wall_seconds > 0 else 0.0,
+        }
+
+
+class _FetchPacer:
+    """Spaces fetch starts at least `interval` seconds apart, across callers, in FIFO order."""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._lock = asyncio.Lock()
+        self._next = 0.0
+
+    async def wait(self) -> None:
+        if self.interval <= 0:
+            return
+        async with self._lock:
+            now = time.monotonic()
+            if self._next > now:
+                await asyncio.sleep(self._next - now)
+                now = self._next
+            self._next = now + self.interval
+
+
+@dataclass
+class _Normalized:
+    key: str
+    writes: Writes
+    outcome: Any
+
+
+@dataclass
+class _Run:
+    total: int
+    stages: Dict[str, StageMetrics] = field(default_factory=lambda: {
+        name: StageMetrics(name) for name in ("fetch", "normalize", "write")})
+    finished: int = 0
+    bulk_writes: int = 0
+    documents_written: int = 0
+
+
+async def run_ingest_pipeline(
+    db,
+    keys: Sequence[str],
+    fetch: FetchFn,
+    normalize: NormalizeFn,
+    on_done: DoneFn,
+    concurrency: int = None,
+    write_batch: int = None,
+    fetch_delay: float = None,
+    queue_size: int = None,
+    progress: Optional[ProgressFn] = None,
+    label: str = "INGEST",
+) -> Dict[str, Any]:
+    """Run keys through fetch -> normalize -> bulk write; returns per-stage metrics."""
+    concurrency = max(1, concurrency or FETCH_CONCURRENCY)
+    write_batch = max(1, write_batch or WRITE_BATCH)
+    fetch_delay = FETCH_DELAY_SECONDS if fetch_delay is None else fetch_delay
+    queue_size = max(1, queue_size or QUEUE_SIZE)
+
+    run = _Run(total=len(keys))
+    pacer = _FetchPacer(fetch_delay)
+    started = time.perf_counter()
+
+    pending: asyncio.Queue = asyncio.Queue()
+    for key in keys:
+        pending.put_nowait(key)
+    fetched: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+    normalized: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+
+    def finish(key: str, outcome: Any, error: Optional[BaseException]) -> None:
+        run.finished += 1
+        try:
+            on_done(key, outcome, error)
+        except Exception as e:
+            logger.error(f"[{label}] result handler failed for {key}: {e}")
+
+    async def report() -> None:
+        if progress is not None and run.total:
+            await progress(min(99, int(run.finished / run.total * 100)), stage="ingest",
+                           done=run.finished, total=run.total)
+
+    async def fetch_worker() -> None:
+        stage = run.stages["fetch"]
+        while True:
+            try:
+                key = pending.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            await pacer.wait()
+            t0 = time.perf_counter()
+            try:
+                raw = await fetch(key)
+            except Exception as e:
+                stage.errors += 1
+                finish(key, None, e)
+            else:
+                stage.items += 1
+                await fetched.put((key, raw))
+            stage.busy_seconds += time.perf_counter() - t0
+
+    async def normalize_worker() -> None:
+        stage = run.stages["normalize"]
+        while True:
+            item = await fetched.get()
+            if item is _STOP:
+                await normalized.put(_STOP)
+                return
+            key, raw = item
+            t0 = time.perf_counter()
+            try:
+                writes, outcome = normalize(key, raw)
+            except Exception as e:
+                stage.errors += 1
+                finish(key, None, e)
+            else:
+                stage.items += 1
+                await normalized.put(_Normalized(key, writes, outcome))
+            stage.busy_seconds += time.perf_counter() - t0
+
+    async def flush(batch: List[_Normalized]) -> None:
+        stage = run.stages["write"]
+        t0 = time.perf_counter()
+        by_collection: Dict[str, List[UpdateOne]] = {}
+        for item in batch:
+            for name, op in item.writes:
+                by_collection.setdefault(name, []).append(op)
+        try:
+            # Dict order = first-seen order, so e.g. stock docs land before their chains
+            for name, ops in by_collection.items():
+                await db[name].bulk_write(ops, ordered=False)
+                run.bulk_writes += 1
+                run.documents_written += len(ops)
+        except Exception as e:
+            stage.errors += len(batch)
+            logger.error(f"[{label}] bulk write failed for {len(batch)} keys: {e}")
+            for item in batch:
+                finish(item.key, None, e)
+        else:
+            stage.items += len(batch)
+            for item in batch:
+                finish(item.key, item.outcome, None)
+        stage.busy_seconds += time.perf_counter() - t0
+        await report()
+
+    async def write_worker() -> None:
+        done = False
+        while not done:
+            item = await normalized.get()
+            if item is _STOP:
+                return
+            batch = [item]
+            # Take whatever is already queued, up to one batch
+            while len(batch) < write_batch:
+                try:
+                    nxt = normalized.get_nowait()
+                except asyncio.QueueEmpty:
+                    break
+                if nxt is _STOP:
+                    done = True
+                    break
+                batch.append(nxt)
+            await flush(batch)
+
+    normalizer = asyncio.create_task(normalize_worker())
+    writer = asyncio.create_task(write_worker())
+    await asyncio.gather(*(fetch_worker() for _ in range(min(concurrency, max(1, run.total)))))
+    await fetched.put(_STOP)
+    await normalizer
+    await writer
+
+    wall = time.perf_counter() - started
+    metrics = {
+        "keys": run.total,
+        "wall_seconds": round(wall, 3),
+        "stages": {name: stage.to_dict(wall) for name, stage in run.stages.items()},
+        "bulk_writes": run.bulk_writes,
+        "documents_written": run.documents_written,
+    }
+    if progress is not None:
+        await progress(100, stage="done", done=run.finished, total=run.total)
+    stages = ", ".join(f"{name}={s['items']} ({s['items_per_second']}/s, {s['errors']} err)"
+                       for name, s in metrics["stages"].items())
+    logger.info(f"[{label}_METRICS] {run.total} keys in {wall:.1f}s: {stages}; "
+                f"{run.bulk_writes} bulk writes, {run.documents_written} docs")
+    return metrics
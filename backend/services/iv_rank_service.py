@@ -31,6 +31,8 @@ from typing import Dict, Any, List, Optional, Tuple
 from dataclasses import dataclass
 import pytz
 
+from .chain_codec import chain_projection, snapshot_chains
+
 logger = logging.getLogger(__name__)
 
 # =============================================================================
@@ -617,7 +619,8 @@ async def backfill_iv_history_from_snapshots(db, run_id: str = None) -> Dict[str
         # option chain docs into memory (default batch=101 × ~5MB = ~500MB spike)
         snapshot_cursor = db.symbol_snapshot.find(
             query,
-            {"symbol": 1, "underlying_price": 1, "as_of": 1, "option_chain": 1}
+            {"symbol": 1, "underlying_price": 1, "as_of": 1,
+             **chain_projection(("strike", "impliedVolatility"), sides=("calls",))}
         ).batch_size(5)
 
         processed = 0
@@ -627,7 +630,7 @@ async def backfill_iv_history_from_snapshots(db, run_id: str = None) -> Dict[str
             symbol = snap.get("symbol")
             stock_price = snap.get("underlying_price", 0)
             as_of = snap.get("as_of")
-            option_chain = snap.get("option_chain", [])
+            option_chain = list(snapshot_chains(snap, ("strike", "impliedVolatility"), sides=("calls",)))
 
             if not symbol or not stock_price or not as_of or not option_chain:
                 skipped += 1
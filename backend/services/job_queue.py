@@ -0,0 +1,427 @@
+"""
+Background Job Queue - Mongo-backed jobs for long-running user operations
+=========================================================================
+
+Heavy endpoints (manual scheduler trigger, rule evaluation, IBKR import,
+bulk AI suggestions) enqueue a job and return its id immediately; the work
+runs off the request path and clients poll /api/jobs/{job_id}.
+
+Same idea as services/scan_progress (stage / pct / elapsed), but persisted
+so status survives the request, is visible from any worker, and supports
+cancellation.
+
+DATABASE:
+- Collection: jobs
+- Status: queued -> running -> succeeded | failed | cancelled
+- Idempotency: unique (user_id, job_type, idempotency_key) when a key is given;
+  re-submitting the same key returns the original job.
+- Single-flight: job types registered with single_flight=True return the
+  user's already queued/running job of that type instead of starting another.
+- Finished jobs get `expires_at` and are removed by a TTL index.
+
+CONCURRENCY:
+- Global cap JOB_QUEUE_MAX_WORKERS (env, default 4) across all job types
+- Per-type cap from register_handler(max_concurrency=...)
+- Jobs are claimed with an atomic queued -> running update, so a job can
+  only ever run once even if several processes try to start it.
+
+LIVENESS:
+- The claiming process stamps `worker_id` and refreshes `heartbeat_at` on its
+  running jobs every JOB_HEARTBEAT_SECONDS, independent of handler progress.
+- Every process reaps running jobs whose heartbeat is older than
+  JOB_STALE_SECONDS (their worker died or restarted) at startup, periodically,
+  and before a single-flight lookup, so a zombie never blocks new jobs.
+
+CANCELLATION is cooperative: POST /jobs/{id}/cancel marks the job; queued jobs
+are cancelled immediately, running handlers stop at their next
+`await job.check_cancelled()` (placed before any destructive step).
+"""
+
+import asyncio
+import logging
+import os
+import socket
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+logger = logging.getLogger(__name__)
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+JOBS_COLLECTION = "jobs"
+
+JOB_QUEUE_MAX_WORKERS = int(os.environ.get("JOB_QUEUE_MAX_WORKERS", "4"))
+JOB_RETENTION_DAYS = 7
+# Running jobs are re-heartbeated by their process at this interval...
+JOB_HEARTBEAT_SECONDS = 30
+# ...so one whose heartbeat is older than this has lost its worker
+JOB_STALE_SECONDS = 3 * 60
+# Minimum spacing between progress writes (stage changes always write)
+PROGRESS_WRITE_INTERVAL_SECONDS = 1.0
+
+ACTIVE_STATUSES = ("queued", "running")
+FINAL_STATUSES = ("succeeded", "failed", "cancelled")
+
+# Fields returned by status polling (params can hold large payloads, e.g. CSV text)
+JOB_PUBLIC_PROJECTION = {"_id": 0, "params": 0, "cancel_requested": 0}
+
+
+# Identifies this process on the jobs it claims (uvicorn runs several workers)
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+class JobCancelled(Exception):
+    """Raised inside a handler when cancellation was requested."""
+
+
+# =============================================================================
+# HANDLER REGISTRY
+# =============================================================================
+
+HandlerFn = Callable[["JobContext"], Awaitable[Optional[Dict[str, Any]]]]
+
+_handlers: Dict[str, Dict[str, Any]] = {}
+_type_semaphores: Dict[str, asyncio.Semaphore] = {}
+_global_semaphore: Optional[asyncio.Semaphore] = None
+_tasks: Dict[str, asyncio.Task] = {}
+_maintenance_task: Optional[asyncio.Task] = None
+
+
+def register_handler(job_type: str, handler: HandlerFn, max_concurrency: int = 1, single_flight: bool = True) -> None:
+    """Register the coroutine that executes jobs of `job_type`."""
+    _handlers[job_type] = {
+        "handler": handler,
+        "max_concurrency": max(1, max_concurrency),
+        "single_flight": single_flight,
+    }
+    _type_semaphores.pop(job_type, None)
+
+
+def _get_semaphores(job_type: str):
+    # Created lazily so they bind to the running event loop
+    global _global_semaphore
+    if _global_semaphore is None:
+        _global_semaphore = asyncio.Semaphore(JOB_QUEUE_MAX_WORKERS)
+    if job_type not in _type_semaphores:
+        _type_semaphores[job_type] = asyncio.Semaphore(_handlers[job_type]["max_concurrency"])
+    return _global_semaphore, _type_semaphores[job_type]
+
+
+# =============================================================================
+# JOB CONTEXT (passed to handlers)
+# =============================================================================
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class JobContext:
+    """Handle given to a running job: params, progress reporting, cancellation."""
+
+    def __init__(self, db, job: Dict[str, Any]):
+        self.db = db
+        self.job_id: str = job["id"]
+        self.job_type: str = job["job_type"]
+        self.user_id: Optional[str] = job.get("user_id")
+        self.params: Dict[str, Any] = job.get("params") or {}
+        self._started = _now()
+        self._last_write = 0.0
+        self._last_stage: Optional[str] = None
+
+    async def progress(self, pct: int, stage: Optional[str] = None, done: Optional[int] = None, total: Optional[int] = None) -> None:
+        """Report progress (throttled; stage changes and 100% always persist)."""
+        loop_now = asyncio.get_event_loop().time()
+        stage_changed = stage is not None and stage != self._last_stage
+        if not stage_changed and pct < 100 and loop_now - self._last_write < PROGRESS_WRITE_INTERVAL_SECONDS:
+            return
+        self._last_write = loop_now
+        if stage is not None:
+            self._last_stage = stage
+
+        update = {
+            "progress.pct": max(0, min(100, int(pct))),
+            "progress.elapsed_seconds": int((_now() - self._started).total_seconds()),
+            "heartbeat_at": _now().isoformat(),
+        }
+        if stage is not None:
+            update["progress.stage"] = stage
+        if done is not None:
+            update["progress.done"] = done
+        if total is not None:
+            update["progress.total"] = total
+        try:
+            await self.db[JOBS_COLLECTION].update_one({"id": self.job_id}, {"$set": update})
+        except Exception as e:
+            logger.warning(f"[JOB_QUEUE] progress write failed for {self.job_id}: {e}")
+
+    async def is_cancelled(self) -> bool:
+        doc = await self.db[JOBS_COLLECTION].find_one({"id": self.job_id}, {"_id": 0, "cancel_requested": 1})
+        return bool(doc and doc.get("cancel_requested"))
+
+    async def check_cancelled(self) -> None:
+        """Raise JobCancelled if the job was cancelled. Call before destructive steps."""
+        if await self.is_cancelled():
+            raise JobCancelled()
+
+
+# =============================================================================
+# ENQUEUE
+# =============================================================================
+
+def _new_job_doc(job_type: str, user_id: Optional[str], params: Dict[str, Any], idempotency_key: Optional[str]) -> Dict[str, Any]:
+    doc = {
+        "id": str(uuid.uuid4()),
+        "job_type": job_type,
+        "user_id": user_id,
+        "status": "queued",
+        "params": params or {},
+        "progress": {"pct": 0, "stage": "Queued", "done": None, "total": None, "elapsed_seconds": 0},
+        "result": None,
+        "error": None,
+        "cancel_requested": False,
+        "created_at": _now().isoformat(),
+        "started_at": None,
+        "finished_at": None,
+        "heartbeat_at": None,
+    }
+    if idempotency_key:
+        doc["idempotency_key"] = idempotency_key
+    return doc
+
+
+async def enqueue(
+    db,
+    job_type: str,
+    user_id: Optional[str],
+    params: Optional[Dict[str, Any]] = None,
+    idempotency_key: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Create (or reuse) a job and start it in the background.
+
+    Returns the public job document plus `deduplicated: bool`.
+    """
+    if job_type not in _handlers:
+        raise ValueError(f"Unknown job type: {job_type}")
+
+    collection = db[JOBS_COLLECTION]
+
+    if idempotency_key:
+        existing = await collection.find_one(
+            {"user_id": user_id, "job_type": job_type, "idempotency_key": idempotency_key},
+            JOB_PUBLIC_PROJECTION
+        )
+        if existing:
+            return {**existing, "deduplicated": True}
+
+    if _handlers[job_type]["single_flight"]:
+        await reap_stale_jobs(db, {"user_id": user_id, "job_type": job_type})
+        existing = await collection.find_one(
+            {"user_id": user_id, "job_type": job_type, "status": {"$in": list(ACTIVE_STATUSES)}},
+            JOB_PUBLIC_PROJECTION,
+            sort=[("created_at", -1)]
+        )
+        if existing:
+            return {**existing, "deduplicated": True}
+
+    doc = _new_job_doc(job_type, user_id, params or {}, idempotency_key)
+    try:
+        await collection.insert_one(dict(doc))
+    except DuplicateKeyError:
+        # Lost a race on the same idempotency key - return the winner
+        existing = await collection.find_one(
+            {"user_id": user_id, "job_type": job_type, "idempotency_key": idempotency_key},
+            JOB_PUBLIC_PROJECTION
+        )
+        return {**existing, "deduplicated": True}
+
+    _spawn(db, doc["id"], job_type)
+    public = {k: v for k, v in doc.items() if k not in JOB_PUBLIC_PROJECTION}
+    return {**public, "deduplicated": False}
+
+
+def _spawn(db, job_id: str, job_type: str) -> None:
+    task = asyncio.create_task(_run_job(db, job_id, job_type))
+    _tasks[job_id] = task
+    task.add_done_callback(lambda _t: _tasks.pop(job_id, None))
+
+
+# =============================================================================
+# WORKER
+# =============================================================================
+
+async def _finish(db, job_id: str, status: str, result: Optional[Dict[str, Any]] = None, error: Optional[str] = None) -> None:
+    now = _now()
+    update = {
+        "status": status,
+        "result": result,
+        "error": error,
+        "finished_at": now.isoformat(),
+        "expires_at": now + timedelta(days=JOB_RETENTION_DAYS),
+    }
+    if status == "succeeded":
+        update["progress.pct"] = 100
+        update["progress.stage"] = "Done"
+    else:
+        update["progress.stage"] = status.title()
+    # Drop potentially large inputs (e.g. uploaded CSV text) once the job is done
+    await db[JOBS_COLLECTION].update_one({"id": job_id}, {"$set": update, "$unset": {"params": ""}})
+
+
+async def _run_job(db, job_id: str, job_type: str) -> None:
+    global_sem, type_sem = _get_semaphores(job_type)
+    async with global_sem, type_sem:
+        now_iso = _now().isoformat()
+        job = await db[JOBS_COLLECTION].find_one_and_update(
+            {"id": job_id, "status": "queued", "cancel_requested": {"$ne": True}},
+            {"$set": {
+                "status": "running",
+                "worker_id": WORKER_ID,
+                "started_at": now_iso,
+                "heartbeat_at": now_iso,
+                "progress.stage": "Starting",
+            }},
+            projection={"_id": 0},
+            return_document=ReturnDocument.AFTER
+        )
+        if not job:
+            # Already claimed elsewhere, or cancelled while queued
+            return
+
+        ctx = JobContext(db, job)
+        started = _now()
+        try:
+            result = await _handlers[job_type]["handler"](ctx)
+            await _finish(db, job_id, "succeeded", result=result)
+            logger.info(f"[JOB_QUEUE] {job_type} {job_id} succeeded in {(_now() - started).total_seconds():.1f}s")
+        except JobCancelled:
+            await _finish(db, job_id, "cancelled")
+            logger.info(f"[JOB_QUEUE] {job_type} {job_id} cancelled")
+        except asyncio.CancelledError:
+            await _finish(db, job_id, "cancelled", error="Worker shut down")
+            raise
+        except Exception as e:
+            # HTTPException raised by shared endpoint code carries a useful .detail
+            error = getattr(e, "detail", None) or str(e) or e.__class__.__name__
+            await _finish(db, job_id, "failed", error=error if isinstance(error, str) else str(error))
+            logger.error(f"[JOB_QUEUE] {job_type} {job_id} failed: {e}")
+
+
+# =============================================================================
+# STATUS / CANCEL / RECOVERY
+# =============================================================================
+
+async def get_job(db, job_id: str, user_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    query: Dict[str, Any] = {"id": job_id}
+    if user_id is not None:
+        query["user_id"] = user_id
+    return await db[JOBS_COLLECTION].find_one(query, JOB_PUBLIC_PROJECTION)
+
+
+async def list_jobs(db, user_id: str, job_type: Optional[str] = None, limit: int = 20) -> List[Dict[str, Any]]:
+    query: Dict[str, Any] = {"user_id": user_id}
+    if job_type:
+        query["job_type"] = job_type
+    return await db[JOBS_COLLECTION].find(query, JOB_PUBLIC_PROJECTION).sort("created_at", -1).limit(limit).to_list(limit)
+
+
+async def cancel_job(db, job_id: str, user_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """Request cancellation. Queued jobs are cancelled immediately."""
+    query: Dict[str, Any] = {"id": job_id}
+    if user_id is not None:
+        query["user_id"] = user_id
+
+    queued = await db[JOBS_COLLECTION].update_one(
+        {**query, "status": "queued"},
+        {"$set": {"cancel_requested": True}}
+    )
+    if queued.modified_count:
+        await _finish(db, job_id, "cancelled")
+    else:
+        await db[JOBS_COLLECTION].update_one(
+            {**query, "status": "running"},
+            {"$set": {"cancel_requested": True, "progress.stage": "Cancelling"}}
+        )
+    return await get_job(db, job_id, user_id)
+
+
+async def reap_stale_jobs(db, query: Optional[Dict[str, Any]] = None) -> int:
+    """Fail running jobs (optionally narrowed by `query`) whose worker stopped heartbeating."""
+    stale_before = (_now() - timedelta(seconds=JOB_STALE_SECONDS)).isoformat()
+    failed = await db[JOBS_COLLECTION].update_many(
+        {**(query or {}), "status": "running", "heartbeat_at": {"$lt": stale_before}},
+        {"$set": {
+            "status": "failed",
+            "error": "Interrupted (worker restarted)",
+            "finished_at": _now().isoformat(),
+            "expires_at": _now() + timedelta(days=JOB_RETENTION_DAYS),
+        }}
+    )
+    return failed.modified_count
+
+
+async def _heartbeat_running_jobs(db) -> None:
+    if not _tasks:
+        return
+    await db[JOBS_COLLECTION].update_many(
+        {"id": {"$in": list(_tasks)}, "status": "running", "worker_id": WORKER_ID},
+        {"$set": {"heartbeat_at": _now().isoformat()}}
+    )
+
+
+async def _maintenance_loop(db) -> None:
+    # Keep this process's jobs alive and reap jobs of processes that died
+    while True:
+        await asyncio.sleep(JOB_HEARTBEAT_SECONDS)
+        try:
+            await _heartbeat_running_jobs(db)
+            reaped = await reap_stale_jobs(db)
+            if reaped:
+                logger.info(f"[JOB_QUEUE] reaped {reaped} stale running jobs")
+        except Exception as e:
+            logger.warning(f"[JOB_QUEUE] maintenance failed: {e}")
+
+
+async def recover_jobs(db) -> Dict[str, int]:
+    """
+    Startup recovery: restart queued jobs, fail running jobs whose worker
+    died (stale heartbeat) and start the heartbeat / reaper loop.
+    """
+    global _maintenance_task
+    failed = await reap_stale_jobs(db)
+
+    resumed = 0
+    async for job in db[JOBS_COLLECTION].find({"status": "queued"}, {"_id": 0, "id": 1, "job_type": 1}):
+        if job["job_type"] in _handlers and job["id"] not in _tasks:
+            _spawn(db, job["id"], job["job_type"])
+            resumed += 1
+
+    if _maintenance_task is None or _maintenance_task.done():
+        _maintenance_task = asyncio.create_task(_maintenance_loop(db))
+
+    if failed or resumed:
+        logger.info(f"[JOB_QUEUE] recovery: {resumed} queued jobs resumed, {failed} stale jobs failed")
+    return {"resumed": resumed, "failed": failed}
+
+
+async def ensure_job_indexes(db) -> None:
+    try:
+        await db[JOBS_COLLECTION].create_index("id", unique=True, background=True)
+        await db[JOBS_COLLECTION].create_index([("user_id", 1), ("created_at", -1)], background=True)
+        await db[JOBS_COLLECTION].create_index([("user_id", 1), ("job_type", 1), ("status", 1)], background=True)
+        await db[JOBS_COLLECTION].create_index([("status", 1), ("heartbeat_at", 1)], background=True)
+        await db[JOBS_COLLECTION].create_index(
+            [("user_id", 1), ("job_type", 1), ("idempotency_key", 1)],
+            unique=True,
+            partialFilterExpression={"idempotency_key": {"$type": "string"}},
+            background=True
+        )
+        await db[JOBS_COLLECTION].create_index("expires_at", expireAfterSeconds=0, background=True)
+    except Exception as e:
+        logger.warning(f"[JOB_QUEUE] index creation failed: {e}")
@@ -0,0 +1,189 @@
+"""
+Liquidity Index - Per-symbol liquidity summary of the latest EOD snapshot
+=========================================================================
+
+Rebuilt after each COMPLETED EOD pipeline run from that run's symbol_snapshot
+docs, so the precomputed scans can pick their universe from the full
+snapshotted universe with one indexed query instead of a hard-coded list.
+
+DATABASE:
+- Collection: symbol_liquidity (one doc per symbol, latest run only)
+- Doc: {symbol, run_id, as_of, price, price_band, avg_volume, market_cap, is_etf,
+        has_leaps, call_oi_total, short_call_oi, leaps_call_oi, quoted_calls,
+        median_spread_pct, liquidity_score, liquidity_rank, updated_at}
+  - short_call_oi / median_spread_pct : calls with dte <= SHORT_DTE_MAX (the CC legs)
+  - leaps_call_oi                     : calls with dte >= LEAPS_DTE_MIN (PMCC long legs)
+  - liquidity_score                   : log10(avg_volume) + log10(short_call_oi)
+                                        - median_spread_pct / 10
+Symbols that are not in the new run are removed.
+"""
+
+import logging
+import math
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from pymongo import UpdateOne
+
+from .chain_codec import chain_projection, snapshot_chains
+
+logger = logging.getLogger(__name__)
+
+LIQUIDITY_COLLECTION = "symbol_liquidity"
+
+SHORT_DTE_MAX = 90
+LEAPS_DTE_MIN = 180
+CHAIN_CALL_FIELDS = ("bid", "ask", "openInterest")
+WRITE_BATCH = 500
+
+PRICE_BANDS = (
+    (10, "under_10"),
+    (50, "10_50"),
+    (200, "50_200"),
+    (500, "200_500"),
+    (float("inf"), "over_500"),
+)
+
+
+def price_band(price: Optional[float]) -> Optional[str]:
+    if not price or price <= 0:
+        return None
+    for upper, label in PRICE_BANDS:
+        if price < upper:
+            return label
+    return None
+
+
+def snapshot_projection() -> Dict[str, int]:
+    return {
+        "_id": 0, "symbol": 1, "underlying_price": 1, "avg_volume": 1, "market_cap": 1,
+        "is_etf": 1, "has_leaps": 1, "as_of": 1,
+        **chain_projection(CHAIN_CALL_FIELDS, sides=("calls",)),
+    }
+
+
+def _num(value) -> float:
+    try:
+        value = float(value or 0)
+    except (TypeError, ValueError):
+        return 0.0
+    return value if math.isfinite(value) else 0.0
+
+
+def summarize_snapshot(doc: Dict[str, Any]) -> Dict[str, Any]:
+    """Liquidity summary of one symbol_snapshot doc."""
+    short_oi = leaps_oi = total_oi = 0.0
+    spreads: List[float] = []
+    quoted = 0
+    for chain in snapshot_chains(doc, CHAIN_CALL_FIELDS, sides=("calls",)):
+        dte = int(chain.get("dte") or 0)
+        for call in chain.get("calls") or []:
+            oi = _num(call.get("openInterest"))
+            total_oi += oi
+            if dte >= LEAPS_DTE_MIN:
+                leaps_oi += oi
+            if dte > SHORT_DTE_MAX:
+                continue
+            short_oi += oi
+            bid, ask = _num(call.get("bid")), _num(call.get("ask"))
+            if bid > 0 and ask >= bid:
+                quoted += 1
+                spreads.append((ask - bid) / ((ask + bid) / 2) * 100)
+
+    price = _num(doc.get("underlying_price"))
+    avg_volume = _num(doc.get("avg_volume"))
+    median_spread = float(np.median(spreads)) if spreads else None
+    score = (
+        math.log10(avg_volume + 1)
+        + math.log10(short_oi + 1)
+        - (median_spread if median_spread is not None else 100.0) / 10
+    )
+    return {
+        "symbol": doc["symbol"],
+        "as_of": doc.get("as_of"),
+        "price": round(price, 4),
+        "price_band": price_band(price),
+        "avg_volume": avg_volume,
+        "market_cap": _num(doc.get("market_cap")),
+        "is_etf": bool(doc.get("is_etf")),
+        "has_leaps": bool(doc.get("has_leaps")),
+        "call_oi_total": int(total_oi),
+        "short_call_oi": int(short_oi),
+        "leaps_call_oi": int(leaps_oi),
+        "quoted_calls": quoted,
+        "median_spread_pct": round(median_spread, 2) if median_spread is not None else None,
+        "liquidity_score": round(score, 4),
+    }
+
+
+async def rebuild_liquidity_index(db, run_id: str) -> Dict[str, Any]:
+    """Recompute symbol_liquidity from one EOD run's symbol_snapshot docs."""
+    started = datetime.now(timezone.utc)
+    rows: List[Dict[str, Any]] = []
+    cursor = db.symbol_snapshot.find({"run_id": run_id}, snapshot_projection()).batch_size(50)
+    async for doc in cursor:
+        rows.append(summarize_snapshot(doc))
+
+    if not rows:
+        logger.warning(f"[LIQUIDITY_INDEX] run_id={run_id} has no snapshots; index left unchanged")
+        return {"run_id": run_id, "symbols": 0}
+
+    rows.sort(key=lambda r: r["liquidity_score"], reverse=True)
+    updated_at = started.isoformat()
+    ops = []
+    for rank, row in enumerate(rows, start=1):
+        row.update({"run_id": run_id, "liquidity_rank": rank, "updated_at": updated_at})
+        ops.append(UpdateOne({"symbol": row["symbol"]}, {"$set": row}, upsert=True))
+    for i in range(0, len(ops), WRITE_BATCH):
+        await db[LIQUIDITY_COLLECTION].bulk_write(ops[i:i + WRITE_BATCH], ordered=False)
+
+    removed = await db[LIQUIDITY_COLLECTION].delete_many({"run_id": {"$ne": run_id}})
+    elapsed = (datetime.now(timezone.utc) - started).total_seconds()
+    logger.info(f"[LIQUIDITY_INDEX] run_id={run_id}: {len(rows)} symbols indexed, "
+                f"{getattr(removed, 'deleted_count', 0)} removed in {elapsed:.1f}s")
+    return {"run_id": run_id, "symbols": len(rows), "removed": getattr(removed, "deleted_count", 0)}
+
+
+async def select_liquid_symbols(
+    db,
+    min_avg_volume: float = 0,
+    min_price: Optional[float] = None,
+    max_price: Optional[float] = None,
+    min_short_call_oi: int = 0,
+    max_median_spread_pct: Optional[float] = None,
+    require_leaps: bool = False,
+    limit: int = 0,
+) -> List[str]:
+    """Symbols passing the liquidity thresholds, most liquid first."""
+    query: Dict[str, Any] = {}
+    if min_avg_volume:
+        query["avg_volume"] = {"$gte": min_avg_volume}
+    if min_price is not None or max_price is not None:
+        query["price"] = {}
+        if min_price is not None:
+            query["price"]["$gte"] = min_price
+        if max_price is not None:
+            query["price"]["$lte"] = max_price
+    if min_short_call_oi:
+        query["short_call_oi"] = {"$gte": min_short_call_oi}
+    if max_median_spread_pct is not None:
+        query["median_spread_pct"] = {"$lte": max_median_spread_pct}
+    if require_leaps:
+        query["has_leaps"] = True
+
+    cursor = db[LIQUIDITY_COLLECTION].find(query, {"_id": 0, "symbol": 1}).sort("liquidity_score", -1)
+    if limit:
+        cursor = cursor.limit(limit)
+    docs = await cursor.to_list(length=limit or None)
+    return [d["symbol"] for d in docs]
+
+
+async def ensure_liquidity_indexes(db) -> None:
+    try:
+        await db[LIQUIDITY_COLLECTION].create_index("symbol", unique=True, background=True)
+        await db[LIQUIDITY_COLLECTION].create_index([("liquidity_score", -1)], background=True)
+        await db[LIQUIDITY_COLLECTION].create_index([("avg_volume", -1), ("price", 1)], background=True)
+        await db[LIQUIDITY_COLLECTION].create_index([("run_id", 1)], background=True)
+    except Exception as e:
+        logger.warning(f"[LIQUIDITY_INDEX] index creation failed: {e}")
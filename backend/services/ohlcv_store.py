@@ -0,0 +1,333 @@
+"""
+OHLCV Store - Local daily bar history with incremental append
+=============================================================
+
+fetch_technical_data (precomputed scans) and the symbol enrichment job used
+to download a full year of daily bars per symbol every night although only
+one new bar exists since the previous run. This store downloads history
+once, then appends only the bars after the last stored session.
+
+DATABASE:
+- Collection: ohlcv_daily    one columnar doc per (symbol, year):
+    {symbol, year, dates[], open[], high[], low[], close[], volume[], last_date}
+  New bars are appended with $push/$each (no rewrite of the year).
+- Collection: ohlcv_symbols  one meta doc per symbol:
+    {symbol, first_date, last_date, last_checked_session, bars, updated_at}
+
+SYNC RULES:
+- No stored history          -> full download (INITIAL_PERIOD)
+- last_checked_session is the latest completed session -> no Yahoo call
+- Otherwise                  -> download from a small overlap before last_date;
+  if the overlapping closes no longer match (split / dividend re-adjustment
+  of Yahoo's adjusted prices) the symbol is rebuilt with a full download.
+- Only completed sessions are stored (no partial intraday bar).
+
+Readers get contiguous NumPy arrays (OHLCVBars) - SMA/RSI/ATR/ADX inputs.
+"""
+
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+from pymongo import UpdateOne
+
+logger = logging.getLogger(__name__)
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+BARS_COLLECTION = "ohlcv_daily"
+META_COLLECTION = "ohlcv_symbols"
+
+INITIAL_PERIOD = "2y"
+DEFAULT_LOOKBACK_BARS = 260  # ~1 trading year, what the scans used via period="1y"
+# Bars re-downloaded before last_date to detect split/dividend re-adjustment
+OVERLAP_DAYS = 7
+ADJUSTMENT_TOLERANCE = 0.005
+
+OHLCV_FIELDS = ("open", "high", "low", "close", "volume")
+
+
+# =============================================================================
+# BARS CONTAINER
+# =============================================================================
+
+@dataclass
+class OHLCVBars:
+    """Daily bars as contiguous arrays, oldest first."""
+    dates: List[str] = field(default_factory=list)
+    open: np.ndarray = field(default_factory=lambda: np.empty(0))
+    high: np.ndarray = field(default_factory=lambda: np.empty(0))
+    low: np.ndarray = field(default_factory=lambda: np.empty(0))
+    close: np.ndarray = field(default_factory=lambda: np.empty(0))
+    volume: np.ndarray = field(default_factory=lambda: np.empty(0))
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    @property
+    def last_date(self) -> Optional[str]:
+        return self.dates[-1] if self.dates else None
+
+    @classmethod
+    def from_columns(cls, dates, open_, high, low, close, volume) -> "OHLCVBars":
+        return cls(
+            dates=list(dates),
+            open=np.ascontiguousarray(open_, dtype=np.float64),
+            high=np.ascontiguousarray(high, dtype=np.float64),
+            low=np.ascontiguousarray(low, dtype=np.float64),
+            close=np.ascontiguousarray(close, dtype=np.float64),
+            volume=np.ascontiguousarray(volume, dtype=np.float64),
+        )
+
+    @classmethod
+    def from_history(cls, hist: pd.DataFrame) -> "OHLCVBars":
+        """Build from a yfinance ticker.history() frame."""
+        if hist is None or hist.empty:
+            return cls()
+        hist = hist.dropna(subset=["Close"])
+        dates = [ts.strftime("%Y-%m-%d") for ts in hist.index]
+        return cls.from_columns(
+            dates, hist["Open"].values, hist["High"].values, hist["Low"].values,
+            hist["Close"].values, hist["Volume"].values,
+        )
+
+    def slice(self, start: int, stop: Optional[int] = None) -> "OHLCVBars":
+        return OHLCVBars.from_columns(
+            self.dates[start:stop], self.open[start:stop], self.high[start:stop],
+            self.low[start:stop], self.close[start:stop], self.volume[start:stop],
+        )
+
+    def tail(self, n: int) -> "OHLCVBars":
+        return self.slice(max(0, len(self) - n))
+
+    def after(self, date_str: Optional[str]) -> "OHLCVBars":
+        """Bars strictly after `date_str`."""
+        if not date_str:
+            return self
+        idx = next((i for i, d in enumerate(self.dates) if d > date_str), len(self))
+        return self.slice(idx)
+
+    def through(self, date_str: str) -> "OHLCVBars":
+        """Bars on or before `date_str`."""
+        idx = next((i for i, d in enumerate(self.dates) if d > date_str), len(self))
+        return self.slice(0, idx)
+
+    def concat(self, other: "OHLCVBars") -> "OHLCVBars":
+        if not len(other):
+            return self
+        if not len(self):
+            return other
+        return OHLCVBars.from_columns(
+            self.dates + other.dates,
+            np.concatenate([self.open, other.open]),
+            np.concatenate([self.high, other.high]),
+            np.concatenate([self.low, other.low]),
+            np.concatenate([self.close, other.close]),
+            np.concatenate([self.volume, other.volume]),
+        )
+
+    def to_frame(self) -> pd.DataFrame:
+        """Frame with yfinance column names, for code written against ticker.history()."""
+        return pd.DataFrame(
+            {"Open": self.open, "High": self.high, "Low": self.low,
+             "Close": self.close, "Volume": self.volume},
+            index=pd.to_datetime(self.dates),
+        )
+
+
+# =============================================================================
+# SESSION HELPERS
+# =============================================================================
+
+def last_completed_session(now: Optional[datetime] = None) -> str:
+    """YYYY-MM-DD of the latest session whose daily bar is final (weekday rules, no holidays)."""
+    from .data_provider import get_last_trading_day_et, now_et
+
+    n = now or now_et()
+    session = get_last_trading_day_et(n)
+    if session == n.strftime("%Y-%m-%d") and n.hour * 60 + n.minute < 16 * 60:
+        # Today's bar is still forming - step back one weekday
+        d = datetime.strptime(session, "%Y-%m-%d") - timedelta(days=1)
+        while d.weekday() >= 5:
+            d -= timedelta(days=1)
+        session = d.strftime("%Y-%m-%d")
+    return session
+
+
+def overlap_matches(stored: OHLCVBars, fresh: OHLCVBars) -> bool:
+    """True when re-downloaded bars agree with stored closes on shared dates."""
+    stored_close = dict(zip(stored.dates, stored.close))
+    shared = [(stored_close[d], c) for d, c in zip(fresh.dates, fresh.close) if d in stored_close]
+    for old, new in shared:
+        if old > 0 and abs(new - old) / old > ADJUSTMENT_TOLERANCE:
+            return False
+    return True
+
+
+# =============================================================================
+# YAHOO DOWNLOAD (blocking - run in an executor)
+# =============================================================================
+
+def download_bars_sync(symbol: str, period: Optional[str] = None, start: Optional[str] = None) -> OHLCVBars:
+    import yfinance as yf
+
+    ticker = yf.Ticker(symbol)
+    if start:
+        hist = ticker.history(start=start, auto_adjust=True)
+    else:
+        hist = ticker.history(period=period or INITIAL_PERIOD, auto_adjust=True)
+    return OHLCVBars.from_history(hist)
+
+
+# =============================================================================
+# STORAGE
+# =============================================================================
+
+def _group_by_year(bars: OHLCVBars) -> Dict[int, OHLCVBars]:
+    groups: Dict[int, List[int]] = {}
+    for i, d in enumerate(bars.dates):
+        groups.setdefault(int(d[:4]), []).append(i)
+    return {
+        year: OHLCVBars.from_columns(
+            [bars.dates[i] for i in idx], bars.open[idx], bars.high[idx],
+            bars.low[idx], bars.close[idx], bars.volume[idx],
+        )
+        for year, idx in ((y, np.array(ix)) for y, ix in groups.items())
+    }
+
+
+def _columns(bars: OHLCVBars) -> Dict[str, list]:
+    cols = {"dates": list(bars.dates)}
+    for f in OHLCV_FIELDS:
+        cols[f] = [float(v) for v in getattr(bars, f)]
+    return cols
+
+
+async def _write_meta(db, symbol: str, first_date: Optional[str], last_date: Optional[str], session: str, n_bars_inc: int = 0, replace_count: Optional[int] = None):
+    update: Dict[str, Any] = {"$set": {
+        "symbol": symbol,
+        "last_checked_session": session,
+        "updated_at": datetime.now(timezone.utc).isoformat(),
+    }}
+    if last_date:
+        update["$set"]["last_date"] = last_date
+    if first_date:
+        update["$min"] = {"first_date": first_date}
+    if replace_count is not None:
+        update["$set"]["bars"] = replace_count
+    elif n_bars_inc:
+        update["$inc"] = {"bars": n_bars_inc}
+    await db[META_COLLECTION].update_one({"symbol": symbol}, update, upsert=True)
+
+
+async def replace_history(db, symbol: str, bars: OHLCVBars, session: str) -> None:
+    """Replace all stored bars for a symbol (initial load / re-adjustment)."""
+    await db[BARS_COLLECTION].delete_many({"symbol": symbol})
+    docs = [
+        {"symbol": symbol, "year": year, "last_date": chunk.last_date, **_columns(chunk)}
+        for year, chunk in sorted(_group_by_year(bars).items())
+    ]
+    if docs:
+        await db[BARS_COLLECTION].insert_many(docs)
+    await db[META_COLLECTION].delete_one({"symbol": symbol})
+    await _write_meta(db, symbol, bars.dates[0] if bars.dates else None, bars.last_date, session, replace_count=len(bars))
+
+
+async def append_bars(db, symbol: str, bars: OHLCVBars, session: str) -> None:
+    """Append new bars (strictly after the stored last_date) to the year buckets."""
+    ops = []
+    for year, chunk in sorted(_group_by_year(bars).items()):
+        cols = _columns(chunk)
+        ops.append(UpdateOne(
+            {"symbol": symbol, "year": year},
+            {"$push": {k: {"$each": v} for k, v in cols.items()}, "$set": {"last_date": chunk.last_date}},
+            upsert=True
+        ))
+    if ops:
+        await db[BARS_COLLECTION].bulk_write(ops, ordered=True)
+    await _write_meta(db, symbol, bars.dates[0] if bars.dates else None, bars.last_date, session, n_bars_inc=len(bars))
+
+
+async def load_bars(db, symbol: str, lookback_bars: Optional[int] = DEFAULT_LOOKBACK_BARS) -> OHLCVBars:
+    """Stored bars for a symbol, oldest first, trimmed to the last `lookback_bars`."""
+    query: Dict[str, Any] = {"symbol": symbol}
+    if lookback_bars:
+        # ~252 bars per year; one extra year covers a partial current year
+        min_year = datetime.now(timezone.utc).year - (lookback_bars // 252 + 1)
+        query["year"] = {"$gte": min_year}
+    docs = await db[BARS_COLLECTION].find(query, {"_id": 0}).sort("year", 1).to_list(length=20)
+
+    bars = OHLCVBars()
+    for doc in docs:
+        bars = bars.concat(OHLCVBars.from_columns(
+            doc.get("dates", []), doc.get("open", []), doc.get("high", []),
+            doc.get("low", []), doc.get("close", []), doc.get("volume", []),
+        ))
+    return bars.tail(lookback_bars) if lookback_bars else bars
+
+
+# =============================================================================
+# SYNC
+# =============================================================================
+
+async def sync_symbol(
+    db,
+    symbol: str,
+    executor=None,
+    lookback_bars: Optional[int] = DEFAULT_LOOKBACK_BARS,
+    session: Optional[str] = None
+) -> OHLCVBars:
+    """
+    Bring a symbol's stored history up to the latest completed session and
+    return the last `lookback_bars` bars.
+
+    Yahoo is called at most once: never when already current, a short
+    overlap download for the daily append, a full download on first use or
+    after a price re-adjustment.
+    """
+    session = session or last_completed_session()
+    loop = asyncio.get_event_loop()
+    meta = await db[META_COLLECTION].find_one({"symbol": symbol}, {"_id": 0})
+
+    if meta and meta.get("last_checked_session", "") >= session:
+        return await load_bars(db, symbol, lookback_bars)
+
+    if not meta or not meta.get("last_date"):
+        fresh = (await loop.run_in_executor(executor, download_bars_sync, symbol, INITIAL_PERIOD, None)).through(session)
+        await replace_history(db, symbol, fresh, session)
+        logger.debug(f"[OHLCV] {symbol}: initial load {len(fresh)} bars")
+        return fresh.tail(lookback_bars) if lookback_bars else fresh
+
+    stored = await load_bars(db, symbol, lookback_bars)
+    start = (datetime.strptime(meta["last_date"], "%Y-%m-%d") - timedelta(days=OVERLAP_DAYS)).strftime("%Y-%m-%d")
+    fresh = (await loop.run_in_executor(executor, download_bars_sync, symbol, None, start)).through(session)
+
+    if not overlap_matches(stored, fresh):
+        logger.info(f"[OHLCV] {symbol}: adjusted prices changed (split/dividend) - rebuilding history")
+        full = (await loop.run_in_executor(executor, download_bars_sync, symbol, INITIAL_PERIOD, None)).through(session)
+        await replace_history(db, symbol, full, session)
+        return full.tail(lookback_bars) if lookback_bars else full
+
+    new_bars = fresh.after(meta["last_date"])
+    if len(new_bars):
+        await append_bars(db, symbol, new_bars, session)
+    else:
+        # Holiday / no new session - remember we checked so we don't re-ask today
+        await _write_meta(db, symbol, None, None, session)
+
+    combined = stored.concat(new_bars)
+    return combined.tail(lookback_bars) if lookback_bars else combined
+
+
+async def ensure_ohlcv_indexes(db) -> None:
+    try:
+        await db[BARS_COLLECTION].create_index([("symbol", 1), ("year", 1)], unique=True, background=True)
+        await db[META_COLLECTION].create_index("symbol", unique=True, background=True)
+    except Exception as e:
+        logger.warning(f"[OHLCV] index creation failed: {e}")
@@ -16,7 +16,10 @@ DATA SOURCES:
 
 ARCHITECTURE:
 - Nightly job runs at 4:45 PM ET (after market close)
-- Results stored in MongoDB `precomputed_scans` collection
+- Results stored as rows in `precomputed_scan_rows`, versioned by a scan_id
+  pointer per profile in `precomputed_scans` (services/scan_store.py)
+- Technicals/fundamentals computed once per symbol per night into
+  `symbol_features` (services/feature_store.py) and shared by all profiles
 - User clicks → instant fetch from DB
 
 SCAN TIMEOUT FIX (December 2025):
@@ -28,20 +31,26 @@ SCAN TIMEOUT FIX (December 2025):
 """
 
 import json
+import os
 from collections import defaultdict
 import asyncio
 import logging
 import aiohttp
 import httpx
 import pytz
+import time
 import uuid
 from datetime import datetime, timezone, timedelta
 from typing import Dict, List, Any, Optional, Tuple
 import yfinance as yf
-import pandas as pd
 import numpy as np
 from concurrent.futures import ThreadPoolExecutor
 
+try:
+    import resource
+except ImportError:  # not on Windows dev boxes
+    resource = None
+
 # Import centralized market status helper
 from .data_provider import is_market_closed
 
@@ -57,6 +66,24 @@ from .resilient_fetch import (
     YAHOO_MAX_RETRIES
 )
 
+# Nightly per-symbol feature table shared by all scan profiles
+from .feature_store import (
+    load_features,
+    save_features,
+    build_feature_doc,
+    etf_fundamentals,
+    today_as_of
+)
+
+# Local daily-bar history (incremental append instead of nightly 1y downloads)
+from .ohlcv_store import sync_symbol, DEFAULT_LOOKBACK_BARS
+from .scan_store import publish_scan, read_scan
+from .scan_dedupe import assign_profiles, best_per_symbol, profile_fit
+from .scan_options_provider import SnapshotOptionsProvider, PARTITION_SIZE
+from .liquidity_index import select_liquid_symbols
+from .process_pool import process_pool, shutdown_pool
+from . import indicators
+
 # Import universe builder for ETF detection
 from utils.universe import is_etf, get_scan_universe, get_tier_counts
 
@@ -128,6 +155,36 @@ HTTP_TIMEOUT = httpx.Timeout(30.0, connect=10.0)
 STOCK_API_RATE_LIMIT = 5
 STOCK_API_RATE_WINDOW = 60  # seconds
 
+# Universe selection from the liquidity index (see get_liquid_symbols)
+LIQUIDITY_MIN_AVG_VOLUME = float(os.environ.get("PRECOMPUTED_MIN_AVG_VOLUME", "1000000"))
+LIQUIDITY_MIN_PRICE = float(os.environ.get("PRECOMPUTED_MIN_PRICE", "10"))
+LIQUIDITY_MIN_SHORT_CALL_OI = int(os.environ.get("PRECOMPUTED_MIN_SHORT_CALL_OI", "1000"))
+LIQUIDITY_MAX_MEDIAN_SPREAD_PCT = float(os.environ.get("PRECOMPUTED_MAX_MEDIAN_SPREAD_PCT", "15"))
+PRECOMPUTED_UNIVERSE_LIMIT = int(os.environ.get("PRECOMPUTED_UNIVERSE_LIMIT", "0"))  # 0 = no cap
+
+# Worker processes scoring the six profiles of a partition (<= 1: on the event loop)
+PRECOMPUTED_SCAN_WORKERS = int(os.environ.get("PRECOMPUTED_SCAN_WORKERS", str(min(6, os.cpu_count() or 1))))
+
+# Opportunities kept per profile (per partition, then again after merging)
+SCAN_RESULT_LIMIT = 50
+
+
+def _process_memory_mb() -> Tuple[Optional[float], Optional[float]]:
+    """(current RSS, peak RSS) of this process in MB; None where the OS doesn't expose it."""
+    current = peak = None
+    try:
+        with open("/proc/self/statm") as f:
+            current = int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1e6
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # KB on Linux
+    return current, peak
+
+
+def _fmt_mb(value: Optional[float]) -> str:
+    return f"{value:.0f}MB" if value is not None else "n/a"
+
 # Risk profile configurations
 RISK_PROFILES = {
     "conservative": {
@@ -295,9 +352,31 @@ class PrecomputedScanService:
     async def get_liquid_symbols(self) -> List[str]:
         """
         Get liquidity-filtered symbol universe.
-        Applies filters: 2M+ avg volume, $10-500 price range.
-        Returns ~150-250 most liquid symbols.
+
+        Selected from the symbol_liquidity index (services/liquidity_index.py),
+        rebuilt after every COMPLETED EOD run over the full snapshotted
+        universe: avg volume, short-dated call OI, median call spread and a
+        price floor, most liquid first (PRECOMPUTED_UNIVERSE_LIMIT caps it).
+        Falls back to the curated list below until the index exists.
         """
+        try:
+            symbols = await select_liquid_symbols(
+                self.db,
+                min_avg_volume=LIQUIDITY_MIN_AVG_VOLUME,
+                min_price=LIQUIDITY_MIN_PRICE,
+                min_short_call_oi=LIQUIDITY_MIN_SHORT_CALL_OI,
+                max_median_spread_pct=LIQUIDITY_MAX_MEDIAN_SPREAD_PCT,
+                limit=PRECOMPUTED_UNIVERSE_LIMIT,
+            )
+        except Exception as e:
+            logger.warning(f"Liquidity index query failed, using curated universe: {e}")
+            symbols = []
+        if symbols:
+            return symbols
+        return self._curated_liquid_symbols()
+
+    def _curated_liquid_symbols(self) -> List[str]:
+        """Curated fallback universe (~150 names) used before the liquidity index is built."""
         # Start with a broad universe of liquid stocks
         # This list is curated for options liquidity
         base_universe = [
@@ -343,45 +422,42 @@ class PrecomputedScanService:
 
     async def fetch_technical_data(self, symbol: str) -> Optional[Dict[str, Any]]:
         """
-        Fetch technical indicators for a symbol using Yahoo Finance.
+        Compute technical indicators for a symbol from the local OHLCV store
+        (services/ohlcv_store.py, synced incrementally from Yahoo Finance).
         Returns SMA50, SMA200, RSI14, ATR14, volume data.
 
         GLOBAL CONSISTENCY: Uses get_underlying_price_yf() for close price.
         """
         try:
+            # Daily bars from the local OHLCV store: one incremental append per
+            # night instead of a full 1y download (~1 trading year for SMA200)
+            bars = await sync_symbol(self.db, symbol, self._executor, lookback_bars=DEFAULT_LOOKBACK_BARS)
+
             def _fetch_yahoo():
                 # Import shared helper inside thread to avoid circular imports
                 from .yf_pricing import get_underlying_price_yf
                 from .data_provider import get_market_state
 
-                ticker = yf.Ticker(symbol)
-                # Get 200 days of history for SMA200
-                hist = ticker.history(period="1y")
-                if hist.empty or len(hist) < 50:
+                if len(bars) < 50:
                     return None
 
-                # Calculate SMAs
-                hist['SMA20'] = hist['Close'].rolling(window=20).mean()
-                hist['SMA50'] = hist['Close'].rolling(window=50).mean()
-                hist['SMA200'] = hist['Close'].rolling(window=200).mean()
-
-                # Calculate RSI (14-period)
-                delta = hist['Close'].diff()
-                gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
-                loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
-                rs = gain / loss
-                hist['RSI14'] = 100 - (100 / (1 + rs))
-
-                # Calculate ATR (14-period)
-                high_low = hist['High'] - hist['Low']
-                high_close = (hist['High'] - hist['Close'].shift()).abs()
-                low_close = (hist['Low'] - hist['Close'].shift()).abs()
-                tr = pd.concat(
-                    [high_low, high_close, low_close], axis=1).max(axis=1)
-                hist['ATR14'] = tr.rolling(window=14).mean()
-
-                # Calculate daily change % for gap detection
-                hist['daily_change_pct'] = hist['Close'].pct_change().abs()
+                # Indicators straight from the stored float64 arrays (services/indicators.py)
+                closes = bars.close
+
+                def _last(series):
+                    value = series[-1] if len(series) else np.nan
+                    return float(value) if np.isfinite(value) else None
+
+                sma20 = _last(indicators.sma(closes, 20))
+                sma50 = _last(indicators.sma(closes, 50))
+                sma200 = _last(indicators.sma(closes, 200))
+                rsi14 = _last(indicators.rsi_sma(closes, 14))
+                atr14 = _last(indicators.atr_sma(bars.high, bars.low, closes, 14))
+
+                # Daily change % for gap detection (last 10 days)
+                daily_change_pct = np.abs(np.diff(closes[-11:]) / closes[-11:-1])
+                daily_change_pct = daily_change_pct[np.isfinite(daily_change_pct)]
+                max_gap_10d = float(daily_change_pct.max()) if len(daily_change_pct) else None
 
                 # ============================================================
                 # GLOBAL CONSISTENCY: Use shared yf_pricing helper for close
@@ -393,7 +469,7 @@ class PrecomputedScanService:
 
                 if close is None or close <= 0:
                     # Fallback to history if helper fails
-                    close = float(hist['Close'].iloc[-1])
+                    close = float(closes[-1])
                     field_used = "history_fallback"
 
                 # Log for verification (NVDA only for debugging)
@@ -401,30 +477,25 @@ class PrecomputedScanService:
                     logger.info(f"[PRECOMPUTED_PRICE_CHECK] symbol={symbol} market_state={market_state} "
                                 f"helper_price={close} field_used={field_used} price_time={price_time}")
 
-                # Get technical indicators from last row (for SMA/RSI/ATR)
-                latest = hist.iloc[-1]
-
                 # Calculate 20-day average volume
-                avg_volume_20d = hist['Volume'].tail(20).mean()
-
-                # Check for gaps in last 10 days
-                max_gap_10d = hist['daily_change_pct'].tail(10).max()
+                volume = float(bars.volume[-1])
+                avg_volume_20d = float(bars.volume[-20:].mean())
 
                 # NOTE: 'close' comes from shared helper, NOT reassigned here
                 return {
                     "symbol": symbol,
                     "close": float(close),  # From get_underlying_price_yf()
                     "close_field_used": field_used,  # Track which field was used
-                    "sma20": float(latest['SMA20']) if pd.notna(latest['SMA20']) else None,
-                    "sma50": float(latest['SMA50']) if pd.notna(latest['SMA50']) else None,
-                    "sma200": float(latest['SMA200']) if pd.notna(latest['SMA200']) else None,
-                    "rsi14": float(latest['RSI14']) if pd.notna(latest['RSI14']) else None,
-                    "atr14": float(latest['ATR14']) if pd.notna(latest['ATR14']) else None,
-                    "atr_pct": float(latest['ATR14'] / close) if pd.notna(latest['ATR14']) and close > 0 else None,
-                    "volume": int(latest['Volume']),
-                    "avg_volume_20d": float(avg_volume_20d),
-                    "max_gap_10d": float(max_gap_10d) if pd.notna(max_gap_10d) else 0,
-                    "volume_above_avg": latest['Volume'] > avg_volume_20d,
+                    "sma20": sma20,
+                    "sma50": sma50,
+                    "sma200": sma200,
+                    "rsi14": rsi14,
+                    "atr14": atr14,
+                    "atr_pct": atr14 / close if atr14 is not None and close > 0 else None,
+                    "volume": int(volume),
+                    "avg_volume_20d": avg_volume_20d,
+                    "max_gap_10d": max_gap_10d if max_gap_10d is not None else 0,
+                    "volume_above_avg": volume > avg_volume_20d,
                     "timestamp": datetime.now(timezone.utc).isoformat()
                 }
 
@@ -539,8 +610,69 @@ class PrecomputedScanService:
                 f"Failed to fetch fundamental data for {symbol}: {e}")
             return None
 
+    # ==================== FEATURE STORE ====================
+
+    async def build_feature_table(
+        self,
+        symbols: List[str],
+        as_of: Optional[str] = None,
+        refresh: bool = False
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Per-symbol technicals + fundamentals for all scan profiles.
+
+        Rows already persisted in symbol_features for `as_of` are reused;
+        only missing symbols are fetched (concurrently, through
+        ResilientYahooFetcher, so the scan semaphore / timeout / retry rules
+        still apply) and then persisted for the rest of the night's profiles.
+
+        Returns:
+            {symbol: {"technical": dict|None, "fundamental": dict|None, "is_etf": bool}}
+        """
+        as_of = as_of or today_as_of()
+        table = {} if refresh else await load_features(self.db, symbols, as_of)
+        missing = [s for s in symbols if s not in table]
+
+        if missing:
+            fetcher = ResilientYahooFetcher(scan_type="feature_store", run_id=f"features_{as_of}")
+            fetcher.set_total_symbols(len(missing))
+
+            async def _fetch_symbol(symbol: str) -> Dict[str, Any]:
+                # ETFs don't have traditional fundamentals (market cap, P/E, EPS)
+                if is_etf(symbol):
+                    technical = await fetcher.fetch(symbol, self.fetch_technical_data, symbol)
+                    fundamental = etf_fundamentals(symbol)
+                else:
+                    technical, fundamental = await asyncio.gather(
+                        fetcher.fetch(symbol, self.fetch_technical_data, symbol),
+                        fetcher.fetch(symbol, self.fetch_fundamental_data, symbol),
+                    )
+                return build_feature_doc(symbol, as_of, technical, fundamental, is_etf(symbol))
+
+            # All symbols are issued at once; the shared scan semaphore
+            # (YAHOO_SCAN_MAX_CONCURRENCY) is the fetch budget that bounds
+            # how many Yahoo calls are actually in flight.
+            new_rows = await asyncio.gather(*[_fetch_symbol(s) for s in missing])
+            for row in new_rows:
+                table[row["symbol"]] = row
+
+            fetcher.get_stats().log_summary()
+            await save_features(self.db, new_rows)
+
+        logger.info(
+            f"[FEATURE_STORE] as_of={as_of}: {len(symbols) - len(missing)} reused, {len(missing)} fetched")
+        return table
+
     # ==================== OPTIONS DATA ====================
 
+    def options_provider(self) -> SnapshotOptionsProvider:
+        """
+        Option chains for the nightly scans, read from the EOD snapshot
+        (services/scan_options_provider.py). Live Yahoo/Polygon fetches below
+        are only used as a fallback when PRECOMPUTED_LIVE_OPTIONS_FALLBACK is set.
+        """
+        return SnapshotOptionsProvider(self.db, live_fetcher=self)
+
     async def fetch_options_for_scan(
         self,
         symbol: str,
@@ -872,7 +1004,8 @@ class PrecomputedScanService:
 
     # ==================== FILTER LOGIC ====================
 
-    def passes_technical_filters(self, tech_data: Dict, profile: Dict) -> Tuple[bool, str]:
+    @staticmethod
+    def passes_technical_filters(tech_data: Dict, profile: Dict) -> Tuple[bool, str]:
         """Check if symbol passes technical filters for given risk profile."""
         if not tech_data:
             return False, "No technical data"
@@ -924,7 +1057,8 @@ class PrecomputedScanService:
 
         return True, "Passed"
 
-    def passes_fundamental_filters(self, fund_data: Dict, profile: Dict) -> Tuple[bool, str]:
+    @staticmethod
+    def passes_fundamental_filters(fund_data: Dict, profile: Dict) -> Tuple[bool, str]:
         """Check if symbol passes fundamental filters."""
         if not fund_data:
             return False, "No fundamental data"
@@ -972,7 +1106,9 @@ class PrecomputedScanService:
     async def run_covered_call_scan(
         self,
         risk_profile: str = "conservative",
-        snapshots: Optional[Dict[str, Dict]] = None
+        snapshots: Optional[Dict[str, Dict]] = None,
+        features: Optional[Dict[str, Dict]] = None,
+        universe: Optional[List[str]] = None
     ) -> List[Dict[str, Any]]:
         """
         Run a covered call scan for the given risk profile.
@@ -980,17 +1116,16 @@ class PrecomputedScanService:
 
         CACHE-ONLY (February 2026):
         - Reads from MongoDB daily_snapshots — zero Yahoo Finance calls.
-        - snapshots dict passed in from run_all_scans (loaded once).
+        - snapshots dict passed in from run_all_scans (one symbol partition
+          at a time, with that partition as `universe`).
         - Falls back to loading from DB if called standalone.
 
-        SCAN TIMEOUT FIX (December 2025):
-        - Uses bounded concurrency via semaphore
-        - Applies timeout/retry to each symbol fetch
-        - Continues on partial failure (logs failed symbols)
-        - Aggregates success/timeout/error counts
+        FEATURE STORE:
+        - Technicals/fundamentals come from build_feature_table() (shared by
+          all six profiles, fetched once per symbol per night).
+        - features dict passed in from run_all_scans; built (or loaded from
+          symbol_features) if called standalone.
         """
-        profile = RISK_PROFILES.get(
-            risk_profile, RISK_PROFILES["conservative"])
         run_id = f"cc_{risk_profile}_{datetime.now(timezone.utc).strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}"
 
         logger.info(
@@ -1000,261 +1135,29 @@ class PrecomputedScanService:
 
         # ── Load snapshots from MongoDB if not passed in ──────────────
         if snapshots is None:
-            today_str = datetime.now(timezone.utc).strftime("%Y-%m-%d")
-            raw_snaps = await self.db.daily_snapshots.find(
-                {"snapshot_date": today_str}
-            ).to_list(length=5000)
-            snapshots = {s["symbol"]: s for s in raw_snaps}
+            snapshots = await self.options_provider().load(
+                datetime.now(timezone.utc).strftime("%Y-%m-%d"))
 
         if not snapshots:
             logger.error(f"CC scan ({risk_profile}): no snapshots available")
             return []
 
         # Get symbol universe — limited to symbols present in snapshots
-        all_symbols = await self.get_liquid_symbols()
+        all_symbols = universe if universe is not None else await self.get_liquid_symbols()
         symbols = [s for s in all_symbols if s in snapshots]
         logger.info(
             f"Scanning {len(symbols)} symbols for {risk_profile} profile ({len(snapshots)} snapshots available)")
 
-        # Initialize resilient fetcher for this scan
-        fetcher = ResilientYahooFetcher(
-            scan_type=f"covered_call_{risk_profile}", run_id=run_id)
-        fetcher.set_total_symbols(len(symbols))
-
-        opportunities = []
-        stats = {
-            "total_symbols": len(symbols),
-            "passed_technical": 0,
-            "passed_fundamental": 0,
-            "passed_options": 0,
-            "failed_technical": [],
-            "failed_fundamental": [],
-            "failed_options": []
-        }
-
-        # Process symbols in batches with bounded concurrency
-        # The semaphore in resilient_fetch limits concurrent Yahoo calls
-        batch_size = 10
-        for i in range(0, len(symbols), batch_size):
-            batch = symbols[i:i + batch_size]
-
-            # Fetch technical and fundamental data with resilience
-            # Each call goes through the semaphore and has timeout/retry
-            tech_results = []
-            fund_results = []
-
-            for symbol in batch:
-                # Technical data fetch with resilience
-                tech_data = await fetcher.fetch(
-                    symbol,  # For logging
-                    self.fetch_technical_data,
-                    symbol  # Pass symbol as argument to fetch_technical_data
-                )
-                tech_results.append(tech_data)
-
-                # ================================================================
-                # ETF HANDLING: Skip fundamental fetch for ETFs
-                # ETFs don't have traditional fundamentals (market cap, P/E, EPS)
-                # Fetching would result in 404s or empty data
-                # ================================================================
-                if is_etf(symbol):
-                    # ETF: Use placeholder data, skip fundamental fetch
-                    fund_results.append(
-                        {"symbol": symbol, "is_etf": True, "fundamentals_skipped": True})
-                    logger.debug(f"ETF_FUNDAMENTALS_SKIPPED | symbol={symbol}")
-                else:
-                    # Stock: Fetch fundamental data with resilience
-                    fund_data = await fetcher.fetch(
-                        symbol,  # For logging
-                        self.fetch_fundamental_data,
-                        symbol  # Pass symbol as argument to fetch_fundamental_data
-                    )
-                    fund_results.append(fund_data)
-
-            for j, symbol in enumerate(batch):
-                tech_data = tech_results[j]
-                fund_data = fund_results[j]
-                symbol_is_etf = is_etf(symbol)
-
-                # Handle fetch failures gracefully (partial success)
-                if tech_data is None:
-                    stats["failed_technical"].append(
-                        (symbol, "Fetch failed/timeout"))
-                    continue
-
-                # Apply technical filters
-                tech_pass, tech_reason = self.passes_technical_filters(
-                    tech_data, profile)
-                if not tech_pass:
-                    stats["failed_technical"].append((symbol, tech_reason))
-                    continue
-                stats["passed_technical"] += 1
-
-                # ================================================================
-                # ETF HANDLING: Skip fundamental filters for ETFs
-                # ETFs pass fundamental stage automatically
-                # ================================================================
-                if symbol_is_etf:
-                    # ETF: Auto-pass fundamentals
-                    stats["passed_fundamental"] += 1
-                    logger.debug(
-                        f"ETF_FUNDAMENTALS_BYPASSED | symbol={symbol}")
-                else:
-                    # Stock: Apply fundamental filters
-                    # Handle fundamental fetch failure
-                    if fund_data is None:
-                        stats["failed_fundamental"].append(
-                            (symbol, "Fetch failed/timeout"))
-                        continue
-
-                    # Apply fundamental filters
-                    fund_pass, fund_reason = self.passes_fundamental_filters(
-                        fund_data, profile)
-                    if not fund_pass:
-                        stats["failed_fundamental"].append(
-                            (symbol, fund_reason))
-                        continue
-                    stats["passed_fundamental"] += 1
-
-                # ── Read options from snapshot (NO Yahoo call) ────────
-                current_price = tech_data.get("close", 0)
-                snap = snapshots.get(symbol, {})
-                raw_short_calls = snap.get("short_calls", [])
+        # ── Shared per-symbol features (computed once per night) ──
+        # Technicals/fundamentals come from the feature store; this
+        # profile is a pure in-memory filter/scorer over that table.
+        if features is None:
+            features = await self.build_feature_table(symbols)
 
-                if not raw_short_calls:
-                    stats["failed_options"].append(
-                        (symbol, "No short_calls in snapshot"))
-                    continue
+        return score_covered_call_profile(risk_profile, snapshots, features, symbols)
 
-                # Convert snapshot short_calls to the same shape fetch_options_for_scan returns
-                options = []
-                for opt in raw_short_calls:
-                    bid = opt.get("bid", 0) or 0
-                    if bid <= 0:
-                        continue
-                    oi = opt.get("open_interest", 0) or 0
-                    dte = opt.get("dte", 0)
-                    strike = opt.get("strike", 0)
-                    premium_yield = bid / current_price if current_price > 0 else 0
-                    options.append({
-                        "strike": strike,
-                        "expiry": opt.get("expiry", ""),
-                        "dte": dte,
-                        "premium": round(bid, 2),
-                        "premium_yield": round(premium_yield, 4),
-                        "delta": opt.get("delta", 0),
-                        "volume": opt.get("volume", 0),
-                        "open_interest": oi,
-                        "bid": bid,
-                        "ask": opt.get("ask", 0),
-                        "iv": opt.get("iv", 0),
-                        "iv_pct": opt.get("iv_pct", 0),
-                    })
-
-                # Apply delta filter from profile
-                options = [
-                    o for o in options
-                    if profile["delta_min"] <= o.get("delta", 0) <= profile["delta_max"]
-                ] if any(o.get("delta", 0) > 0 for o in options) else options
-
-                if not options:
-                    stats["failed_options"].append(
-                        (symbol, "No matching options in snapshot"))
-                    continue
-
-                stats["passed_options"] += 1
-
-                # Filter by premium yield
-                min_yield = profile.get("premium_yield_min", 0)
-                qualified_options = [o for o in options if o.get(
-                    "premium_yield", 0) >= min_yield]
-
-                if not qualified_options:
-                    continue
-
-                # Score and rank options
-                for opt in qualified_options:
-                    # Calculate composite score
-                    roi_score = min(opt["premium_yield"] * 100 * 15, 40)
-                    delta_score = 20 - abs(opt["delta"] - 0.30) * 50
-                    dte_score = 10 - abs(opt["dte"] - 30) * 0.3
-
-                    # Fundamental bonus (ETFs get neutral score since fundamentals skipped)
-                    fund_score = 0
-                    if not symbol_is_etf:
-                        if fund_data.get("roe", 0) > 0.15:
-                            fund_score += 5
-                        if fund_data.get("revenue_growth", 0) > 0.10:
-                            fund_score += 5
-
-                    total_score = max(
-                        0, roi_score + delta_score + dte_score + fund_score)
-
-                    opportunities.append({
-                        "symbol": symbol,
-                        "stock_price": round(current_price, 2),
-                        "strike": opt["strike"],
-                        "expiry": opt["expiry"],
-                        "dte": opt["dte"],
-                        "premium": round(opt["premium"], 2),
-                        "premium_yield": round(opt["premium_yield"] * 100, 2),
-                        "roi_pct": round(opt["premium_yield"] * 100, 2),
-                        "delta": opt["delta"],
-                        "volume": opt.get("volume", 0),
-                        "score": round(total_score, 1),
-                        "risk_profile": risk_profile,
-                        "strategy": "covered_call",
-                        # Timeframe classification
-                        "timeframe": "weekly" if opt["dte"] <= 14 else "monthly",
-                        # ETF flag
-                        "is_etf": symbol_is_etf,
-                        # Include technical indicators
-                        "sma50": tech_data.get("sma50"),
-                        "sma200": tech_data.get("sma200"),
-                        "rsi14": tech_data.get("rsi14"),
-                        "atr_pct": round(tech_data.get("atr_pct", 0) * 100, 2) if tech_data.get("atr_pct") else None,
-                        # Include fundamental data (None for ETFs)
-                        "market_cap": fund_data.get("market_cap", 0) if not symbol_is_etf else None,
-                        "eps_ttm": fund_data.get("eps_ttm", 0) if not symbol_is_etf else None,
-                        "roe": round(fund_data.get("roe", 0) * 100, 1) if fund_data.get("roe") and not symbol_is_etf else None,
-                        "debt_to_equity": fund_data.get("debt_to_equity") if not symbol_is_etf else None,
-                        "days_to_earnings": fund_data.get("days_to_earnings") if not symbol_is_etf else None,
-                        "sector": fund_data.get("sector", "") if not symbol_is_etf else "ETF",
-                        # Include analyst rating (None for ETFs)
-                        "analyst_rating": fund_data.get("analyst_rating") if not symbol_is_etf else None,
-                        "num_analysts": fund_data.get("num_analysts", 0) if not symbol_is_etf else None,
-                        "target_price": fund_data.get("target_price") if not symbol_is_etf else None,
-                        # Include IV data
-                        "iv": opt.get("iv"),
-                        "iv_pct": round(opt.get("iv", 0) * 100, 1) if opt.get("iv") else None,
-                        # Include OI and IV Rank data
-                        "open_interest": opt.get("open_interest", 0),
-                        "iv_rank": round(min(100, opt.get("iv", 0) * 100 * 1.5), 0) if opt.get("iv") else None,
-                    })
-
-            # Inter-batch delay to avoid rate limiting
-            # Reduced since semaphore now controls concurrency
-            await asyncio.sleep(1.0)
-
-        # Log resilient fetch stats
-        scan_stats = fetcher.get_stats()
-        scan_stats.log_summary()
-
-        # Deduplicate: Keep best Weekly + Monthly per symbol
-        opportunities = self._dedupe_by_symbol_timeframe(opportunities)
-
-        # Sort by score and limit
-        opportunities.sort(key=lambda x: x["score"], reverse=True)
-        opportunities = opportunities[:50]  # Top 50
-
-        logger.info(f"Scan complete: {len(opportunities)} opportunities found")
-        logger.info(f"Stats: {stats['passed_technical']} passed tech, "
-                    f"{stats['passed_fundamental']} passed fund, "
-                    f"{stats['passed_options']} had options")
-
-        return opportunities
-
-    def _dedupe_by_symbol_timeframe(self, opportunities: List[Dict]) -> List[Dict]:
+    @staticmethod
+    def _dedupe_by_symbol_timeframe(opportunities: List[Dict]) -> List[Dict]:
         """
         PHASE 3: AI-Based Best Option Selection per Symbol
 
@@ -1270,34 +1173,8 @@ class PrecomputedScanService:
         2. Highest quality score (quality_score field) - Tie-breaker
         3. Highest ROI (roi_pct field) - Secondary tie-breaker
         """
-        if not opportunities:
-            return []
-
-        # Group by symbol only (not by timeframe)
-        symbol_best = {}
-
-        for opp in opportunities:
-            symbol = opp["symbol"]
-
-            if symbol not in symbol_best:
-                symbol_best[symbol] = opp
-            else:
-                # Compare: score → quality_score → roi_pct
-                current_best = symbol_best[symbol]
-
-                # Primary: AI score
-                if opp.get("score", 0) > current_best.get("score", 0):
-                    symbol_best[symbol] = opp
-                elif opp.get("score", 0) == current_best.get("score", 0):
-                    # Tie-breaker 1: quality_score
-                    if opp.get("quality_score", 0) > current_best.get("quality_score", 0):
-                        symbol_best[symbol] = opp
-                    elif opp.get("quality_score", 0) == current_best.get("quality_score", 0):
-                        # Tie-breaker 2: roi_pct
-                        if opp.get("roi_pct", 0) > current_best.get("roi_pct", 0):
-                            symbol_best[symbol] = opp
-
-        result = list(symbol_best.values())
+        # Single pass with (score, quality_score, roi_pct) keys (services/scan_dedupe.py)
+        result = best_per_symbol(opportunities)
         logger.debug(
             f"PHASE 3: Deduplicated {len(opportunities)} candidates to {len(result)} unique symbols")
         return result
@@ -1316,12 +1193,10 @@ class PrecomputedScanService:
         to ensure users always see something (previous market close data).
         """
         try:
-            now = datetime.now(timezone.utc)
-
             # SAFETY: Don't overwrite good data with empty results
             if not opportunities or len(opportunities) == 0:
                 existing = await self.db.precomputed_scans.find_one(
-                    {"strategy": strategy, "risk_profile": risk_profile}
+                    {"strategy": strategy, "risk_profile": risk_profile}, {"count": 1}
                 )
                 if existing and existing.get("count", 0) > 0:
                     logger.warning(f"Scan returned 0 results for {strategy}/{risk_profile}. "
@@ -1334,26 +1209,17 @@ class PrecomputedScanService:
             else:
                 profile_config = RISK_PROFILES.get(risk_profile, {})
 
-            scan_doc = {
-                "strategy": strategy,  # "covered_call" or "pmcc"
-                "risk_profile": risk_profile,
-                "opportunities": opportunities,
-                "count": len(opportunities),
-                "computed_at": now.isoformat(),
-                "computed_date": now.strftime("%Y-%m-%d"),
-                "label": profile_config.get("label", risk_profile.title()),
-                "description": profile_config.get("description", ""),
-            }
-
-            # Upsert - replace existing scan for same strategy+profile
-            await self.db.precomputed_scans.update_one(
-                {"strategy": strategy, "risk_profile": risk_profile},
-                {"$set": scan_doc},
-                upsert=True
+            # Rows under a new scan_id, then an atomic pointer swap (services/scan_store.py)
+            scan_id = await publish_scan(
+                self.db, strategy, risk_profile, opportunities,
+                metadata={
+                    "label": profile_config.get("label", risk_profile.title()),
+                    "description": profile_config.get("description", ""),
+                }
             )
 
             logger.info(
-                f"Stored {len(opportunities)} {risk_profile} {strategy} results")
+                f"Stored {len(opportunities)} {risk_profile} {strategy} results (scan_id={scan_id})")
             return True
 
         except Exception as e:
@@ -1363,15 +1229,26 @@ class PrecomputedScanService:
     async def get_scan_results(
         self,
         strategy: str,
-        risk_profile: str
+        risk_profile: str,
+        scan_id: Optional[str] = None,
+        min_score: Optional[float] = None,
+        min_dte: Optional[int] = None,
+        max_dte: Optional[int] = None,
+        symbols: Optional[List[str]] = None,
+        sort_by: str = "score",
+        sort_dir: int = -1,
+        offset: int = 0,
+        limit: int = 50
     ) -> Optional[Dict]:
-        """Retrieve pre-computed scan results."""
+        """Retrieve one filtered / sorted page of pre-computed scan results."""
         try:
-            result = await self.db.precomputed_scans.find_one(
-                {"strategy": strategy, "risk_profile": risk_profile},
-                {"_id": 0}
+            return await read_scan(
+                self.db, strategy, risk_profile, scan_id=scan_id,
+                min_score=min_score, min_dte=min_dte, max_dte=max_dte, symbols=symbols,
+                sort_by=sort_by, sort_dir=sort_dir, offset=offset, limit=limit
             )
-            return result
+        except ValueError:
+            raise
         except Exception as e:
             logger.error(f"Error fetching scan results: {e}")
             return None
@@ -1381,7 +1258,7 @@ class PrecomputedScanService:
         try:
             scans = await self.db.precomputed_scans.find(
                 {},
-                {"_id": 0, "strategy": 1, "risk_profile": 1, "count": 1,
+                {"_id": 0, "strategy": 1, "risk_profile": 1, "count": 1, "scan_id": 1,
                  "computed_at": 1, "label": 1, "description": 1}
             ).to_list(100)
             return scans
@@ -1391,12 +1268,28 @@ class PrecomputedScanService:
 
     # ==================== NIGHTLY JOB ====================
 
-    async def run_all_scans(self):
+    async def run_all_scans(self, max_workers: Optional[int] = None):
         """
         Run all pre-computed scans.
         Called by scheduler after market close.
-        Reads ONLY from MongoDB daily_snapshots — zero Yahoo Finance calls.
-        Snapshots loaded ONCE and passed to both CC and PMCC scan methods.
+        Options come from the EOD snapshot (daily_snapshots, else the latest
+        symbol_snapshot run) via SnapshotOptionsProvider; live fetch only
+        behind PRECOMPUTED_LIVE_OPTIONS_FALLBACK.
+
+        STREAMING (low-memory nodes):
+        - Chains are streamed in symbol partitions (PRECOMPUTED_SCAN_PARTITION_SIZE)
+          projected to the leg fields the profiles read; all six profiles
+          score a partition, keep their top SCAN_RESULT_LIMIT, and the
+          partition is released before the next one is read.
+        - Per-profile results are symbol-disjoint across partitions, so
+          merging the partition winners gives the same top list as one
+          in-memory pass.
+        - The six profiles of a partition are scored in parallel on a
+          process pool (`max_workers`, default PRECOMPUTED_SCAN_WORKERS), so
+          a partition takes about as long as its slowest profile.
+        - Current/peak RSS is logged per partition ([SCAN_MEM]).
+        The per-symbol feature table (technicals + fundamentals) is built
+        ONCE and shared by every partition and profile.
         """
         logger.info("=" * 50)
         logger.info("STARTING NIGHTLY PRE-COMPUTED SCANS (cache-only)")
@@ -1404,67 +1297,139 @@ class PrecomputedScanService:
 
         start_time = datetime.now()
         results = {}
+        rss_start, peak_start = _process_memory_mb()
 
-        # ── Load snapshots ONCE ──────────────────────────────────────
+        # ── Resolve the snapshot source (symbol names only, no chains) ──
         today_str = datetime.now(timezone.utc).strftime("%Y-%m-%d")
-        raw_snaps = await self.db.daily_snapshots.find(
-            {"snapshot_date": today_str}
-        ).to_list(length=5000)
+        provider = self.options_provider()
+        available = set(await provider.resolve(today_str))
 
-        if not raw_snaps:
-            logger.error("No daily_snapshots found for today — aborting scans")
+        if not available and not provider.live_fallback:
+            logger.error("No option snapshots found for today — aborting scans")
             return {"error": "no_snapshots"}
+        logger.info(f"{len(available)} snapshots for {today_str} "
+                    f"(source={provider.source}, run_id={provider.run_id})")
 
-        # Index by symbol for O(1) lookup
-        snapshots: Dict[str, Dict] = {s["symbol"]: s for s in raw_snaps}
-        logger.info(f"Loaded {len(snapshots)} snapshots for {today_str}")
+        # ── Compute per-symbol features ONCE for all six profiles ────
+        universe = [
+            s for s in await self.get_liquid_symbols()
+            if s in available or provider.live_fallback
+        ]
+        features = await self.build_feature_table(universe, as_of=today_str)
 
-        # ── CC scans ─────────────────────────────────────────────────
-        all_opportunities: Dict[str, List[Dict]] = {}
-        for profile in ["conservative", "balanced", "aggressive"]:
+        profiles = [
+            (strategy, profile)
+            for strategy in ("covered_call", "pmcc")
+            for profile in ("conservative", "balanced", "aggressive")
+        ]
+        collected: Dict[Tuple[str, str], List[Dict]] = {key: [] for key in profiles}
+        errors: Dict[Tuple[str, str], Exception] = {}
+        elapsed_by_profile: Dict[Tuple[str, str], float] = defaultdict(float)
+
+        # ── Evaluate all six profiles per partition ──────────────────
+        # Scoring is CPU-bound and pure over the partition and its features
+        # (score_profile), so the profiles run in worker processes and the
+        # partition's wall-clock is about that of its slowest profile. With
+        # one worker they are scored in turn on the event loop.
+        workers = PRECOMPUTED_SCAN_WORKERS if max_workers is None else max_workers
+        pool = process_pool(min(workers, len(profiles)))
+        loop = asyncio.get_running_loop()
+
+        async def _run_profile(strategy: str, profile: str, snapshots: Dict[str, Dict],
+                               partition_features: Dict[str, Dict], symbols: List[str]):
             try:
-                logger.info(
-                    f"\n--- Running {profile.upper()} Covered Call scan ---")
-                opportunities = await self.run_covered_call_scan(profile, snapshots)
-                all_opportunities[profile] = opportunities
-                logger.info(
-                    f"  Found {len(opportunities)} raw opportunities for {profile}")
+                if pool is None:
+                    opportunities, elapsed = score_profile(
+                        strategy, profile, snapshots, partition_features, symbols)
+                else:
+                    opportunities, elapsed = await loop.run_in_executor(
+                        pool, score_profile, strategy, profile, snapshots, partition_features, symbols)
+                error = None
             except Exception as e:
-                logger.error(f"Error in {profile} CC scan: {e}")
-                all_opportunities[profile] = []
-                results[f"cc_{profile}"] = f"Error: {str(e)}"
-
-        deduped_opportunities = self._dedupe_across_profiles(all_opportunities)
-        for profile, opportunities in deduped_opportunities.items():
-            await self.store_scan_results("covered_call", profile, opportunities)
-            results[f"cc_{profile}"] = len(opportunities)
-            logger.info(
-                f"  Stored {len(opportunities)} deduplicated opportunities for {profile}")
-
-        # ── PMCC scans ───────────────────────────────────────────────
-        logger.info("\n" + "=" * 50)
-        logger.info("STARTING PMCC SCANS")
-        logger.info("=" * 50)
+                logger.error(f"Error in {profile} {strategy} scan: {e}")
+                opportunities, elapsed, error = [], 0.0, e
+            elapsed_by_profile[(strategy, profile)] += elapsed
+            return strategy, profile, opportunities, error
+
+        async def _scan_partition(snapshots: Dict[str, Dict], label: str):
+            symbols = list(snapshots)
+            # Only this partition's features are sent to the workers
+            partition_features = {s: features[s] for s in symbols if s in features}
+            profile_runs = await asyncio.gather(*[
+                _run_profile(strategy, profile, snapshots, partition_features, symbols)
+                for strategy, profile in profiles
+            ])
+            for strategy, profile, opportunities, error in profile_runs:
+                collected[(strategy, profile)].extend(opportunities)
+                if error is not None:
+                    errors.setdefault((strategy, profile), error)
+            rss, peak = _process_memory_mb()
+            logger.info(f"[SCAN_MEM] {label}: {len(symbols)} symbols, "
+                        f"rss={_fmt_mb(rss)} peak={_fmt_mb(peak)}")
+
+        streamed = [s for s in universe if s in available]
+        partition_count = 0
+        completed = False
+        try:
+            async for partition in provider.iter_partitions(streamed):
+                partition_count += 1
+                await _scan_partition(partition, f"partition {partition_count}")
+                del partition
+
+            # Flagged fallback: live chains only for symbols the snapshot missed
+            if provider.live_fallback:
+                missing = [s for s in universe if s not in available]
+                prices = {
+                    s: ((features.get(s) or {}).get("technical") or {}).get("close")
+                    for s in missing
+                }
+                live: Dict[str, Dict] = {}
+                await provider.fill_missing_live(live, missing, prices)
+                if live:
+                    await _scan_partition(live, "live fallback")
+            completed = True
+        finally:
+            await shutdown_pool(pool, cancel=not completed)
 
+        all_opportunities: Dict[str, List[Dict]] = {}
         pmcc_opportunities: Dict[str, List[Dict]] = {}
-        for profile in ["conservative", "balanced", "aggressive"]:
-            try:
-                logger.info(f"\n--- Running {profile.upper()} PMCC scan ---")
-                opportunities = await self.run_pmcc_scan(profile, snapshots)
-                pmcc_opportunities[profile] = opportunities
-                logger.info(
-                    f"  Found {len(opportunities)} raw PMCC opportunities for {profile}")
-            except Exception as e:
-                logger.error(f"Error in {profile} PMCC scan: {e}")
-                pmcc_opportunities[profile] = []
-                results[f"pmcc_{profile}"] = f"Error: {str(e)}"
+        for (strategy, profile), opportunities in collected.items():
+            # Each partition already kept its best per symbol; re-rank the union
+            opportunities.sort(key=lambda x: x["score"], reverse=True)
+            opportunities = opportunities[:SCAN_RESULT_LIMIT]
+            target = all_opportunities if strategy == "covered_call" else pmcc_opportunities
+            target[profile] = opportunities
+            logger.info(
+                f"  {strategy}/{profile}: {len(opportunities)} raw opportunities "
+                f"in {elapsed_by_profile[(strategy, profile)]:.1f}s of scoring")
+            error = errors.get((strategy, profile))
+            if error is not None:
+                key = "cc" if strategy == "covered_call" else "pmcc"
+                results[f"{key}_{profile}"] = f"Error: {str(error)}"
+        collected.clear()
+
+        rss_end, peak_end = _process_memory_mb()
+        logger.info(
+            f"[SCAN_MEM] {partition_count} partitions of <= {PARTITION_SIZE} symbols: "
+            f"rss {_fmt_mb(rss_start)} -> {_fmt_mb(rss_end)}, "
+            f"peak {_fmt_mb(peak_start)} -> {_fmt_mb(peak_end)}")
 
+        # ── Dedupe within each strategy, then store all six in parallel ──
+        deduped_opportunities = self._dedupe_across_profiles(all_opportunities)
         deduped_pmcc = self._dedupe_across_profiles(pmcc_opportunities)
-        for profile, opportunities in deduped_pmcc.items():
-            await self.store_scan_results("pmcc", profile, opportunities)
-            results[f"pmcc_{profile}"] = len(opportunities)
+
+        to_store = (
+            [("covered_call", "cc", p, o) for p, o in deduped_opportunities.items()]
+            + [("pmcc", "pmcc", p, o) for p, o in deduped_pmcc.items()]
+        )
+        await asyncio.gather(*[
+            self.store_scan_results(strategy, profile, opportunities)
+            for strategy, _, profile, opportunities in to_store
+        ])
+        for strategy, key, profile, opportunities in to_store:
+            results[f"{key}_{profile}"] = len(opportunities)
             logger.info(
-                f"  Stored {len(opportunities)} deduplicated PMCC opportunities for {profile}")
+                f"  Stored {len(opportunities)} deduplicated {strategy} opportunities for {profile}")
 
         duration = (datetime.now() - start_time).total_seconds()
         logger.info("=" * 50)
@@ -1485,117 +1450,17 @@ class PrecomputedScanService:
         3. Balanced: Moderate ATR, decent fundamentals
         4. Aggressive: High ATR, momentum characteristics
         """
-        # Track which symbols are assigned to which profile
-        symbol_assignments = {}  # symbol -> (profile, best_opportunity)
-
-        # Priority order: conservative first, then balanced, then aggressive
-        # But we'll assign based on BEST FIT, not just first-come
-        profiles_order = ["conservative", "balanced", "aggressive"]
-
-        for profile in profiles_order:
-            for opp in all_opportunities.get(profile, []):
-                symbol = opp["symbol"]
-
-                if symbol not in symbol_assignments:
-                    # First time seeing this symbol, assign it
-                    symbol_assignments[symbol] = (profile, opp)
-                else:
-                    # Symbol already assigned, check if this profile is a better fit
-                    existing_profile, existing_opp = symbol_assignments[symbol]
-
-                    # Calculate "fit score" for each profile based on characteristics
-                    existing_fit = self._calculate_profile_fit(
-                        existing_opp, existing_profile)
-                    new_fit = self._calculate_profile_fit(opp, profile)
-
-                    # If new profile is a better fit, reassign
-                    if new_fit > existing_fit:
-                        symbol_assignments[symbol] = (profile, opp)
-
-        # Build deduplicated lists for each profile
-        deduped = {profile: [] for profile in profiles_order}
-        for symbol, (profile, opp) in symbol_assignments.items():
-            deduped[profile].append(opp)
-
-        # Sort each profile's list by score
-        for profile in deduped:
-            deduped[profile].sort(key=lambda x: x["score"], reverse=True)
-            deduped[profile] = deduped[profile][:50]  # Limit to 50
-
-        return deduped
+        # Single pass, grouped by symbol, each fit computed at most once
+        # (services/scan_dedupe.py); ties keep the earliest candidate in
+        # conservative -> balanced -> aggressive order.
+        return assign_profiles(all_opportunities, ("conservative", "balanced", "aggressive"), limit=50)
 
     def _calculate_profile_fit(self, opp: Dict, profile: str) -> float:
         """
         Calculate how well an opportunity fits a specific profile.
         Higher score = better fit.
         """
-        fit_score = 0
-
-        atr_pct = opp.get("atr_pct", 3) or 3  # Default 3%
-        market_cap = opp.get("market_cap", 0) or 0
-        eps = opp.get("eps_ttm", 0) or 0
-        roe = opp.get("roe", 0) or 0
-        delta = opp.get("delta", 0.35) or 0.35
-        dte = opp.get("dte", 30) or 30
-
-        if profile == "conservative":
-            # Conservative prefers: low ATR, high market cap, positive EPS, low delta, longer DTE
-            if atr_pct <= 3:
-                fit_score += 20
-            elif atr_pct <= 4:
-                fit_score += 10
-
-            if market_cap >= 50_000_000_000:  # $50B+
-                fit_score += 20
-            elif market_cap >= 10_000_000_000:  # $10B+
-                fit_score += 10
-
-            if eps > 0:
-                fit_score += 15
-
-            if delta <= 0.30:
-                fit_score += 15
-
-            if dte >= 30:
-                fit_score += 10
-
-        elif profile == "balanced":
-            # Balanced prefers: moderate ATR, decent market cap, moderate delta
-            if 3 <= atr_pct <= 5:
-                fit_score += 20
-            elif atr_pct < 3:
-                fit_score += 10
-
-            if 5_000_000_000 <= market_cap <= 50_000_000_000:
-                fit_score += 15
-
-            if 0.30 <= delta <= 0.40:
-                fit_score += 15
-
-            if 20 <= dte <= 40:
-                fit_score += 10
-
-        elif profile == "aggressive":
-            # Aggressive prefers: high ATR, any market cap, higher delta, shorter DTE
-            if atr_pct >= 4:
-                fit_score += 25
-            elif atr_pct >= 3:
-                fit_score += 15
-
-            if delta >= 0.40:
-                fit_score += 20
-
-            if dte <= 21:
-                fit_score += 15
-
-            # Higher premium yield is bonus for aggressive
-            premium_yield = opp.get("premium_yield", 0) or 0
-            if premium_yield >= 1.5:
-                fit_score += 15
-            elif premium_yield >= 1.0:
-                fit_score += 10
-
-        return fit_score
+        return profile_fit(opp, profile)
 
     # ==================== PMCC SCAN LOGIC ====================
 
@@ -1914,32 +1779,29 @@ class PrecomputedScanService:
     async def run_pmcc_scan(
         self,
         risk_profile: str = "conservative",
-        snapshots: Optional[Dict[str, Dict]] = None
+        snapshots: Optional[Dict[str, Dict]] = None,
+        features: Optional[Dict[str, Dict]] = None,
+        universe: Optional[List[str]] = None
     ) -> List[Dict[str, Any]]:
         """
         Run a PMCC (Poor Man's Covered Call) scan for the given risk profile.
 
         CACHE-ONLY (February 2026):
         - Reads leaps_calls and short_calls from MongoDB daily_snapshots.
-        - snapshots dict passed in from run_all_scans (loaded once).
+        - snapshots dict passed in from run_all_scans (one symbol partition
+          at a time, with that partition as `universe`).
         - Falls back to loading from DB if called standalone.
 
         PMCC structure:
         - Long Call (LEAPS): Deep ITM, high delta, long DTE
         - Short Call: OTM, lower delta, shorter DTE
 
-        SCAN TIMEOUT FIX (December 2025):
-        - Uses bounded concurrency via semaphore
-        - Applies timeout/retry to each symbol fetch
-        - Continues on partial failure (logs failed symbols)
-        - Aggregates success/timeout/error counts
+        FEATURE STORE:
+        - Technicals/fundamentals come from build_feature_table() (shared
+          with the CC profiles, fetched once per symbol per night).
 
         Returns ranked list of PMCC opportunities.
         """
-        cc_profile = RISK_PROFILES.get(
-            risk_profile, RISK_PROFILES["conservative"])
-        pmcc_profile = PMCC_PROFILES.get(
-            risk_profile, PMCC_PROFILES["conservative"])
         run_id = f"pmcc_{risk_profile}_{datetime.now(timezone.utc).strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}"
 
         logger.info(f"Starting {risk_profile} PMCC scan (run_id={run_id})...")
@@ -1948,357 +1810,546 @@ class PrecomputedScanService:
 
         # ── Load snapshots from MongoDB if not passed in ──────────────
         if snapshots is None:
-            today_str = datetime.now(timezone.utc).strftime("%Y-%m-%d")
-            raw_snaps = await self.db.daily_snapshots.find(
-                {"snapshot_date": today_str}
-            ).to_list(length=5000)
-            snapshots = {s["symbol"]: s for s in raw_snaps}
+            snapshots = await self.options_provider().load(
+                datetime.now(timezone.utc).strftime("%Y-%m-%d"))
 
         if not snapshots:
             logger.error(f"PMCC scan ({risk_profile}): no snapshots available")
             return []
 
         # Get symbol universe — limited to symbols present in snapshots
-        all_symbols = await self.get_liquid_symbols()
+        all_symbols = universe if universe is not None else await self.get_liquid_symbols()
         symbols = [s for s in all_symbols if s in snapshots]
         logger.info(f"Scanning {len(symbols)} symbols for {risk_profile} PMCC ({len(snapshots)} snapshots available)")
 
-        # Initialize resilient fetcher for this scan
-        fetcher = ResilientYahooFetcher(
-            scan_type=f"pmcc_{risk_profile}", run_id=run_id)
-        fetcher.set_total_symbols(len(symbols))
-
-        opportunities = []
-        pmcc_debug = RejectStats(sample_limit=5)
-        stats = {
-            "total_symbols": len(symbols),
-            "passed_technical": 0,
-            "passed_fundamental": 0,
-            "has_leaps": 0,
-            "has_short_call": 0,
-        }
-
-        # Process symbols in batches with bounded concurrency
-        batch_size = 10
-        for i in range(0, len(symbols), batch_size):
-            batch = symbols[i:i + batch_size]
-
-            # Fetch technical and fundamental data with resilience
-            tech_results = []
-            fund_results = []
-
-            for symbol in batch:
-                # Technical data fetch with resilience
-                tech_data = await fetcher.fetch(
-                    symbol,  # For logging
-                    self.fetch_technical_data,
-                    symbol
-                )
-                tech_results.append(tech_data)
-
-                # ================================================================
-                # ETF HANDLING: Skip fundamental fetch for ETFs (same as CC scan)
-                # ================================================================
-                if is_etf(symbol):
-                    fund_results.append(
-                        {"symbol": symbol, "is_etf": True, "fundamentals_skipped": True})
-                    logger.debug(
-                        f"PMCC_ETF_FUNDAMENTALS_SKIPPED | symbol={symbol}")
-                else:
-                    # Fundamental data fetch with resilience
-                    fund_data = await fetcher.fetch(
-                        symbol,  # For logging
-                        self.fetch_fundamental_data,
-                        symbol
-                    )
-                    fund_results.append(fund_data)
-
-            for j, symbol in enumerate(batch):
-                pmcc_debug.total += 1
-                tech_data = tech_results[j]
-                fund_data = fund_results[j]
-                symbol_is_etf = is_etf(symbol)
-
-                # Handle fetch failures gracefully
-                if tech_data is None:
-                    pmcc_debug.reject("fetch_failed_technical", {
-                                      "symbol": symbol})
-                    continue
-
-                # Apply technical filters (same as covered call)
-                tech_pass, _ = self.passes_technical_filters(
-                    tech_data, cc_profile)
-                if not tech_pass:
-                    pmcc_debug.reject("fails_technical_filters", {
-                                      "symbol": symbol, "close": tech_data.get("close")})
-                    continue
-                stats["passed_technical"] += 1
-
-                # ================================================================
-                # ETF HANDLING: Skip fundamental filters for ETFs
-                # ================================================================
-                if symbol_is_etf:
-                    # ETF: Auto-pass fundamentals
-                    stats["passed_fundamental"] += 1
-                    logger.debug(
-                        f"PMCC_ETF_FUNDAMENTALS_BYPASSED | symbol={symbol}")
-                else:
-                    # Stock: Apply fundamental filters
-                    # Handle fundamental fetch failure
-                    if fund_data is None:
-                        pmcc_debug.reject("fetch_failed_fundamental", {
-                                          "symbol": symbol})
-                        continue
-
-                    # Apply fundamental filters
-                    fund_pass, _ = self.passes_fundamental_filters(
-                        fund_data, cc_profile)
-                    if not fund_pass:
-                        pmcc_debug.reject("fails_fundamental_filters", {
-                                          "symbol": symbol})
-                        continue
-                    stats["passed_fundamental"] += 1
-
-                current_price = tech_data.get("close", 0)
-                if current_price <= 0:
-                    pmcc_debug.reject("missing_underlying_price", {
-                                      "symbol": symbol, "close": current_price})
-                    continue
-
-                # ── Read LEAPS and short calls from snapshot (NO Yahoo call) ──
-                snap = snapshots.get(symbol, {})
-
-                # Build leaps list from snapshot leaps_calls
-                raw_leaps = snap.get("leaps_calls", [])
-                leaps = []
-                for l in raw_leaps:
-                    ask = l.get("ask", 0) or 0
-                    if ask <= 0:
-                        continue
-                    oi = l.get("open_interest", 0) or 0
-                    dte = l.get("dte", 0)
-                    if not (pmcc_profile.get("long_dte_min", 365) <= dte <= pmcc_profile.get("long_dte_max", 730)):
-                        continue
-                    leaps.append({
-                        "strike": l.get("strike", 0),
-                        "expiry": l.get("expiry", ""),
-                        "dte": dte,
-                        "premium": round(ask, 2),  # ASK for BUY leg
-                        "delta": l.get("delta", 0),
-                        "open_interest": oi,
-                        "itm_pct": l.get("itm_pct", 0),
-                        "iv": l.get("iv", 0),
-                        "iv_pct": l.get("iv_pct", 0),
-                    })
-
-                if not leaps:
-                    pmcc_debug.reject(
-                        "no_leaps", {"symbol": symbol, "price": current_price})
-                    continue
-                stats["has_leaps"] += 1
-
-                # Build short_calls list from snapshot short_calls
-                raw_shorts = snap.get("short_calls", [])
-                short_calls = []
-                for s in raw_shorts:
-                    bid = s.get("bid", 0) or 0
-                    if bid <= 0:
-                        continue
-                    oi = s.get("open_interest", 0) or 0
-                    dte = s.get("dte", 0)
-                    if not (pmcc_profile.get("short_dte_min", 20) <= dte <= pmcc_profile.get("short_dte_max", 45)):
-                        continue
-                    short_calls.append({
-                        "strike": s.get("strike", 0),
-                        "expiry": s.get("expiry", ""),
-                        "dte": dte,
-                        "premium": round(bid, 2),  # BID for SELL leg
-                        "delta": s.get("delta", 0),
-                        "open_interest": oi,
-                        "iv": s.get("iv", 0),
-                        "iv_pct": s.get("iv_pct", 0),
-                    })
-
-                if not short_calls:
-                    pmcc_debug.reject("no_short_calls", {
-                                      "symbol": symbol, "price": current_price})
-                    continue
-                stats["has_short_call"] += 1
-
-                # Find best LEAP and short call combination
-                best_leap = leaps[0]  # Already sorted by quality in snapshot
-                best_short = max(
-                    short_calls, key=lambda x: x.get("premium", 0))
-
-                # ============================================================
-                # GLOBAL CONSISTENCY: Use shared pricing rules
-                # BUY LEAP at ASK, SELL short at BID
-                # ============================================================
-                leap_ask = best_leap["premium"]   # LEAPS use ASK for BUY
-                short_bid = best_short["premium"]  # Short calls use BID for SELL
-
-                # ============================================================
-                # MANDATORY SAFETY RULES: Solvency + Break-even
-                # These are enforced in precomputed PMCC to match custom PMCC
-                # ============================================================
-                is_valid, structure_flags = validate_pmcc_structure_rules(
-                    long_strike=best_leap["strike"],
-                    short_strike=best_short["strike"],
-                    leap_ask=leap_ask,
-                    short_bid=short_bid
-                )
+        # ── Shared per-symbol features (computed once per night) ──
+        # Technicals/fundamentals come from the feature store; this
+        # profile is a pure in-memory filter/scorer over that table.
+        if features is None:
+            features = await self.build_feature_table(symbols)
+
+        return score_pmcc_profile(risk_profile, snapshots, features, symbols)
+
+
+
+# ==================== PROFILE SCORING ====================
+# Module-level and pure over (snapshots, features, symbols) so run_all_scans
+# can score the six profiles in worker processes (services/process_pool.py).
+
+def score_covered_call_profile(
+    risk_profile: str,
+    snapshots: Dict[str, Dict],
+    features: Dict[str, Dict],
+    symbols: List[str]
+) -> List[Dict[str, Any]]:
+    """Ranked covered call opportunities for one risk profile over `symbols`."""
+    profile = RISK_PROFILES.get(
+        risk_profile, RISK_PROFILES["conservative"])
+
+    opportunities = []
+    stats = {
+        "total_symbols": len(symbols),
+        "passed_technical": 0,
+        "passed_fundamental": 0,
+        "passed_options": 0,
+        "failed_technical": [],
+        "failed_fundamental": [],
+        "failed_options": []
+    }
 
-                if not is_valid:
-                    # Skip this combination - fails solvency or break-even
-                    # Record which rule(s) rejected so "0 results" can be diagnosed quickly.
-                    pmcc_debug.reject("pmcc_structure_rejected", {
-                                      "symbol": symbol, "flags": structure_flags})
-                    try:
-                        if isinstance(structure_flags, dict):
-                            for k, v in structure_flags.items():
-                                if v:
-                                    pmcc_debug.reject(f"pmcc_rule_{k}", {
-                                                      "symbol": symbol})
-                        elif isinstance(structure_flags, (list, tuple, set)):
-                            for k in structure_flags:
-                                pmcc_debug.reject(f"pmcc_rule_{k}", {
-                                                  "symbol": symbol})
-                        elif isinstance(structure_flags, str) and structure_flags:
-                            pmcc_debug.reject(f"pmcc_rule_{structure_flags}", {
-                                              "symbol": symbol})
-                    except Exception:
-                        pass
-                    logger.debug(
-                        f"PMCC_STRUCTURE_REJECTED | symbol={symbol} | flags={structure_flags}")
-                    continue
-
-                # Use shared economics computation for consistency
-                economics = compute_pmcc_economics(
-                    long_strike=best_leap["strike"],
-                    short_strike=best_short["strike"],
-                    leap_ask=leap_ask,
-                    short_bid=short_bid,
-                    current_price=current_price
-                )
+    for symbol in symbols:
+        feat = features.get(symbol) or {}
+        tech_data = feat.get("technical")
+        fund_data = feat.get("fundamental")
+        symbol_is_etf = is_etf(symbol)
+
+        # Handle fetch failures gracefully (partial success)
+        if tech_data is None:
+            stats["failed_technical"].append(
+                (symbol, "Fetch failed/timeout"))
+            continue
+
+        # Apply technical filters
+        tech_pass, tech_reason = PrecomputedScanService.passes_technical_filters(
+            tech_data, profile)
+        if not tech_pass:
+            stats["failed_technical"].append((symbol, tech_reason))
+            continue
+        stats["passed_technical"] += 1
+
+        # ================================================================
+        # ETF HANDLING: Skip fundamental filters for ETFs
+        # ETFs pass fundamental stage automatically
+        # ================================================================
+        if symbol_is_etf:
+            # ETF: Auto-pass fundamentals
+            stats["passed_fundamental"] += 1
+            logger.debug(
+                f"ETF_FUNDAMENTALS_BYPASSED | symbol={symbol}")
+        else:
+            # Stock: Apply fundamental filters
+            # Handle fundamental fetch failure
+            if fund_data is None:
+                stats["failed_fundamental"].append(
+                    (symbol, "Fetch failed/timeout"))
+                continue
+
+            # Apply fundamental filters
+            fund_pass, fund_reason = PrecomputedScanService.passes_fundamental_filters(
+                fund_data, profile)
+            if not fund_pass:
+                stats["failed_fundamental"].append(
+                    (symbol, fund_reason))
+                continue
+            stats["passed_fundamental"] += 1
+
+        # ── Read options from snapshot (NO Yahoo call) ────────
+        current_price = tech_data.get("close", 0)
+        snap = snapshots.get(symbol, {})
+        raw_short_calls = snap.get("short_calls", [])
+
+        if not raw_short_calls:
+            stats["failed_options"].append(
+                (symbol, "No short_calls in snapshot"))
+            continue
+
+        # Convert snapshot short_calls to the same shape fetch_options_for_scan returns
+        options = []
+        for opt in raw_short_calls:
+            bid = opt.get("bid", 0) or 0
+            if bid <= 0:
+                continue
+            oi = opt.get("open_interest", 0) or 0
+            dte = opt.get("dte", 0)
+            strike = opt.get("strike", 0)
+            premium_yield = bid / current_price if current_price > 0 else 0
+            options.append({
+                "strike": strike,
+                "expiry": opt.get("expiry", ""),
+                "dte": dte,
+                "premium": round(bid, 2),
+                "premium_yield": round(premium_yield, 4),
+                "delta": opt.get("delta", 0),
+                "volume": opt.get("volume", 0),
+                "open_interest": oi,
+                "bid": bid,
+                "ask": opt.get("ask", 0),
+                "iv": opt.get("iv", 0),
+                "iv_pct": opt.get("iv_pct", 0),
+            })
+
+        # Apply delta filter from profile
+        options = [
+            o for o in options
+            if profile["delta_min"] <= o.get("delta", 0) <= profile["delta_max"]
+        ] if any(o.get("delta", 0) > 0 for o in options) else options
+
+        if not options:
+            stats["failed_options"].append(
+                (symbol, "No matching options in snapshot"))
+            continue
+
+        stats["passed_options"] += 1
+
+        # Filter by premium yield
+        min_yield = profile.get("premium_yield_min", 0)
+        qualified_options = [o for o in options if o.get(
+            "premium_yield", 0) >= min_yield]
+
+        if not qualified_options:
+            continue
+
+        # Score and rank options
+        for opt in qualified_options:
+            # Calculate composite score
+            roi_score = min(opt["premium_yield"] * 100 * 15, 40)
+            delta_score = 20 - abs(opt["delta"] - 0.30) * 50
+            dte_score = 10 - abs(opt["dte"] - 30) * 0.3
+
+            # Fundamental bonus (ETFs get neutral score since fundamentals skipped)
+            fund_score = 0
+            if not symbol_is_etf:
+                if fund_data.get("roe", 0) > 0.15:
+                    fund_score += 5
+                if fund_data.get("revenue_growth", 0) > 0.10:
+                    fund_score += 5
+
+            total_score = max(
+                0, roi_score + delta_score + dte_score + fund_score)
+
+            opportunities.append({
+                "symbol": symbol,
+                "stock_price": round(current_price, 2),
+                "strike": opt["strike"],
+                "expiry": opt["expiry"],
+                "dte": opt["dte"],
+                "premium": round(opt["premium"], 2),
+                "premium_yield": round(opt["premium_yield"] * 100, 2),
+                "roi_pct": round(opt["premium_yield"] * 100, 2),
+                "delta": opt["delta"],
+                "volume": opt.get("volume", 0),
+                "score": round(total_score, 1),
+                "risk_profile": risk_profile,
+                "strategy": "covered_call",
+                # Timeframe classification
+                "timeframe": "weekly" if opt["dte"] <= 14 else "monthly",
+                # ETF flag
+                "is_etf": symbol_is_etf,
+                # Include technical indicators
+                "sma50": tech_data.get("sma50"),
+                "sma200": tech_data.get("sma200"),
+                "rsi14": tech_data.get("rsi14"),
+                "atr_pct": round(tech_data.get("atr_pct", 0) * 100, 2) if tech_data.get("atr_pct") else None,
+                # Include fundamental data (None for ETFs)
+                "market_cap": fund_data.get("market_cap", 0) if not symbol_is_etf else None,
+                "eps_ttm": fund_data.get("eps_ttm", 0) if not symbol_is_etf else None,
+                "roe": round(fund_data.get("roe", 0) * 100, 1) if fund_data.get("roe") and not symbol_is_etf else None,
+                "debt_to_equity": fund_data.get("debt_to_equity") if not symbol_is_etf else None,
+                "days_to_earnings": fund_data.get("days_to_earnings") if not symbol_is_etf else None,
+                "sector": fund_data.get("sector", "") if not symbol_is_etf else "ETF",
+                # Include analyst rating (None for ETFs)
+                "analyst_rating": fund_data.get("analyst_rating") if not symbol_is_etf else None,
+                "num_analysts": fund_data.get("num_analysts", 0) if not symbol_is_etf else None,
+                "target_price": fund_data.get("target_price") if not symbol_is_etf else None,
+                # Include IV data
+                "iv": opt.get("iv"),
+                "iv_pct": round(opt.get("iv", 0) * 100, 1) if opt.get("iv") else None,
+                # Include OI and IV Rank data
+                "open_interest": opt.get("open_interest", 0),
+                "iv_rank": round(min(100, opt.get("iv", 0) * 100 * 1.5), 0) if opt.get("iv") else None,
+            })
+
+    # Deduplicate: Keep best Weekly + Monthly per symbol
+    opportunities = PrecomputedScanService._dedupe_by_symbol_timeframe(opportunities)
+
+    # Sort by score and limit
+    opportunities.sort(key=lambda x: x["score"], reverse=True)
+    opportunities = opportunities[:SCAN_RESULT_LIMIT]
+
+    logger.info(f"Scan complete: {len(opportunities)} opportunities found")
+    logger.info(f"Stats: {stats['passed_technical']} passed tech, "
+                f"{stats['passed_fundamental']} passed fund, "
+                f"{stats['passed_options']} had options")
+
+    return opportunities
+
+
+def score_pmcc_profile(
+    risk_profile: str,
+    snapshots: Dict[str, Dict],
+    features: Dict[str, Dict],
+    symbols: List[str]
+) -> List[Dict[str, Any]]:
+    """Ranked PMCC opportunities for one risk profile over `symbols`."""
+    cc_profile = RISK_PROFILES.get(
+        risk_profile, RISK_PROFILES["conservative"])
+    pmcc_profile = PMCC_PROFILES.get(
+        risk_profile, PMCC_PROFILES["conservative"])
+
+    opportunities = []
+    pmcc_debug = RejectStats(sample_limit=5)
+    stats = {
+        "total_symbols": len(symbols),
+        "passed_technical": 0,
+        "passed_fundamental": 0,
+        "has_leaps": 0,
+        "has_short_call": 0,
+    }
 
-                # Extract computed values
-                net_debit = economics["net_debit"]
-                net_debit_total = economics["net_debit_total"]
-                max_profit = economics["max_profit"]
-                max_profit_total = economics["max_profit_total"]
-                breakeven = economics["breakeven"]
-                capital_efficiency = economics["capital_efficiency"] or 0
-
-                # ROI on capital deployed (net_debit basis)
-                roi_pct = economics["roi_per_cycle"]
-
-                # Use shared pmcc_scoring service
-                from backend.services.pmcc_scoring import compute_pmcc_metrics, hard_reject, warning_badges, score_pmcc
-
-                spot = current_price
-                pmcc_metrics = compute_pmcc_metrics(
-                    spot=spot,
-                    long_strike=best_leap["strike"],
-                    long_ask=leap_ask,
-                    long_delta=best_leap.get("delta", 0),
-                    long_dte=best_leap.get("dte", 365),
-                    long_oi=best_leap.get("oi", 0),
-                    long_iv=best_leap.get("iv", 0),
-                    short_strike=best_short["strike"],
-                    short_bid=short_bid,
-                    short_delta=best_short.get("delta", 0),
-                    short_dte=best_short.get("dte", 30),
-                    short_oi=best_short.get("oi", 0),
-                    long_spread_pct=best_leap.get("spread_pct", 20.0),
-                    short_spread_pct=best_short.get("spread_pct", 20.0),
-                )
-                reject = hard_reject(pmcc_metrics, risk_profile)
-                if reject:
-                    pmcc_debug.reject("pmcc_scoring_rejected", {"symbol": symbol, "reason": reject})
-                    continue
-                badges = warning_badges(pmcc_metrics)
-                score = score_pmcc(pmcc_metrics, risk_profile)
-
-                opportunities.append({
-                    "symbol": symbol,
-                    "stock_price": round(current_price, 2),
-                    "risk_profile": risk_profile,
-                    "strategy": "pmcc",
-                    # Long leg (LEAP) - BUY at ASK
-                    "long_strike": best_leap["strike"],
-                    "long_expiry": best_leap["expiry"],
-                    "long_dte": best_leap["dte"],
-                    # ASK price used for BUY
-                    "long_premium": round(leap_ask, 2),
-                    "long_delta": best_leap["delta"],
-                    "long_itm_pct": best_leap.get("itm_pct", 0),
-                    # Short leg - SELL at BID
-                    "short_strike": best_short["strike"],
-                    "short_expiry": best_short["expiry"],
-                    "short_dte": best_short["dte"],
-                    # BID price used for SELL
-                    "short_premium": round(short_bid, 2),
-                    "short_delta": best_short["delta"],
-                    # Combined metrics (from shared computation)
-                    "net_debit": round(net_debit, 2),
-                    "net_debit_total": round(net_debit_total, 2),
-                    "width": economics["width"],
-                    "max_profit": round(max_profit, 2),
-                    "max_profit_total": round(max_profit_total, 2),
-                    "breakeven": breakeven,
-                    "roi_pct": round(roi_pct, 2),
-                    "capital_efficiency": round(capital_efficiency, 1),
-                    "pricing_rule": economics["pricing_rule"],
-                    "score": round(score, 1),
-                    # pmcc_scoring metrics
-                    **{k: pmcc_metrics[k] for k in pmcc_metrics},
-                    "warning_badges": badges,
-                    "pmcc_score": round(score, 1),
-                    # Technical indicators
-                    "sma50": tech_data.get("sma50"),
-                    "sma200": tech_data.get("sma200"),
-                    "rsi14": tech_data.get("rsi14"),
-                    "atr_pct": round(tech_data.get("atr_pct", 0) * 100, 2) if tech_data.get("atr_pct") else None,
-                    # Fundamental data
-                    "market_cap": fund_data.get("market_cap", 0),
-                    "eps_ttm": fund_data.get("eps_ttm", 0),
-                    "roe": round(fund_data.get("roe", 0) * 100, 1) if fund_data.get("roe") else None,
-                    "debt_to_equity": fund_data.get("debt_to_equity"),
-                    "days_to_earnings": fund_data.get("days_to_earnings"),
-                    "sector": fund_data.get("sector", ""),
-                    # Include analyst rating
-                    "analyst_rating": fund_data.get("analyst_rating"),
-                    "num_analysts": fund_data.get("num_analysts", 0),
-                    "target_price": fund_data.get("target_price"),
-                })
-                pmcc_debug.keep()
-
-            # Inter-batch delay
-            await asyncio.sleep(1.0)
-
-        # Log resilient fetch stats
-        scan_stats = fetcher.get_stats()
-        scan_stats.log_summary()
+    for symbol in symbols:
+        feat = features.get(symbol) or {}
+        pmcc_debug.total += 1
+        tech_data = feat.get("technical")
+        fund_data = feat.get("fundamental")
+        symbol_is_etf = is_etf(symbol)
+
+        # Handle fetch failures gracefully
+        if tech_data is None:
+            pmcc_debug.reject("fetch_failed_technical", {
+                              "symbol": symbol})
+            continue
+
+        # Apply technical filters (same as covered call)
+        tech_pass, _ = PrecomputedScanService.passes_technical_filters(
+            tech_data, cc_profile)
+        if not tech_pass:
+            pmcc_debug.reject("fails_technical_filters", {
+                              "symbol": symbol, "close": tech_data.get("close")})
+            continue
+        stats["passed_technical"] += 1
+
+        # ================================================================
+        # ETF HANDLING: Skip fundamental filters for ETFs
+        # ================================================================
+        if symbol_is_etf:
+            # ETF: Auto-pass fundamentals
+            stats["passed_fundamental"] += 1
+            logger.debug(
+                f"PMCC_ETF_FUNDAMENTALS_BYPASSED | symbol={symbol}")
+        else:
+            # Stock: Apply fundamental filters
+            # Handle fundamental fetch failure
+            if fund_data is None:
+                pmcc_debug.reject("fetch_failed_fundamental", {
+                                  "symbol": symbol})
+                continue
+
+            # Apply fundamental filters
+            fund_pass, _ = PrecomputedScanService.passes_fundamental_filters(
+                fund_data, cc_profile)
+            if not fund_pass:
+                pmcc_debug.reject("fails_fundamental_filters", {
+                                  "symbol": symbol})
+                continue
+            stats["passed_fundamental"] += 1
+
+        current_price = tech_data.get("close", 0)
+        if current_price <= 0:
+            pmcc_debug.reject("missing_underlying_price", {
+                              "symbol": symbol, "close": current_price})
+            continue
+
+        # ── Read LEAPS and short calls from snapshot (NO Yahoo call) ──
+        snap = snapshots.get(symbol, {})
+
+        # Build leaps list from snapshot leaps_calls
+        raw_leaps = snap.get("leaps_calls", [])
+        leaps = []
+        for l in raw_leaps:
+            ask = l.get("ask", 0) or 0
+            if ask <= 0:
+                continue
+            oi = l.get("open_interest", 0) or 0
+            dte = l.get("dte", 0)
+            if not (pmcc_profile.get("long_dte_min", 365) <= dte <= pmcc_profile.get("long_dte_max", 730)):
+                continue
+            leaps.append({
+                "strike": l.get("strike", 0),
+                "expiry": l.get("expiry", ""),
+                "dte": dte,
+                "premium": round(ask, 2),  # ASK for BUY leg
+                "delta": l.get("delta", 0),
+                "open_interest": oi,
+                "itm_pct": l.get("itm_pct", 0),
+                "iv": l.get("iv", 0),
+                "iv_pct": l.get("iv_pct", 0),
+            })
+
+        if not leaps:
+            pmcc_debug.reject(
+                "no_leaps", {"symbol": symbol, "price": current_price})
+            continue
+        stats["has_leaps"] += 1
+
+        # Build short_calls list from snapshot short_calls
+        raw_shorts = snap.get("short_calls", [])
+        short_calls = []
+        for s in raw_shorts:
+            bid = s.get("bid", 0) or 0
+            if bid <= 0:
+                continue
+            oi = s.get("open_interest", 0) or 0
+            dte = s.get("dte", 0)
+            if not (pmcc_profile.get("short_dte_min", 20) <= dte <= pmcc_profile.get("short_dte_max", 45)):
+                continue
+            short_calls.append({
+                "strike": s.get("strike", 0),
+                "expiry": s.get("expiry", ""),
+                "dte": dte,
+                "premium": round(bid, 2),  # BID for SELL leg
+                "delta": s.get("delta", 0),
+                "open_interest": oi,
+                "iv": s.get("iv", 0),
+                "iv_pct": s.get("iv_pct", 0),
+            })
+
+        if not short_calls:
+            pmcc_debug.reject("no_short_calls", {
+                              "symbol": symbol, "price": current_price})
+            continue
+        stats["has_short_call"] += 1
+
+        # Find best LEAP and short call combination
+        best_leap = leaps[0]  # Already sorted by quality in snapshot
+        best_short = max(
+            short_calls, key=lambda x: x.get("premium", 0))
 
         # ============================================================
-        # PHASE 3: AI-BASED BEST OPTION SELECTION PER SYMBOL (PMCC)
+        # GLOBAL CONSISTENCY: Use shared pricing rules
+        # BUY LEAP at ASK, SELL short at BID
         # ============================================================
-        symbol_best = {}
-        for opp in opportunities:
-            symbol = opp["symbol"]
-            if symbol not in symbol_best or opp["score"] > symbol_best[symbol]["score"]:
-                symbol_best[symbol] = opp
-
-        opportunities = list(symbol_best.values())
-        opportunities.sort(key=lambda x: x["score"], reverse=True)
-        opportunities = opportunities[:50]
+        leap_ask = best_leap["premium"]   # LEAPS use ASK for BUY
+        short_bid = best_short["premium"]  # Short calls use BID for SELL
 
-        logger.info(
-            f"PMCC scan complete: {len(opportunities)} opportunities found")
-        logger.info(f"Stats: {stats['passed_technical']} passed tech, "
-                    f"{stats['passed_fundamental']} passed fund, "
-                    f"{stats['has_leaps']} had LEAPS, "
-                    f"{stats['has_short_call']} had short calls")
-        pmcc_debug.log(logger_obj=logger, prefix=f"PMCC_DEBUG_{risk_profile}")
-
-        return opportunities
\ No newline at end of file
+        # ============================================================
+        # MANDATORY SAFETY RULES: Solvency + Break-even
+        # These are enforced in precomputed PMCC to match custom PMCC
+        # ============================================================
+        is_valid, structure_flags = validate_pmcc_structure_rules(
+            long_strike=best_leap["strike"],
+            short_strike=best_short["strike"],
+            leap_ask=leap_ask,
+            short_bid=short_bid
+        )
+
+        if not is_valid:
+            # Skip this combination - fails solvency or break-even
+            # Record which rule(s) rejected so "0 results" can be diagnosed quickly.
+            pmcc_debug.reject("pmcc_structure_rejected", {
+                              "symbol": symbol, "flags": structure_flags})
+            try:
+                if isinstance(structure_flags, dict):
+                    for k, v in structure_flags.items():
+                        if v:
+                            pmcc_debug.reject(f"pmcc_rule_{k}", {
+                                              "symbol": symbol})
+                elif isinstance(structure_flags, (list, tuple, set)):
+                    for k in structure_flags:
+                        pmcc_debug.reject(f"pmcc_rule_{k}", {
+                                          "symbol": symbol})
+                elif isinstance(structure_flags, str) and structure_flags:
+                    pmcc_debug.reject(f"pmcc_rule_{structure_flags}", {
+                                      "symbol": symbol})
+            except Exception:
+                pass
+            logger.debug(
+                f"PMCC_STRUCTURE_REJECTED | symbol={symbol} | flags={structure_flags}")
+            continue
+
+        # Use shared economics computation for consistency
+        economics = compute_pmcc_economics(
+            long_strike=best_leap["strike"],
+            short_strike=best_short["strike"],
+            leap_ask=leap_ask,
+            short_bid=short_bid,
+            current_price=current_price
+        )
+
+        # Extract computed values
+        net_debit = economics["net_debit"]
+        net_debit_total = economics["net_debit_total"]
+        max_profit = economics["max_profit"]
+        max_profit_total = economics["max_profit_total"]
+        breakeven = economics["breakeven"]
+        capital_efficiency = economics["capital_efficiency"] or 0
+
+        # ROI on capital deployed (net_debit basis)
+        roi_pct = economics["roi_per_cycle"]
+
+        # Use shared pmcc_scoring service
+        from backend.services.pmcc_scoring import compute_pmcc_metrics, hard_reject, warning_badges, score_pmcc
+
+        spot = current_price
+        pmcc_metrics = compute_pmcc_metrics(
+            spot=spot,
+            long_strike=best_leap["strike"],
+            long_ask=leap_ask,
+            long_delta=best_leap.get("delta", 0),
+            long_dte=best_leap.get("dte", 365),
+            long_oi=best_leap.get("oi", 0),
+            long_iv=best_leap.get("iv", 0),
+            short_strike=best_short["strike"],
+            short_bid=short_bid,
+            short_delta=best_short.get("delta", 0),
+            short_dte=best_short.get("dte", 30),
+            short_oi=best_short.get("oi", 0),
+            long_spread_pct=best_leap.get("spread_pct", 20.0),
+            short_spread_pct=best_short.get("spread_pct", 20.0),
+        )
+        reject = hard_reject(pmcc_metrics, risk_profile)
+        if reject:
+            pmcc_debug.reject("pmcc_scoring_rejected", {"symbol": symbol, "reason": reject})
+            continue
+        badges = warning_badges(pmcc_metrics)
+        score = score_pmcc(pmcc_metrics, risk_profile)
+
+        opportunities.append({
+            "symbol": symbol,
+            "stock_price": round(current_price, 2),
+            "risk_profile": risk_profile,
+            "strategy": "pmcc",
+            # Long leg (LEAP) - BUY at ASK
+            "long_strike": best_leap["strike"],
+            "long_expiry": best_leap["expiry"],
+            "long_dte": best_leap["dte"],
+            # ASK price used for BUY
+            "long_premium": round(leap_ask, 2),
+            "long_delta": best_leap["delta"],
+            "long_itm_pct": best_leap.get("itm_pct", 0),
+            # Short leg - SELL at BID
+            "short_strike": best_short["strike"],
+            "short_expiry": best_short["expiry"],
+            "short_dte": best_short["dte"],
+            # BID price used for SELL
+            "short_premium": round(short_bid, 2),
+            "short_delta": best_short["delta"],
+            # Combined metrics (from shared computation)
+            "net_debit": round(net_debit, 2),
+            "net_debit_total": round(net_debit_total, 2),
+            "width": economics["width"],
+            "max_profit": round(max_profit, 2),
+            "max_profit_total": round(max_profit_total, 2),
+            "breakeven": breakeven,
+            "roi_pct": round(roi_pct, 2),
+            "capital_efficiency": round(capital_efficiency, 1),
+            "pricing_rule": economics["pricing_rule"],
+            "score": round(score, 1),
+            # pmcc_scoring metrics
+            **{k: pmcc_metrics[k] for k in pmcc_metrics},
+            "warning_badges": badges,
+            "pmcc_score": round(score, 1),
+            # Technical indicators
+            "sma50": tech_data.get("sma50"),
+            "sma200": tech_data.get("sma200"),
+            "rsi14": tech_data.get("rsi14"),
+            "atr_pct": round(tech_data.get("atr_pct", 0) * 100, 2) if tech_data.get("atr_pct") else None,
+            # Fundamental data
+            "market_cap": fund_data.get("market_cap", 0),
+            "eps_ttm": fund_data.get("eps_ttm", 0),
+            "roe": round(fund_data.get("roe", 0) * 100, 1) if fund_data.get("roe") else None,
+            "debt_to_equity": fund_data.get("debt_to_equity"),
+            "days_to_earnings": fund_data.get("days_to_earnings"),
+            "sector": fund_data.get("sector", ""),
+            # Include analyst rating
+            "analyst_rating": fund_data.get("analyst_rating"),
+            "num_analysts": fund_data.get("num_analysts", 0),
+            "target_price": fund_data.get("target_price"),
+        })
+        pmcc_debug.keep()
+
+    # ============================================================
+    # PHASE 3: AI-BASED BEST OPTION SELECTION PER SYMBOL (PMCC)
+    # ============================================================
+    symbol_best = {}
+    for opp in opportunities:
+        symbol = opp["symbol"]
+        if symbol not in symbol_best or opp["score"] > symbol_best[symbol]["score"]:
+            symbol_best[symbol] = opp
+
+    opportunities = list(symbol_best.values())
+    opportunities.sort(key=lambda x: x["score"], reverse=True)
+    opportunities = opportunities[:SCAN_RESULT_LIMIT]
+
+    logger.info(
+        f"PMCC scan complete: {len(opportunities)} opportunities found")
+    logger.info(f"Stats: {stats['passed_technical']} passed tech, "
+                f"{stats['passed_fundamental']} passed fund, "
+                f"{stats['has_leaps']} had LEAPS, "
+                f"{stats['has_short_call']} had short calls")
+    pmcc_debug.log(logger_obj=logger, prefix=f"PMCC_DEBUG_{risk_profile}")
+
+    return opportunities
+
+
+def score_profile(
+    strategy: str,
+    risk_profile: str,
+    snapshots: Dict[str, Dict],
+    features: Dict[str, Dict],
+    symbols: List[str]
+) -> Tuple[List[Dict[str, Any]], float]:
+    """One profile's opportunities and its scoring time in seconds (a run_all_scans pool task)."""
+    start = time.perf_counter()
+    score = score_covered_call_profile if strategy == "covered_call" else score_pmcc_profile
+    opportunities = score(risk_profile, snapshots, features, symbols)
+    return opportunities, time.perf_counter() - start
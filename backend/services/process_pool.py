@@ -0,0 +1,70 @@
+"""
+Process Pool - Shared factory for CPU-bound worker pools
+========================================================
+
+profile_sweep (grid points), snapshot_backtest (replayed symbols) and
+scan_compute (EOD scan chunks) fan pure-CPU work out to processes. They all
+get their pool here so the start method is decided in one place.
+
+The API process is multi-threaded (uvicorn, Motor/pymongo monitor threads,
+APScheduler, the EOD pipeline thread). Forking it copies locks that another
+thread may hold at that instant, and a child can deadlock on them. Workers
+are therefore started with `forkserver` (forked from a clean, single-threaded
+server process), or `spawn` where forkserver is unavailable. Either way the
+worker re-imports the submitted function's module, so pool functions must be
+module-level.
+
+Shutdown: shutdown_pool() waits for in-flight work off the event loop, or
+cancels queued work without waiting on the error path.
+
+Config:
+    PROCESS_POOL_START_METHOD  forkserver (default) | spawn
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+PROCESS_POOL_START_METHOD = os.environ.get("PROCESS_POOL_START_METHOD", "forkserver")
+
+
+def _mp_context():
+    method = PROCESS_POOL_START_METHOD
+    if method not in multiprocessing.get_all_start_methods() or method == "fork":
+        method = "spawn"
+    return multiprocessing.get_context(method)
+
+
+def process_pool(
+    max_workers: int,
+    initializer: Optional[Callable[..., Any]] = None,
+    initargs: Sequence[Any] = (),
+) -> Optional[ProcessPoolExecutor]:
+    """ProcessPoolExecutor with a thread-safe start method, or None for <= 1 worker."""
+    if max_workers <= 1:
+        return None
+    return ProcessPoolExecutor(
+        max_workers=max_workers,
+        mp_context=_mp_context(),
+        initializer=initializer,
+        initargs=tuple(initargs),
+    )
+
+
+async def shutdown_pool(pool: Optional[ProcessPoolExecutor], cancel: bool = False) -> None:
+    """
+    Shut `pool` down without blocking the event loop. With `cancel` (error
+    path) queued work is dropped and nothing is awaited; otherwise in-flight
+    work finishes in a thread-pool thread.
+    """
+    if pool is None:
+        return
+    if cancel:
+        pool.shutdown(wait=False, cancel_futures=True)
+        return
+    await asyncio.get_running_loop().run_in_executor(None, pool.shutdown)
@@ -0,0 +1,342 @@
+"""
+Profile Sweep - Replay stored CC scans over a grid of profile parameters
+========================================================================
+
+get_optimal_settings (routes/simulator.py) only summarises the parameters of
+a user's own past trades. This engine answers "how would these RISK_PROFILES
+thresholds have done?" from what the EOD pipeline already stored:
+
+- Candidates : scan_results_cc rows of the COMPLETED runs in [start, end]
+- Outcomes   : underlying_price in later symbol_snapshot docs; the close at
+               expiry is the last snapshot on or before the expiry date.
+               Candidates whose expiry is after the last snapshot are open
+               and left out.
+
+Per grid point the scan's selection is replayed: candidates passing the
+thresholds, best score per (run, symbol). Metrics per point:
+- hit_rate          : % of selected calls that expired OTM (not assigned)
+- avg_premium_pct   : premium (bid) / stock price, %
+- avg_realized_pct  : option-leg P&L / stock price, % = premium - max(0, S_T - K)
+
+Candidates are loaded once into NumPy columns sorted by (run, symbol, -score);
+a grid point is a handful of vector comparisons plus a group-first pick.
+Grid chunks are spread over a process pool (PROFILE_SWEEP_MAX_WORKERS) that
+receives the columns once per worker.
+"""
+
+import asyncio
+import itertools
+import logging
+import os
+from bisect import bisect_right
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .precomputed_scans import RISK_PROFILES
+from .process_pool import process_pool
+
+logger = logging.getLogger(__name__)
+
+# Thresholds that exist on stored scan_results_cc rows
+SWEEP_PARAMS = (
+    "delta_min", "delta_max", "dte_min", "dte_max", "premium_yield_min",
+    "iv_percentile_min", "iv_percentile_max", "market_cap_min",
+)
+# Fields the sweep reads from scan_results_cc
+CANDIDATE_FIELDS = (
+    "run_id", "symbol", "stock_price", "strike", "expiry", "dte", "delta",
+    "premium_bid", "iv_percentile", "market_cap", "score",
+)
+
+MAX_GRID_POINTS = int(os.environ.get("PROFILE_SWEEP_MAX_GRID_POINTS", "5000"))
+SWEEP_MAX_WORKERS = int(os.environ.get("PROFILE_SWEEP_MAX_WORKERS", str(min(4, os.cpu_count() or 1))))
+SWEEP_CHUNK_SIZE = 50
+CURSOR_BATCH_SIZE = 1000
+
+
+def _day(value) -> Optional[str]:
+    """YYYY-MM-DD of a datetime or ISO string (as_of is stored as both)."""
+    if isinstance(value, datetime):
+        return value.strftime("%Y-%m-%d")
+    if isinstance(value, str) and len(value) >= 10:
+        return value[:10]
+    return None
+
+
+def profile_params(profile: str) -> Dict[str, Any]:
+    """The sweepable thresholds of one RISK_PROFILES entry."""
+    config = RISK_PROFILES.get(profile, RISK_PROFILES["conservative"])
+    return {p: config.get(p) for p in SWEEP_PARAMS}
+
+
+# =============================================================================
+# CANDIDATE COLUMNS
+# =============================================================================
+
+@dataclass
+class SweepCandidates:
+    """Replayable CC candidates as columns, sorted by (group, -score)."""
+    group: np.ndarray           # int64: one id per (run, symbol)
+    score: np.ndarray
+    delta: np.ndarray
+    dte: np.ndarray
+    premium_yield: np.ndarray   # fraction, as in RISK_PROFILES premium_yield_min
+    iv_percentile: np.ndarray   # NaN when not stored (passes any IV filter)
+    market_cap: np.ndarray
+    hit: np.ndarray             # bool: expired OTM
+    premium_pct: np.ndarray
+    realized_pct: np.ndarray
+    runs: int
+    open_candidates: int = 0
+
+    def __len__(self) -> int:
+        return len(self.group)
+
+
+def _float(value, default: float = np.nan) -> float:
+    try:
+        return float(value) if value is not None else default
+    except (TypeError, ValueError):
+        return default
+
+
+def build_candidates(
+    rows: Iterable[Dict[str, Any]],
+    closes: Dict[str, Tuple[List[str], List[float]]],
+) -> SweepCandidates:
+    """
+    Columns from scan_results_cc rows. `closes` maps symbol -> (sorted days,
+    prices); a row is kept only if its expiry is covered by that history.
+    """
+    group_ids: Dict[Tuple[str, str], int] = {}
+    runs = set()
+    cols: Dict[str, List[float]] = {k: [] for k in (
+        "group", "score", "delta", "dte", "premium_yield", "iv_percentile",
+        "market_cap", "hit", "premium_pct", "realized_pct")}
+    open_candidates = 0
+
+    for row in rows:
+        price = _float(row.get("stock_price"), 0.0)
+        strike = _float(row.get("strike"), 0.0)
+        expiry = (row.get("expiry") or "")[:10]
+        if price <= 0 or strike <= 0 or not expiry:
+            continue
+        days, prices = closes.get(row["symbol"], ([], []))
+        if not days or days[-1] < expiry:
+            open_candidates += 1
+            continue
+        i = bisect_right(days, expiry) - 1
+        if i < 0:
+            continue
+        settle = prices[i]
+        premium = _float(row.get("premium_bid"), 0.0)
+
+        key = (row["run_id"], row["symbol"])
+        runs.add(row["run_id"])
+        cols["group"].append(group_ids.setdefault(key, len(group_ids)))
+        cols["score"].append(_float(row.get("score"), 0.0))
+        cols["delta"].append(_float(row.get("delta"), 0.0))
+        cols["dte"].append(_float(row.get("dte"), 0.0))
+        cols["premium_yield"].append(premium / price)
+        cols["iv_percentile"].append(_float(row.get("iv_percentile")))
+        cols["market_cap"].append(_float(row.get("market_cap"), 0.0))
+        cols["hit"].append(settle <= strike)
+        cols["premium_pct"].append(premium / price * 100)
+        cols["realized_pct"].append((premium - max(0.0, settle - strike)) / price * 100)
+
+    arrays = {k: np.asarray(v, dtype=np.int64 if k == "group" else bool if k == "hit" else np.float64)
+              for k, v in cols.items()}
+    order = np.lexsort((-arrays["score"], arrays["group"]))
+    return SweepCandidates(
+        **{k: v[order] for k, v in arrays.items()},
+        runs=len(runs),
+        open_candidates=open_candidates,
+    )
+
+
+# =============================================================================
+# GRID EVALUATION
+# =============================================================================
+
+def build_grid(spec: Dict[str, Sequence[float]], base: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+    """Cartesian product of `spec` over `base`; points with min > max are dropped."""
+    unknown = set(spec) - set(SWEEP_PARAMS)
+    if unknown:
+        raise ValueError(f"Unknown sweep parameters: {sorted(unknown)}")
+    base = dict(base or {})
+    names = list(spec)
+    grid = []
+    for values in itertools.product(*(spec[n] for n in names)):
+        point = {**base, **dict(zip(names, values))}
+        if any(
+            point.get(f"{p}_min") is not None and point.get(f"{p}_max") is not None
+            and point[f"{p}_min"] > point[f"{p}_max"]
+            for p in ("delta", "dte", "iv_percentile")
+        ):
+            continue
+        grid.append(point)
+    if len(grid) > MAX_GRID_POINTS:
+        raise ValueError(f"Grid has {len(grid)} points (max {MAX_GRID_POINTS})")
+    return grid
+
+
+def _mask(c: SweepCandidates, point: Dict[str, Any]) -> np.ndarray:
+    mask = np.ones(len(c), dtype=bool)
+    for column, lo, hi in (
+        (c.delta, "delta_min", "delta_max"),
+        (c.dte, "dte_min", "dte_max"),
+        (c.premium_yield, "premium_yield_min", None),
+        (c.market_cap, "market_cap_min", None),
+    ):
+        if point.get(lo) is not None:
+            mask &= column >= point[lo]
+        if hi and point.get(hi) is not None:
+            mask &= column <= point[hi]
+    iv_lo, iv_hi = point.get("iv_percentile_min"), point.get("iv_percentile_max")
+    if iv_lo is not None or iv_hi is not None:
+        iv = c.iv_percentile
+        ok = np.ones(len(c), dtype=bool)
+        if iv_lo is not None:
+            ok &= iv >= iv_lo
+        if iv_hi is not None:
+            ok &= iv <= iv_hi
+        mask &= ok | np.isnan(iv)
+    return mask
+
+
+def evaluate_point(c: SweepCandidates, point: Dict[str, Any]) -> Dict[str, Any]:
+    """Replay one grid point: best-scoring passing candidate per (run, symbol)."""
+    idx = np.flatnonzero(_mask(c, point))
+    if idx.size:
+        groups = c.group[idx]
+        idx = idx[np.concatenate(([True], groups[1:] != groups[:-1]))]
+    trades = int(idx.size)
+    result = {"params": point, "trades": trades, "hit_rate": None,
+              "avg_premium_pct": None, "avg_realized_pct": None, "total_realized_pct": 0.0}
+    if trades:
+        realized = c.realized_pct[idx]
+        result.update({
+            "hit_rate": round(float(c.hit[idx].mean()) * 100, 2),
+            "avg_premium_pct": round(float(c.premium_pct[idx].mean()), 4),
+            "avg_realized_pct": round(float(realized.mean()), 4),
+            "total_realized_pct": round(float(realized.sum()), 4),
+        })
+    return result
+
+
+_worker_candidates: Optional[SweepCandidates] = None
+
+
+def _init_worker(candidates: SweepCandidates) -> None:
+    global _worker_candidates
+    _worker_candidates = candidates
+
+
+def _evaluate_chunk(points: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return [evaluate_point(_worker_candidates, p) for p in points]
+
+
+def evaluate_grid(
+    candidates: SweepCandidates,
+    grid: List[Dict[str, Any]],
+    max_workers: int = SWEEP_MAX_WORKERS,
+    chunk_size: int = SWEEP_CHUNK_SIZE,
+) -> List[Dict[str, Any]]:
+    """Evaluate every grid point (in grid order), in a process pool when it pays off."""
+    chunks = [grid[i:i + chunk_size] for i in range(0, len(grid), chunk_size)]
+    if max_workers <= 1 or len(chunks) <= 1:
+        return [evaluate_point(candidates, p) for p in grid]
+    with process_pool(min(max_workers, len(chunks)), _init_worker, (candidates,)) as pool:
+        return [r for chunk in pool.map(_evaluate_chunk, chunks) for r in chunk]
+
+
+# =============================================================================
+# LOADING + ENTRY POINT
+# =============================================================================
+
+async def _completed_runs(db, start: str, end: Optional[str] = None) -> List[Dict[str, Any]]:
+    runs = await db.scan_runs.find(
+        {"status": {"$in": ["COMPLETED", "completed"]}},
+        {"_id": 0, "run_id": 1, "as_of": 1}
+    ).to_list(length=None)
+    out = []
+    for run in runs:
+        day = _day(run.get("as_of"))
+        if day and day >= start and (end is None or day <= end):
+            out.append({"run_id": run["run_id"], "day": day})
+    return sorted(out, key=lambda r: r["day"])
+
+
+async def load_candidates(db, start: str, end: str) -> SweepCandidates:
+    """scan_results_cc rows of the runs in [start, end] with outcomes from symbol_snapshot."""
+    sweep_runs = [r["run_id"] for r in await _completed_runs(db, start, end)]
+    rows: List[Dict[str, Any]] = []
+    projection = {"_id": 0, **{f: 1 for f in CANDIDATE_FIELDS}}
+    cursor = db.scan_results_cc.find({"run_id": {"$in": sweep_runs}}, projection).batch_size(CURSOR_BATCH_SIZE)
+    async for row in cursor:
+        rows.append(row)
+
+    # Prices from every run since `start` (expiries extend past `end`)
+    price_runs = {r["run_id"]: r["day"] for r in await _completed_runs(db, start)}
+    symbols = sorted({r["symbol"] for r in rows})
+    by_symbol: Dict[str, Dict[str, float]] = {}
+    cursor = db.symbol_snapshot.find(
+        {"run_id": {"$in": list(price_runs)}, "symbol": {"$in": symbols}},
+        {"_id": 0, "run_id": 1, "symbol": 1, "underlying_price": 1}
+    ).batch_size(CURSOR_BATCH_SIZE)
+    async for doc in cursor:
+        price = _float(doc.get("underlying_price"), 0.0)
+        if price > 0:
+            by_symbol.setdefault(doc["symbol"], {})[price_runs[doc["run_id"]]] = price
+
+    closes = {}
+    for symbol, series in by_symbol.items():
+        days = sorted(series)
+        closes[symbol] = (days, [series[d] for d in days])
+    return build_candidates(rows, closes)
+
+
+async def run_profile_sweep(
+    db,
+    start: str,
+    end: str,
+    spec: Dict[str, Sequence[float]],
+    base_profile: str = "balanced",
+    top: int = 20,
+    max_workers: int = SWEEP_MAX_WORKERS,
+) -> Dict[str, Any]:
+    """
+    Sweep `spec` (param -> values) around `base_profile`'s thresholds over the
+    CC runs in [start, end]. Returns the top points by avg realized premium,
+    plus every RISK_PROFILES entry evaluated as a baseline.
+    """
+    grid = build_grid(spec, profile_params(base_profile))
+    started = datetime.now()
+    candidates = await load_candidates(db, start, end)
+    loop = asyncio.get_running_loop()
+    results = await loop.run_in_executor(None, evaluate_grid, candidates, grid, max_workers)
+    baselines = {name: evaluate_point(candidates, profile_params(name)) for name in RISK_PROFILES}
+
+    ranked = sorted(
+        (r for r in results if r["trades"]),
+        key=lambda r: (r["avg_realized_pct"], r["hit_rate"]),
+        reverse=True,
+    )
+    elapsed = (datetime.now() - started).total_seconds()
+    logger.info(f"[PROFILE_SWEEP] {len(grid)} points x {len(candidates)} candidates "
+                f"({candidates.runs} runs) in {elapsed:.1f}s")
+    return {
+        "start": start,
+        "end": end,
+        "base_profile": base_profile,
+        "grid_points": len(grid),
+        "candidates": len(candidates),
+        "open_candidates": candidates.open_candidates,
+        "runs": candidates.runs,
+        "elapsed_seconds": round(elapsed, 2),
+        "baselines": baselines,
+        "top": ranked[:top],
+    }
@@ -0,0 +1,282 @@
+"""
+Retention Manager - Tiered retention for the per-run EOD collections
+====================================================================
+
+symbol_snapshot, scan_results_cc, scan_results_pmcc and scan_universe_audit
+gain a full universe per EOD run and had no retention, so their run_id
+indexes (and every run_id query) kept growing. apply_retention() places each
+scan_runs run in a tier per collection:
+
+    hot      the newest RETENTION_HOT_RUNS COMPLETED runs, and anything newer
+             than the oldest of them - never touched
+    warm     older than hot, younger than the policy's expire_days - compacted
+    expired  as_of older than expire_days - every document of the run deleted
+
+Compaction per policy:
+
+    encode_chains  symbol_snapshot option_chain re-encoded as compressed
+                   columnar option_chain_packed (chain_codec); every reader
+                   already accepts both formats
+    top_n          only the RETENTION_RESULTS_TOP_N best-scored rows kept
+    sweep_fields   every row kept, trimmed to the fields profile_sweep reads
+                   (profile_sweep.CANDIDATE_FIELDS)
+    None           no warm tier (expiry only)
+
+symbol_snapshot runs (snapshot_backtest, and profile_sweep outcomes) and
+scan_results_cc rows (profile_sweep candidates) are replayed, so they never
+expire inside the backtest horizon: their expire_days is the larger of the
+policy's own days and BACKTEST_HORIZON_DAYS. Their compaction keeps every
+symbol / row, so a replay of an old run sees the same universe the scan did
+rather than a score-selected slice. A backtest or sweep can reach back
+BACKTEST_HORIZON_DAYS.
+
+Deletes run in chunks of RETENTION_DELETE_CHUNK _ids so a large expiry never
+holds one long delete. Documents whose run_id has no scan_runs entry (runs
+that crashed before publishing) expire by their own as_of.
+
+The tier applied is recorded on the run (scan_runs.retention.<collection>),
+so repeated passes only touch runs that changed tier. Reclaimed bytes are the
+BSON sizes of deleted documents plus the size drop of re-encoded ones.
+"""
+
+import logging
+import os
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Sequence
+
+import bson
+from pymongo import UpdateOne
+
+from services.chain_codec import PACKED_FIELD, encode_chains, resolve_compression
+
+logger = logging.getLogger(__name__)
+
+HOT_RUNS = int(os.environ.get("RETENTION_HOT_RUNS", "5"))
+RESULTS_TOP_N = int(os.environ.get("RETENTION_RESULTS_TOP_N", "100"))
+DELETE_CHUNK = int(os.environ.get("RETENTION_DELETE_CHUNK", "1000"))
+COMPACT_BATCH = 20  # symbol_snapshot docs re-encoded per bulk write (chains are MBs each)
+TRIM_BATCH = 500  # scan_results_cc rows trimmed per bulk write
+ARCHIVE_COMPRESSION = os.environ.get("RETENTION_CHAIN_COMPRESSION", "zlib")
+BACKTEST_HORIZON_DAYS = int(os.environ.get("BACKTEST_HORIZON_DAYS", str(3 * 365)))
+
+RETENTION_FIELD = "retention"
+
+
+@dataclass(frozen=True)
+class RetentionPolicy:
+    collection: str
+    compact: Optional[str]  # "encode_chains" | "top_n" | "sweep_fields" | None
+    expire_days: int
+
+
+POLICIES = (
+    RetentionPolicy("symbol_snapshot", "encode_chains",
+                    max(int(os.environ.get("RETENTION_SNAPSHOT_DAYS", "180")), BACKTEST_HORIZON_DAYS)),
+    RetentionPolicy("scan_results_cc", "sweep_fields",
+                    max(int(os.environ.get("RETENTION_RESULTS_DAYS", "365")), BACKTEST_HORIZON_DAYS)),
+    RetentionPolicy("scan_results_pmcc", "top_n", int(os.environ.get("RETENTION_RESULTS_DAYS", "365"))),
+    RetentionPolicy("scan_universe_audit", None, int(os.environ.get("RETENTION_AUDIT_DAYS", "30"))),
+)
+
+
+def _as_of(value) -> Optional[datetime]:
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    if not isinstance(value, datetime):
+        return None
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+def hot_run_ids(runs: Sequence[Dict[str, Any]], hot_runs: int = None) -> set:
+    """Runs (sorted newest first) down to and including the hot_runs-th COMPLETED one."""
+    hot_runs = HOT_RUNS if hot_runs is None else hot_runs
+    hot, completed = set(), 0
+    for run in runs:
+        if completed >= hot_runs and _as_of(run.get("as_of")) is not None:
+            break
+        hot.add(run["run_id"])
+        if str(run.get("status", "")).upper() == "COMPLETED":
+            completed += 1
+    # Runs with no usable as_of cannot be aged; keep them hot
+    hot.update(r["run_id"] for r in runs if _as_of(r.get("as_of")) is None)
+    return hot
+
+
+def run_tier(run: Dict[str, Any], policy: RetentionPolicy, hot: set, now: datetime) -> str:
+    if run["run_id"] in hot:
+        return "hot"
+    if _as_of(run.get("as_of")) < now - timedelta(days=policy.expire_days):
+        return "expired"
+    return "warm" if policy.compact else "hot"
+
+
+async def _bson_bytes(coll, ids: List[Any]) -> int:
+    try:
+        rows = await coll.aggregate([
+            {"$match": {"_id": {"$in": ids}}},
+            {"$group": {"_id": None, "bytes": {"$sum": {"$bsonSize": "$$ROOT"}}}},
+        ]).to_list(length=1)
+    except Exception as e:  # $bsonSize needs MongoDB 4.4+
+        logger.debug(f"[RETENTION] size estimate unavailable: {e}")
+        return 0
+    return int(rows[0]["bytes"]) if rows else 0
+
+
+async def _delete_ids(coll, ids: List[Any], dry_run: bool, stats: Dict[str, int]) -> None:
+    for i in range(0, len(ids), DELETE_CHUNK):
+        chunk = ids[i:i + DELETE_CHUNK]
+        stats["bytes_reclaimed"] += await _bson_bytes(coll, chunk)
+        if dry_run:
+            stats["documents_deleted"] += len(chunk)
+        else:
+            result = await coll.delete_many({"_id": {"$in": chunk}})
+            stats["documents_deleted"] += result.deleted_count
+
+
+async def _ids(cursor) -> List[Any]:
+    return [doc["_id"] async for doc in cursor]
+
+
+async def _expire_run(coll, run_id: str, dry_run: bool, stats: Dict[str, int]) -> None:
+    await _delete_ids(coll, await _ids(coll.find({"run_id": run_id}, {"_id": 1})), dry_run, stats)
+
+
+async def _compact_top_n(coll, run_id: str, dry_run: bool, stats: Dict[str, int]) -> None:
+    cursor = coll.find({"run_id": run_id}, {"_id": 1}).sort("score", -1).skip(RESULTS_TOP_N)
+    await _delete_ids(coll, await _ids(cursor), dry_run, stats)
+
+
+async def _compact_chains(coll, run_id: str, dry_run: bool, stats: Dict[str, int]) -> None:
+    compression = resolve_compression(ARCHIVE_COMPRESSION)
+    query = {"run_id": run_id, "option_chain": {"$type": "array"}, PACKED_FIELD: {"$exists": False}}
+    ops: List[UpdateOne] = []
+
+    async def flush():
+        if ops and not dry_run:
+            await coll.bulk_write(ops, ordered=False)
+        ops.clear()
+
+    async for doc in coll.find(query, {"_id": 1, "option_chain": 1}).batch_size(COMPACT_BATCH):
+        packed = encode_chains(doc["option_chain"], compression)
+        before = len(bson.encode({"option_chain": doc["option_chain"]}))
+        after = len(bson.encode({PACKED_FIELD: packed, "option_chain_format": "columnar"}))
+        stats["documents_rewritten"] += 1
+        stats["bytes_reclaimed"] += max(0, before - after)
+        ops.append(UpdateOne(
+            {"_id": doc["_id"]},
+            {"$set": {PACKED_FIELD: packed, "option_chain_format": "columnar"}, "$unset": {"option_chain": ""}},
+        ))
+        if len(ops) >= COMPACT_BATCH:
+            await flush()
+    await flush()
+
+
+async def _compact_sweep_fields(coll, run_id: str, dry_run: bool, stats: Dict[str, int]) -> None:
+    # Imported here: profile_sweep pulls in the scan profiles
+    from services.profile_sweep import CANDIDATE_FIELDS
+
+    keep = {"_id", "as_of", *CANDIDATE_FIELDS}
+    ops: List[UpdateOne] = []
+
+    async def flush():
+        if ops and not dry_run:
+            await coll.bulk_write(ops, ordered=False)
+        ops.clear()
+
+    async for doc in coll.find({"run_id": run_id}).batch_size(TRIM_BATCH):
+        extra = [k for k in doc if k not in keep]
+        if not extra:
+            continue
+        trimmed = {k: v for k, v in doc.items() if k in keep}
+        stats["documents_rewritten"] += 1
+        stats["bytes_reclaimed"] += max(0, len(bson.encode(doc)) - len(bson.encode(trimmed)))
+        ops.append(UpdateOne({"_id": doc["_id"]}, {"$unset": {k: "" for k in extra}}))
+        if len(ops) >= TRIM_BATCH:
+            await flush()
+    await flush()
+
+
+_COMPACTORS = {"encode_chains": _compact_chains, "top_n": _compact_top_n, "sweep_fields": _compact_sweep_fields}
+
+
+async def _expire_orphans(coll, known: set, policy: RetentionPolicy, now: datetime,
+                          dry_run: bool, stats: Dict[str, int]) -> None:
+    cutoff = now - timedelta(days=policy.expire_days)
+    for run_id in await coll.distinct("run_id"):
+        if run_id in known:
+            continue
+        doc = await coll.find_one({"run_id": run_id}, {"_id": 0, "as_of": 1})
+        as_of = _as_of((doc or {}).get("as_of"))
+        if as_of is not None and as_of < cutoff:
+            await _expire_run(coll, run_id, dry_run, stats)
+            stats["orphan_runs"] += 1
+
+
+async def apply_retention(
+    db,
+    policies: Sequence[RetentionPolicy] = POLICIES,
+    dry_run: bool = False,
+    now: Optional[datetime] = None,
+    progress=None,
+) -> Dict[str, Any]:
+    """
+    One retention pass over `policies`. With dry_run nothing is written and
+    the report shows what a real pass would do. `progress(pct, stage)` is
+    awaited per policy when given (JobContext.progress).
+    """
+    now = now or datetime.now(timezone.utc)
+    runs = await db.scan_runs.find(
+        {}, {"_id": 0, "run_id": 1, "status": 1, "as_of": 1, RETENTION_FIELD: 1}
+    ).sort("as_of", -1).to_list(length=None)
+    hot = hot_run_ids(runs)
+    known = {r["run_id"] for r in runs}
+
+    report: Dict[str, Any] = {"dry_run": dry_run, "runs": len(runs), "hot_runs": sorted(hot), "collections": {}}
+    for i, policy in enumerate(policies):
+        coll = db[policy.collection]
+        stats = {"compacted_runs": 0, "expired_runs": 0, "orphan_runs": 0,
+                 "documents_rewritten": 0, "documents_deleted": 0, "bytes_reclaimed": 0}
+        for run in runs:
+            tier = run_tier(run, policy, hot, now)
+            applied = (run.get(RETENTION_FIELD) or {}).get(policy.collection)
+            if tier == "hot" or (tier == "warm" and applied in ("compacted", "expired")) or applied == "expired":
+                continue
+            if tier == "expired":
+                await _expire_run(coll, run["run_id"], dry_run, stats)
+                stats["expired_runs"] += 1
+                marker = "expired"
+            else:
+                await _COMPACTORS[policy.compact](coll, run["run_id"], dry_run, stats)
+                stats["compacted_runs"] += 1
+                marker = "compacted"
+            if not dry_run:
+                await db.scan_runs.update_one(
+                    {"run_id": run["run_id"]},
+                    {"$set": {f"{RETENTION_FIELD}.{policy.collection}": marker, "retention_at": now}}
+                )
+        await _expire_orphans(coll, known, policy, now, dry_run, stats)
+        report["collections"][policy.collection] = stats
+        logger.info(f"[RETENTION] {policy.collection}: {stats}")
+        if progress is not None:
+            await progress(min(99, int((i + 1) / len(policies) * 100)), stage=policy.collection)
+
+    report["bytes_reclaimed"] = sum(s["bytes_reclaimed"] for s in report["collections"].values())
+    report["completed_at"] = datetime.now(timezone.utc).isoformat()
+    if progress is not None:
+        await progress(100, stage="done")
+    return report
+
+
+def policy_summary(policies: Sequence[RetentionPolicy] = POLICIES) -> Dict[str, Any]:
+    return {
+        "hot_runs": HOT_RUNS,
+        "results_top_n": RESULTS_TOP_N,
+        "delete_chunk": DELETE_CHUNK,
+        "chain_compression": resolve_compression(ARCHIVE_COMPRESSION),
+        "backtest_horizon_days": BACKTEST_HORIZON_DAYS,
+        "policies": [asdict(p) for p in policies],
+    }
@@ -0,0 +1,318 @@
+"""
+Roll Engine - Vectorized roll / short-call candidate scoring
+============================================================
+
+Shared engine for every "what should the next short call be?" question:
+- GET  /simulator/trades/{id}/roll-suggestions
+- POST /simulator/manage/{id}          (ai_trade_manager roll target)
+- ai_wallet.decision_engine            (SELL_ANOTHER_CALL ranking)
+
+The chain is loaded ONCE into a column table (NumPy arrays) and every
+(expiry, strike) is evaluated in a single pass:
+    credit/debit vs closing the current short, new breakeven, delta,
+    annualized yield, weekly return and assignment risk (P(ITM) at expiry).
+
+Callers apply their own gates via boolean masks and take the top-N.
+No I/O happens here - chains come from symbol_snapshot (EOD pipeline)
+or whatever the caller already holds.
+"""
+
+import math
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from services.greeks_service import SIGMA_PROXY_DEFAULT, get_risk_free_rate
+
+
+# Default scoring weights for roll candidates (sum = 1.0)
+ROLL_SCORE_WEIGHTS: Dict[str, float] = {
+    "yield": 0.35,          # annualized yield, normalised against 60%
+    "credit": 0.20,         # net credit vs closing the current short
+    "safety": 0.30,         # 1 - assignment risk
+    "be_protection": 0.15,  # strike above the (new) breakeven
+}
+
+YIELD_REFERENCE_PCT = 60.0   # annualized yield that scores 1.0
+
+
+# ==================== VECTORIZED BLACK-SCHOLES ====================
+
+def _norm_cdf(x: np.ndarray) -> np.ndarray:
+    """Standard normal CDF (Abramowitz & Stegun 7.1.26, |err| < 1.5e-7)."""
+    z = np.abs(x) / math.sqrt(2.0)
+    t = 1.0 / (1.0 + 0.3275911 * z)
+    poly = t * (0.254829592 + t * (-0.284496736 + t * (1.421413741 + t * (-1.453152027 + t * 1.061405429))))
+    erf = 1.0 - poly * np.exp(-z * z)
+    return 0.5 * (1.0 + np.sign(x) * erf)
+
+
+def bs_call_delta_and_itm_prob(
+    spot: float,
+    strikes: np.ndarray,
+    dte: np.ndarray,
+    iv: np.ndarray,
+    r: Optional[float] = None
+) -> tuple:
+    """
+    Black-Scholes call delta N(d1) and P(ITM at expiry) N(d2) for a vector
+    of contracts. Missing/invalid IV falls back to SIGMA_PROXY_DEFAULT, the
+    same rule as greeks_service.calculate_greeks.
+    """
+    if r is None:
+        r = get_risk_free_rate()
+    sigma = np.where((iv > 0.01) & (iv <= 5.0), iv, SIGMA_PROXY_DEFAULT)
+    T = np.maximum(dte, 0) / 365.0
+    expired = T <= 0
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sqrt_t = np.sqrt(np.where(expired, 1.0, T))
+        d1 = (np.log(spot / strikes) + (r + 0.5 * sigma ** 2) * T) / (sigma * sqrt_t)
+        d2 = d1 - sigma * sqrt_t
+
+    intrinsic = (spot > strikes).astype(float)
+    delta = np.where(expired, intrinsic, _norm_cdf(d1))
+    itm_prob = np.where(expired, intrinsic, _norm_cdf(d2))
+    return delta, itm_prob
+
+
+# ==================== CHAIN TABLE ====================
+
+def _num(row: Dict[str, Any], *keys, default=0.0) -> float:
+    for key in keys:
+        value = row.get(key)
+        if value:
+            try:
+                return float(value)
+            except (TypeError, ValueError):
+                return default
+    return default
+
+
+@dataclass
+class ChainTable:
+    """Column-oriented call chain. One row per (expiry, strike)."""
+    strike: np.ndarray
+    expiry: np.ndarray
+    dte: np.ndarray
+    bid: np.ndarray
+    ask: np.ndarray
+    delta: np.ndarray
+    iv: np.ndarray
+    oi: np.ndarray
+    volume: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.strike)
+
+    @classmethod
+    def from_calls(cls, calls: List[Dict[str, Any]], today: Optional[date] = None) -> "ChainTable":
+        """
+        Build a table from option dicts as produced anywhere in the codebase
+        (symbol_snapshot.option_chain, _snapshot_option_to_call_dict,
+        fetch_options_chain). Puts are dropped; rows without a type are calls.
+
+        If `today` is given, DTE is recomputed from the expiry string
+        (rows with unparseable expiries are dropped); otherwise the row's
+        own `dte` field is used.
+        """
+        cols = {k: [] for k in ("strike", "expiry", "dte", "bid", "ask", "delta", "iv", "oi", "volume")}
+        for c in calls:
+            option_type = str(c.get("option_type") or c.get("type") or "call").lower()
+            if option_type not in ("call", "c"):
+                continue
+            expiry = str(c.get("expiry") or c.get("expiration_date") or c.get("expiration") or "")[:10]
+            if today is not None:
+                try:
+                    dte = (datetime.strptime(expiry, "%Y-%m-%d").date() - today).days
+                except ValueError:
+                    continue
+            else:
+                dte = int(c.get("dte") or 0)
+            cols["strike"].append(_num(c, "strike"))
+            cols["expiry"].append(expiry)
+            cols["dte"].append(dte)
+            cols["bid"].append(_num(c, "bid"))
+            cols["ask"].append(_num(c, "ask"))
+            cols["delta"].append(abs(_num(c, "delta")))
+            cols["iv"].append(_num(c, "implied_volatility", "iv"))
+            cols["oi"].append(int(_num(c, "open_interest", "oi")))
+            cols["volume"].append(int(_num(c, "volume")))
+
+        return cls(
+            strike=np.asarray(cols["strike"], dtype=np.float64),
+            expiry=np.asarray(cols["expiry"], dtype=object),
+            dte=np.asarray(cols["dte"], dtype=np.int64),
+            bid=np.asarray(cols["bid"], dtype=np.float64),
+            ask=np.asarray(cols["ask"], dtype=np.float64),
+            delta=np.asarray(cols["delta"], dtype=np.float64),
+            iv=np.asarray(cols["iv"], dtype=np.float64),
+            oi=np.asarray(cols["oi"], dtype=np.int64),
+            volume=np.asarray(cols["volume"], dtype=np.int64),
+        )
+
+
+# ==================== POSITION STATE ====================
+
+@dataclass
+class RollPosition:
+    """The short call being rolled (per-share values)."""
+    current_price: float
+    short_strike: float
+    close_cost: float           # cost to buy back the current short call
+    break_even: float
+    contracts: int = 1
+    strategy: str = "covered_call"
+    leaps_strike: Optional[float] = None
+
+    @classmethod
+    def from_simulator_trade(cls, trade: Dict[str, Any], current_price: Optional[float] = None) -> "RollPosition":
+        price = current_price or trade.get("current_underlying_price") or trade.get("entry_underlying_price") or 0
+        return cls(
+            current_price=float(price),
+            short_strike=float(trade.get("short_call_strike") or 0),
+            close_cost=float(trade.get("current_option_value") or 0),
+            break_even=float(trade.get("breakeven") or 0),
+            contracts=int(trade.get("contracts") or 1),
+            strategy=trade.get("strategy_type", "covered_call"),
+            leaps_strike=trade.get("leaps_strike"),
+        )
+
+
+# ==================== SCORING ====================
+
+@dataclass
+class RollCandidates:
+    """All metrics for every row of a ChainTable, plus the eligibility mask."""
+    table: ChainTable
+    mask: np.ndarray
+    net_credit: np.ndarray
+    new_breakeven: np.ndarray
+    delta: np.ndarray
+    assignment_risk: np.ndarray
+    annualized_yield_pct: np.ndarray
+    weekly_return_pct: np.ndarray
+    score: np.ndarray
+    contracts: int = 1
+
+    def top(self, n: Optional[int] = 5, key: str = "score") -> List[Dict[str, Any]]:
+        """Top-N eligible rows by `key` (descending), tie-break on higher strike. n=None returns all."""
+        idx = np.flatnonzero(self.mask)
+        if idx.size == 0:
+            return []
+        primary = getattr(self, key)[idx]
+        order = np.lexsort((-self.table.strike[idx], -primary))
+        if n is not None:
+            order = order[:n]
+        return [self._row(i) for i in idx[order]]
+
+    def _row(self, i: int) -> Dict[str, Any]:
+        t = self.table
+        return {
+            "strike": float(t.strike[i]),
+            "expiry": t.expiry[i],
+            "dte": int(t.dte[i]),
+            "bid": float(t.bid[i]),
+            "ask": float(t.ask[i]),
+            "premium": float(t.bid[i]),
+            "delta": round(float(self.delta[i]), 4),
+            "iv": float(t.iv[i]),
+            "open_interest": int(t.oi[i]),
+            "net_credit": round(float(self.net_credit[i]), 2),
+            "total_credit": round(float(self.net_credit[i]) * 100 * self.contracts, 2),
+            "new_breakeven": round(float(self.new_breakeven[i]), 2),
+            "assignment_risk": round(float(self.assignment_risk[i]), 4),
+            "annualized_yield_pct": round(float(self.annualized_yield_pct[i]), 2),
+            "weekly_return_pct": round(float(self.weekly_return_pct[i]), 2),
+            "score": round(float(self.score[i]), 4),
+        }
+
+
+def score_roll_candidates(
+    table: ChainTable,
+    position: RollPosition,
+    *,
+    min_dte: int = 1,
+    max_dte: int = 60,
+    target_dte: Optional[int] = None,
+    dte_window: Optional[int] = None,
+    otm_only: bool = True,
+    min_delta: Optional[float] = None,
+    max_delta: Optional[float] = None,
+    min_weekly_return_pct: Optional[float] = None,
+    allow_debit: bool = True,
+    r: Optional[float] = None
+) -> RollCandidates:
+    """
+    Evaluate every (expiry, strike) of the chain against the position at once.
+
+    Gates (all optional except the basic sanity ones):
+        min_dte/max_dte          DTE range
+        target_dte + dte_window  |dte - target| <= window
+        otm_only                 strike > current price
+        min_delta/max_delta      delta band (chain delta, BS when missing)
+        min_weekly_return_pct    premium / price scaled to 7 days
+        allow_debit              False drops rolls that cost more than the
+                                 current short's buy-back
+    PMCC positions additionally require strike > LEAPS breakeven.
+    """
+    cp = position.current_price
+    strike, dte, bid = table.strike, table.dte, table.bid
+
+    bs_delta, itm_prob = bs_call_delta_and_itm_prob(cp, np.where(strike > 0, strike, 1.0), dte, table.iv, r=r)
+    delta = np.where(table.delta > 0, table.delta, bs_delta)
+
+    net_credit = bid - position.close_cost
+    new_breakeven = position.break_even - net_credit
+    safe_dte = np.maximum(dte, 1)
+    if cp > 0:
+        annualized_yield_pct = bid / cp * (365.0 / safe_dte) * 100
+        weekly_return_pct = bid / cp * (7.0 / safe_dte) * 100
+    else:
+        annualized_yield_pct = np.zeros(len(table))
+        weekly_return_pct = np.zeros(len(table))
+
+    mask = (strike > 0) & (bid > 0) & (dte > 0) & (dte >= min_dte) & (dte <= max_dte)
+    if target_dte is not None and dte_window is not None:
+        mask &= np.abs(dte - target_dte) <= dte_window
+    if otm_only:
+        mask &= strike > cp
+    if min_delta is not None:
+        mask &= delta >= min_delta
+    if max_delta is not None:
+        mask &= delta <= max_delta
+    if min_weekly_return_pct is not None:
+        mask &= weekly_return_pct >= min_weekly_return_pct
+    if not allow_debit:
+        mask &= net_credit >= 0
+    if position.strategy == "pmcc" and position.break_even > 0:
+        mask &= strike > position.break_even
+
+    w = ROLL_SCORE_WEIGHTS
+    yield_score = np.minimum(annualized_yield_pct / YIELD_REFERENCE_PCT, 1.0)
+    credit_score = np.clip(0.5 + net_credit / np.maximum(bid, 0.01) * 0.5, 0.0, 1.0)
+    if position.break_even > 0:
+        be_score = np.clip((strike - new_breakeven) / (position.break_even * 0.05), 0.0, 1.0)
+    else:
+        be_score = np.full(len(table), 0.5)
+    score = (
+        w["yield"] * yield_score
+        + w["credit"] * credit_score
+        + w["safety"] * (1.0 - itm_prob)
+        + w["be_protection"] * be_score
+    )
+
+    return RollCandidates(
+        table=table,
+        mask=mask,
+        net_credit=net_credit,
+        new_breakeven=new_breakeven,
+        delta=delta,
+        assignment_risk=itm_prob,
+        annualized_yield_pct=annualized_yield_pct,
+        weekly_return_pct=weekly_return_pct,
+        score=score,
+        contracts=position.contracts,
+    )
@@ -0,0 +1,133 @@
+"""
+Run Registry - In-process pointer to the latest COMPLETED EOD run
+=================================================================
+
+Screener, watchlist, portfolio and precomputed-result endpoints each looked
+up the latest COMPLETED scan_runs document (sorted by completed_at) on every
+request. The registry keeps that document in process and refreshes it when
+a run is published:
+
+- publish(run)  pipeline-completion hook; run_eod_pipeline calls it after the
+                atomic scan_runs publish (in-process runs: scheduler thread,
+                startup auto-seed)
+- watch(db)     change stream on scan_runs, started at app startup; any
+                insert/update/replace/delete drops the cached run. Needs a
+                replica set - on a standalone server it logs and returns.
+- TTL           without a live change stream the cached run is re-read after
+                RUN_REGISTRY_TTL_SECONDS, so subprocess pipeline runs are
+                picked up within that window
+
+latest_completed_run / latest_completed_run_id are FastAPI dependencies:
+
+    run: Optional[dict] = Depends(latest_completed_run)
+"""
+
+import asyncio
+import copy
+import logging
+import os
+import time
+from typing import Any, Dict, Optional
+
+from pymongo.errors import PyMongoError
+
+logger = logging.getLogger(__name__)
+
+RUN_REGISTRY_TTL_SECONDS = float(os.environ.get("RUN_REGISTRY_TTL_SECONDS", "60"))
+
+# EOD pipeline stores COMPLETED; older runs used lowercase
+COMPLETED_STATUSES = ("COMPLETED", "completed")
+
+_UNSET = object()
+
+
+class RunRegistry:
+    def __init__(self, ttl_seconds: float = None):
+        self.ttl_seconds = RUN_REGISTRY_TTL_SECONDS if ttl_seconds is None else ttl_seconds
+        self.watching = False
+        self._run: Any = _UNSET
+        self._db_name: Optional[str] = None
+        self._loaded_at = 0.0
+        self._lock: Optional[asyncio.Lock] = None
+        self.lookups = 0
+
+    def _fresh(self, db) -> bool:
+        if self._run is _UNSET or self._db_name != getattr(db, "name", None):
+            return False
+        return self.watching or time.monotonic() - self._loaded_at < self.ttl_seconds
+
+    async def latest_run(self, db) -> Optional[Dict[str, Any]]:
+        """Latest COMPLETED scan_runs document (without _id), or None."""
+        if not self._fresh(db):
+            if self._lock is None:
+                self._lock = asyncio.Lock()
+            async with self._lock:
+                # One lookup per expiry even when a burst of requests misses together
+                if not self._fresh(db):
+                    self.lookups += 1
+                    run = await db.scan_runs.find_one(
+                        {"status": {"$in": list(COMPLETED_STATUSES)}},
+                        {"_id": 0},
+                        sort=[("completed_at", -1)]
+                    )
+                    self._store(run, getattr(db, "name", None))
+        return copy.deepcopy(self._run)
+
+    async def latest_run_id(self, db) -> Optional[str]:
+        run = await self.latest_run(db)
+        return run.get("run_id") if run else None
+
+    def _store(self, run: Optional[Dict[str, Any]], db_name: Optional[str]) -> None:
+        self._run = run
+        self._db_name = db_name
+        self._loaded_at = time.monotonic()
+
+    def publish(self, run: Dict[str, Any], db_name: Optional[str] = None) -> None:
+        """Pipeline-completion hook: make a just-published COMPLETED run the latest."""
+        if run.get("status") not in COMPLETED_STATUSES:
+            return
+        if db_name is not None and self._db_name not in (None, db_name):
+            return
+        run = {k: v for k, v in run.items() if k != "_id"}
+        self._store(run, db_name or self._db_name)
+        logger.info(f"[RUN_REGISTRY] latest run -> {run.get('run_id')}")
+
+    def invalidate(self) -> None:
+        self._run = _UNSET
+
+    async def watch(self, db) -> None:
+        """Invalidate on every scan_runs change until cancelled (no-op without change streams)."""
+        try:
+            async with db.scan_runs.watch() as stream:
+                self.watching = True
+                self.invalidate()
+                logger.info("[RUN_REGISTRY] watching scan_runs change stream")
+                async for _change in stream:
+                    self.invalidate()
+        except PyMongoError as e:
+            logger.info(f"[RUN_REGISTRY] change stream unavailable, using {self.ttl_seconds:.0f}s TTL: {e}")
+        finally:
+            self.watching = False
+
+
+run_registry = RunRegistry()
+
+
+async def get_latest_run(db) -> Optional[Dict[str, Any]]:
+    return await run_registry.latest_run(db)
+
+
+async def get_latest_run_id(db) -> Optional[str]:
+    return await run_registry.latest_run_id(db)
+
+
+# ==================== FASTAPI DEPENDENCIES ====================
+
+async def latest_completed_run() -> Optional[Dict[str, Any]]:
+    from database import db
+    return await run_registry.latest_run(db)
+
+
+async def latest_completed_run_id() -> Optional[str]:
+    from database import db
+    return await run_registry.latest_run_id(db)
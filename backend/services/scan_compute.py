@@ -0,0 +1,109 @@
+"""
+Scan Compute - Process-pool execution of CPU-bound scan work
+============================================================
+
+After the snapshot reads, compute_scan_results is pure CPU (chain parsing,
+greeks, validation, scoring, PMCC pairing) and used to run on the API
+process's event-loop thread: one core, and API latency suffered while it ran.
+The work is now partitioned by symbol:
+
+    parent (event loop)                     workers (processes)
+    -------------------                     -------------------
+    cursor over symbol_snapshot  --chunk->  fn(chunk) -> results per symbol
+    enrichment / IV reads, result writes <-
+
+map_chunks() reads ahead while chunks are computed and yields results in
+submission order, with at most `max_in_flight` chunks outstanding so memory
+stays bounded (snapshots are MBs each).
+
+Chain inputs cross the process boundary compactly: columnar snapshots
+(option_chain_packed, chain_codec) are sent as-is and decoded in the worker;
+legacy option_chain lists are trimmed to the call fields the scan reads.
+
+Workers come from services.process_pool (forkserver start method: the API
+process is multi-threaded and must not be forked directly).
+
+Config:
+    SCAN_COMPUTE_WORKERS  processes (default min(4, cores)); <= 1 computes in
+                          the default thread executor, off the event loop
+    SCAN_COMPUTE_CHUNK    symbols per task (default 8)
+"""
+
+import asyncio
+import logging
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, AsyncIterable, AsyncIterator, Callable, Dict, List, Optional, Sequence, Tuple
+
+from services.chain_codec import PACKED_FIELD
+from services.process_pool import process_pool
+
+logger = logging.getLogger(__name__)
+
+SCAN_COMPUTE_WORKERS = int(os.environ.get("SCAN_COMPUTE_WORKERS", str(min(4, os.cpu_count() or 1))))
+SCAN_COMPUTE_CHUNK = int(os.environ.get("SCAN_COMPUTE_CHUNK", "8"))
+
+
+def compute_pool(max_workers: int = None) -> Optional[ProcessPoolExecutor]:
+    """Process pool for scan computation, or None when configured for one worker."""
+    max_workers = SCAN_COMPUTE_WORKERS if max_workers is None else max_workers
+    return process_pool(max_workers)
+
+
+def compact_snapshot(doc: Dict[str, Any], call_fields: Sequence[str]) -> Dict[str, Any]:
+    """
+    symbol_snapshot doc reduced for pickling to a worker: packed chains pass
+    through untouched, legacy chains keep expiry/dte and `call_fields` of calls.
+    """
+    if doc.get(PACKED_FIELD) or not doc.get("option_chain"):
+        return doc
+    compact = {k: v for k, v in doc.items() if k != "option_chain"}
+    compact["option_chain"] = [
+        {
+            "expiry": chain.get("expiry", ""),
+            "dte": chain.get("dte", 0),
+            "calls": [{f: c[f] for f in call_fields if f in c} for c in chain.get("calls") or []],
+        }
+        for chain in doc["option_chain"]
+    ]
+    return compact
+
+
+async def map_chunks(
+    items: AsyncIterable[Any],
+    fn: Callable[[List[Any]], List[Any]],
+    pool: Optional[ProcessPoolExecutor] = None,
+    chunk_size: int = SCAN_COMPUTE_CHUNK,
+    max_in_flight: int = 2,
+) -> AsyncIterator[Tuple[List[Any], List[Any]]]:
+    """
+    Yield (chunk, fn(chunk)) for consecutive chunks of `items`, in order.
+    `fn` must be a picklable module-level function when `pool` is given.
+    """
+    loop = asyncio.get_running_loop()
+    pending: deque = deque()
+
+    def submit(chunk):
+        if pool is None:
+            return chunk, loop.run_in_executor(None, fn, chunk)
+        return chunk, asyncio.wrap_future(pool.submit(fn, chunk))
+
+    chunk: List[Any] = []
+    try:
+        async for item in items:
+            chunk.append(item)
+            if len(chunk) >= chunk_size:
+                pending.append(submit(chunk))
+                chunk = []
+                while len(pending) >= max(1, max_in_flight):
+                    done, future = pending.popleft()
+                    yield done, await future
+        if chunk:
+            pending.append(submit(chunk))
+        while pending:
+            done, future = pending.popleft()
+            yield done, await future
+    finally:
+        for _, future in pending:
+            future.cancel()
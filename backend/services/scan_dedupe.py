@@ -0,0 +1,132 @@
+"""
+Scan Dedupe - Single-pass candidate selection for precomputed scans
+===================================================================
+
+Replaces the per-dict comparison loops in PrecomputedScanService:
+- best_per_symbol : one option per symbol (score -> quality_score -> roi_pct)
+- profile_fit     : how well a candidate fits its profile
+- assign_profiles : cross-profile dedupe, each symbol to its best-fit profile
+
+All profiles' candidates are walked ONCE as a grouped argmax keyed by symbol.
+Each candidate's fit is computed at most once (the previous loop recomputed
+both sides on every collision) and each profile's fit only reads the fields
+it uses; best_per_symbol only builds tie-break keys on equal scores.
+Results are identical to the previous loops, including tie-breaks:
+- "replace only if strictly better" keeps the FIRST maximal candidate
+- output order follows each symbol's first appearance before the score sort
+
+Candidates arrive as dicts, so converting them to NumPy columns first costs
+more than the whole selection (see scripts/bench_scan_dedupe.py).
+"""
+
+from typing import Callable, Dict, List, Sequence
+
+PROFILES = ("conservative", "balanced", "aggressive")
+PROFILE_LIMIT = 50
+
+
+def _conservative_fit(opp: Dict) -> float:
+    # Low ATR, high market cap, positive EPS, low delta, longer DTE
+    atr_pct = opp.get("atr_pct", 3) or 3
+    market_cap = opp.get("market_cap", 0) or 0
+    fit = 20 if atr_pct <= 3 else 10 if atr_pct <= 4 else 0
+    fit += 20 if market_cap >= 50_000_000_000 else 10 if market_cap >= 10_000_000_000 else 0
+    if (opp.get("eps_ttm", 0) or 0) > 0:
+        fit += 15
+    if (opp.get("delta", 0.35) or 0.35) <= 0.30:
+        fit += 15
+    if (opp.get("dte", 30) or 30) >= 30:
+        fit += 10
+    return fit
+
+
+def _balanced_fit(opp: Dict) -> float:
+    # Moderate ATR, mid/large market cap, moderate delta
+    atr_pct = opp.get("atr_pct", 3) or 3
+    fit = 20 if 3 <= atr_pct <= 5 else 10 if atr_pct < 3 else 0
+    if 5_000_000_000 <= (opp.get("market_cap", 0) or 0) <= 50_000_000_000:
+        fit += 15
+    if 0.30 <= (opp.get("delta", 0.35) or 0.35) <= 0.40:
+        fit += 15
+    if 20 <= (opp.get("dte", 30) or 30) <= 40:
+        fit += 10
+    return fit
+
+
+def _aggressive_fit(opp: Dict) -> float:
+    # High ATR, higher delta, shorter DTE, premium yield bonus
+    atr_pct = opp.get("atr_pct", 3) or 3
+    fit = 25 if atr_pct >= 4 else 15 if atr_pct >= 3 else 0
+    if (opp.get("delta", 0.35) or 0.35) >= 0.40:
+        fit += 20
+    if (opp.get("dte", 30) or 30) <= 21:
+        fit += 15
+    premium_yield = opp.get("premium_yield", 0) or 0
+    fit += 15 if premium_yield >= 1.5 else 10 if premium_yield >= 1.0 else 0
+    return fit
+
+
+_FIT_BY_PROFILE: Dict[str, Callable[[Dict], float]] = {
+    "conservative": _conservative_fit,
+    "balanced": _balanced_fit,
+    "aggressive": _aggressive_fit,
+}
+
+
+def profile_fit(opp: Dict, profile: str) -> float:
+    """Fit of one opportunity for `profile` (0 for unknown profiles). Higher = better."""
+    fit_fn = _FIT_BY_PROFILE.get(profile)
+    return fit_fn(opp) if fit_fn else 0
+
+
+def best_per_symbol(opportunities: List[Dict]) -> List[Dict]:
+    """One opportunity per symbol: highest score, then quality_score, then roi_pct."""
+    best: Dict[str, Dict] = {}
+    for opp in opportunities:
+        symbol = opp["symbol"]
+        current = best.get(symbol)
+        if current is None:
+            best[symbol] = opp
+            continue
+        # Score settles almost every collision; the tie-break tuple is built only on equal scores
+        score, current_score = opp.get("score", 0), current.get("score", 0)
+        if score > current_score or (
+            score == current_score
+            and (opp.get("quality_score", 0), opp.get("roi_pct", 0))
+            > (current.get("quality_score", 0), current.get("roi_pct", 0))
+        ):
+            best[symbol] = opp
+    return list(best.values())
+
+
+def assign_profiles(
+    by_profile: Dict[str, List[Dict]],
+    profiles: Sequence[str] = PROFILES,
+    limit: int = PROFILE_LIMIT,
+) -> Dict[str, List[Dict]]:
+    """
+    Cross-profile dedupe: each symbol goes to the profile whose candidate fits best,
+    then each profile is sorted by score and capped at `limit`.
+    """
+    # symbol -> [fit or None (not needed until a second candidate shows up), profile, opp]
+    best: Dict[str, list] = {}
+    for profile in profiles:
+        fit_fn = _FIT_BY_PROFILE.get(profile, lambda _opp: 0)
+        for opp in by_profile.get(profile, []):
+            current = best.get(opp["symbol"])
+            if current is None:
+                best[opp["symbol"]] = [None, profile, opp]
+                continue
+            if current[0] is None:
+                current[0] = profile_fit(current[2], current[1])
+            fit = fit_fn(opp)
+            if fit > current[0]:
+                current[:] = [fit, profile, opp]
+
+    deduped: Dict[str, List[Dict]] = {profile: [] for profile in profiles}
+    for _, profile, opp in best.values():
+        deduped[profile].append(opp)
+    for profile in deduped:
+        deduped[profile].sort(key=lambda x: x["score"], reverse=True)
+        deduped[profile] = deduped[profile][:limit]
+    return deduped
@@ -0,0 +1,278 @@
+"""
+Snapshot Options Provider - Option chains for the nightly precomputed scans
+===========================================================================
+
+PrecomputedScanService reads option chains from what the EOD snapshot job
+already stored that evening instead of calling Yahoo/Polygon per symbol:
+
+1. daily_snapshots for `as_of`  (short_calls / leaps_calls, already scan-shaped)
+2. symbol_snapshot for the latest COMPLETED scan_runs run (option_chain, converted)
+
+Both are read through ONE cursor with a projection on only the fields the
+scans use (puts, raw prices and audit fields never leave Mongo), so the
+5:20 PM scans are I/O-light and give the same result for the same snapshot.
+
+run_all_scans streams instead of loading everything: resolve() picks the
+source and lists its symbols (distinct, no chains read), then
+iter_partitions() yields PRECOMPUTED_SCAN_PARTITION_SIZE symbols at a time
+with only the leg fields the CC/PMCC profiles read (SCAN_LEG_FIELDS), so a
+partition's chains can be released once all profiles have scored it.
+
+Live fetch (fetch_options_for_scan / fetch_leaps_options) is a fallback for
+symbols missing from the snapshot, OFF unless
+PRECOMPUTED_LIVE_OPTIONS_FALLBACK=true.
+
+Output shape (per symbol, same as a daily_snapshots doc):
+    {"symbol", "underlying_price", "short_calls": [...], "leaps_calls": [...]}
+    option: {strike, expiry, dte, bid, ask, delta, volume, open_interest, iv, iv_pct, itm_pct}
+"""
+
+import logging
+import os
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Sequence
+
+from .chain_codec import chain_projection, snapshot_chains
+from .greeks_backfill import backfill_greeks
+from .greeks_service import GREEKS_STAMPED_FIELD, normalize_iv_fields
+
+logger = logging.getLogger(__name__)
+
+LIVE_FALLBACK_ENV = "PRECOMPUTED_LIVE_OPTIONS_FALLBACK"
+
+OPTION_FIELDS = ("strike", "expiry", "dte", "bid", "ask", "delta", "volume",
+                 "open_interest", "iv", "iv_pct", "itm_pct")
+# Leg fields the CC/PMCC profile loops actually read
+SCAN_LEG_FIELDS = {
+    "short_calls": ("strike", "expiry", "dte", "bid", "ask", "delta", "volume",
+                    "open_interest", "iv", "iv_pct"),
+    "leaps_calls": ("strike", "expiry", "dte", "ask", "delta", "open_interest",
+                    "itm_pct", "iv", "iv_pct"),
+}
+CHAIN_CALL_FIELDS = ("strike", "bid", "ask", "volume", "openInterest", "impliedVolatility", "delta")
+
+# Expiry buckets when converting a full symbol_snapshot chain
+SHORT_DTE_MAX = 90
+LEAPS_DTE_MIN = 180
+LEAPS_DTE_MAX = 800
+CURSOR_BATCH_SIZE = 200
+PARTITION_SIZE = int(os.environ.get("PRECOMPUTED_SCAN_PARTITION_SIZE", "200"))
+
+
+def live_fallback_enabled() -> bool:
+    return os.environ.get(LIVE_FALLBACK_ENV, "false").lower() in ("1", "true", "yes")
+
+
+def daily_snapshot_projection(leg_fields: Optional[Dict[str, Sequence[str]]] = None) -> Dict[str, int]:
+    projection = {"_id": 0, "symbol": 1, "snapshot_date": 1, "underlying_price": 1}
+    for leg in ("short_calls", "leaps_calls"):
+        fields = OPTION_FIELDS if leg_fields is None else leg_fields.get(leg, ())
+        projection.update({f"{leg}.{f}": 1 for f in fields})
+    return projection
+
+
+def symbol_snapshot_projection() -> Dict[str, int]:
+    return {"_id": 0, "symbol": 1, "underlying_price": 1, "as_of": 1, GREEKS_STAMPED_FIELD: 1,
+            **chain_projection(CHAIN_CALL_FIELDS, sides=("calls",))}
+
+
+def _num(value) -> float:
+    try:
+        value = float(value or 0)
+    except (TypeError, ValueError):
+        return 0.0
+    return value if value == value else 0.0  # NaN -> 0
+
+
+def chain_to_snapshot(doc: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Convert a symbol_snapshot doc (raw Yahoo or columnar chain) to the
+    daily_snapshots shape. Delta is the one stamped at ingest; it is not
+    recomputed here (SnapshotOptionsProvider stamps unstamped docs first).
+    """
+    price = _num(doc.get("underlying_price"))
+    short_calls: List[Dict[str, Any]] = []
+    leaps_calls: List[Dict[str, Any]] = []
+
+    for chain in snapshot_chains(doc, CHAIN_CALL_FIELDS, sides=("calls",)):
+        dte = int(chain.get("dte") or 0)
+        if dte <= 0:
+            continue
+        if dte <= SHORT_DTE_MAX:
+            bucket = short_calls
+        elif LEAPS_DTE_MIN <= dte <= LEAPS_DTE_MAX:
+            bucket = leaps_calls
+        else:
+            continue
+
+        for call in chain.get("calls") or []:
+            strike = _num(call.get("strike"))
+            if strike <= 0:
+                continue
+            iv_data = normalize_iv_fields(_num(call.get("impliedVolatility")))
+            bucket.append({
+                "strike": strike,
+                "expiry": chain.get("expiry", ""),
+                "dte": dte,
+                "bid": _num(call.get("bid")),
+                "ask": _num(call.get("ask")),
+                "delta": round(_num(call.get("delta")), 4) if price > 0 else 0,
+                "volume": int(_num(call.get("volume"))),
+                "open_interest": int(_num(call.get("openInterest"))),
+                "iv": iv_data["iv"],
+                "iv_pct": iv_data["iv_pct"],
+                "itm_pct": round((price - strike) / price * 100, 1) if price > 0 else 0,
+            })
+
+    return {
+        "symbol": doc["symbol"],
+        "underlying_price": price,
+        "short_calls": short_calls,
+        "leaps_calls": leaps_calls,
+    }
+
+
+class SnapshotOptionsProvider:
+    """
+    Loads the night's option chains for PrecomputedScanService in one bulk read.
+
+    `source` / `run_id` describe where the last load() came from, for logs and
+    run summaries. `live_fetcher` is the scan service (fetch_options_for_scan /
+    fetch_leaps_options), used only when the live fallback flag is on.
+    """
+
+    def __init__(self, db, live_fetcher=None, live_fallback: Optional[bool] = None,
+                 batch_size: int = CURSOR_BATCH_SIZE):
+        self.db = db
+        self.live_fetcher = live_fetcher
+        self.live_fallback = live_fallback_enabled() if live_fallback is None else live_fallback
+        self.batch_size = batch_size
+        self.source: Optional[str] = None
+        self.run_id: Optional[str] = None
+        self._source_query: Optional[Dict[str, Any]] = None
+
+    async def load(self, as_of: str, symbols: Optional[Iterable[str]] = None) -> Dict[str, Dict[str, Any]]:
+        """Chains keyed by symbol: daily_snapshots for `as_of`, else the latest EOD run."""
+        symbols = list(symbols) if symbols is not None else None
+
+        query: Dict[str, Any] = {"snapshot_date": as_of}
+        if symbols is not None:
+            query["symbol"] = {"$in": symbols}
+        snapshots = await self._read(self.db.daily_snapshots, query, daily_snapshot_projection())
+        if snapshots:
+            self.source, self.run_id = "daily_snapshots", None
+            logger.info(f"[OPTIONS_PROVIDER] {len(snapshots)} chains from daily_snapshots {as_of}")
+            return snapshots
+
+        run = await self._latest_run()
+        if not run:
+            self.source, self.run_id = None, None
+            return {}
+
+        query = {"run_id": run["run_id"]}
+        if symbols is not None:
+            query["symbol"] = {"$in": symbols}
+        snapshots = await self._read_symbol_snapshots(query)
+        self.source, self.run_id = "symbol_snapshot", run["run_id"]
+        logger.info(f"[OPTIONS_PROVIDER] {len(snapshots)} chains from symbol_snapshot "
+                    f"run_id={run['run_id']} as_of={run.get('as_of')} (no daily_snapshots for {as_of})")
+        return snapshots
+
+    async def resolve(self, as_of: str) -> List[str]:
+        """
+        Pick the source for `as_of` (same order as load()) and return the
+        symbols it holds. Only symbol names are read; chains stay in Mongo
+        until iter_partitions().
+        """
+        query: Dict[str, Any] = {"snapshot_date": as_of}
+        symbols = await self.db.daily_snapshots.distinct("symbol", query)
+        if symbols:
+            self.source, self.run_id, self._source_query = "daily_snapshots", None, query
+            return symbols
+
+        run = await self._latest_run()
+        if not run:
+            self.source, self.run_id, self._source_query = None, None, None
+            return []
+        query = {"run_id": run["run_id"]}
+        self.source, self.run_id, self._source_query = "symbol_snapshot", run["run_id"], query
+        return await self.db.symbol_snapshot.distinct("symbol", query)
+
+    async def iter_partitions(
+        self,
+        symbols: Sequence[str],
+        partition_size: Optional[int] = None,
+        leg_fields: Dict[str, Sequence[str]] = SCAN_LEG_FIELDS,
+    ) -> AsyncIterator[Dict[str, Dict[str, Any]]]:
+        """
+        Chains for `symbols` from the resolve()d source, `partition_size` symbols
+        per yield (in `symbols` order). Nothing is kept between partitions.
+        """
+        if self._source_query is None:
+            return
+        size = max(1, partition_size or PARTITION_SIZE)
+        for start in range(0, len(symbols), size):
+            chunk = list(symbols[start:start + size])
+            query = {**self._source_query, "symbol": {"$in": chunk}}
+            if self.source == "daily_snapshots":
+                docs = await self._read(self.db.daily_snapshots, query, daily_snapshot_projection(leg_fields))
+            else:
+                docs = await self._read_symbol_snapshots(query)
+            yield {symbol: docs[symbol] for symbol in chunk if symbol in docs}
+
+    async def _read(self, collection, query: Dict[str, Any], projection: Dict[str, int]) -> Dict[str, Dict]:
+        out: Dict[str, Dict] = {}
+        cursor = collection.find(query, projection).batch_size(self.batch_size)
+        async for doc in cursor:
+            out[doc["symbol"]] = doc
+        return out
+
+    async def _read_symbol_snapshots(self, query: Dict[str, Any]) -> Dict[str, Dict]:
+        """symbol_snapshot chains in the daily_snapshots shape, stamping (once, stored) docs without greeks."""
+        docs = await self._read(self.db.symbol_snapshot, query, symbol_snapshot_projection())
+        unstamped = [symbol for symbol, doc in docs.items() if not doc.get(GREEKS_STAMPED_FIELD)]
+        if unstamped:
+            match = {**query, "symbol": {"$in": unstamped}}
+            await backfill_greeks(self.db, ("symbol_snapshot",), match=match)
+            docs.update(await self._read(self.db.symbol_snapshot, match, symbol_snapshot_projection()))
+        return {symbol: chain_to_snapshot(doc) for symbol, doc in docs.items()}
+
+    async def _latest_run(self) -> Optional[Dict[str, Any]]:
+        # EOD pipeline stores COMPLETED; older runs used lowercase
+        return await self.db.scan_runs.find_one(
+            {"status": {"$in": ["COMPLETED", "completed"]}},
+            {"_id": 0, "run_id": 1, "as_of": 1},
+            sort=[("completed_at", -1)]
+        )
+
+    async def fill_missing_live(
+        self,
+        snapshots: Dict[str, Dict[str, Any]],
+        symbols: Iterable[str],
+        prices: Dict[str, float],
+    ) -> int:
+        """Live-fetch chains for `symbols` missing from `snapshots` (flag-gated). Returns count filled."""
+        if not self.live_fallback or self.live_fetcher is None:
+            return 0
+        filled = 0
+        for symbol in symbols:
+            price = prices.get(symbol) or 0
+            if symbol in snapshots or price <= 0:
+                continue
+            shorts = await self.live_fetcher.fetch_options_for_scan(symbol, price, 1, SHORT_DTE_MAX, 0.0, 1.0)
+            leaps = await self.live_fetcher.fetch_leaps_options(
+                symbol, price, LEAPS_DTE_MIN, LEAPS_DTE_MAX, 0.0, 1.0, 0.0
+            )
+            if not shorts and not leaps:
+                continue
+            snapshots[symbol] = {
+                "symbol": symbol,
+                "underlying_price": price,
+                "short_calls": [{f: o.get(f, 0) for f in OPTION_FIELDS} for o in shorts],
+                # Live LEAPS carry the ASK as `premium` (BUY leg)
+                "leaps_calls": [{**{f: o.get(f, 0) for f in OPTION_FIELDS}, "ask": o.get("premium", 0)} for o in leaps],
+                "live_fallback": True,
+            }
+            filled += 1
+        if filled:
+            logger.warning(f"[OPTIONS_PROVIDER] live fallback filled {filled} symbols missing from the snapshot")
+        return filled
@@ -0,0 +1,220 @@
+"""
+Precomputed Scan Store - Versioned row storage for precomputed scan results
+===========================================================================
+
+Each (strategy, risk_profile) scan used to be ONE precomputed_scans document
+with the whole `opportunities` list embedded, read in full on every request.
+Opportunities are now individual rows, and precomputed_scans keeps only a
+small pointer document per profile:
+
+DATABASE:
+- precomputed_scan_rows : one doc per opportunity
+  {scan_id, strategy, risk_profile, rank, symbol, score, dte, ...opportunity}
+  dte is normalised for PMCC rows (short leg dte).
+- precomputed_scans     : pointer + metadata per (strategy, risk_profile)
+  {strategy, risk_profile, scan_id, previous_scan_id, count, computed_at,
+   computed_date, label, description}
+
+PUBLISH:
+1. Insert all rows of the new version under a fresh scan_id (invisible to readers)
+2. Swap the pointer's scan_id in one update (atomic for readers)
+3. Delete rows of versions older than the previous one; the previous version
+   is kept so a client paging with an explicit scan_id is not cut off mid-way
+
+READ:
+Filter (score / dte / symbols), sort (whitelisted fields, rank as tie-break)
+and skip/limit run in Mongo, so response size scales with the page.
+Pointer docs that still embed `opportunities` (written before this store)
+are served with the same semantics in memory until the next publish.
+"""
+
+import logging
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional
+
+from pymongo import ReturnDocument
+
+logger = logging.getLogger(__name__)
+
+POINTER_COLLECTION = "precomputed_scans"
+ROWS_COLLECTION = "precomputed_scan_rows"
+
+SORT_FIELDS = ("score", "dte", "symbol", "roi_pct", "premium_yield", "delta", "stock_price", "rank")
+DEFAULT_PAGE_SIZE = 50
+INSERT_CHUNK = 1000
+
+
+def new_scan_id(strategy: str, risk_profile: str, now: Optional[datetime] = None) -> str:
+    now = now or datetime.now(timezone.utc)
+    return f"{strategy}:{risk_profile}:{now.strftime('%Y%m%dT%H%M%S')}:{uuid.uuid4().hex[:8]}"
+
+
+def to_row(scan_id: str, strategy: str, risk_profile: str, rank: int, opp: Dict[str, Any]) -> Dict[str, Any]:
+    row = dict(opp)
+    row.pop("_id", None)
+    if row.get("dte") is None and row.get("short_dte") is not None:
+        row["dte"] = row["short_dte"]
+    row.update({"scan_id": scan_id, "strategy": strategy, "risk_profile": risk_profile, "rank": rank})
+    return row
+
+
+def build_row_query(
+    scan_id: str,
+    min_score: Optional[float] = None,
+    min_dte: Optional[int] = None,
+    max_dte: Optional[int] = None,
+    symbols: Optional[Iterable[str]] = None,
+) -> Dict[str, Any]:
+    query: Dict[str, Any] = {"scan_id": scan_id}
+    if min_score:
+        query["score"] = {"$gte": min_score}
+    if min_dte is not None or max_dte is not None:
+        query["dte"] = {}
+        if min_dte is not None:
+            query["dte"]["$gte"] = min_dte
+        if max_dte is not None:
+            query["dte"]["$lte"] = max_dte
+    if symbols:
+        query["symbol"] = {"$in": [s.upper() for s in symbols]}
+    return query
+
+
+def _sort_spec(sort_by: str, sort_dir: int) -> List:
+    if sort_by not in SORT_FIELDS:
+        raise ValueError(f"sort_by must be one of {', '.join(SORT_FIELDS)}")
+    spec = [(sort_by, -1 if sort_dir < 0 else 1)]
+    if sort_by != "rank":
+        spec.append(("rank", 1))
+    return spec
+
+
+async def publish_scan(
+    db,
+    strategy: str,
+    risk_profile: str,
+    opportunities: List[Dict[str, Any]],
+    metadata: Optional[Dict[str, Any]] = None,
+) -> str:
+    """Write a new scan version and atomically point (strategy, risk_profile) at it."""
+    now = datetime.now(timezone.utc)
+    scan_id = new_scan_id(strategy, risk_profile, now)
+    rows = [to_row(scan_id, strategy, risk_profile, i, opp) for i, opp in enumerate(opportunities)]
+    for i in range(0, len(rows), INSERT_CHUNK):
+        await db[ROWS_COLLECTION].insert_many(rows[i:i + INSERT_CHUNK], ordered=False)
+
+    pointer = {
+        **(metadata or {}),
+        "strategy": strategy,
+        "risk_profile": risk_profile,
+        "scan_id": scan_id,
+        "count": len(rows),
+        "computed_at": now.isoformat(),
+        "computed_date": now.strftime("%Y-%m-%d"),
+    }
+    before = await db[POINTER_COLLECTION].find_one_and_update(
+        {"strategy": strategy, "risk_profile": risk_profile},
+        {"$set": pointer, "$unset": {"opportunities": ""}},
+        upsert=True,
+        return_document=ReturnDocument.BEFORE,
+    )
+    previous_scan_id = (before or {}).get("scan_id")
+    await db[POINTER_COLLECTION].update_one(
+        {"strategy": strategy, "risk_profile": risk_profile, "scan_id": scan_id},
+        {"$set": {"previous_scan_id": previous_scan_id}},
+    )
+
+    keep = [scan_id] + ([previous_scan_id] if previous_scan_id else [])
+    try:
+        await db[ROWS_COLLECTION].delete_many(
+            {"strategy": strategy, "risk_profile": risk_profile, "scan_id": {"$nin": keep}}
+        )
+    except Exception as e:
+        logger.warning(f"[SCAN_STORE] cleanup of old {strategy}/{risk_profile} rows failed: {e}")
+    return scan_id
+
+
+def _filter_embedded(
+    opportunities: List[Dict[str, Any]],
+    min_score: Optional[float],
+    min_dte: Optional[int],
+    max_dte: Optional[int],
+    symbols: Optional[Iterable[str]],
+) -> List[Dict[str, Any]]:
+    wanted = {s.upper() for s in symbols} if symbols else None
+    rows = []
+    for rank, opp in enumerate(opportunities):
+        dte = opp.get("dte", opp.get("short_dte"))
+        if min_score and (opp.get("score") or 0) < min_score:
+            continue
+        if min_dte is not None and (dte is None or dte < min_dte):
+            continue
+        if max_dte is not None and (dte is None or dte > max_dte):
+            continue
+        if wanted is not None and opp.get("symbol") not in wanted:
+            continue
+        rows.append({**opp, "dte": dte, "rank": rank})
+    return rows
+
+
+async def read_scan(
+    db,
+    strategy: str,
+    risk_profile: str,
+    scan_id: Optional[str] = None,
+    min_score: Optional[float] = None,
+    min_dte: Optional[int] = None,
+    max_dte: Optional[int] = None,
+    symbols: Optional[Iterable[str]] = None,
+    sort_by: str = "score",
+    sort_dir: int = -1,
+    offset: int = 0,
+    limit: int = DEFAULT_PAGE_SIZE,
+) -> Optional[Dict[str, Any]]:
+    """
+    One page of a stored scan plus its metadata, or None if the profile was never stored.
+
+    `total` is the number of rows matching the filters (not the page size).
+    Pass the returned scan_id back to keep paging a stable version.
+    """
+    sort = _sort_spec(sort_by, sort_dir)
+    pointer = await db[POINTER_COLLECTION].find_one(
+        {"strategy": strategy, "risk_profile": risk_profile}, {"_id": 0}
+    )
+    if not pointer:
+        return None
+
+    embedded = pointer.pop("opportunities", None)
+    scan_id = scan_id or pointer.get("scan_id")
+    page_meta = {"offset": offset, "limit": limit, "sort_by": sort_by, "sort_dir": sort_dir}
+
+    if not pointer.get("scan_id") and embedded is not None:
+        rows = _filter_embedded(embedded, min_score, min_dte, max_dte, symbols)
+        for field, direction in reversed(sort):
+            # Missing values sort like Mongo nulls: first ascending, last descending
+            rows.sort(key=lambda r: (r.get(field) is not None, r.get(field)), reverse=direction < 0)
+        return {**pointer, **page_meta, "total": len(rows), "opportunities": rows[offset:offset + limit]}
+
+    query = build_row_query(scan_id, min_score, min_dte, max_dte, symbols)
+    total = await db[ROWS_COLLECTION].count_documents(query)
+    page = await db[ROWS_COLLECTION].find(
+        query, {"_id": 0, "scan_id": 0}
+    ).sort(sort).skip(offset).limit(limit).to_list(length=limit)
+    return {**pointer, **page_meta, "scan_id": scan_id, "total": total, "opportunities": page}
+
+
+async def ensure_scan_store_indexes(db) -> None:
+    try:
+        await db[POINTER_COLLECTION].create_index(
+            [("strategy", 1), ("risk_profile", 1)],
+            unique=True,
+            partialFilterExpression={"strategy": {"$type": "string"}},
+            background=True
+        )
+        await db[ROWS_COLLECTION].create_index([("scan_id", 1), ("score", -1), ("rank", 1)], background=True)
+        await db[ROWS_COLLECTION].create_index([("scan_id", 1), ("symbol", 1)], background=True)
+        await db[ROWS_COLLECTION].create_index([("scan_id", 1), ("dte", 1)], background=True)
+        await db[ROWS_COLLECTION].create_index([("scan_id", 1), ("rank", 1)], background=True)
+        await db[ROWS_COLLECTION].create_index([("strategy", 1), ("risk_profile", 1), ("scan_id", 1)], background=True)
+    except Exception as e:
+        logger.warning(f"[SCAN_STORE] index creation failed: {e}")
@@ -0,0 +1,385 @@
+"""
+Snapshot Backtest - Replay stored EOD symbol_snapshot runs day by day
+=====================================================================
+
+Checks whether calculate_cc_score (CC) and score_pmcc (PMCC) pick winners
+without waiting for live simulator trades. For each trading day in
+[start, end] (latest COMPLETED run of the day):
+
+1. The day's symbol_snapshot docs are streamed in chunks of SYMBOL_CHUNK
+   (projection: underlying + call fields only) and each symbol is evaluated
+   in a process pool (BACKTEST_MAX_WORKERS):
+   - best CC call per compute_scan_results rules, scored by calculate_cc_score
+   - best LEAPS/short pair per the EOD PMCC rules, scored by score_pmcc
+   - mid quotes of the contracts held in open virtual positions
+2. Positions whose (short) expiry is on or before the day are settled at the
+   day's underlying price; the rest are marked to the quoted mid (last known
+   mark when the contract is not quoted).
+3. The top BACKTEST_TOP_N new candidates per strategy open one contract each
+   (one open position per symbol per strategy), at BID for sold legs and ASK
+   for bought legs, as the scans price them.
+
+Only one run's chunk plus the open positions are held in memory, so years of
+chains are never loaded at once. How far back runs exist is set by retention:
+symbol_snapshot runs are kept for retention_manager.BACKTEST_HORIZON_DAYS
+(default 3 years); older runs have had their snapshots deleted and replay empty.
+
+Positions (per contract, x100):
+- CC   : long 100 shares + short call. Settles at premium + min(S_T, K) - S_0
+- PMCC : long LEAPS + short call, closed at the short expiry
+         (short at intrinsic, LEAPS at its mark). Capital = net debit.
+
+Output per strategy: daily equity curve (realized + unrealized), drawdown /
+Sharpe from equity_series.series_stats, closed-trade win rate and returns.
+"""
+
+import asyncio
+import logging
+import os
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from services.eod_pipeline import (
+    CC_MAX_OTM_PCT, CC_MAX_PREMIUM_YIELD, CC_MIN_OTM_PCT, CC_MIN_PREMIUM_YIELD,
+    PMCC_MAX_LEAP_DTE, PMCC_MAX_LEAP_SPREAD_PCT, PMCC_MAX_SHORT_DELTA, PMCC_MAX_SHORT_DTE,
+    PMCC_MAX_SHORT_SPREAD_PCT, PMCC_MIN_LEAP_DELTA, PMCC_MIN_LEAP_DTE, PMCC_MIN_LEAP_OI,
+    PMCC_MIN_SHORT_BID, PMCC_MIN_SHORT_DELTA, PMCC_MIN_SHORT_DTE, PMCC_MIN_SHORT_OI,
+    calculate_cc_score, calculate_greeks_simple, check_cc_eligibility,
+    validate_cc_option, validate_pmcc_structure,
+)
+from services.chain_codec import chain_projection, snapshot_chains
+from services.equity_series import series_stats
+from services.pmcc_scoring import compute_pmcc_metrics, hard_reject, score_pmcc
+from services.process_pool import process_pool, shutdown_pool
+
+logger = logging.getLogger(__name__)
+
+STRATEGIES = ("cc", "pmcc")
+BACKTEST_TOP_N = int(os.environ.get("SNAPSHOT_BACKTEST_TOP_N", "10"))
+BACKTEST_MAX_WORKERS = int(os.environ.get("SNAPSHOT_BACKTEST_MAX_WORKERS", str(min(4, os.cpu_count() or 1))))
+SYMBOL_CHUNK = 50
+PMCC_MAX_LEAPS_PER_SYMBOL = 3  # as compute_scan_results
+DEFAULT_IV = 0.30
+
+CALL_FIELDS = ("strike", "bid", "ask", "impliedVolatility", "openInterest")
+
+
+def replay_projection() -> Dict[str, int]:
+    return {"_id": 0, "symbol": 1, "underlying_price": 1, "avg_volume": 1,
+            "market_cap": 1, "is_etf": 1, "has_leaps": 1, **chain_projection(CALL_FIELDS, sides=("calls",))}
+
+
+def _day(value) -> Optional[str]:
+    if isinstance(value, datetime):
+        return value.strftime("%Y-%m-%d")
+    if isinstance(value, str) and len(value) >= 10:
+        return value[:10]
+    return None
+
+
+def _dte(expiry: str, day: str) -> Optional[int]:
+    try:
+        return (datetime.strptime(expiry[:10], "%Y-%m-%d") - datetime.strptime(day, "%Y-%m-%d")).days
+    except (TypeError, ValueError):
+        return None
+
+
+def _calls(doc: Dict[str, Any], day: str):
+    """(expiry, dte on `day`, strike, bid, ask, iv, oi) for every quoted call."""
+    for chain in snapshot_chains(doc, CALL_FIELDS, sides=("calls",)):
+        expiry = chain.get("expiry") or ""
+        dte = _dte(expiry, day)
+        if dte is None or dte <= 0:
+            continue
+        for call in chain.get("calls") or []:
+            yield (expiry, dte, call.get("strike") or 0, call.get("bid") or 0, call.get("ask") or 0,
+                   call.get("impliedVolatility") or 0, call.get("openInterest") or 0)
+
+
+def _mid(bid: float, ask: float) -> Optional[float]:
+    if bid > 0 and ask > 0:
+        return (bid + ask) / 2
+    return bid or ask or None
+
+
+# =============================================================================
+# PER-SYMBOL SELECTION (pure; runs in worker processes)
+# =============================================================================
+
+def select_cc(doc: Dict[str, Any], day: str) -> Optional[Dict[str, Any]]:
+    """Best covered call of one snapshot by calculate_cc_score (compute_scan_results rules)."""
+    price = doc.get("underlying_price") or 0
+    eligible, _ = check_cc_eligibility(doc["symbol"], price, doc.get("market_cap") or 0,
+                                       doc.get("avg_volume") or 0, doc.get("is_etf", False))
+    if price <= 0 or not eligible:
+        return None
+    best = None
+    for expiry, dte, strike, bid, ask, iv, oi in _calls(doc, day):
+        valid, _ = validate_cc_option(strike=strike, stock_price=price, bid=bid, iv=iv, oi=oi, dte=dte, ask=ask)
+        if not valid:
+            continue
+        premium_yield = bid / price * 100
+        otm_pct = (strike - price) / price * 100
+        if not (CC_MIN_PREMIUM_YIELD <= premium_yield <= CC_MAX_PREMIUM_YIELD
+                and CC_MIN_OTM_PCT <= otm_pct <= CC_MAX_OTM_PCT):
+            continue
+        spread = (ask - bid) / ((ask + bid) / 2) if ask > 0 and bid > 0 else 1.0
+        delta = calculate_greeks_simple(price, strike, dte, iv if iv > 0 else DEFAULT_IV)["delta"]
+        score = calculate_cc_score({"cycle_yield": bid / price, "delta": delta,
+                                    "open_interest": oi, "spread_pct": spread})
+        if best is None or score > best["score"]:
+            best = {"symbol": doc["symbol"], "score": score, "stock_price": price, "strike": strike,
+                    "expiry": expiry, "dte": dte, "premium": bid, "mark": _mid(bid, ask)}
+    return best
+
+
+def select_pmcc(doc: Dict[str, Any], day: str) -> Optional[Dict[str, Any]]:
+    """Best LEAPS/short pair of one snapshot by score_pmcc (EOD PMCC leg rules)."""
+    price = doc.get("underlying_price") or 0
+    if price <= 0 or not doc.get("has_leaps", True):
+        return None
+    leaps, shorts = [], []
+    for expiry, dte, strike, bid, ask, iv, oi in _calls(doc, day):
+        if PMCC_MIN_LEAP_DTE <= dte <= PMCC_MAX_LEAP_DTE and strike < price and ask > 0:
+            delta = calculate_greeks_simple(price, strike, dte, iv if iv > 0 else DEFAULT_IV)["delta"]
+            mid = _mid(bid, ask)
+            spread = (ask - bid) / mid * 100 if bid > 0 else 0.0
+            if delta >= PMCC_MIN_LEAP_DELTA and oi >= PMCC_MIN_LEAP_OI and spread <= PMCC_MAX_LEAP_SPREAD_PCT:
+                leaps.append((expiry, dte, strike, bid, ask, iv, oi, delta, spread))
+        if PMCC_MIN_SHORT_DTE <= dte <= PMCC_MAX_SHORT_DTE and bid >= PMCC_MIN_SHORT_BID:
+            delta = calculate_greeks_simple(price, strike, dte, iv if iv > 0 else DEFAULT_IV)["delta"]
+            spread = (ask - bid) / ((ask + bid) / 2) * 100 if ask > 0 else 100.0
+            if (PMCC_MIN_SHORT_DELTA <= delta <= PMCC_MAX_SHORT_DELTA and oi >= PMCC_MIN_SHORT_OI
+                    and spread <= PMCC_MAX_SHORT_SPREAD_PCT):
+                shorts.append((expiry, dte, strike, bid, ask, iv, oi, delta, spread))
+
+    best = None
+    for l_exp, l_dte, l_strike, l_bid, l_ask, l_iv, l_oi, l_delta, l_spread in leaps[:PMCC_MAX_LEAPS_PER_SYMBOL]:
+        for s_exp, s_dte, s_strike, s_bid, s_ask, s_iv, s_oi, s_delta, s_spread in shorts:
+            valid, _ = validate_pmcc_structure(
+                stock_price=price, leap_strike=l_strike, leap_ask=l_ask, leap_bid=l_bid,
+                leap_delta=l_delta, leap_dte=l_dte, leap_oi=l_oi, short_strike=s_strike,
+                short_bid=s_bid, short_ask=s_ask, short_delta=s_delta, short_dte=s_dte,
+                short_oi=s_oi, short_iv=s_iv,
+            )
+            if not valid:
+                continue
+            metrics = compute_pmcc_metrics(
+                spot=price, long_strike=l_strike, long_ask=l_ask, long_delta=l_delta, long_dte=l_dte,
+                long_oi=l_oi, long_iv=l_iv, short_strike=s_strike, short_bid=s_bid, short_delta=s_delta,
+                short_dte=s_dte, short_oi=s_oi, long_spread_pct=l_spread, short_spread_pct=s_spread,
+            )
+            if hard_reject(metrics):
+                continue
+            score = score_pmcc(metrics)
+            if best is None or score > best["score"]:
+                best = {"symbol": doc["symbol"], "score": score, "stock_price": price,
+                        "leap_strike": l_strike, "leap_expiry": l_exp, "leap_cost": l_ask,
+                        "leap_mark": _mid(l_bid, l_ask), "strike": s_strike, "expiry": s_exp,
+                        "premium": s_bid, "mark": _mid(s_bid, s_ask)}
+    return best
+
+
+def quote_marks(doc: Dict[str, Any], contracts: List[Tuple[str, float]]) -> Dict[Tuple[str, float], float]:
+    """Mid quotes of the held (expiry, strike) contracts present in one snapshot."""
+    wanted = set(contracts)
+    marks = {}
+    if not wanted:
+        return marks
+    for chain in snapshot_chains(doc, CALL_FIELDS, sides=("calls",)):
+        expiry = chain.get("expiry") or ""
+        for call in chain.get("calls") or []:
+            key = (expiry, call.get("strike") or 0)
+            if key in wanted:
+                mid = _mid(call.get("bid") or 0, call.get("ask") or 0)
+                if mid:
+                    marks[key] = mid
+    return marks
+
+
+def evaluate_symbol(task: Tuple[Dict[str, Any], str, List[Tuple[str, float]]]) -> Dict[str, Any]:
+    doc, day, contracts = task
+    return {
+        "symbol": doc["symbol"],
+        "price": doc.get("underlying_price") or 0,
+        "cc": select_cc(doc, day),
+        "pmcc": select_pmcc(doc, day),
+        "marks": quote_marks(doc, contracts),
+    }
+
+
+# =============================================================================
+# VIRTUAL BOOK
+# =============================================================================
+
+class VirtualBook:
+    """Open virtual positions and realized P/L of one strategy."""
+
+    def __init__(self, strategy: str):
+        self.strategy = strategy
+        self.open: Dict[str, Dict[str, Any]] = {}   # symbol -> position
+        self.realized = 0.0
+        self.closed: List[Dict[str, Any]] = []
+
+    def contracts(self, symbol: str) -> List[Tuple[str, float]]:
+        pos = self.open.get(symbol)
+        if not pos:
+            return []
+        keys = [(pos["expiry"], pos["strike"])]
+        if self.strategy == "pmcc":
+            keys.append((pos["leap_expiry"], pos["leap_strike"]))
+        return keys
+
+    def open_position(self, candidate: Dict[str, Any], day: str) -> None:
+        pos = dict(candidate, opened=day, price=candidate["stock_price"])
+        if self.strategy == "cc":
+            pos["capital"] = candidate["stock_price"] * 100
+        else:
+            pos["capital"] = (candidate["leap_cost"] - candidate["premium"]) * 100
+            pos["leap_mark"] = pos["leap_mark"] or candidate["leap_cost"]
+        pos["mark"] = pos["mark"] or candidate["premium"]
+        self.open[candidate["symbol"]] = pos
+
+    def mark(self, symbol: str, price: float, marks: Dict[Tuple[str, float], float]) -> None:
+        pos = self.open.get(symbol)
+        if not pos:
+            return
+        if price > 0:
+            pos["price"] = price
+        pos["mark"] = marks.get((pos["expiry"], pos["strike"]), pos["mark"])
+        if self.strategy == "pmcc":
+            pos["leap_mark"] = marks.get((pos["leap_expiry"], pos["leap_strike"]), pos["leap_mark"])
+
+    def _pnl(self, pos: Dict[str, Any], short_value: float) -> float:
+        if self.strategy == "cc":
+            return ((pos["price"] - pos["stock_price"]) + (pos["premium"] - short_value)) * 100
+        leap_value = max(pos["leap_mark"], pos["price"] - pos["leap_strike"])
+        return ((leap_value - pos["leap_cost"]) + (pos["premium"] - short_value)) * 100
+
+    def settle(self, day: str) -> None:
+        for symbol in [s for s, p in self.open.items() if p["expiry"][:10] <= day]:
+            pos = self.open.pop(symbol)
+            pnl = self._pnl(pos, max(0.0, pos["price"] - pos["strike"]))
+            self.realized += pnl
+            self.closed.append({"symbol": symbol, "opened": pos["opened"], "closed": day,
+                                "score": pos["score"], "pnl": round(pnl, 2),
+                                "return_pct": round(pnl / pos["capital"] * 100, 2) if pos["capital"] > 0 else None})
+
+    def point(self, day: str) -> Dict[str, Any]:
+        unrealized = sum(self._pnl(p, p["mark"]) for p in self.open.values())
+        return {
+            "date": day,
+            "equity": round(self.realized + unrealized, 2),
+            "realized": round(self.realized, 2),
+            "unrealized": round(unrealized, 2),
+            "capital": round(sum(p["capital"] for p in self.open.values()), 2),
+            "open_trades": len(self.open),
+        }
+
+    def summary(self, curve: List[Dict[str, Any]]) -> Dict[str, Any]:
+        returns = [t["return_pct"] for t in self.closed if t["return_pct"] is not None]
+        wins = [t for t in self.closed if t["pnl"] > 0]
+        return {
+            "curve": curve,
+            "stats": series_stats(curve),
+            "closed_trades": len(self.closed),
+            "open_trades": len(self.open),
+            "win_rate": round(len(wins) / len(self.closed) * 100, 1) if self.closed else None,
+            "avg_return_pct": round(sum(returns) / len(returns), 2) if returns else None,
+            "realized": round(self.realized, 2),
+        }
+
+
+# =============================================================================
+# REPLAY
+# =============================================================================
+
+async def replay_days(db, start: str, end: str) -> List[Dict[str, str]]:
+    """Latest COMPLETED run per day in [start, end], oldest first."""
+    runs = await db.scan_runs.find(
+        {"status": {"$in": ["COMPLETED", "completed"]}},
+        {"_id": 0, "run_id": 1, "as_of": 1, "completed_at": 1}
+    ).to_list(length=None)
+    by_day: Dict[str, Dict[str, Any]] = {}
+    for run in runs:
+        day = _day(run.get("as_of"))
+        if not day or not (start <= day <= end):
+            continue
+        if day not in by_day or str(run.get("completed_at") or "") >= str(by_day[day].get("completed_at") or ""):
+            by_day[day] = run
+    return [{"day": d, "run_id": by_day[d]["run_id"]} for d in sorted(by_day)]
+
+
+async def run_snapshot_backtest(
+    db,
+    start: str,
+    end: str,
+    top_n: int = BACKTEST_TOP_N,
+    max_workers: int = BACKTEST_MAX_WORKERS,
+    progress=None,
+) -> Dict[str, Any]:
+    """
+    Replay the EOD runs in [start, end]. `progress(pct, stage)` is awaited per
+    day when given (JobContext.progress).
+    """
+    days = await replay_days(db, start, end)
+    books = {s: VirtualBook(s) for s in STRATEGIES}
+    curves: Dict[str, List[Dict[str, Any]]] = {s: [] for s in STRATEGIES}
+    loop = asyncio.get_running_loop()
+    pool = process_pool(max_workers)
+    started = datetime.now()
+
+    async def _evaluate(tasks):
+        if pool is None:
+            return await loop.run_in_executor(None, lambda: [evaluate_symbol(t) for t in tasks])
+        return await loop.run_in_executor(None, lambda: list(pool.map(evaluate_symbol, tasks, chunksize=8)))
+
+    completed = False
+    try:
+        for i, run in enumerate(days):
+            day = run["day"]
+            candidates: Dict[str, List[Dict[str, Any]]] = {s: [] for s in STRATEGIES}
+            cursor = db.symbol_snapshot.find({"run_id": run["run_id"]}, replay_projection()).batch_size(SYMBOL_CHUNK)
+            chunk: List[Dict[str, Any]] = []
+
+            async def _flush(docs):
+                tasks = [(d, day, books["cc"].contracts(d["symbol"]) + books["pmcc"].contracts(d["symbol"]))
+                         for d in docs]
+                for result in await _evaluate(tasks):
+                    for strategy, book in books.items():
+                        book.mark(result["symbol"], result["price"], result["marks"])
+                        if result[strategy] and result["symbol"] not in book.open:
+                            candidates[strategy].append(result[strategy])
+
+            async for doc in cursor:
+                if doc.get("symbol"):
+                    chunk.append(doc)
+                if len(chunk) >= SYMBOL_CHUNK:
+                    await _flush(chunk)
+                    chunk = []
+            if chunk:
+                await _flush(chunk)
+
+            for strategy, book in books.items():
+                book.settle(day)
+                picks = sorted(candidates[strategy], key=lambda c: c["score"], reverse=True)
+                for candidate in picks[:top_n]:
+                    book.open_position(candidate, day)
+                curves[strategy].append(book.point(day))
+
+            if progress:
+                await progress(int((i + 1) / len(days) * 100), f"Replayed {day}")
+        completed = True
+    finally:
+        await shutdown_pool(pool, cancel=not completed)
+
+    elapsed = (datetime.now() - started).total_seconds()
+    logger.info(f"[SNAPSHOT_BACKTEST] {len(days)} days {start}..{end} replayed in {elapsed:.1f}s")
+    return {
+        "start": start,
+        "end": end,
+        "days": len(days),
+        "top_n": top_n,
+        "elapsed_seconds": round(elapsed, 2),
+        "strategies": {s: books[s].summary(curves[s]) for s in STRATEGIES},
+    }
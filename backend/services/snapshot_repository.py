@@ -0,0 +1,497 @@
+"""
+Snapshot Repository - One read API over every stored option-chain snapshot
+==========================================================================
+
+Chain data lives in several stores, each written by a different job:
+
+    symbol_snapshot         EOD pipeline, per run_id (Yahoo records, dict or columnar)
+    daily_snapshots         scheduler job, per snapshot_date (short_calls / leaps_calls)
+    eod_options_chain       EODIngestionService, per trade_date (is_final)
+    eod_market_snapshot     EODMarketSnapshotService, per trade_date (is_final, flat calls)
+    option_chain_snapshots  SnapshotService, latest per symbol (snapshot_trade_date)
+
+get_chains(symbols, run_or_date, fields, dte_range, strike_band) resolves
+which store holds `run_or_date`, reads all requested symbols in ONE projected
+query and returns contracts in one normalized shape:
+
+    {symbol: {"symbol", "source", "key", "underlying_price",
+              "calls": [contract, ...], "puts": [contract, ...]}}
+    contract: {expiry, dte, + requested CONTRACT_FIELDS}
+
+Results sit in an in-process LRU keyed by (source, run_id / date, symbol,
+fields, sides). Only immutable keys are cached: run ids never change once
+written, and final-only stores (eod_options_chain, eod_market_snapshot) never
+rewrite a final date. Dates are resolved on every call, never cached: a later
+COMPLETED run of the same day, or a date first written after a lookup, must
+be seen. Reads of rewritable date-keyed stores (daily_snapshots,
+option_chain_snapshots) always go to Mongo.
+
+SLICING ON READ:
+dte_range (min, max) and strike_band (fractions of the underlying price) are
+pushed into Mongo as $filter expressions, so a 7-45 DTE near-the-money read
+ships a few KB instead of the whole chain. symbol_snapshot is already one
+sub-document per expiry: dict chains are sliced by expiry and strike
+server-side, columnar chains by expiry (strikes are binary columns and are
+sliced after decode). A chain already cached unsliced is sliced in memory.
+slice_pipeline() gives the services that return whole snapshot documents
+(SnapshotService, EODPriceContract) the same server-side slicing.
+
+Callers go through get_snapshot_repository(db) so the cache is shared, and
+the stores can be consolidated later without touching them.
+"""
+
+import logging
+import os
+import re
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from .chain_codec import COLUMN_DTYPES, PACKED_FIELD, chain_projection, snapshot_chains
+from .greeks_service import GREEKS_STAMPED_FIELD, normalize_iv_fields
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_CACHE_SIZE = int(os.environ.get("SNAPSHOT_REPOSITORY_CACHE_SIZE", "2000"))  # symbol chains
+
+CONTRACT_FIELDS = ("contract_symbol", "strike", "bid", "ask", "last_price", "volume",
+                   "open_interest", "iv", "delta")
+# Stored names per normalized field, across all stores
+FIELD_ALIASES = {
+    "contract_symbol": ("contract_symbol", "contractSymbol", "contract_ticker"),
+    "strike": ("strike",),
+    "bid": ("bid",),
+    "ask": ("ask",),
+    "last_price": ("last_price", "lastPrice"),
+    "volume": ("volume",),
+    "open_interest": ("open_interest", "openInterest"),
+    "iv": ("iv", "implied_volatility", "impliedVolatility"),
+    "delta": ("delta",),
+}
+SIDES = ("calls", "puts")
+_DATE_RE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+
+
+@dataclass(frozen=True)
+class ChainSource:
+    """Where one store keeps its chains. `containers` maps side -> array fields."""
+    name: str
+    price_field: str
+    containers: Dict[str, Tuple[str, ...]]
+    date_field: Optional[str] = None
+    run_field: Optional[str] = None
+    final_only: bool = False
+    type_field: Optional[str] = None   # calls and puts share one array
+    grouped: bool = False              # symbol_snapshot: expiry groups, dict or columnar
+    stamped: bool = True               # greeks stamped at ingest / by greeks_backfill
+    extra_query: Dict[str, Any] = field(default_factory=dict)
+
+
+CHAIN_SOURCES = {
+    "symbol_snapshot": ChainSource(
+        "symbol_snapshot", "underlying_price", {"calls": (), "puts": ()},
+        run_field="run_id", grouped=True),
+    "daily_snapshots": ChainSource(
+        "daily_snapshots", "underlying_price", {"calls": ("short_calls", "leaps_calls"), "puts": ()},
+        date_field="snapshot_date", stamped=False),
+    "eod_options_chain": ChainSource(
+        "eod_options_chain", "stock_price", {"calls": ("calls",), "puts": ("puts",)},
+        date_field="trade_date", run_field="ingestion_run_id", final_only=True),
+    "eod_market_snapshot": ChainSource(
+        "eod_market_snapshot", "underlying_price", {"calls": ("option_chain",), "puts": ("option_chain",)},
+        date_field="trade_date", run_field="run_id", final_only=True, type_field="type"),
+    "option_chain_snapshots": ChainSource(
+        "option_chain_snapshots", "stock_price", {"calls": ("calls",), "puts": ("puts",)},
+        date_field="snapshot_trade_date"),
+}
+# Probed in this order when get_chains is given a date
+DATE_SOURCE_ORDER = ("daily_snapshots", "symbol_snapshot", "eod_options_chain",
+                     "eod_market_snapshot", "option_chain_snapshots")
+# symbol_snapshot stores Yahoo's camelCase records, plus greeks stamped at ingest
+YAHOO_FIELDS = {"contract_symbol": "contractSymbol", "strike": "strike", "bid": "bid", "ask": "ask",
+                "last_price": "lastPrice", "volume": "volume", "open_interest": "openInterest",
+                "iv": "impliedVolatility", "delta": "delta"}
+
+
+def _day(value) -> Optional[str]:
+    if isinstance(value, datetime):
+        return value.strftime("%Y-%m-%d")
+    return str(value)[:10] if value else None
+
+
+def _clean(value):
+    if value is None or (isinstance(value, float) and value != value):  # NaN -> None
+        return None
+    return value
+
+
+def _first(raw: Dict[str, Any], aliases: Sequence[str]):
+    for name in aliases:
+        if name in raw:
+            return raw[name]
+    return None
+
+
+def normalize_contract(raw: Dict[str, Any], fields: Sequence[str], expiry: str = None, dte: int = None) -> Dict[str, Any]:
+    """One stored contract (any store's naming) -> {expiry, dte, *fields}."""
+    contract = {
+        "expiry": expiry if expiry is not None else raw.get("expiry", ""),
+        "dte": dte if dte is not None else _clean(_first(raw, ("dte", "daysToExpiration"))),
+    }
+    for name in fields:
+        value = _clean(_first(raw, FIELD_ALIASES[name]))
+        if name == "iv" and value is not None:
+            value = normalize_iv_fields(value)["iv"]
+        contract[name] = value
+    return contract
+
+
+def source_projection(source: ChainSource, fields: Sequence[str], sides: Sequence[str]) -> Dict[str, int]:
+    projection = {"_id": 0, "symbol": 1, source.price_field: 1, GREEKS_STAMPED_FIELD: 1}
+    if source.grouped:
+        stored = [YAHOO_FIELDS[f] for f in fields if f in YAHOO_FIELDS]
+        projection.update(chain_projection(stored, sides=sides))
+        return projection
+    for side in sides:
+        for container in source.containers[side]:
+            projection[f"{container}.expiry"] = 1
+            projection[f"{container}.dte"] = 1
+            if source.type_field:
+                projection[f"{container}.{source.type_field}"] = 1
+            for name in fields:
+                projection.update({f"{container}.{alias}": 1 for alias in FIELD_ALIASES[name]})
+    return projection
+
+
+def normalize_doc(source: ChainSource, doc: Dict[str, Any], key: str,
+                  fields: Sequence[str], sides: Sequence[str]) -> Dict[str, Any]:
+    """A stored snapshot doc -> the repository's per-symbol chain shape."""
+    chain = {
+        "symbol": doc["symbol"],
+        "source": source.name,
+        "key": key,
+        "underlying_price": _clean(doc.get(source.price_field)),
+        **{side: [] for side in SIDES},
+    }
+    if source.grouped:
+        stored = [YAHOO_FIELDS[f] for f in fields if f in YAHOO_FIELDS]
+        renamed = {YAHOO_FIELDS[f]: f for f in fields if f in YAHOO_FIELDS}
+        for group in snapshot_chains(doc, stored, sides=sides):
+            for side in sides:
+                for raw in group.get(side) or []:
+                    contract = normalize_contract(
+                        {renamed[k]: v for k, v in raw.items() if k in renamed},
+                        fields, group.get("expiry", ""), group.get("dte"))
+                    chain[side].append(contract)
+        return chain
+    for side in sides:
+        for container in source.containers[side]:
+            for raw in doc.get(container) or []:
+                if source.type_field and raw.get(source.type_field, "call") != side[:-1]:
+                    continue
+                chain[side].append(normalize_contract(raw, fields))
+    return chain
+
+
+def _in_bounds(value, bounds, scale: float = 1.0) -> bool:
+    lo, hi = bounds
+    if value is None:
+        return False
+    return (lo is None or value >= lo * scale) and (hi is None or value <= hi * scale)
+
+
+def slice_chain(chain: Dict[str, Any], dte_range: Optional[Tuple] = None,
+                strike_band: Optional[Tuple] = None) -> Dict[str, Any]:
+    """In-memory dte_range / strike_band slice (same rules as the $filter below)."""
+    if dte_range is None and strike_band is None:
+        return chain
+    price = chain.get("underlying_price")
+
+    def keep(c):
+        if dte_range is not None and not _in_bounds(c.get("dte"), dte_range):
+            return False
+        if strike_band is not None and price and not _in_bounds(c.get("strike"), strike_band, price):
+            return False
+        return True
+    return {**chain, **{side: [c for c in chain[side] if keep(c)] for side in SIDES}}
+
+
+# =============================================================================
+# SERVER-SIDE SLICING ($filter)
+# =============================================================================
+
+def _bound_conds(expr: str, bounds: Optional[Tuple], scale=None) -> List[Dict[str, Any]]:
+    if bounds is None:
+        return []
+    lo, hi = bounds
+    conds = []
+    if lo is not None:
+        conds.append({"$gte": [expr, lo if scale is None else {"$multiply": [scale, lo]}]})
+    if hi is not None:
+        conds.append({"$lte": [expr, hi if scale is None else {"$multiply": [scale, hi]}]})
+    return conds
+
+
+def _pick(prefix: str, names: Sequence[str]) -> Dict[str, str]:
+    return {name: f"$${prefix}.{name}" for name in names}
+
+
+def contract_filter(input_expr: str, dte_range: Optional[Tuple] = None, strike_band: Optional[Tuple] = None,
+                    price_expr: Optional[str] = None, extra: Sequence[Dict[str, Any]] = ()) -> Dict[str, Any]:
+    """$filter keeping the contracts of `input_expr` inside dte_range and strike_band x price."""
+    conds = _bound_conds("$$c.dte", dte_range) + list(extra)
+    if price_expr:
+        conds += _bound_conds("$$c.strike", strike_band, price_expr)
+    return {"$filter": {"input": {"$ifNull": [input_expr, []]}, "as": "c", "cond": {"$and": conds}}}
+
+
+def slice_pipeline(
+    match: Dict[str, Any],
+    keep: Sequence[str],
+    drop: Sequence[str] = (),
+    dte_range: Optional[Tuple] = None,
+    strike_band: Optional[Tuple] = None,
+    price_field: str = "stock_price",
+    valid_only: bool = False,
+    sort: Optional[Dict[str, int]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    One snapshot document with its `keep` contract arrays sliced in Mongo and
+    its `drop` arrays left behind (flat calls/puts stores).
+    """
+    extra = [{"$eq": ["$$c.valid", True]}] if valid_only else []
+    pipeline: List[Dict[str, Any]] = [{"$match": match}]
+    if sort:
+        pipeline.append({"$sort": sort})
+    pipeline.append({"$limit": 1})
+    if keep:
+        pipeline.append({"$addFields": {
+            array: contract_filter(f"${array}", dte_range, strike_band, f"${price_field}", extra)
+            for array in keep
+        }})
+    pipeline.append({"$project": {"_id": 0, **{array: 0 for array in drop}}})
+    return pipeline
+
+
+def _group_filter(input_expr: str, dte_range: Optional[Tuple]) -> Dict[str, Any]:
+    return {"$filter": {"input": {"$ifNull": [input_expr, []]}, "as": "g",
+                        "cond": {"$and": _bound_conds("$$g.dte", dte_range)}}}
+
+
+def source_pipeline(source: ChainSource, query: Dict[str, Any], fields: Sequence[str], sides: Sequence[str],
+                    dte_range: Optional[Tuple], strike_band: Optional[Tuple]) -> List[Dict[str, Any]]:
+    """get_chains' projection as an aggregation with dte/strike slicing in Mongo."""
+    price = f"${source.price_field}"
+    project: Dict[str, Any] = {"_id": 0, "symbol": 1, source.price_field: 1, GREEKS_STAMPED_FIELD: 1}
+    if source.grouped:
+        stored = [YAHOO_FIELDS[f] for f in fields if f in YAHOO_FIELDS]
+        columns = [f for f in stored if f in COLUMN_DTYPES]
+        if "contractSymbol" in stored and "strike" not in columns:
+            columns.append("strike")
+        project["option_chain"] = {"$cond": [
+            {"$isArray": "$option_chain"},
+            {"$map": {"input": _group_filter("$option_chain", dte_range), "as": "g", "in": {
+                "expiry": "$$g.expiry", "dte": "$$g.dte",
+                **{side: {"$map": {"input": contract_filter(f"$$g.{side}", None, strike_band, price),
+                                   "as": "c", "in": _pick("c", stored)}}
+                   for side in sides},
+            }}},
+            "$$REMOVE",
+        ]}
+        project[PACKED_FIELD] = {"$cond": [
+            {"$ifNull": [f"${PACKED_FIELD}", False]},
+            {"v": f"${PACKED_FIELD}.v", "compression": f"${PACKED_FIELD}.compression",
+             "chains": {"$map": {"input": _group_filter(f"${PACKED_FIELD}.chains", dte_range), "as": "g", "in": {
+                 "expiry": "$$g.expiry", "dte": "$$g.dte",
+                 **{side: {"n": f"$$g.{side}.n", "cols": _pick(f"g.{side}.cols", columns)} for side in sides},
+             }}}},
+            "$$REMOVE",
+        ]}
+    else:
+        names = ["expiry", "dte"] + ([source.type_field] if source.type_field else [])
+        names += [alias for name in fields for alias in FIELD_ALIASES[name]]
+        for container in dict.fromkeys(c for side in sides for c in source.containers[side]):
+            project[container] = {"$map": {
+                "input": contract_filter(f"${container}", dte_range, strike_band, price),
+                "as": "c", "in": _pick("c", names),
+            }}
+    return [{"$match": query}, {"$project": project}]
+
+
+class SnapshotRepository:
+    """
+    Batched, cached chain reads over all snapshot stores.
+
+    `hits` / `misses` count symbol chains served from / loaded into the LRU.
+    """
+
+    def __init__(self, db, cache_size: int = SNAPSHOT_CACHE_SIZE):
+        self.db = db
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[tuple, Dict[str, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    async def resolve(self, run_or_date: Optional[str] = None,
+                      source: Optional[str] = None) -> Tuple[Optional[str], Optional[str]]:
+        """
+        (source name, key) for a run id, a YYYY-MM-DD date or None (latest
+        COMPLETED EOD run). Dates probe DATE_SOURCE_ORDER unless `source` is given.
+        """
+        if run_or_date is None:
+            run = await self._latest_run()
+            return ("symbol_snapshot", run["run_id"]) if run else (None, None)
+        if not _DATE_RE.match(run_or_date):
+            return source or "symbol_snapshot", run_or_date
+
+        for name in ([source] if source else DATE_SOURCE_ORDER):
+            key = await self._date_key(CHAIN_SOURCES[name], run_or_date)
+            if key:
+                return name, key
+        return None, None
+
+    async def get_chains(
+        self,
+        symbols: Sequence[str],
+        run_or_date: Optional[str] = None,
+        fields: Optional[Sequence[str]] = None,
+        dte_range: Optional[Tuple] = None,
+        sides: Sequence[str] = SIDES,
+        source: Optional[str] = None,
+        strike_band: Optional[Tuple] = None,
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Chains for `symbols` (missing symbols are left out), in `symbols` order.
+        `fields` are CONTRACT_FIELDS names (None = all); expiry/dte always come back.
+        dte_range (min, max) and strike_band (min, max as fractions of the
+        underlying) are sliced in Mongo; either bound may be None.
+        Returned chains are shared with the cache: treat them as read-only.
+        """
+        fields = tuple(CONTRACT_FIELDS if fields is None else fields)
+        if strike_band is not None and "strike" not in fields:
+            fields += ("strike",)
+        sides = tuple(sides)
+        sliced = dte_range is not None or strike_band is not None
+        dte_range = tuple(dte_range) if dte_range is not None else None
+        strike_band = tuple(strike_band) if strike_band is not None else None
+        symbols = [s.upper() for s in symbols]
+        name, key = await self.resolve(run_or_date, source)
+        if name is None:
+            return {}
+        chain_source = CHAIN_SOURCES[name]
+        cacheable = chain_source.final_only or not _DATE_RE.match(key)
+
+        found: Dict[str, Dict[str, Any]] = {}
+        missing = []
+        for symbol in symbols:
+            if not cacheable:
+                missing.append(symbol)
+                continue
+            full_key = (name, key, symbol, fields, sides)
+            cached = self._cache_get(full_key + (dte_range, strike_band)) if sliced else None
+            if cached is None:
+                cached = self._cache_get(full_key)
+                if cached is not None:
+                    cached = slice_chain(cached, dte_range, strike_band)
+            if cached is not None:
+                found[symbol] = cached
+            else:
+                missing.append(symbol)
+
+        async def load(load_symbols: List[str], stamp: bool) -> List[str]:
+            """Read `load_symbols` into found; returns the symbols left out as unstamped."""
+            query = {**self._key_query(chain_source, key), "symbol": {"$in": load_symbols}}
+            collection = self.db[chain_source.name]
+            if sliced:
+                cursor = collection.aggregate(
+                    source_pipeline(chain_source, query, fields, sides, dte_range, strike_band))
+            else:
+                cursor = collection.find(query, source_projection(chain_source, fields, sides))
+            unstamped = []
+            async for doc in cursor:
+                if stamp and not doc.get(GREEKS_STAMPED_FIELD):
+                    unstamped.append(doc["symbol"])
+                    continue
+                # Columnar strikes can only be sliced after decode
+                chain = slice_chain(normalize_doc(chain_source, doc, key, fields, sides), dte_range, strike_band)
+                found[chain["symbol"]] = chain
+                if cacheable:
+                    cache_key = (name, key, chain["symbol"], fields, sides)
+                    self._cache_put(cache_key + (dte_range, strike_band) if sliced else cache_key, chain)
+            return unstamped
+
+        if missing:
+            # Docs written before ingest-time greeks are stamped and stored once, then read again
+            unstamped = await load(missing, chain_source.stamped and "delta" in fields)
+            if unstamped:
+                from .greeks_backfill import backfill_greeks  # greeks_backfill imports this module
+                match = {**self._key_query(chain_source, key), "symbol": {"$in": unstamped}}
+                await backfill_greeks(self.db, (chain_source.name,), match=match)
+                await load(unstamped, False)
+            self.misses += len(missing)
+            logger.debug(f"[SNAPSHOT_REPO] {name}:{key} loaded {len(missing)} symbols "
+                         f"({len(symbols) - len(missing)} cached)")
+
+        return {s: found[s] for s in symbols if s in found}
+
+    def clear(self):
+        self._cache.clear()
+
+    # ── internals ─────────────────────────────────────────────────────
+
+    def _cache_get(self, key: tuple) -> Optional[Dict[str, Any]]:
+        chain = self._cache.get(key)
+        if chain is not None:
+            self._cache.move_to_end(key)
+            self.hits += 1
+        return chain
+
+    def _cache_put(self, key: tuple, chain: Dict[str, Any]):
+        self._cache[key] = chain
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    @staticmethod
+    def _key_query(source: ChainSource, key: str) -> Dict[str, Any]:
+        field_name = source.date_field if _DATE_RE.match(key) and source.date_field else source.run_field
+        if field_name is None:
+            raise ValueError(f"{source.name} snapshots are keyed by date, got {key!r}")
+        query = {field_name: key, **source.extra_query}
+        if source.final_only:
+            query["is_final"] = True
+        return query
+
+    async def _latest_run(self) -> Optional[Dict[str, Any]]:
+        # EOD pipeline stores COMPLETED; older runs used lowercase
+        return await self.db.scan_runs.find_one(
+            {"status": {"$in": ["COMPLETED", "completed"]}},
+            {"_id": 0, "run_id": 1, "as_of": 1},
+            sort=[("completed_at", -1)]
+        )
+
+    async def _date_key(self, source: ChainSource, day: str) -> Optional[str]:
+        if source.grouped:
+            # symbol_snapshot is keyed by run: the latest COMPLETED run of that day
+            runs = await self.db.scan_runs.find(
+                {"status": {"$in": ["COMPLETED", "completed"]}},
+                {"_id": 0, "run_id": 1, "as_of": 1, "completed_at": 1}
+            ).to_list(length=None)
+            runs = [r for r in runs if _day(r.get("as_of")) == day]
+            if not runs:
+                return None
+            return max(runs, key=lambda r: str(r.get("completed_at") or ""))["run_id"]
+        query = self._key_query(source, day)
+        return day if await self.db[source.name].find_one(query, {"_id": 1}) else None
+
+
+_REPOSITORY: Optional[SnapshotRepository] = None
+
+
+def get_snapshot_repository(db) -> SnapshotRepository:
+    """Process-wide repository (one LRU shared by every route) for `db`."""
+    global _REPOSITORY
+    if _REPOSITORY is None or _REPOSITORY.db is not db:
+        _REPOSITORY = SnapshotRepository(db)
+    return _REPOSITORY
@@ -42,6 +42,12 @@ import pandas_market_calendars as mcal
 import yfinance as yf
 import httpx
 from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import UpdateOne
+
+from services.greeks_backfill import backfill_greeks
+from services.greeks_service import GREEKS_STAMPED_FIELD, stamp_contract_greeks
+from services.ingest_pipeline import run_ingest_pipeline
+from services.snapshot_repository import slice_pipeline
 
 logger = logging.getLogger(__name__)
 
@@ -173,6 +179,43 @@ class SnapshotService:
         - earnings_date: For ±7 day exclusion in Layer 3
         """
         now = datetime.now(timezone.utc)
+        snapshot = self._build_stock_snapshot(symbol, None, None, now)
+        
+        try:
+            data, source = await self._fetch_stock_data(symbol)
+            snapshot = self._build_stock_snapshot(symbol, data, source, now)
+            
+            # Store in database
+            await self.db.stock_snapshots.update_one(
+                {"symbol": symbol.upper()},
+                {"$set": snapshot},
+                upsert=True
+            )
+            
+            logger.info(f"Ingested stock snapshot for {symbol}: stock_close_price=${snapshot.get('stock_close_price')}, source={snapshot.get('source')}")
+            
+        except Exception as e:
+            snapshot["error"] = str(e)
+            logger.error(f"Error ingesting stock snapshot for {symbol}: {e}")
+        
+        return snapshot
+    
+    async def _fetch_stock_data(self, symbol: str) -> Tuple[Optional[Dict], Optional[str]]:
+        """Previous-close stock data: Yahoo first, Polygon fallback. Returns (data, source)."""
+        data = await self._fetch_stock_yahoo(symbol)
+        if data and data.get("previous_close"):
+            return data, "yahoo"
+        
+        if self.polygon_api_key:
+            # Fallback to Polygon (already uses close price from previous day)
+            data = await self._fetch_stock_polygon(symbol)
+            if data and data.get("price"):
+                return data, "polygon"
+        
+        return None, None
+    
+    def _build_stock_snapshot(self, symbol: str, data: Optional[Dict], source: Optional[str], now: datetime) -> Dict[str, Any]:
+        """LAYER 1 stock snapshot document from fetched data (schema only when data is None)."""
         ltd = self.get_last_trading_day(now)
         ltd_str = ltd.strftime('%Y-%m-%d')
         
@@ -201,60 +244,40 @@ class SnapshotService:
             "error": None
         }
         
-        try:
-            # Try Yahoo Finance first
-            data = await self._fetch_stock_yahoo(symbol)
+        if source == "yahoo":
+            # CRITICAL: Use ONLY previousClose, not regularMarketPrice
+            previous_close = data["previous_close"]
             
-            if data and data.get("previous_close"):
-                # CRITICAL: Use ONLY previousClose, not regularMarketPrice
-                previous_close = data["previous_close"]
-                
-                snapshot.update({
-                    "source": "yahoo",
-                    "stock_close_price": previous_close,  # MANDATORY FIELD
-                    "price": previous_close,  # Legacy compatibility
-                    "volume": data.get("volume"),
-                    "market_cap": data.get("market_cap"),
-                    "avg_volume": data.get("avg_volume"),
-                    "earnings_date": data.get("earnings_date"),
-                    "analyst_rating": data.get("analyst_rating"),
-                    "completeness_flag": True
-                })
-                
-                logger.info(f"[LAYER1] {symbol}: Using previousClose=${previous_close} (LTD={ltd_str})")
-                
-            elif self.polygon_api_key:
-                # Fallback to Polygon (already uses close price from previous day)
-                data = await self._fetch_stock_polygon(symbol)
-                if data and data.get("price"):
-                    snapshot.update({
-                        "source": "polygon",
-                        "stock_close_price": data["price"],  # Polygon /prev returns previous close
-                        "price": data["price"],  # Legacy compatibility
-                        "volume": data.get("volume"),
-                        "completeness_flag": True
-                    })
-                    
-                    logger.info(f"[LAYER1] {symbol}: Polygon fallback, close=${data['price']} (LTD={ltd_str})")
+            snapshot.update({
+                "source": "yahoo",
+                "stock_close_price": previous_close,  # MANDATORY FIELD
+                "price": previous_close,  # Legacy compatibility
+                "volume": data.get("volume"),
+                "market_cap": data.get("market_cap"),
+                "avg_volume": data.get("avg_volume"),
+                "earnings_date": data.get("earnings_date"),
+                "analyst_rating": data.get("analyst_rating"),
+                "completeness_flag": True
+            })
             
-            # Calculate data age from market close
-            market_close = self.get_market_close_time(ltd)
-            if market_close:
-                age_delta = now - market_close
-                snapshot["data_age_hours"] = round(age_delta.total_seconds() / 3600, 1)
+            logger.info(f"[LAYER1] {symbol}: Using previousClose=${previous_close} (LTD={ltd_str})")
             
-            # Store in database
-            await self.db.stock_snapshots.update_one(
-                {"symbol": symbol.upper()},
-                {"$set": snapshot},
-                upsert=True
-            )
-            
-            logger.info(f"Ingested stock snapshot for {symbol}: stock_close_price=${snapshot.get('stock_close_price')}, source={snapshot.get('source')}")
+        elif source == "polygon":
+            snapshot.update({
+                "source": "polygon",
+                "stock_close_price": data["price"],  # Polygon /prev returns previous close
+                "price": data["price"],  # Legacy compatibility
+                "volume": data.get("volume"),
+                "completeness_flag": True
+            })
             
-        except Exception as e:
-            snapshot["error"] = str(e)
-            logger.error(f"Error ingesting stock snapshot for {symbol}: {e}")
+            logger.info(f"[LAYER1] {symbol}: Polygon fallback, close=${data['price']} (LTD={ltd_str})")
+        
+        # Calculate data age from market close
+        market_close = self.get_market_close_time(ltd)
+        if market_close:
+            age_delta = now - market_close
+            snapshot["data_age_hours"] = round(age_delta.total_seconds() / 3600, 1)
         
         return snapshot
     
@@ -282,6 +305,49 @@ class SnapshotService:
         Returns snapshot document with full chain data
         """
         now = datetime.now(timezone.utc)
+        snapshot = self._build_chain_snapshot(symbol, stock_price, stock_trade_date, None, now)
+        
+        if not snapshot["date_validation_passed"]:
+            # Store the failed snapshot for debugging
+            await self.db.option_chain_snapshots.update_one(
+                {"symbol": symbol.upper()},
+                {"$set": snapshot},
+                upsert=True
+            )
+            return snapshot
+        
+        try:
+            # Fetch from Yahoo (has BID/ASK data)
+            chain_data = await self._fetch_option_chain_yahoo(symbol, stock_price)
+            snapshot = self._build_chain_snapshot(symbol, stock_price, stock_trade_date, chain_data, now)
+            
+            # Store in database
+            await self.db.option_chain_snapshots.update_one(
+                {"symbol": symbol.upper()},
+                {"$set": snapshot},
+                upsert=True
+            )
+            
+            logger.info(f"Ingested option chain for {symbol}: {snapshot['valid_contracts']} valid contracts, complete={snapshot['completeness_flag']}, date_match={snapshot['date_validation_passed']}")
+            
+        except Exception as e:
+            snapshot["error"] = str(e)
+            logger.error(f"Error ingesting option chain for {symbol}: {e}")
+        
+        return snapshot
+    
+    def _build_chain_snapshot(
+        self,
+        symbol: str,
+        stock_price: float,
+        stock_trade_date: Optional[str],
+        chain_data: Optional[Dict],
+        now: datetime
+    ) -> Dict[str, Any]:
+        """
+        LAYER 1 option chain snapshot document: date cross-validation, fetched
+        chain, greeks stage, completeness and data age.
+        """
         ltd = self.get_last_trading_day(now)
         ltd_str = ltd.strftime('%Y-%m-%d')
         
@@ -310,7 +376,8 @@ class SnapshotService:
             "completeness_flag": False,
             "date_validation_passed": False,
             "source": None,
-            "error": None
+            "error": None,
+            GREEKS_STAMPED_FIELD: True
         }
         
         # CRITICAL: Cross-validate dates
@@ -319,55 +386,34 @@ class SnapshotService:
             logger.error(f"[LAYER1 HARD FAIL] {symbol}: {error_msg}")
             snapshot["error"] = error_msg
             snapshot["date_validation_passed"] = False
-            
-            # Store the failed snapshot for debugging
-            await self.db.option_chain_snapshots.update_one(
-                {"symbol": symbol.upper()},
-                {"$set": snapshot},
-                upsert=True
-            )
             return snapshot
         
         snapshot["date_validation_passed"] = True
         
-        try:
-            # Fetch from Yahoo (has BID/ASK data)
-            chain_data = await self._fetch_option_chain_yahoo(symbol, stock_price)
+        if chain_data:
+            # Greeks stage: one vectorized Black-Scholes pass over the kept contracts
+            stamp_contract_greeks(chain_data.get("calls", []) + chain_data.get("puts", []), stock_price)
             
-            if chain_data:
-                snapshot.update({
-                    "source": "yahoo",
-                    "expiries": chain_data.get("expiries", []),
-                    "calls": chain_data.get("calls", []),
-                    "puts": chain_data.get("puts", []),
-                    "total_contracts": chain_data.get("total_contracts", 0),
-                    "valid_contracts": chain_data.get("valid_contracts", 0),
-                    "rejection_reasons": chain_data.get("rejection_reasons", [])
-                })
-                
-                # Validate completeness
-                snapshot["completeness_flag"] = self._validate_chain_completeness(
-                    snapshot, stock_price
-                )
-            
-            # Calculate data age
-            market_close = self.get_market_close_time(ltd)
-            if market_close:
-                age_delta = now - market_close
-                snapshot["data_age_hours"] = round(age_delta.total_seconds() / 3600, 1)
+            snapshot.update({
+                "source": "yahoo",
+                "expiries": chain_data.get("expiries", []),
+                "calls": chain_data.get("calls", []),
+                "puts": chain_data.get("puts", []),
+                "total_contracts": chain_data.get("total_contracts", 0),
+                "valid_contracts": chain_data.get("valid_contracts", 0),
+                "rejection_reasons": chain_data.get("rejection_reasons", [])
+            })
             
-            # Store in database
-            await self.db.option_chain_snapshots.update_one(
-                {"symbol": symbol.upper()},
-                {"$set": snapshot},
-                upsert=True
+            # Validate completeness
+            snapshot["completeness_flag"] = self._validate_chain_completeness(
+                snapshot, stock_price
             )
-            
-            logger.info(f"Ingested option chain for {symbol}: {snapshot['valid_contracts']} valid contracts, complete={snapshot['completeness_flag']}, date_match={snapshot['date_validation_passed']}")
-            
-        except Exception as e:
-            snapshot["error"] = str(e)
-            logger.error(f"Error ingesting option chain for {symbol}: {e}")
+        
+        # Calculate data age
+        market_close = self.get_market_close_time(ltd)
+        if market_close:
+            age_delta = now - market_close
+            snapshot["data_age_hours"] = round(age_delta.total_seconds() / 3600, 1)
         
         return snapshot
     
@@ -615,8 +661,8 @@ class SnapshotService:
         CRITICAL: Stores BID and ASK separately for enforcement in scan phase.
         Rejects contracts with missing/invalid BID.
         """
-        # Import shared Greeks service for Black-Scholes calculations
-        from services.greeks_service import calculate_greeks, normalize_iv_fields
+        # Shared IV normalization (greeks are stamped per chain afterwards)
+        from services.greeks_service import normalize_iv_fields
         
         strike = row.get('strike', 0)
         bid = row.get('bid', 0) if not (hasattr(row.get('bid'), '__iter__') and len(row.get('bid', [])) == 0) else 0
@@ -648,16 +694,6 @@ class SnapshotService:
         # Normalize IV to decimal and percentage forms
         iv_data = normalize_iv_fields(implied_volatility)
         
-        # Calculate Greeks using Black-Scholes (not moneyness fallback)
-        T = max(dte, 1) / 365.0
-        greeks_result = calculate_greeks(
-            S=stock_price,
-            K=float(strike) if strike else 0,
-            T=T,
-            sigma=iv_data["iv"] if iv_data["iv"] > 0 else None,
-            option_type=option_type
-        )
-        
         # LAYER 1 COMPLIANT: Full schema with all downstream fields
         # CCE VOLATILITY & GREEKS CORRECTNESS: All fields always populated
         contract = {
@@ -678,12 +714,8 @@ class SnapshotService:
             "implied_volatility": float(implied_volatility),  # Raw from Yahoo
             "iv": iv_data["iv"],  # Normalized decimal
             "iv_pct": iv_data["iv_pct"],  # Normalized percentage
-            # GREEKS (Black-Scholes) - ALWAYS POPULATED
-            "delta": greeks_result.delta,
-            "delta_source": greeks_result.delta_source,
-            "gamma": greeks_result.gamma,
-            "theta": greeks_result.theta,
-            "vega": greeks_result.vega,
+            # GREEKS (Black-Scholes): delta, delta_source, gamma, theta, vega are
+            # stamped on the kept contracts in _build_chain_snapshot()
             # IV RANK (placeholder - computed at symbol level in scan phase)
             "iv_rank": 50.0,  # Default neutral
             "iv_percentile": 50.0,
@@ -791,7 +823,14 @@ class SnapshotService:
         
         return snapshot, None
     
-    async def get_option_chain_snapshot(self, symbol: str) -> Tuple[Optional[Dict], Optional[str]]:
+    async def get_option_chain_snapshot(
+        self,
+        symbol: str,
+        dte_range: Optional[Tuple] = None,
+        strike_band: Optional[Tuple] = None,
+        sides: Tuple[str, ...] = ("calls", "puts"),
+        valid_only: bool = False
+    ) -> Tuple[Optional[Dict], Optional[str]]:
         """
         Get stored option chain snapshot for scanning.
         
@@ -801,12 +840,28 @@ class SnapshotService:
         - Returns snapshot if valid
         - Returns None with error if missing, incomplete, stale, or date mismatch
         
+        SLICING: dte_range / strike_band (fractions of stock_price) / valid_only
+        filter `sides` inside Mongo; sides not requested are not read
+        (sides=() for metadata only).
+        
         SCAN MUST ABORT if this returns None!
         """
-        snapshot = await self.db.option_chain_snapshots.find_one(
-            {"symbol": symbol.upper()},
-            {"_id": 0}
-        )
+        if dte_range is None and strike_band is None and not valid_only and tuple(sides) == ("calls", "puts"):
+            snapshot = await self.db.option_chain_snapshots.find_one(
+                {"symbol": symbol.upper()},
+                {"_id": 0}
+            )
+        else:
+            docs = await self.db.option_chain_snapshots.aggregate(slice_pipeline(
+                {"symbol": symbol.upper()},
+                keep=list(sides),
+                drop=[side for side in ("calls", "puts") if side not in sides],
+                dte_range=dte_range,
+                strike_band=strike_band,
+                price_field="stock_price",
+                valid_only=valid_only
+            )).to_list(1)
+            snapshot = docs[0] if docs else None
         
         if not snapshot:
             return None, f"No option chain snapshot exists for {symbol}"
@@ -822,6 +877,12 @@ class SnapshotService:
         if snapshot.get("date_validation_passed") is False:
             return None, f"Date mismatch in option chain for {symbol}: stock_date != options_date"
         
+        # Written before ingest-time greeks: stamp and store it once, then read it again
+        if not snapshot.get(GREEKS_STAMPED_FIELD):
+            stamped = await backfill_greeks(self.db, ("option_chain_snapshots",), match={"symbol": symbol.upper()})
+            if stamped["documents"]:
+                return await self.get_option_chain_snapshot(symbol, dte_range, strike_band, sides, valid_only)
+        
         return snapshot, None
     
     async def get_valid_calls_for_scan(
@@ -840,7 +901,14 @@ class SnapshotService:
         
         Returns: (contracts, error_message)
         """
-        snapshot, error = await self.get_option_chain_snapshot(symbol)
+        # DTE window and strike band are sliced in Mongo; checks below stay as the contract
+        snapshot, error = await self.get_option_chain_snapshot(
+            symbol,
+            dte_range=(min_dte, max_dte),
+            strike_band=(min_strike_pct, max_strike_pct),
+            sides=("calls",),
+            valid_only=True
+        )
         if error:
             return [], error
         
@@ -851,9 +919,6 @@ class SnapshotService:
         calls = snapshot.get("calls", [])
         valid_calls = []
         
-        # Import shared Greeks service for on-the-fly computation if needed
-        from services.greeks_service import calculate_greeks, normalize_iv_fields
-        
         for call in calls:
             if not call.get("valid"):
                 continue
@@ -871,9 +936,8 @@ class SnapshotService:
             if bid < min_bid:
                 continue
             
-            # CCE VOLATILITY & GREEKS CORRECTNESS:
-            # If delta_source is missing/UNKNOWN, compute Greeks on the fly
-            # This handles legacy data that was ingested before the update
+            # Greeks and IV are stamped at ingestion (legacy rows by the
+            # greeks_backfill job, see get_option_chain_snapshot) - never recomputed on read
             delta = call.get("delta", 0.0)
             delta_source = call.get("delta_source", "UNKNOWN")
             gamma = call.get("gamma", 0.0)
@@ -882,27 +946,6 @@ class SnapshotService:
             iv = call.get("iv", 0.0)
             iv_pct = call.get("iv_pct", 0.0)
             
-            # If data looks like legacy (delta_source unknown or iv=0 but implied_volatility exists)
-            if delta_source == "UNKNOWN" or (iv == 0 and call.get("implied_volatility", 0) > 0):
-                iv_raw = call.get("implied_volatility", 0)
-                iv_data = normalize_iv_fields(iv_raw)
-                iv = iv_data["iv"]
-                iv_pct = iv_data["iv_pct"]
-                
-                T = max(dte, 1) / 365.0
-                greeks_result = calculate_greeks(
-                    S=stock_price,
-                    K=strike,
-                    T=T,
-                    sigma=iv if iv > 0 else None,
-                    option_type="call"
-                )
-                delta = greeks_result.delta
-                delta_source = greeks_result.delta_source
-                gamma = greeks_result.gamma
-                theta = greeks_result.theta
-                vega = greeks_result.vega
-            
             # Return contract with BID as the premium (SELL leg)
             # CCE VOLATILITY & GREEKS: All fields always populated
             valid_calls.append({
@@ -952,7 +995,14 @@ class SnapshotService:
         
         Returns: (contracts, error_message)
         """
-        snapshot, error = await self.get_option_chain_snapshot(symbol)
+        # LEAPS window and ITM strikes (<= stock price) are sliced in Mongo
+        snapshot, error = await self.get_option_chain_snapshot(
+            symbol,
+            dte_range=(min_dte, max_dte),
+            strike_band=(None, 1.0),
+            sides=("calls",),
+            valid_only=True
+        )
         if error:
             return [], error
         
@@ -990,23 +1040,9 @@ class SnapshotService:
                 if spread_pct > max_spread_pct:
                     continue
             
-            # CCE VOLATILITY & GREEKS CORRECTNESS: Use Black-Scholes for delta
-            from services.greeks_service import calculate_greeks, normalize_iv_fields
-            
-            iv_raw = call.get("implied_volatility", 0) or call.get("iv", 0)
-            iv_data = normalize_iv_fields(iv_raw)
-            T = max(dte, 1) / 365.0
-            
-            greeks_result = calculate_greeks(
-                S=stock_price,
-                K=strike,
-                T=T,
-                sigma=iv_data["iv"] if iv_data["iv"] > 0 else None,
-                option_type="call"
-            )
-            
-            est_delta = greeks_result.delta
-            delta_source = greeks_result.delta_source
+            # CCE VOLATILITY & GREEKS CORRECTNESS: Black-Scholes delta stamped at ingestion
+            est_delta = call.get("delta", 0.0)
+            delta_source = call.get("delta_source", "UNKNOWN")
             
             if est_delta < min_delta:
                 continue
@@ -1024,12 +1060,12 @@ class SnapshotService:
                 # Greeks (Black-Scholes) - ALWAYS POPULATED
                 "delta": est_delta,
                 "delta_source": delta_source,
-                "gamma": greeks_result.gamma,
-                "theta": greeks_result.theta,
-                "vega": greeks_result.vega,
+                "gamma": call.get("gamma", 0.0),
+                "theta": call.get("theta", 0.0),
+                "vega": call.get("vega", 0.0),
                 # IV fields (standardized) - ALWAYS POPULATED
-                "iv": iv_data["iv"],
-                "iv_pct": iv_data["iv_pct"],
+                "iv": call.get("iv", 0.0),
+                "iv_pct": call.get("iv_pct", 0.0),
                 "implied_volatility": call.get("implied_volatility", 0),  # Legacy
                 # IV Rank (placeholder - computed at symbol level)
                 "iv_rank": 50.0,
@@ -1046,7 +1082,7 @@ class SnapshotService:
     
     # ==================== BATCH INGESTION ====================
     
-    async def ingest_symbols(self, symbols: List[str]) -> Dict[str, Any]:
+    async def ingest_symbols(self, symbols: List[str], progress=None) -> Dict[str, Any]:
         """
         Batch ingest stock and option chain snapshots for multiple symbols.
         
@@ -1055,6 +1091,11 @@ class SnapshotService:
         CRITICAL: Cross-validates stock and options dates.
         Rejects symbols where dates don't match.
         
+        Runs on the staged ingest pipeline (services/ingest_pipeline.py):
+        concurrent stock + chain fetches, document build / greeks stage,
+        bulk upserts. `progress` is a job progress callback; per-stage
+        throughput is returned under "metrics".
+        
         This should be called:
         - After market close (4:45 PM ET)
         - Before running any scans
@@ -1066,61 +1107,72 @@ class SnapshotService:
             "total": len(symbols),
             "started_at": datetime.now(timezone.utc).isoformat()
         }
+        now = datetime.now(timezone.utc)
         
-        for symbol in symbols:
-            try:
-                # Ingest stock first
-                stock_snapshot = await self.ingest_stock_snapshot(symbol)
-                
-                if not stock_snapshot.get("completeness_flag"):
-                    results["failed"].append({
-                        "symbol": symbol,
-                        "reason": stock_snapshot.get("error") or "Stock data incomplete"
-                    })
-                    continue
-                
-                # CRITICAL: Pass stock_trade_date for cross-validation
-                stock_trade_date = stock_snapshot.get("stock_price_trade_date")
-                stock_close_price = stock_snapshot.get("stock_close_price")
-                
-                # Ingest option chain with cross-validation
-                chain_snapshot = await self.ingest_option_chain_snapshot(
-                    symbol, 
-                    stock_close_price,  # Use stock_close_price, not legacy "price"
-                    stock_trade_date    # Pass for date cross-validation
-                )
-                
-                # Check for date mismatch (HARD FAIL condition)
-                if not chain_snapshot.get("date_validation_passed"):
-                    results["date_mismatch"].append({
-                        "symbol": symbol,
-                        "stock_date": stock_trade_date,
-                        "options_date": chain_snapshot.get("options_data_trade_day"),
-                        "reason": chain_snapshot.get("error") or "Date mismatch between stock and options"
-                    })
-                    continue
-                
-                if chain_snapshot.get("completeness_flag"):
-                    results["success"].append({
-                        "symbol": symbol,
-                        "stock_close_price": stock_close_price,
-                        "stock_trade_date": stock_trade_date,
-                        "valid_contracts": chain_snapshot.get("valid_contracts", 0)
-                    })
-                else:
-                    results["failed"].append({
-                        "symbol": symbol,
-                        "reason": chain_snapshot.get("error") or "Option chain incomplete"
-                    })
-                
-                # Rate limiting
-                await asyncio.sleep(0.5)
-                
-            except Exception as e:
-                results["failed"].append({
+        async def fetch(symbol: str):
+            data, source = await self._fetch_stock_data(symbol)
+            close_price = (data or {}).get("previous_close" if source == "yahoo" else "price")
+            # Chain fetch only for a complete stock snapshot, priced off its close
+            chain_data = await self._fetch_option_chain_yahoo(symbol, close_price) if source else None
+            return data, source, chain_data
+        
+        def normalize(symbol: str, raw):
+            data, source, chain_data = raw
+            stock_snapshot = self._build_stock_snapshot(symbol, data, source, now)
+            writes = [("stock_snapshots", UpdateOne(
+                {"symbol": stock_snapshot["symbol"]}, {"$set": stock_snapshot}, upsert=True))]
+            
+            if not stock_snapshot.get("completeness_flag"):
+                return writes, ("failed", {
                     "symbol": symbol,
-                    "reason": str(e)
+                    "reason": stock_snapshot.get("error") or "Stock data incomplete"
                 })
+            
+            # CRITICAL: stock_trade_date for cross-validation, stock_close_price (not legacy "price")
+            stock_trade_date = stock_snapshot.get("stock_price_trade_date")
+            stock_close_price = stock_snapshot.get("stock_close_price")
+            chain_snapshot = self._build_chain_snapshot(
+                symbol, stock_close_price, stock_trade_date, chain_data, now
+            )
+            writes.append(("option_chain_snapshots", UpdateOne(
+                {"symbol": chain_snapshot["symbol"]}, {"$set": chain_snapshot}, upsert=True)))
+            
+            # Check for date mismatch (HARD FAIL condition)
+            if not chain_snapshot.get("date_validation_passed"):
+                return writes, ("date_mismatch", {
+                    "symbol": symbol,
+                    "stock_date": stock_trade_date,
+                    "options_date": chain_snapshot.get("options_data_trade_day"),
+                    "reason": chain_snapshot.get("error") or "Date mismatch between stock and options"
+                })
+            
+            if chain_snapshot.get("completeness_flag"):
+                return writes, ("success", {
+                    "symbol": symbol,
+                    "stock_close_price": stock_close_price,
+                    "stock_trade_date": stock_trade_date,
+                    "valid_contracts": chain_snapshot.get("valid_contracts", 0)
+                })
+            return writes, ("failed", {
+                "symbol": symbol,
+                "reason": chain_snapshot.get("error") or "Option chain incomplete"
+            })
+        
+        def on_done(symbol: str, outcome, error) -> None:
+            if error is not None:
+                results["failed"].append({"symbol": symbol, "reason": str(error)})
+                return
+            bucket, entry = outcome
+            results[bucket].append(entry)
+        
+        results["metrics"] = await run_ingest_pipeline(
+            self.db, symbols, fetch, normalize, on_done, progress=progress, label="SNAPSHOT_INGEST"
+        )
+        
+        # Report in input order, as the sequential loop did
+        order = {symbol: i for i, symbol in enumerate(symbols)}
+        for bucket in ("success", "failed", "date_mismatch"):
+            results[bucket].sort(key=lambda entry: order.get(entry["symbol"], len(order)))
         
         results["completed_at"] = datetime.now(timezone.utc).isoformat()
         results["success_count"] = len(results["success"])
@@ -17,32 +17,27 @@ from datetime import datetime, timezone
 from typing import Dict, List, Optional
 from concurrent.futures import ThreadPoolExecutor
 
+import pandas as pd
 import yfinance as yf
 
+from services import indicators
+from services.ohlcv_store import OHLCVBars, sync_symbol
+
 logger = logging.getLogger(__name__)
 
+# Stored bars passed to the indicator helpers: the same ~2 calendar months
+# the old ticker.history(period="2mo") call returned (EMA seeds depend on it)
+HISTORY_WINDOW_MONTHS = 2
+
 
 def _calc_rsi(closes: list, period: int = 14):
     """Calculate RSI from a list of closing prices (oldest first)."""
-    if len(closes) < period + 1:
-        return None
-    changes = [closes[i] - closes[i - 1] for i in range(1, len(closes))]
-    recent = changes[-period:]
-    gains = [c for c in recent if c > 0]
-    losses = [abs(c) for c in recent if c < 0]
-    avg_gain = sum(gains) / period
-    avg_loss = sum(losses) / period or 0.001
-    rs = avg_gain / avg_loss
-    return round(100 - (100 / (1 + rs)), 1)
+    return indicators.rsi(closes, period)
 
 
 def _calc_ema(prices: list, period: int) -> float:
     """Calculate EMA from a list of prices (oldest first)."""
-    k = 2 / (period + 1)
-    ema = prices[0]
-    for p in prices[1:]:
-        ema = p * k + ema * (1 - k)
-    return ema
+    return float(indicators.ema(prices, period)[-1])
 
 
 def _calc_macd_signal(closes: list):
@@ -50,22 +45,7 @@ def _calc_macd_signal(closes: list):
     Calculate MACD signal direction (bullish/bearish) from closing prices (oldest first).
     Uses 12/26 EMA for MACD line, 9-period EMA for signal line.
     """
-    if len(closes) < 35:
-        return None
-    # Build MACD line values for last 9 bars to compute signal EMA
-    macd_values = []
-    start = max(26, len(closes) - 9)
-    for i in range(start, len(closes)):
-        subset = closes[:i + 1]
-        if len(subset) >= 26:
-            macd_values.append(_calc_ema(subset, 12) - _calc_ema(subset, 26))
-    if len(macd_values) < 2:
-        return None
-    signal_ema = macd_values[0]
-    k = 2 / 10  # 9-period EMA
-    for m in macd_values[1:]:
-        signal_ema = m * k + signal_ema * (1 - k)
-    return "bullish" if macd_values[-1] > signal_ema else "bearish"
+    return indicators.macd_signal_direction(closes)
 
 
 def _calc_adx(highs: list, lows: list, closes: list, period: int = 14):
@@ -73,45 +53,22 @@ def _calc_adx(highs: list, lows: list, closes: list, period: int = 14):
     Calculate ADX using Wilder's smoothing method.
     Returns (adx_value, trend_strength_label).
     """
-    if len(closes) < period * 2 + 1:
-        return None, None
-    tr_values, plus_dm, minus_dm = [], [], []
-    for i in range(1, len(closes)):
-        tr = max(highs[i] - lows[i], abs(highs[i] - closes[i - 1]), abs(lows[i] - closes[i - 1]))
-        tr_values.append(tr)
-        up = highs[i] - highs[i - 1]
-        down = lows[i - 1] - lows[i]
-        plus_dm.append(up if up > down and up > 0 else 0)
-        minus_dm.append(down if down > up and down > 0 else 0)
-    if len(tr_values) < period:
-        return None, None
-    atr = sum(tr_values[:period])
-    spdm = sum(plus_dm[:period])
-    smdm = sum(minus_dm[:period])
-    dx_values = []
-    for i in range(period, len(tr_values)):
-        atr = atr - atr / period + tr_values[i]
-        spdm = spdm - spdm / period + plus_dm[i]
-        smdm = smdm - smdm / period + minus_dm[i]
-        pdi = 100 * spdm / atr if atr > 0 else 0
-        mdi = 100 * smdm / atr if atr > 0 else 0
-        di_sum = pdi + mdi
-        dx_values.append(100 * abs(pdi - mdi) / di_sum if di_sum > 0 else 0)
-    if not dx_values:
-        return None, None
-    adx = sum(dx_values[:period]) / period if len(dx_values) >= period else sum(dx_values) / len(dx_values)
-    for i in range(period, len(dx_values)):
-        adx = (adx * (period - 1) + dx_values[i]) / period
-    adx = round(adx, 1)
-    label = "strong" if adx > 25 else "moderate" if adx >= 15 else "weak"
-    return adx, label
-
-
-def fetch_analyst_data_sync(symbol: str) -> Dict:
+    return indicators.adx(highs, lows, closes, period)
+
+
+def _two_month_window(bars: OHLCVBars) -> OHLCVBars:
+    if not len(bars):
+        return bars
+    cutoff = (pd.Timestamp(bars.last_date) - pd.DateOffset(months=HISTORY_WINDOW_MONTHS)).strftime("%Y-%m-%d")
+    return bars.after(cutoff)
+
+
+def fetch_analyst_data_sync(symbol: str, bars: Optional[OHLCVBars] = None) -> Dict:
     """
     Fetch analyst + technical indicator data from Yahoo Finance (blocking call).
 
     Returns analyst rating, SMA, RSI, MACD signal, ADX, and overall trend.
+    `bars` (from the OHLCV store) replaces the 2-month history download when given.
     """
     try:
         ticker = yf.Ticker(symbol)
@@ -161,17 +118,17 @@ def fetch_analyst_data_sync(symbol: str) -> Dict:
         trend_strength = None
         trend = None
         try:
-            hist = ticker.history(period="2mo")
+            hist = _two_month_window(bars).to_frame() if bars is not None else ticker.history(period="2mo")
             if not hist.empty and len(hist) >= 15:
-                closes = hist["Close"].tolist()
+                closes = hist["Close"].to_numpy(dtype=float)
                 rsi = _calc_rsi(closes)
                 macd_signal = _calc_macd_signal(closes)
                 if len(hist) >= 29:
                     adx, trend_strength = _calc_adx(
-                        hist["High"].tolist(), hist["Low"].tolist(), closes
+                        hist["High"].to_numpy(dtype=float), hist["Low"].to_numpy(dtype=float), closes
                     )
                 # Overall trend from SMA crossover
-                cp = current_price or (closes[-1] if closes else None)
+                cp = current_price or (float(closes[-1]) if len(closes) else None)
                 if cp and fifty_day_avg and two_hundred_day_avg:
                     if cp > fifty_day_avg and fifty_day_avg > two_hundred_day_avg:
                         trend = "bullish"
@@ -237,9 +194,19 @@ async def enrich_symbols(
         for i in range(0, len(symbols), batch_size):
             batch = symbols[i:i + batch_size]
             
+            # Daily bars from the OHLCV store (incremental append, no 2mo download)
+            bar_results = await asyncio.gather(
+                *[sync_symbol(db, symbol, executor) for symbol in batch],
+                return_exceptions=True
+            )
+            batch_bars = {
+                symbol: (None if isinstance(bars, Exception) or not len(bars) else bars)
+                for symbol, bars in zip(batch, bar_results)
+            }
+
             # Fetch analyst data concurrently
             futures = [
-                loop.run_in_executor(executor, fetch_analyst_data_sync, symbol)
+                loop.run_in_executor(executor, fetch_analyst_data_sync, symbol, batch_bars[symbol])
                 for symbol in batch
             ]
             
@@ -0,0 +1,353 @@
+"""
+Simulator Trade Events - Append-only trade history with snapshot compaction
+===========================================================================
+
+Every change to a simulator trade is also recorded as a small, immutable
+event so P&L paths can be rebuilt by streaming events instead of rereading
+(and rewriting) whole trade documents.
+
+EVENT TYPES:
+- opened       : entry snapshot (strikes, premiums, capital)
+- mark         : price-update cycle mark (spot, option value, P/L, delta, dte)
+- roll         : short call replaced
+- rule_action  : rule engine action (close / alert / ...)
+- closed | expired | assigned : terminal events with final P/L
+
+DATABASE:
+- Collection: simulator_trade_events     (append-only, one doc per event)
+- Collection: simulator_trade_snapshots  (compacted state every N events)
+- The trade document keeps an `events_since_snapshot` counter that rides on
+  the $set the price update already performs, so deciding when to compact
+  costs no extra query.
+
+The trade document remains the source of truth for the current view; events
+are the source of truth for history/analytics.
+"""
+
+import logging
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from bson import ObjectId
+
+logger = logging.getLogger(__name__)
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+EVENTS_COLLECTION = "simulator_trade_events"
+SNAPSHOTS_COLLECTION = "simulator_trade_snapshots"
+
+# Fold events into a state snapshot after this many events
+COMPACT_EVERY_N_EVENTS = 50
+
+TERMINAL_EVENTS = ("closed", "expired", "assigned")
+
+# Compact field names for mark events (mark events dominate the collection)
+MARK_FIELDS = {
+    "current_underlying_price": "spot",
+    "current_option_value": "opt",
+    "short_mark": "short_mark",
+    "long_mark": "long_mark",
+    "unrealized_pnl": "upnl",
+    "total_pl": "pl",
+    "current_delta": "delta",
+    "dte_remaining": "dte",
+}
+
+
+# =============================================================================
+# EVENT CONSTRUCTION
+# =============================================================================
+
+def _now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def build_event(trade: Dict[str, Any], event_type: str, data: Dict[str, Any], ts: Optional[str] = None) -> Dict[str, Any]:
+    """Build an event document for a trade."""
+    return {
+        "trade_id": trade["id"],
+        "user_id": trade.get("user_id"),
+        "type": event_type,
+        "ts": ts or _now_iso(),
+        "data": data,
+    }
+
+
+def build_mark_event(trade: Dict[str, Any], update_doc: Dict[str, Any], ts: Optional[str] = None) -> Dict[str, Any]:
+    """Build a compact `mark` event from a price-update $set document."""
+    data = {short: update_doc[field] for field, short in MARK_FIELDS.items() if update_doc.get(field) is not None}
+    return build_event(trade, "mark", data, ts=ts)
+
+
+def build_opened_event(trade: Dict[str, Any]) -> Dict[str, Any]:
+    """Build the `opened` event from a freshly inserted trade document."""
+    return build_event(trade, "opened", {
+        "symbol": trade.get("symbol"),
+        "strategy_type": trade.get("strategy_type"),
+        "contracts": trade.get("contracts", 1),
+        "entry_spot": trade.get("entry_underlying_price"),
+        "short_call_strike": trade.get("short_call_strike"),
+        "short_call_expiry": trade.get("short_call_expiry"),
+        "short_call_premium": trade.get("short_call_premium"),
+        "leaps_strike": trade.get("leaps_strike"),
+        "leaps_expiry": trade.get("leaps_expiry"),
+        "leaps_premium": trade.get("leaps_premium"),
+        "capital_deployed": trade.get("capital_deployed"),
+        "premium_received": trade.get("premium_received"),
+    }, ts=trade.get("created_at"))
+
+
+# =============================================================================
+# WRITE PATH
+# =============================================================================
+
+def changed_fields(trade: Dict[str, Any], update_doc: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Subset of a $set document whose values differ from the loaded trade.
+    Keeps price-update writes proportional to what actually moved.
+    """
+    return {k: v for k, v in update_doc.items() if trade.get(k, object()) != v}
+
+
+async def append_event(db, event: Dict[str, Any]) -> None:
+    """Append one event. Never raises - history must not break the trade write."""
+    try:
+        await db[EVENTS_COLLECTION].insert_one(dict(event))
+        await db.simulator_trades.update_one(
+            {"id": event["trade_id"]},
+            {"$inc": {"events_since_snapshot": 1}}
+        )
+    except Exception as e:
+        logger.warning(f"[TRADE_EVENTS] append failed for {event.get('trade_id')}: {e}")
+
+
+async def append_events(db, events: List[Dict[str, Any]]) -> int:
+    """
+    Bulk-append events (one unordered insert for a whole price-update cycle).
+    Callers are expected to $inc `events_since_snapshot` in their own trade
+    update so this stays a single write.
+    """
+    if not events:
+        return 0
+    try:
+        result = await db[EVENTS_COLLECTION].insert_many([dict(e) for e in events], ordered=False)
+        return len(result.inserted_ids)
+    except Exception as e:
+        logger.warning(f"[TRADE_EVENTS] bulk append of {len(events)} events failed: {e}")
+        return 0
+
+
+# =============================================================================
+# STATE REDUCER
+# =============================================================================
+
+def _empty_state() -> Dict[str, Any]:
+    return {
+        "status": "open",
+        "marks": 0,
+        "roll_count": 0,
+        "rule_actions": 0,
+        "last_mark": None,
+        "last_pnl": 0.0,
+        "peak_pnl": 0.0,
+        "max_drawdown": 0.0,
+        "realized_pnl": None,
+        "through_ts": None,
+    }
+
+
+def apply_event(state: Dict[str, Any], event: Dict[str, Any]) -> Dict[str, Any]:
+    """Fold one event into a trade state (pure; returns the same dict)."""
+    etype = event.get("type")
+    data = event.get("data") or {}
+
+    if etype == "opened":
+        state.update({k: v for k, v in data.items() if v is not None})
+        state["status"] = "open"
+    elif etype == "mark":
+        state["marks"] += 1
+        state["last_mark"] = data
+        pnl = mark_pnl(data)
+        if pnl is not None:
+            state["last_pnl"] = pnl
+            state["peak_pnl"] = max(state["peak_pnl"], pnl)
+            state["max_drawdown"] = max(state["max_drawdown"], state["peak_pnl"] - pnl)
+    elif etype == "roll":
+        state["roll_count"] += 1
+        state["status"] = "rolled"
+        for key in ("short_call_strike", "short_call_expiry", "short_call_premium", "premium_received"):
+            if data.get(key) is not None:
+                state[key] = data[key]
+    elif etype == "rule_action":
+        state["rule_actions"] += 1
+    elif etype in TERMINAL_EVENTS:
+        state["status"] = etype
+        state["realized_pnl"] = data.get("final_pnl")
+
+    state["through_ts"] = event.get("ts") or state.get("through_ts")
+    return state
+
+
+def mark_pnl(data: Dict[str, Any]) -> Optional[float]:
+    """P/L of a mark: real-mark total_pl when present, BS unrealized otherwise."""
+    pnl = data.get("pl")
+    if pnl is None:
+        pnl = data.get("upnl")
+    return float(pnl) if pnl is not None else None
+
+
+def max_drawdown(values: List[float]) -> float:
+    """Largest peak-to-trough drop of a P/L (or equity) series."""
+    peak = None
+    worst = 0.0
+    for v in values:
+        peak = v if peak is None else max(peak, v)
+        worst = max(worst, peak - v)
+    return worst
+
+
+# =============================================================================
+# READ PATH
+# =============================================================================
+
+async def stream_events(
+    db,
+    trade_id: str,
+    after_ts: Optional[str] = None,
+    event_types: Optional[List[str]] = None,
+    after_id: Optional[ObjectId] = None,
+    with_ids: bool = False
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Stream a trade's events in (ts, _id) order without materialising them.
+    With `after_id` the start is the (after_ts, after_id) position in that order,
+    so events sharing after_ts are not skipped; `with_ids` keeps `_id`.
+    """
+    query: Dict[str, Any] = {"trade_id": trade_id}
+    if after_ts and after_id is not None:
+        query["$or"] = [{"ts": {"$gt": after_ts}}, {"ts": after_ts, "_id": {"$gt": after_id}}]
+    elif after_ts:
+        query["ts"] = {"$gt": after_ts}
+    if event_types:
+        query["type"] = {"$in": event_types}
+    projection = None if with_ids else {"_id": 0}
+    cursor = db[EVENTS_COLLECTION].find(query, projection).sort([("ts", 1), ("_id", 1)])
+    async for event in cursor:
+        yield event
+
+
+async def get_events_page(
+    db,
+    trade_id: str,
+    after_ts: Optional[str] = None,
+    after_id: Optional[str] = None,
+    event_types: Optional[List[str]] = None,
+    limit: int = 500
+) -> Dict[str, Any]:
+    """
+    One page of a trade's events, oldest first. A mark and the terminal event
+    of the same price update share one ts, so pages are keyed on (ts, _id):
+    pass next_after / next_after_id back to get the next page.
+
+    Raises bson.errors.InvalidId for a malformed after_id.
+    """
+    cursor_id = ObjectId(after_id) if after_id else None
+    events: List[Dict[str, Any]] = []
+    last_id = None
+    async for event in stream_events(db, trade_id, after_ts, event_types, after_id=cursor_id, with_ids=True):
+        last_id = event.pop("_id", None)
+        events.append(event)
+        if len(events) >= limit:
+            break
+    more = len(events) >= limit
+    return {
+        "events": events,
+        "next_after": events[-1]["ts"] if more else None,
+        "next_after_id": str(last_id) if more and last_id is not None else None,
+    }
+
+
+async def get_latest_snapshot(db, trade_id: str) -> Optional[Dict[str, Any]]:
+    return await db[SNAPSHOTS_COLLECTION].find_one(
+        {"trade_id": trade_id}, {"_id": 0}, sort=[("through_ts", -1)]
+    )
+
+
+async def load_trade_state(db, trade_id: str) -> Dict[str, Any]:
+    """Latest compacted snapshot + the events appended after it."""
+    snapshot = await get_latest_snapshot(db, trade_id)
+    state = dict(snapshot["state"]) if snapshot else _empty_state()
+    async for event in stream_events(db, trade_id, after_ts=state.get("through_ts")):
+        apply_event(state, event)
+    return state
+
+
+async def compact_trade(db, trade_id: str, user_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """Write a new compacted snapshot for a trade and reset its counter."""
+    state = await load_trade_state(db, trade_id)
+    if not state.get("through_ts"):
+        return None
+    await db[SNAPSHOTS_COLLECTION].insert_one({
+        "trade_id": trade_id,
+        "user_id": user_id,
+        "through_ts": state["through_ts"],
+        "created_at": _now_iso(),
+        "state": dict(state),
+    })
+    await db.simulator_trades.update_one({"id": trade_id}, {"$set": {"events_since_snapshot": 0}})
+    return state
+
+
+async def compact_if_due(db, trades: List[Dict[str, Any]], pending: int = 1) -> int:
+    """
+    Compact every trade whose counter (as loaded, plus `pending` events just
+    appended) reached COMPACT_EVERY_N_EVENTS. Returns number compacted.
+    """
+    compacted = 0
+    for trade in trades:
+        if (trade.get("events_since_snapshot") or 0) + pending >= COMPACT_EVERY_N_EVENTS:
+            try:
+                if await compact_trade(db, trade["id"], trade.get("user_id")):
+                    compacted += 1
+            except Exception as e:
+                logger.warning(f"[TRADE_EVENTS] compaction failed for {trade.get('id')}: {e}")
+    return compacted
+
+
+async def get_pnl_path(db, trade_id: str) -> Dict[str, Any]:
+    """
+    P/L path for one trade, streamed from mark + terminal events.
+
+    Returns:
+        {"points": [{"ts", "pnl", "spot"}], "max_drawdown": float, "final_pnl": float|None}
+    """
+    points = []
+    final_pnl = None
+    async for event in stream_events(db, trade_id, event_types=["mark", *TERMINAL_EVENTS]):
+        data = event.get("data") or {}
+        if event["type"] == "mark":
+            pnl = mark_pnl(data)
+            if pnl is not None:
+                points.append({"ts": event["ts"], "pnl": pnl, "spot": data.get("spot")})
+        else:
+            final_pnl = data.get("final_pnl")
+            if final_pnl is not None:
+                points.append({"ts": event["ts"], "pnl": float(final_pnl), "spot": data.get("close_price")})
+    return {
+        "points": points,
+        "max_drawdown": round(max_drawdown([p["pnl"] for p in points]), 2),
+        "final_pnl": final_pnl,
+    }
+
+
+async def ensure_trade_event_indexes(db) -> None:
+    """Create indexes for the event and snapshot collections."""
+    try:
+        await db[EVENTS_COLLECTION].create_index([("trade_id", 1), ("ts", 1)], background=True)
+        await db[EVENTS_COLLECTION].create_index([("user_id", 1), ("ts", 1)], background=True)
+        await db[SNAPSHOTS_COLLECTION].create_index([("trade_id", 1), ("through_ts", -1)], background=True)
+    except Exception as e:
+        logger.warning(f"[TRADE_EVENTS] index creation failed: {e}")
@@ -0,0 +1,410 @@
+"""
+Shared test helpers: an in-memory stand-in for Motor collections
+================================================================
+
+FakeDB / FakeCollection implement the slice of the Motor API the services
+use (find / find_one / updates / bulk_write / deletes / distinct) with
+Mongo-like query matching, so unit tests don't each hand-roll one:
+
+    from tests.conftest import FakeDB
+
+    db = FakeDB(scan_runs=[...])          # seed collections by name
+    db.symbol_snapshot.docs.append(...)   # or edit .docs directly
+
+Semantics kept deliberately small:
+- Reads return deep copies; inclusion projections return whole documents
+  (tests assert on the recorded `finds` instead), exclusions are applied.
+- `_id` is never generated, so stored rows compare equal to what was written.
+- Writes are recorded on the shared `log` as (collection, method, count).
+- aggregate() is not implemented; tests that need it subclass FakeCollection
+  and point FakeDB.collection_class at the subclass.
+"""
+
+import copy
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from bson import ObjectId
+from pymongo import ReturnDocument
+
+_MISSING = object()
+
+
+# =============================================================================
+# QUERY / UPDATE EVALUATION
+# =============================================================================
+
+def get_path(doc: Any, path: str) -> Any:
+    """Value at a dotted path, or _MISSING."""
+    for part in path.split("."):
+        if not isinstance(doc, dict) or part not in doc:
+            return _MISSING
+        doc = doc[part]
+    return doc
+
+
+def _type_rank(value: Any) -> int:
+    # BSON comparison order: null < numbers < strings < objects < arrays < ObjectId < bool < dates
+    if value is _MISSING or value is None:
+        return 0
+    if isinstance(value, ObjectId):
+        return 5
+    if isinstance(value, bool):
+        return 6
+    if isinstance(value, (int, float)):
+        return 1
+    if isinstance(value, str):
+        return 2
+    if isinstance(value, dict):
+        return 3
+    if isinstance(value, (list, tuple)):
+        return 4
+    if isinstance(value, datetime):
+        return 7
+    return 8
+
+
+def sort_key(value: Any) -> Tuple[int, Any]:
+    rank = _type_rank(value)
+    return (rank, None if rank in (0, 3, 8) else value)
+
+
+def _compare(value: Any, op: str, arg: Any) -> bool:
+    # Comparisons only match within one BSON type (no str vs datetime)
+    if value is _MISSING or value is None or _type_rank(value) != _type_rank(arg):
+        return False
+    if op == "$gt":
+        return value > arg
+    if op == "$gte":
+        return value >= arg
+    if op == "$lt":
+        return value < arg
+    return value <= arg
+
+
+def _matches_condition(value: Any, cond: Any) -> bool:
+    if isinstance(cond, dict) and cond and all(k.startswith("$") for k in cond):
+        for op, arg in cond.items():
+            present = value is not _MISSING
+            plain = None if value is _MISSING else value
+            if op == "$in":
+                if not (plain in arg or (isinstance(plain, list) and any(v in arg for v in plain))):
+                    return False
+            elif op == "$nin":
+                if plain in arg:
+                    return False
+            elif op == "$ne":
+                if plain == arg:
+                    return False
+            elif op == "$eq":
+                if plain != arg:
+                    return False
+            elif op in ("$gt", "$gte", "$lt", "$lte"):
+                if not _compare(value, op, arg):
+                    return False
+            elif op == "$exists":
+                if present != bool(arg):
+                    return False
+            elif op == "$type":
+                if arg == "array" and not isinstance(plain, list):
+                    return False
+            else:
+                raise NotImplementedError(f"FakeCollection: query operator {op}")
+        return True
+    if isinstance(value, list) and not isinstance(cond, list):
+        return cond in value
+    return (None if value is _MISSING else value) == cond
+
+
+def matches(doc: Dict[str, Any], query: Optional[Dict[str, Any]]) -> bool:
+    """Mongo-style match of `doc` against a find() filter."""
+    for key, cond in (query or {}).items():
+        if key == "$and":
+            if not all(matches(doc, q) for q in cond):
+                return False
+        elif key == "$or":
+            if not any(matches(doc, q) for q in cond):
+                return False
+        elif not _matches_condition(get_path(doc, key), cond):
+            return False
+    return True
+
+
+def _set_path(doc: Dict[str, Any], path: str, value: Any) -> None:
+    parts = path.split(".")
+    for part in parts[:-1]:
+        doc = doc.setdefault(part, {})
+    doc[parts[-1]] = value
+
+
+def _unset_path(doc: Dict[str, Any], path: str) -> None:
+    parts = path.split(".")
+    for part in parts[:-1]:
+        doc = doc.get(part)
+        if not isinstance(doc, dict):
+            return
+    doc.pop(parts[-1], None)
+
+
+def apply_update(doc: Dict[str, Any], update: Dict[str, Any], inserting: bool = False) -> None:
+    """Apply an update document ($set, $unset, $inc, $min, $max, $push, ...) in place."""
+    for op, fields in update.items():
+        if op == "$setOnInsert" and not inserting:
+            continue
+        for path, value in fields.items():
+            current = get_path(doc, path)
+            if op in ("$set", "$setOnInsert"):
+                _set_path(doc, path, copy.deepcopy(value))
+            elif op == "$unset":
+                _unset_path(doc, path)
+            elif op == "$inc":
+                _set_path(doc, path, (0 if current is _MISSING else current) + value)
+            elif op == "$min":
+                _set_path(doc, path, value if current is _MISSING else min(current, value))
+            elif op == "$max":
+                _set_path(doc, path, value if current is _MISSING else max(current, value))
+            elif op in ("$push", "$addToSet"):
+                items = value["$each"] if isinstance(value, dict) and "$each" in value else [value]
+                target = [] if current is _MISSING else current
+                for item in copy.deepcopy(items):
+                    if op == "$push" or item not in target:
+                        target.append(item)
+                _set_path(doc, path, target)
+            else:
+                raise NotImplementedError(f"FakeCollection: update operator {op}")
+
+
+def _project(doc: Dict[str, Any], projection: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    doc = copy.deepcopy(doc)
+    if projection and all(not v for v in projection.values()):
+        for path in projection:
+            _unset_path(doc, path)
+    return doc
+
+
+def _upsert_doc(query: Dict[str, Any]) -> Dict[str, Any]:
+    doc: Dict[str, Any] = {}
+    for key, cond in query.items():
+        if not key.startswith("$") and not (isinstance(cond, dict) and any(k.startswith("$") for k in cond)):
+            _set_path(doc, key, copy.deepcopy(cond))
+    return doc
+
+
+# =============================================================================
+# FAKES
+# =============================================================================
+
+class FakeResult:
+    """Stands in for pymongo's UpdateResult / DeleteResult / BulkWriteResult."""
+
+    def __init__(self, matched=0, modified=0, deleted=0, inserted=0, upserted=0, upserted_id=None):
+        self.matched_count = matched
+        self.modified_count = modified
+        self.deleted_count = deleted
+        self.inserted_count = inserted
+        self.upserted_count = upserted
+        self.upserted_id = upserted_id
+
+
+class FakeCursor:
+    def __init__(self, docs: List[Dict[str, Any]]):
+        self._docs = docs
+
+    def sort(self, key, direction: int = 1):
+        spec = key if isinstance(key, list) else [(key, direction)]
+        for field, order in reversed(spec):
+            self._docs.sort(key=lambda d: sort_key(get_path(d, field)), reverse=order < 0)
+        return self
+
+    def skip(self, n: int):
+        self._docs = self._docs[n:]
+        return self
+
+    def limit(self, n: int):
+        if n:
+            self._docs = self._docs[:n]
+        return self
+
+    def batch_size(self, n: int):
+        return self
+
+    async def to_list(self, length: Optional[int] = None):
+        return self._docs[:length] if length else list(self._docs)
+
+    def __aiter__(self):
+        self._it = iter(self._docs)
+        return self
+
+    async def __anext__(self):
+        try:
+            return next(self._it)
+        except StopIteration:
+            raise StopAsyncIteration
+
+
+class FakeCollection:
+    """Just enough of a Motor collection for the services under test."""
+
+    def __init__(self, docs: Optional[List[Dict[str, Any]]] = None, name: str = "", log: Optional[list] = None):
+        self.name = name
+        self.docs: List[Dict[str, Any]] = docs if docs is not None else []
+        self.log = log if log is not None else []
+        self.finds: List[Tuple[Dict[str, Any], Optional[Dict[str, Any]]]] = []
+        self.bulk_ordered: List[bool] = []
+
+    def _record(self, method: str, n: int) -> None:
+        self.log.append((self.name, method, n))
+
+    def _matching(self, query) -> List[Dict[str, Any]]:
+        return [d for d in self.docs if matches(d, query)]
+
+    # -- reads ----------------------------------------------------------------
+
+    def find(self, query=None, projection=None):
+        self.finds.append((query, projection))
+        return FakeCursor([_project(d, projection) for d in self._matching(query)])
+
+    async def find_one(self, query=None, projection=None, sort=None):
+        cursor = FakeCursor(self._matching(query)).sort(sort or [])
+        return _project(cursor._docs[0], projection) if cursor._docs else None
+
+    async def count_documents(self, query):
+        return len(self._matching(query))
+
+    async def distinct(self, key, query=None):
+        values = [get_path(d, key) for d in self._matching(query)]
+        return list(dict.fromkeys(copy.deepcopy(v) for v in values if v is not _MISSING))
+
+    # -- writes ---------------------------------------------------------------
+
+    async def insert_one(self, doc):
+        self.docs.append(copy.deepcopy(doc))
+        self._record("insert_one", 1)
+        return FakeResult(inserted=1)
+
+    async def insert_many(self, docs, ordered=True):
+        docs = list(docs)
+        self.docs.extend(copy.deepcopy(d) for d in docs)
+        self._record("insert_many", len(docs))
+        return FakeResult(inserted=len(docs))
+
+    def _update(self, query, update, upsert=False, many=False) -> Tuple[FakeResult, Optional[Dict[str, Any]]]:
+        targets = self._matching(query)
+        if not many:
+            targets = targets[:1]
+        for doc in targets:
+            apply_update(doc, update)
+        if targets or not upsert:
+            return FakeResult(matched=len(targets), modified=len(targets)), (targets[0] if targets else None)
+        doc = _upsert_doc(query)
+        apply_update(doc, update, inserting=True)
+        self.docs.append(doc)
+        return FakeResult(upserted=1, upserted_id=doc.get("_id")), doc
+
+    async def update_one(self, query, update, upsert=False):
+        self._record("update_one", 1)
+        return self._update(query, update, upsert)[0]
+
+    async def update_many(self, query, update, upsert=False):
+        result, _ = self._update(query, update, upsert, many=True)
+        self._record("update_many", result.modified_count)
+        return result
+
+    async def replace_one(self, query, replacement, upsert=False):
+        self._record("replace_one", 1)
+        return self._replace(query, replacement, upsert)
+
+    def _replace(self, query, replacement, upsert=False) -> FakeResult:
+        for i, doc in enumerate(self.docs):
+            if matches(doc, query):
+                self.docs[i] = copy.deepcopy(replacement)
+                return FakeResult(matched=1, modified=1)
+        if upsert:
+            self.docs.append({**_upsert_doc(query), **copy.deepcopy(replacement)})
+            return FakeResult(upserted=1)
+        return FakeResult()
+
+    async def find_one_and_update(self, query, update, projection=None, sort=None, upsert=False,
+                                  return_document=ReturnDocument.BEFORE):
+        targets = self._matching(query)
+        if sort:
+            targets = FakeCursor(targets).sort(sort)._docs
+        before = copy.deepcopy(targets[0]) if targets else None
+        if targets:
+            apply_update(targets[0], update)
+            after = targets[0]
+        elif upsert:
+            after = _upsert_doc(query)
+            apply_update(after, update, inserting=True)
+            self.docs.append(after)
+        else:
+            return None
+        self._record("find_one_and_update", 1)
+        if return_document == ReturnDocument.AFTER:
+            return _project(after, projection)
+        return _project(before, projection) if before is not None else None
+
+    def _delete(self, query, many=True) -> int:
+        targets = self._matching(query)
+        if not many:
+            targets = targets[:1]
+        ids = {id(d) for d in targets}
+        self.docs = [d for d in self.docs if id(d) not in ids]
+        return len(targets)
+
+    async def delete_one(self, query):
+        self._record("delete_one", 1)
+        return FakeResult(deleted=self._delete(query, many=False))
+
+    async def delete_many(self, query):
+        deleted = self._delete(query)
+        self._record("delete_many", deleted)
+        return FakeResult(deleted=deleted)
+
+    async def bulk_write(self, ops, ordered=True):
+        ops = list(ops)
+        self.bulk_ordered.append(ordered)
+        total = FakeResult()
+        for op in ops:
+            kind = type(op).__name__
+            if kind == "InsertOne":
+                self.docs.append(copy.deepcopy(op._doc))
+                total.inserted_count += 1
+                continue
+            if kind in ("DeleteOne", "DeleteMany"):
+                total.deleted_count += self._delete(op._filter, many=kind == "DeleteMany")
+                continue
+            if kind == "ReplaceOne":
+                result = self._replace(op._filter, op._doc, op._upsert)
+            else:
+                result, _ = self._update(op._filter, op._doc, op._upsert, many=kind == "UpdateMany")
+            total.matched_count += result.matched_count
+            total.modified_count += result.modified_count
+            total.upserted_count += result.upserted_count
+        self._record("bulk_write", len(ops))
+        return total
+
+    async def create_index(self, *args, **kwargs):
+        return None
+
+
+class FakeDB(dict):
+    """Motor database stand-in: collections by item or attribute, created on first use."""
+
+    collection_class = FakeCollection
+
+    def __init__(self, **collections: List[Dict[str, Any]]):
+        super().__init__()
+        self.log: List[Tuple[str, str, int]] = []
+        for name, docs in collections.items():
+            self[name] = self.collection_class(docs, name=name, log=self.log)
+
+    def __missing__(self, name):
+        self[name] = self.collection_class(name=name, log=self.log)
+        return self[name]
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return self[name]
+
@@ -0,0 +1,140 @@
+"""
+Unit Tests for the Columnar Chain Codec
+=======================================
+
+1. Round trip of Yahoo-style records (NaN / missing values, derived fields)
+2. Packed BSON is several times smaller than the dict chain; zlib shrinks it further
+3. Lazy decode: only requested fields and sides, projection paths for both formats
+4. Readers give identical results on dict and packed snapshots
+5. pack_snapshot only packs when SNAPSHOT_CHAIN_FORMAT=columnar; zlib/zstd round trips
+"""
+
+import math
+import random
+from datetime import datetime, timezone
+
+import bson
+import pytest
+
+# Add backend to path
+import sys
+sys.path.insert(0, '/app/backend')
+
+from services import chain_codec
+from services.chain_codec import (
+    PACKED_FIELD, chain_projection, encode_chains, pack_snapshot, snapshot_chains
+)
+from services.greeks_service import stamp_chain_greeks
+from services.liquidity_index import summarize_snapshot
+from services.scan_options_provider import chain_to_snapshot
+
+
+def _record(symbol, expiry, dte, strike, rng, side="C"):
+    bid = round(rng.uniform(0.05, 20), 2)
+    return {
+        "contractSymbol": f"{symbol}{expiry[2:4]}{expiry[5:7]}{expiry[8:10]}{side}{int(strike * 1000):08d}",
+        "lastTradeDate": datetime(2025, 1, 2, 20, 59, rng.randrange(60), tzinfo=timezone.utc),
+        "strike": strike,
+        "lastPrice": round(bid + 0.05, 2),
+        "bid": bid,
+        "ask": round(bid + rng.choice([0.05, 0.1, 0.25]), 2),
+        "change": round(rng.uniform(-1, 1), 2),
+        "percentChange": round(rng.uniform(-30, 30), 4),
+        "volume": rng.choice([float("nan"), 0.0, 12.0, 1530.0]),
+        "openInterest": rng.randrange(0, 20000),
+        "impliedVolatility": round(rng.uniform(0.1, 1.2), 6),
+        "inTheMoney": rng.random() < 0.5,
+        "contractSize": "REGULAR",
+        "currency": "USD",
+        "daysToExpiration": dte,
+    }
+
+
+def _snapshot(symbol="AAPL", n_expiries=12, strikes=60, seed=1):
+    rng = random.Random(seed)
+    chains = []
+    for i in range(n_expiries):
+        expiry, dte = f"2025-{i + 1:02d}-17", 15 + 30 * i
+        chains.append({
+            "expiry": expiry, "dte": dte,
+            "calls": [_record(symbol, expiry, dte, 100 + 2.5 * k, rng) for k in range(strikes)],
+            "puts": [_record(symbol, expiry, dte, 100 + 2.5 * k, rng, "P") for k in range(strikes)],
+        })
+    stamp_chain_greeks(chains, 150.0)  # as the EOD pipeline stores them
+    return {"symbol": symbol, "underlying_price": 150.0, "avg_volume": 5e7, "option_chain": chains}
+
+
+def _packed(doc, compression="none"):
+    packed = {k: v for k, v in doc.items() if k != "option_chain"}
+    packed[PACKED_FIELD] = encode_chains(doc["option_chain"], compression)
+    # Through BSON, as Motor would return it
+    return bson.decode(bson.encode(packed))
+
+
+def _same(a, b):
+    if isinstance(a, float) and math.isnan(a):
+        return b is None or (isinstance(b, float) and math.isnan(b))
+    return a == b
+
+
+def test_round_trip():
+    doc = _snapshot(n_expiries=2, strikes=5)
+    decoded = list(snapshot_chains(_packed(doc)))
+    for original, chain in zip(doc["option_chain"], decoded):
+        assert (chain["expiry"], chain["dte"]) == (original["expiry"], original["dte"])
+        for side in ("calls", "puts"):
+            for rec, out in zip(original[side], chain[side]):
+                for field in chain_codec.COLUMN_DTYPES:
+                    assert _same(rec[field], out[field]), field
+                assert out["contractSymbol"] == rec["contractSymbol"]
+                assert out["daysToExpiration"] == rec["daysToExpiration"]
+
+
+def test_packed_is_much_smaller():
+    doc = _snapshot()
+    dict_size = len(bson.encode(doc))
+    packed_size = len(bson.encode(_packed(doc)))
+    assert dict_size / packed_size >= 5
+    assert len(bson.encode(_packed(doc, "zlib"))) < packed_size
+
+
+def test_lazy_fields_and_projection():
+    packed = _packed(_snapshot(n_expiries=3, strikes=4))
+    chains = list(snapshot_chains(packed, ("strike", "bid"), sides=("calls",)))
+    assert set(chains[0]) == {"expiry", "dte", "calls"}
+    assert set(chains[0]["calls"][0]) == {"strike", "bid"}
+
+    projection = chain_projection(("bid", "daysToExpiration"), sides=("calls",))
+    assert projection[f"{PACKED_FIELD}.chains.calls.cols.bid"] == 1
+    assert projection["option_chain.calls.bid"] == 1
+    assert not any("puts" in k for k in projection)
+    assert f"{PACKED_FIELD}.chains.calls.cols.daysToExpiration" not in projection
+
+
+def test_readers_match_on_both_formats():
+    doc = _snapshot(n_expiries=10, strikes=20, seed=3)
+    packed = _packed(doc)
+    assert chain_to_snapshot(packed) == chain_to_snapshot(doc)
+    assert summarize_snapshot(packed) == summarize_snapshot(doc)
+
+
+def test_pack_snapshot_env(monkeypatch):
+    doc = _snapshot(n_expiries=1, strikes=2)
+    monkeypatch.delenv(chain_codec.CHAIN_FORMAT_ENV, raising=False)
+    assert "option_chain" in pack_snapshot(dict(doc))
+    monkeypatch.setenv(chain_codec.CHAIN_FORMAT_ENV, "columnar")
+    packed = pack_snapshot(dict(doc))
+    assert "option_chain" not in packed and packed["option_chain_format"] == "columnar"
+    assert chain_codec.has_chain(packed)
+
+
+def test_zlib_round_trip():
+    doc = _snapshot(n_expiries=2, strikes=10)
+    assert list(snapshot_chains(_packed(doc, "zlib"))) == list(snapshot_chains(_packed(doc)))
+
+
+def test_zstd_round_trip():
+    pytest.importorskip("zstandard")
+    doc = _snapshot(n_expiries=2, strikes=10)
+    plain = list(snapshot_chains(_packed(doc)))
+    assert list(snapshot_chains(_packed(doc, "zstd"))) == plain
@@ -0,0 +1,144 @@
+"""
+Unit Tests for Chain Validator Batch Mode
+=========================================
+
+1. validate_covered_calls_batch / validate_contracts_batch / validate_pmcc_batch
+   accept exactly the rows the per-contract methods accept, and the reason code
+   names the same first failing rule
+2. Batch rejections are aggregated in rejection_counts (no per-row log entries)
+3. validate_chain (vectorized counting) keeps its verdicts and messages
+"""
+
+import random
+
+import numpy as np
+
+# Add backend to path
+import sys
+sys.path.insert(0, '/app/backend')
+
+from services.chain_validator import (
+    REASON_BID_MISSING, REASON_DEEP_ITM, REASON_DTE_TOO_LONG, REASON_LABELS, REASON_NO_WIDTH, REASON_OK,
+    REASON_SHORT_STRIKE_INVALID, REASON_SPREAD_TOO_WIDE, OptionChainValidator, chain_table
+)
+
+
+def _maybe(rng, value):
+    return rng.choice([value, value, value, None, 0])
+
+
+def test_covered_calls_batch_matches_scalar():
+    rng = random.Random(11)
+    validator = OptionChainValidator()
+    rows = []
+    for _ in range(3000):
+        bid = round(rng.uniform(0.05, 5), 2)
+        rows.append({
+            "strike": _maybe(rng, round(rng.uniform(60, 160), 1)),
+            "expiry": rng.choice(["2026-11-20", "2026-11-20", ""]),
+            "bid": _maybe(rng, bid),
+            "ask": rng.choice([None, round(bid * rng.uniform(1.0, 1.3), 2)]),
+            "dte": rng.choice([0, 7, 30, 45, 61, 90]),
+        })
+    result = validator.validate_covered_calls_batch(chain_table(rows), 100.0)
+
+    for row, code in zip(rows, result.reasons):
+        ok, reason = validator.validate_covered_call(
+            "X", 100.0, row["strike"], row["expiry"], row["bid"], row["dte"], ask=row["ask"])
+        assert ok == (code == REASON_OK), (row, reason, code)
+        if code == REASON_DEEP_ITM:
+            assert "deep ITM" in reason
+        elif code == REASON_DTE_TOO_LONG:
+            assert reason.startswith("DTE too long")
+        elif code == REASON_SPREAD_TOO_WIDE:
+            assert "Spread" in reason
+        elif code == REASON_BID_MISSING:
+            assert "BID is zero or missing" in reason
+
+
+def test_contracts_batch_matches_scalar_both_legs():
+    rng = random.Random(5)
+    validator = OptionChainValidator()
+    rows = [{"strike": _maybe(rng, round(rng.uniform(20, 260), 1)),
+             "expiry": rng.choice(["2027-01-15", None]),
+             "bid": _maybe(rng, round(rng.uniform(0.5, 3), 2)),
+             "ask": _maybe(rng, round(rng.uniform(0.5, 3.5), 2))} for _ in range(2000)]
+    table = chain_table(rows, ("strike", "expiry", "bid", "ask"))
+    prices = np.array([rng.choice([100.0, 50.0]) for _ in rows])
+
+    for is_buy_leg in (False, True):
+        result = validator.validate_contracts_batch(table, prices, is_buy_leg=is_buy_leg)
+        for row, price, valid in zip(rows, prices, result.valid):
+            contract = {k: v for k, v in row.items() if v is not None or k == "expiry"}
+            contract.setdefault("bid", 0)
+            contract.setdefault("ask", 0)
+            ok, _ = validator.validate_contract("X", contract, float(price), is_buy_leg=is_buy_leg)
+            assert ok == bool(valid), (row, price, is_buy_leg)
+
+
+def test_pmcc_batch_matches_scalar():
+    rng = random.Random(3)
+    validator = OptionChainValidator()
+    leaps, shorts = [], []
+    for _ in range(2000):
+        leap_ask = round(rng.uniform(10, 40), 2)
+        leaps.append({"strike": rng.choice([60.0, 70.0, 80.0, 0]), "expiry": rng.choice(["2028-01-21", ""]),
+                      "ask": leap_ask, "bid": round(leap_ask * rng.uniform(0.85, 1.0), 2),
+                      "dte": rng.choice([300, 400, 700]), "delta": rng.choice([0.65, 0.75, 0.85]),
+                      "open_interest": rng.choice([100, 600, 5000])})
+        short_bid = round(rng.uniform(0.2, 3), 2)
+        shorts.append({"strike": rng.choice([75.0, 105.0, 120.0]), "expiry": "2026-11-20",
+                       "bid": _maybe(rng, short_bid), "ask": round(short_bid * rng.uniform(1.0, 1.2), 2),
+                       "dte": rng.choice([7, 21, 35, 50])})
+    leap_fields = ("strike", "expiry", "ask", "bid", "dte", "delta", "open_interest")
+    result = validator.validate_pmcc_batch(chain_table(leaps, leap_fields), chain_table(shorts), 100.0)
+
+    for leap, short, code in zip(leaps, shorts, result.reasons):
+        ok, reason = validator.validate_pmcc_structure(
+            "X", 100.0, leap["strike"], leap["expiry"], leap["ask"], leap["dte"], leap["delta"],
+            leap["open_interest"], short["strike"], short["expiry"], short["bid"], short["dte"],
+            leap_bid=leap["bid"], short_ask=short["ask"])
+        assert ok == (code == REASON_OK), (leap, short, reason, code)
+        # Same leg as the scalar message
+        if REASON_OK < code < REASON_SHORT_STRIKE_INVALID:
+            assert "LEAP" in reason and "Short" not in reason
+        elif code >= REASON_NO_WIDTH:
+            assert "Short strike" in reason
+        elif code:
+            assert "Short" in reason
+
+
+def test_batch_counts_not_logs():
+    validator = OptionChainValidator()
+    rows = [{"strike": 105.0, "expiry": "2026-11-20", "bid": 1.0, "dte": 30},
+            {"strike": 105.0, "expiry": "2026-11-20", "bid": 0.0, "dte": 30},
+            {"strike": 80.0, "expiry": "2026-11-20", "bid": 1.0, "dte": 30},
+            {"strike": 80.0, "expiry": "2026-11-20", "bid": 1.0, "dte": 90}]
+    result = validator.validate_covered_calls_batch(chain_table(rows), 100.0)
+    assert result.valid.tolist() == [True, False, False, False]
+    assert result.labels()[0] is None
+    assert result.counts() == {REASON_LABELS[REASON_BID_MISSING]: 1,
+                               REASON_LABELS[REASON_DEEP_ITM]: 1,
+                               REASON_LABELS[REASON_DTE_TOO_LONG]: 1}
+
+    validator.validate_covered_calls_batch(chain_table(rows), 100.0)
+    assert validator.rejection_counts[REASON_LABELS[REASON_DEEP_ITM]] == 2
+    assert validator.get_rejection_log() == []
+    assert validator.get_rejection_summary()["batch_rejections"] == dict(validator.rejection_counts)
+    validator.clear_rejection_log()
+    assert not validator.rejection_counts
+
+
+def test_validate_chain_verdicts():
+    validator = OptionChainValidator()
+    calls = [{"strike": s, "bid": 1.0, "ask": 1.05} for s in (90.0, 100.0, 110.0)]
+    assert validator.validate_chain("OK", 100.0, calls, expiries=["2026-11-20"]) == (True, None)
+
+    wide = calls[:2] + [{"strike": 110.0, "bid": 1.0, "ask": 2.0}]
+    ok, reason = validator.validate_chain("WIDE", 100.0, wide, expiries=["2026-11-20"])
+    assert not ok and reason == "Insufficient contracts with spread ≤10.0% (found 2, need 3)"
+
+    sparse = calls + [{"strike": None, "bid": None, "ask": None}, {"strike": 150.0, "bid": 1.0, "ask": 1.0}]
+    ok, reason = validator.validate_chain("SPARSE", 100.0, sparse[1:], expiries=["2026-11-20"])
+    assert not ok and reason.startswith("Insufficient strikes within ±20% of spot (found 2")
+    assert [r["symbol"] for r in validator.get_rejection_log()] == ["WIDE", "SPARSE"]
@@ -0,0 +1,102 @@
+"""
+Unit Tests for the Simulator Equity Series
+==========================================
+
+Tests the pure parts of the per-user equity / greeks series:
+1. Portfolio point aggregation (P/L split, capital, position greeks)
+2. Drawdown / Sharpe stats
+3. LTTB downsampling keeps endpoints and extremes
+"""
+
+import pytest
+
+# Add backend to path
+import sys
+sys.path.insert(0, '/app/backend')
+
+from services.equity_series import (
+    SERIES_FIELDS,
+    _month_range,
+    compute_portfolio_point,
+    downsample_lttb,
+    series_stats,
+)
+
+
+CC_OPEN = {
+    "status": "open", "strategy_type": "covered_call", "contracts": 2,
+    "current_underlying_price": 50.0, "capital_deployed": 10000.0,
+    "total_pl": 120.0, "unrealized_pnl": 80.0,
+    "current_delta": 0.30, "current_gamma": 0.05, "current_theta": -0.02, "current_vega": 0.10,
+}
+
+PMCC_OPEN = {
+    "status": "rolled", "strategy_type": "pmcc", "contracts": 1,
+    "current_underlying_price": 100.0, "capital_deployed": 2500.0,
+    "unrealized_pnl": -40.0, "leaps_delta": 0.80,
+    "current_delta": 0.25,
+}
+
+CLOSED = {"status": "closed", "realized_pnl": 300.0}
+ASSIGNED = {"status": "assigned", "final_pnl": 150.0}
+
+
+class TestComputePortfolioPoint:
+    def test_empty(self):
+        point = compute_portfolio_point([])
+        assert set(point) == set(SERIES_FIELDS)
+        assert all(v == 0 for v in point.values())
+
+    def test_pnl_split(self):
+        point = compute_portfolio_point([CC_OPEN, PMCC_OPEN, CLOSED, ASSIGNED])
+        assert point["realized"] == 450.0
+        # total_pl preferred over unrealized_pnl when present
+        assert point["unrealized"] == 80.0
+        assert point["equity"] == 530.0
+        assert point["capital"] == 12500.0
+        assert point["open_trades"] == 2
+
+    def test_position_greeks(self):
+        point = compute_portfolio_point([CC_OPEN, PMCC_OPEN])
+        # CC: (1 - 0.30) * 200 = 140 ; PMCC: (0.80 - 0.25) * 100 = 55
+        assert point["delta"] == pytest.approx(195.0)
+        assert point["delta_dollars"] == pytest.approx(140 * 50 + 55 * 100)
+        # Short call greeks are negated
+        assert point["gamma"] == pytest.approx(-10.0)
+        assert point["theta"] == pytest.approx(4.0)
+        assert point["vega"] == pytest.approx(-20.0)
+
+
+class TestSeriesStats:
+    def test_empty(self):
+        assert series_stats([])["points"] == 0
+
+    def test_drawdown_and_sharpe(self):
+        pts = [{"equity": e, "capital": 1000.0} for e in (0, 50, 20, 80, 60, 100)]
+        stats = series_stats(pts)
+        assert stats["max_drawdown"] == 30.0
+        assert stats["sharpe"] is not None and stats["sharpe"] > 0
+        assert stats["peak_capital"] == 1000.0
+
+    def test_no_sharpe_without_period(self):
+        pts = [{"equity": e, "capital": 1000.0} for e in (0, 50, 20, 80, 60, 100)]
+        stats = series_stats(pts, periods_per_year=None)
+        assert stats["sharpe"] is None and stats["max_drawdown"] == 30.0
+
+
+class TestDownsample:
+    def test_passthrough_when_small(self):
+        pts = [{"equity": float(i)} for i in range(5)]
+        assert downsample_lttb(pts, 10) == pts
+
+    def test_keeps_endpoints_and_spike(self):
+        pts = [{"equity": 0.0} for _ in range(100)]
+        pts[37] = {"equity": 500.0}
+        out = downsample_lttb(pts, 10)
+        assert len(out) == 10
+        assert out[0] is pts[0] and out[-1] is pts[-1]
+        assert pts[37] in out
+
+
+def test_month_range_crosses_year():
+    assert _month_range("2025-11-15", "2026-02-01") == ["2025-11", "2025-12", "2026-01", "2026-02"]
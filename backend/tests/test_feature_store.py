@@ -0,0 +1,107 @@
+"""
+Unit Tests for the Symbol Feature Store
+=======================================
+
+Verifies that precomputed scan profiles share one feature table:
+1. Technicals/fundamentals fetched once per symbol per night
+2. Persisted rows are reused by later profiles (no refetch)
+3. ETFs skip the fundamentals fetch
+4. Profiles run purely over a supplied feature table
+"""
+
+import asyncio
+
+# Add backend to path
+import sys
+sys.path.insert(0, '/app/backend')
+
+from services.feature_store import FEATURES_COLLECTION
+from services.precomputed_scans import PrecomputedScanService
+from tests.conftest import FakeDB
+
+
+class _CountingService(PrecomputedScanService):
+    def __init__(self, db):
+        super().__init__(db)
+        self.tech_calls = []
+        self.fund_calls = []
+
+    async def fetch_technical_data(self, symbol):
+        self.tech_calls.append(symbol)
+        return {"symbol": symbol, "close": 100.0, "sma50": 95.0, "sma200": 90.0,
+                "rsi14": 55.0, "atr_pct": 0.02, "avg_volume_20d": 5_000_000}
+
+    async def fetch_fundamental_data(self, symbol):
+        self.fund_calls.append(symbol)
+        return {"symbol": symbol, "market_cap": 50e9, "roe": 0.2}
+
+
+def test_features_fetched_once_and_reused():
+    db = FakeDB()
+    service = _CountingService(db)
+
+    async def scenario():
+        first = await service.build_feature_table(["AAPL", "MSFT", "SPY"], as_of="2026-01-05")
+        # Later profile on the same night: nothing refetched
+        second = await service.build_feature_table(["AAPL", "MSFT", "SPY"], as_of="2026-01-05")
+        return first, second
+
+    first, second = asyncio.run(scenario())
+    assert sorted(service.tech_calls) == ["AAPL", "MSFT", "SPY"]
+    # ETF fundamentals are a placeholder, never fetched
+    assert sorted(service.fund_calls) == ["AAPL", "MSFT"]
+    assert first["SPY"]["fundamental"]["is_etf"] is True
+    assert second["AAPL"]["technical"]["close"] == 100.0
+    assert len(db[FEATURES_COLLECTION].docs) == 3
+
+
+def test_new_day_and_refresh_refetch():
+    service = _CountingService(FakeDB())
+
+    async def scenario():
+        await service.build_feature_table(["AAPL"], as_of="2026-01-05")
+        await service.build_feature_table(["AAPL"], as_of="2026-01-06")
+        await service.build_feature_table(["AAPL"], as_of="2026-01-06", refresh=True)
+
+    asyncio.run(scenario())
+    assert service.tech_calls == ["AAPL", "AAPL", "AAPL"]
+
+
+def test_profile_scan_uses_supplied_features_without_fetching():
+    service = _CountingService(FakeDB())
+
+    async def _symbols():
+        return ["AAPL"]
+    service.get_liquid_symbols = _symbols
+
+    snapshots = {"AAPL": {"symbol": "AAPL", "short_calls": []}}
+    features = {"AAPL": {"technical": None, "fundamental": None, "is_etf": False}}
+    result = asyncio.run(service.run_covered_call_scan("balanced", snapshots, features))
+
+    assert result == []
+    assert service.tech_calls == [] and service.fund_calls == []
+
+
+def test_missing_symbols_fetched_concurrently():
+    from services.resilient_fetch import reset_scan_semaphore, YAHOO_SCAN_MAX_CONCURRENCY
+
+    class _SlowService(_CountingService):
+        async def fetch_technical_data(self, symbol):
+            await asyncio.sleep(0.2)
+            return await super().fetch_technical_data(symbol)
+
+    reset_scan_semaphore()
+    service = _SlowService(FakeDB())
+    symbols = [f"S{i}" for i in range(YAHOO_SCAN_MAX_CONCURRENCY)]
+
+    async def scenario():
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        await service.build_feature_table(symbols, as_of="2026-01-05")
+        return loop.time() - start
+
+    elapsed = asyncio.run(scenario())
+    reset_scan_semaphore()
+    # Sequential would take 0.2s * N; bounded fan-out takes about one fetch
+    assert elapsed < 0.2 * len(symbols) * 0.6
+    assert sorted(service.tech_calls) == sorted(symbols)
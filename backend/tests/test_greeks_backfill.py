@@ -0,0 +1,175 @@
+"""
+Unit Tests for Ingest-Time Greeks and the Greeks Backfill
+=========================================================
+
+1. calculate_greeks_vectorized matches calculate_greeks row for row
+   (proxy sigma, expiry, missing inputs, puts)
+2. stamp_contract_greeks / stamp_chain_greeks set the stored fields in place
+3. backfill_greeks stamps flat, grouped and columnar snapshot docs, skips
+   stamped ones and is idempotent
+4. get_valid_calls_for_scan returns stored greeks without recomputing; a read
+   of a document the backfill has not reached stamps and stores it once
+"""
+
+import asyncio
+import random
+
+import bson
+import numpy as np
+
+# Add backend to path
+import sys
+sys.path.insert(0, '/app/backend')
+
+from services.chain_codec import PACKED_FIELD, encode_chains, snapshot_chains
+from services.greeks_backfill import backfill_greeks
+from services.greeks_service import (
+    GREEKS_STAMPED_FIELD, calculate_greeks, calculate_greeks_vectorized,
+    stamp_chain_greeks, stamp_contract_greeks
+)
+from tests.conftest import FakeDB
+
+
+def test_vectorized_matches_scalar():
+    rng = random.Random(7)
+    rows = []
+    for _ in range(2000):
+        S = rng.uniform(5, 500)
+        rows.append((
+            rng.choice([S, S, S, 0.0]),
+            S * rng.uniform(0.3, 2.0),
+            rng.choice([rng.randint(1, 800) / 365, rng.randint(1, 800) / 365, 0.0]),
+            rng.choice([round(rng.uniform(0.05, 2.5), 4), None, 0.005, 6.0]),
+            rng.choice(["call", "put"]),
+        ))
+    vec = calculate_greeks_vectorized(
+        [r[0] for r in rows], [r[1] for r in rows], [r[2] for r in rows],
+        [np.nan if r[3] is None else r[3] for r in rows],
+        np.array([r[4] for r in rows]), r=0.045,
+    )
+    for i, (S, K, T, sigma, kind) in enumerate(rows):
+        scalar = calculate_greeks(S, K, T, sigma, kind, r=0.045)
+        for name in ("delta", "gamma", "theta", "vega"):
+            assert abs(getattr(scalar, name) - vec[name][i]) < 1e-9, (name, rows[i])
+        assert scalar.delta_source == vec["delta_source"][i]
+
+
+def test_stamp_contracts_and_chains():
+    contracts = [
+        {"strike": 105.0, "dte": 30, "option_type": "call", "implied_volatility": 0.3},
+        {"strike": 95.0, "dte": 30, "implied_volatility": 0.0},
+        {"strike": 95.0, "dte": 0, "type": "put", "implied_volatility": 45.0},
+    ]
+    stamp_contract_greeks(contracts, 100.0, option_type="put")
+    call, put_proxy, put_pct_iv = contracts
+    expected = calculate_greeks(100.0, 105.0, 30 / 365, 0.3, "call")
+    assert (call["delta"], call["gamma"], call["iv"], call["iv_pct"]) == (expected.delta, expected.gamma, 0.3, 30.0)
+    assert put_proxy["delta"] < 0 and put_proxy["delta_source"] == "BS_PROXY_SIGMA" and put_proxy["iv"] == 0.0
+    assert put_pct_iv["iv"] == 0.45 and put_pct_iv["delta_source"] == "BS"  # dte 0 priced as 1 day
+
+    chain = [{"expiry": "2026-11-20", "dte": 33,
+              "calls": [{"strike": 210.0, "impliedVolatility": 0.28}],
+              "puts": [{"strike": 190.0, "impliedVolatility": 0.31}]}]
+    assert stamp_chain_greeks(chain, 200.0) == 2
+    assert chain[0]["calls"][0]["delta"] == calculate_greeks(200.0, 210.0, 33 / 365, 0.28, "call").delta
+    assert chain[0]["puts"][0]["delta"] < 0
+    assert chain[0]["calls"][0]["impliedVolatility"] == 0.28  # raw IV untouched
+
+
+def _yahoo_chain():
+    return [{"expiry": "2026-11-20", "dte": 33,
+             "calls": [{"strike": 210.0, "bid": 2.5, "impliedVolatility": 0.28}],
+             "puts": [{"strike": 190.0, "bid": 1.0, "impliedVolatility": 0.3}]}]
+
+
+def test_backfill_stamps_every_store_once():
+    db = FakeDB()
+    db["option_chain_snapshots"].docs = [
+        {"_id": 1, "symbol": "AAPL", "stock_price": 200.0,
+         "calls": [{"strike": 210.0, "dte": 33, "option_type": "call", "implied_volatility": 0.28,
+                    "delta": 0.4, "valid": True}],
+         "puts": [{"strike": 190.0, "dte": 33, "implied_volatility": 0.3}]},
+        {"_id": 2, "symbol": "MSFT", "stock_price": 400.0, GREEKS_STAMPED_FIELD: True,
+         "calls": [{"strike": 410.0, "dte": 33, "delta": 0.45, "delta_source": "BS"}], "puts": []},
+    ]
+    db["eod_market_snapshot"].docs = [
+        {"_id": 3, "symbol": "AAPL", "underlying_price": 200.0,
+         "option_chain": [{"strike": 210.0, "dte": 33, "type": "call", "implied_volatility": 0.28}]},
+    ]
+    packed = {"_id": 5, "symbol": "AAPL", "underlying_price": 200.0, "option_chain_format": "columnar",
+              PACKED_FIELD: encode_chains(_yahoo_chain(), "zlib")}
+    db["symbol_snapshot"].docs = [
+        {"_id": 4, "symbol": "AAPL", "underlying_price": 200.0, "option_chain": _yahoo_chain()},
+        bson.decode(bson.encode(packed)),
+    ]
+
+    progress = []
+
+    async def report(pct, stage=None, done=None, total=None):
+        progress.append((pct, stage))
+
+    result = asyncio.run(backfill_greeks(db, batch_size=1, progress=report))
+    assert result["stamped"] == {"option_chain_snapshots": 1, "eod_options_chain": 0,
+                                 "eod_market_snapshot": 1, "symbol_snapshot": 2}
+    assert progress[-1] == (100, "done")
+
+    expected = calculate_greeks(200.0, 210.0, 33 / 365, 0.28, "call").delta
+    legacy = db["option_chain_snapshots"].docs[0]
+    assert legacy["calls"][0]["delta"] == expected and legacy["calls"][0]["delta_source"] == "BS"
+    assert legacy["calls"][0]["valid"] is True and legacy["puts"][0]["delta"] < 0
+    assert db["option_chain_snapshots"].docs[1]["calls"][0]["delta"] == 0.45  # already stamped: untouched
+    assert db["eod_market_snapshot"].docs[0]["option_chain"][0]["iv_pct"] == 28.0
+
+    grouped, columnar = db["symbol_snapshot"].docs
+    assert grouped["option_chain"][0]["calls"][0]["delta"] == expected
+    chain, = snapshot_chains(columnar, ("strike", "delta"))
+    assert chain["calls"][0]["delta"] == expected and chain["puts"][0]["delta"] < 0
+    assert columnar[PACKED_FIELD]["compression"] == "zlib"
+
+    # Second run finds nothing left to stamp
+    writes = len(db.log)
+    assert asyncio.run(backfill_greeks(db))["documents"] == 0
+    assert len(db.log) == writes
+
+
+def test_valid_calls_use_stored_greeks(monkeypatch):
+    from services.snapshot_service import SnapshotService
+    import services.greeks_service as greeks_service
+
+    call = {"strike": 105.0, "dte": 30, "expiry": "2026-11-20", "bid": 1.2, "ask": 1.3, "valid": True,
+            "option_type": "call", "implied_volatility": 0.3}
+    stamp_contract_greeks([call], 100.0)
+
+    service = SnapshotService.__new__(SnapshotService)
+
+    async def snapshot(*args, **kwargs):
+        return {"stock_price": 100.0, "calls": [dict(call)]}, None
+
+    service.get_option_chain_snapshot = snapshot
+    monkeypatch.setattr(greeks_service, "calculate_greeks",
+                        lambda *a, **k: (_ for _ in ()).throw(AssertionError("recomputed on read")))
+
+    calls, error = asyncio.run(service.get_valid_calls_for_scan("AAPL"))
+    assert error is None
+    assert (calls[0]["delta"], calls[0]["delta_source"], calls[0]["iv"]) == (call["delta"], "BS", 0.3)
+
+
+def test_chain_snapshot_read_stamps_and_stores_once():
+    from services.snapshot_service import SnapshotService
+
+    call = {"strike": 105.0, "dte": 30, "expiry": "2026-11-20", "bid": 1.2, "ask": 1.3, "valid": True,
+            "option_type": "call", "implied_volatility": 0.3}
+    expected = stamp_contract_greeks([dict(call)], 100.0)[0]
+    db = FakeDB(option_chain_snapshots=[{"_id": 1, "symbol": "AAPL", "stock_price": 100.0, "calls": [call],
+                                         "puts": [], "completeness_flag": True, "data_age_hours": 0}])
+    service = SnapshotService.__new__(SnapshotService)
+    service.db = db
+
+    snapshot, error = asyncio.run(service.get_option_chain_snapshot("AAPL"))
+    assert error is None and snapshot[GREEKS_STAMPED_FIELD]
+    assert {k: snapshot["calls"][0][k] for k in ("delta", "delta_source", "gamma", "iv")} == \
+        {k: expected[k] for k in ("delta", "delta_source", "gamma", "iv")}
+    assert db.option_chain_snapshots.docs[0][GREEKS_STAMPED_FIELD]
+
+    asyncio.run(service.get_option_chain_snapshot("AAPL"))
+    assert [m for _, m, _ in db.log].count("bulk_write") == 1
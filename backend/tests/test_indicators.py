@@ -0,0 +1,192 @@
+"""
+Unit Tests for the Indicator Library
+====================================
+
+Parity of services/indicators.py against the implementations it replaced:
+1. Enrichment path: list-based RSI / EMA / MACD signal / ADX (copied below)
+2. Scan path: pandas rolling SMA / RSI / ATR from fetch_technical_data
+3. IndicatorState: one-bar updates match the batch functions, and survive
+   a to_dict() / from_dict() round trip
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Add backend to path
+import sys
+sys.path.insert(0, '/app/backend')
+
+from services import indicators
+from services.indicators import IndicatorState
+
+
+# ---------------------------------------------------------------------------
+# Reference implementations (as they were in services/symbol_enrichment.py)
+# ---------------------------------------------------------------------------
+
+def _ref_rsi(closes, period=14):
+    if len(closes) < period + 1:
+        return None
+    changes = [closes[i] - closes[i - 1] for i in range(1, len(closes))]
+    recent = changes[-period:]
+    gains = [c for c in recent if c > 0]
+    losses = [abs(c) for c in recent if c < 0]
+    avg_gain = sum(gains) / period
+    avg_loss = sum(losses) / period or 0.001
+    rs = avg_gain / avg_loss
+    return round(100 - (100 / (1 + rs)), 1)
+
+
+def _ref_ema(prices, period):
+    k = 2 / (period + 1)
+    ema = prices[0]
+    for p in prices[1:]:
+        ema = p * k + ema * (1 - k)
+    return ema
+
+
+def _ref_macd_signal(closes):
+    if len(closes) < 35:
+        return None
+    macd_values = []
+    start = max(26, len(closes) - 9)
+    for i in range(start, len(closes)):
+        subset = closes[:i + 1]
+        if len(subset) >= 26:
+            macd_values.append(_ref_ema(subset, 12) - _ref_ema(subset, 26))
+    if len(macd_values) < 2:
+        return None
+    signal_ema = macd_values[0]
+    k = 2 / 10
+    for m in macd_values[1:]:
+        signal_ema = m * k + signal_ema * (1 - k)
+    return "bullish" if macd_values[-1] > signal_ema else "bearish"
+
+
+def _ref_adx(highs, lows, closes, period=14):
+    if len(closes) < period * 2 + 1:
+        return None, None
+    tr_values, plus_dm, minus_dm = [], [], []
+    for i in range(1, len(closes)):
+        tr = max(highs[i] - lows[i], abs(highs[i] - closes[i - 1]), abs(lows[i] - closes[i - 1]))
+        tr_values.append(tr)
+        up = highs[i] - highs[i - 1]
+        down = lows[i - 1] - lows[i]
+        plus_dm.append(up if up > down and up > 0 else 0)
+        minus_dm.append(down if down > up and down > 0 else 0)
+    atr = sum(tr_values[:period])
+    spdm = sum(plus_dm[:period])
+    smdm = sum(minus_dm[:period])
+    dx_values = []
+    for i in range(period, len(tr_values)):
+        atr = atr - atr / period + tr_values[i]
+        spdm = spdm - spdm / period + plus_dm[i]
+        smdm = smdm - smdm / period + minus_dm[i]
+        pdi = 100 * spdm / atr if atr > 0 else 0
+        mdi = 100 * smdm / atr if atr > 0 else 0
+        di_sum = pdi + mdi
+        dx_values.append(100 * abs(pdi - mdi) / di_sum if di_sum > 0 else 0)
+    if not dx_values:
+        return None, None
+    adx = sum(dx_values[:period]) / period if len(dx_values) >= period else sum(dx_values) / len(dx_values)
+    for i in range(period, len(dx_values)):
+        adx = (adx * (period - 1) + dx_values[i]) / period
+    adx = round(adx, 1)
+    label = "strong" if adx > 25 else "moderate" if adx >= 15 else "weak"
+    return adx, label
+
+
+def _ref_scan_frame(high, low, close):
+    """Rolling indicators exactly as fetch_technical_data computed them with pandas."""
+    hist = pd.DataFrame({"High": high, "Low": low, "Close": close})
+    hist['SMA20'] = hist['Close'].rolling(window=20).mean()
+    hist['SMA200'] = hist['Close'].rolling(window=200).mean()
+    delta = hist['Close'].diff()
+    gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
+    loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
+    hist['RSI14'] = 100 - (100 / (1 + gain / loss))
+    high_low = hist['High'] - hist['Low']
+    high_close = (hist['High'] - hist['Close'].shift()).abs()
+    low_close = (hist['Low'] - hist['Close'].shift()).abs()
+    tr = pd.concat([high_low, high_close, low_close], axis=1).max(axis=1)
+    hist['ATR14'] = tr.rolling(window=14).mean()
+    return hist
+
+
+def _random_bars(n, seed):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, n)))
+    spread = np.abs(rng.normal(0, 0.01, n)) * close
+    high = close + spread
+    low = close - spread * rng.uniform(0.5, 1.5, n)
+    volume = rng.integers(1_000, 100_000, n).astype(float)
+    return high, low, close, volume
+
+
+# ---------------------------------------------------------------------------
+# Tests
+# ---------------------------------------------------------------------------
+
+@pytest.mark.parametrize("seed,n", [(1, 15), (2, 29), (3, 35), (4, 42), (5, 260)])
+def test_enrichment_indicators_match_reference(seed, n):
+    high, low, close, _ = _random_bars(n, seed)
+    cl, hl, ll = close.tolist(), high.tolist(), low.tolist()
+
+    assert indicators.rsi(close) == _ref_rsi(cl)
+    assert indicators.ema(close, 12)[-1] == pytest.approx(_ref_ema(cl, 12), rel=1e-12)
+    assert indicators.macd_signal_direction(close) == _ref_macd_signal(cl)
+    assert indicators.adx(high, low, close) == _ref_adx(hl, ll, cl)
+
+
+def test_rsi_floor_on_monotonic_series():
+    closes = np.arange(1.0, 20.0)
+    assert indicators.rsi(closes) == _ref_rsi(closes.tolist())
+    assert indicators.rsi(closes[:10]) is None
+
+
+@pytest.mark.parametrize("seed", [7, 8])
+def test_scan_indicators_match_pandas(seed):
+    high, low, close, _ = _random_bars(260, seed)
+    ref = _ref_scan_frame(high, low, close)
+
+    np.testing.assert_allclose(indicators.sma(close, 20), ref['SMA20'].to_numpy(), rtol=1e-9, equal_nan=True)
+    np.testing.assert_allclose(indicators.sma(close, 200), ref['SMA200'].to_numpy(), rtol=1e-9, equal_nan=True)
+    np.testing.assert_allclose(indicators.rsi_sma(close, 14), ref['RSI14'].to_numpy(), rtol=1e-9, equal_nan=True)
+    np.testing.assert_allclose(
+        indicators.atr_sma(high, low, close, 14), ref['ATR14'].to_numpy(), rtol=1e-9, equal_nan=True
+    )
+
+
+def test_rsi_sma_all_gains_is_100():
+    closes = np.arange(1.0, 30.0)
+    assert indicators.rsi_sma(closes, 14)[-1] == 100.0
+
+
+def test_incremental_state_matches_batch():
+    high, low, close, volume = _random_bars(300, 11)
+    state = IndicatorState.from_arrays(high[:250], low[:250], close[:250], volume[:250])
+
+    # Persist / reload, then feed the remaining bars one at a time
+    for i in range(250, 300):
+        state = IndicatorState.from_dict(state.to_dict())
+        state.update(high[i], low[i], close[i], volume[i])
+
+    values = state.values()
+    assert values["sma20"] == pytest.approx(indicators.sma(close, 20)[-1], rel=1e-9)
+    assert values["sma200"] == pytest.approx(indicators.sma(close, 200)[-1], rel=1e-9)
+    assert values["rsi14"] == pytest.approx(indicators.rsi_sma(close, 14)[-1], rel=1e-9)
+    assert values["atr14"] == pytest.approx(indicators.atr_sma(high, low, close, 14)[-1], rel=1e-9)
+    assert values["avg_volume_20d"] == pytest.approx(volume[-20:].mean())
+    assert values["rsi"] == indicators.rsi(close)
+    assert values["macd_signal"] == indicators.macd_signal_direction(close)
+    assert (values["adx"], values["trend_strength"]) == indicators.adx(high, low, close)
+
+
+def test_incremental_state_short_history():
+    high, low, close, volume = _random_bars(20, 12)
+    values = IndicatorState.from_arrays(high, low, close, volume).values()
+    assert values["sma50"] is None
+    assert values["macd_signal"] is None
+    assert values["adx"] is None
+    assert values["sma20"] == pytest.approx(close.mean())
@@ -0,0 +1,152 @@
+"""
+Unit Tests for the Staged Ingest Pipeline
+=========================================
+
+1. run_ingest_pipeline overlaps fetches up to the concurrency limit and
+   batches writes per collection (stock collection before chain collection)
+2. A failing fetch / normalize is reported through on_done and does not stop
+   the other keys; metrics and progress cover every stage
+3. Fetch starts are spaced fetch_delay apart across all fetch workers
+4. EODIngestionService.ingest_all_eod skips already-final symbols from one
+   batched lookup and bulk upserts the rest, results in input order
+"""
+
+import asyncio
+import time
+
+# Add backend to path
+import sys
+sys.path.insert(0, '/app/backend')
+
+from pymongo import UpdateOne
+
+from services.ingest_pipeline import run_ingest_pipeline
+from tests.conftest import FakeDB
+
+
+def test_pipeline_concurrency_batching_and_order():
+    db = FakeDB()
+    active = {"now": 0, "peak": 0}
+
+    async def fetch(key):
+        active["now"] += 1
+        active["peak"] = max(active["peak"], active["now"])
+        await asyncio.sleep(0.01)
+        active["now"] -= 1
+        return key.lower()
+
+    def normalize(key, raw):
+        return [("stocks", UpdateOne({"k": key}, {"$set": {"k": key, "v": raw}}, upsert=True)),
+                ("chains", UpdateOne({"k": key}, {"$set": {"k": key}}, upsert=True))], raw
+
+    done = []
+    keys = [f"S{i}" for i in range(20)]
+    metrics = asyncio.run(run_ingest_pipeline(
+        db, keys, fetch, normalize, lambda k, o, e: done.append((k, o, e)),
+        concurrency=4, write_batch=8, fetch_delay=0,
+    ))
+
+    assert active["peak"] == 4
+    writes = [(name, n) for name, method, n in db.log if method == "bulk_write"]
+    assert sorted(done) == sorted((k, k.lower(), None) for k in keys)
+    assert len(db["stocks"].docs) == len(db["chains"].docs) == 20
+    # Every flush writes the stock collection before the chain collection, <= 8 keys each
+    assert [name for name, _ in writes[::2]] == ["stocks"] * (len(writes) // 2)
+    assert all(n <= 8 for _, n in writes)
+    assert not any(db["stocks"].bulk_ordered + db["chains"].bulk_ordered)
+    assert metrics["documents_written"] == 40 and metrics["bulk_writes"] == len(writes)
+    assert metrics["stages"]["write"]["items"] == 20
+
+
+def test_pipeline_isolates_failures_and_reports_progress():
+    db = FakeDB()
+
+    async def fetch(key):
+        if key == "BAD_FETCH":
+            raise RuntimeError("provider down")
+        return key
+
+    def normalize(key, raw):
+        if key == "BAD_NORM":
+            raise ValueError("bad chain")
+        return [("stocks", UpdateOne({"k": key}, {"$set": {"k": key}}, upsert=True))], "ok"
+
+    done = {}
+    progress = []
+
+    async def report(pct, stage=None, done=None, total=None):
+        progress.append((pct, stage, done, total))
+
+    metrics = asyncio.run(run_ingest_pipeline(
+        db, ["A", "BAD_FETCH", "B", "BAD_NORM"], fetch, normalize,
+        lambda k, o, e: done.__setitem__(k, (o, e)), fetch_delay=0, progress=report,
+    ))
+
+    assert done["A"] == ("ok", None) and done["B"] == ("ok", None)
+    assert isinstance(done["BAD_FETCH"][1], RuntimeError)
+    assert isinstance(done["BAD_NORM"][1], ValueError)
+    assert metrics["stages"]["fetch"]["errors"] == 1 and metrics["stages"]["normalize"]["errors"] == 1
+    assert set(metrics["stages"]["fetch"]) == {"items", "errors", "busy_seconds", "items_per_second"}
+    assert all(pct < 100 for pct, *_ in progress[:-1])
+    assert progress[-1] == (100, "done", 4, 4)
+
+
+def test_pipeline_fetch_delay_is_shared_across_workers():
+    starts = []
+
+    async def fetch(key):
+        starts.append(time.monotonic())
+        await asyncio.sleep(0.05)
+        return key
+
+    def normalize(key, raw):
+        return [], raw
+
+    asyncio.run(run_ingest_pipeline(
+        FakeDB(), [f"S{i}" for i in range(6)], fetch, normalize, lambda k, o, e: None,
+        concurrency=4, fetch_delay=0.02,
+    ))
+
+    gaps = [b - a for a, b in zip(starts, starts[1:])]
+    assert len(starts) == 6 and min(gaps) >= 0.018
+
+
+def test_ingest_all_eod_skips_final_and_bulk_writes(monkeypatch):
+    from services.eod_ingestion_service import EODIngestionService
+    import services.ingest_pipeline as ingest_pipeline
+
+    monkeypatch.setattr(ingest_pipeline, "FETCH_DELAY_SECONDS", 0)
+    db = FakeDB()
+    service = EODIngestionService(db)
+    trade_date = "2026-10-16"
+    db["eod_market_close"].docs = [{"symbol": "MSFT", "trade_date": trade_date,
+                                   "is_final": True, "market_close_price": 410.0}]
+    db["eod_options_chain"].docs = [{"symbol": "MSFT", "trade_date": trade_date, "is_final": True}]
+
+    fetched = []
+
+    async def price(symbol, td):
+        fetched.append(symbol)
+        if symbol == "FAIL":
+            raise RuntimeError("no quote")
+        return {"close_price": 200.0}
+
+    async def chain(symbol, stock_price):
+        return {"calls": [{"strike": 210.0, "dte": 30, "option_type": "call", "implied_volatility": 0.3}],
+                "puts": [], "expiries": ["2026-11-20"], "total_contracts": 1, "valid_contracts": 1}
+
+    service._fetch_eod_price_yahoo = price
+    service._fetch_options_chain_yahoo = chain
+
+    result = asyncio.run(service.ingest_all_eod(["FAIL", "MSFT", "AAPL"], trade_date))
+
+    assert "MSFT" not in fetched
+    assert result["stock_skipped"] == ["MSFT"] and result["options_skipped"] == ["MSFT"]
+    assert result["stock_success"] == ["AAPL"]
+    assert [f["symbol"] for f in result["stock_failed"]] == ["FAIL"]
+    assert result["metrics"]["keys"] == 3
+
+    aapl = next(d for d in db["eod_market_close"].docs if d["symbol"] == "AAPL")
+    assert aapl["is_final"] and aapl["market_close_price"] == 200.0
+    options = [d for d in db["eod_options_chain"].docs if d["symbol"] == "AAPL"]
+    assert len(options) == 1 and options[0]["calls"][0]["delta"] > 0
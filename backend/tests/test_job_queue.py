@@ -0,0 +1,181 @@
+"""
+Unit Tests for the Background Job Queue
+=======================================
+
+Runs the queue against the in-memory FakeDB (tests/conftest.py):
+1. Enqueue -> run -> succeeded with result and progress
+2. Idempotency keys and single-flight dedupe
+3. Cancellation (queued and cooperative) and failure capture
+4. Running jobs whose worker died are reaped instead of blocking single-flight
+"""
+
+import asyncio
+from datetime import timedelta
+
+import pytest
+
+# Add backend to path
+import sys
+sys.path.insert(0, '/app/backend')
+
+from services import job_queue
+from tests.conftest import FakeDB
+
+
+async def _drain():
+    while job_queue._tasks:
+        await asyncio.gather(*list(job_queue._tasks.values()), return_exceptions=True)
+
+
+@pytest.fixture(autouse=True)
+def _reset_queue():
+    job_queue._handlers.clear()
+    job_queue._type_semaphores.clear()
+    job_queue._global_semaphore = None
+    job_queue._tasks.clear()
+    job_queue._maintenance_task = None
+    yield
+
+
+def test_job_runs_and_stores_result():
+    async def handler(job):
+        await job.progress(50, "Halfway", done=1, total=2)
+        return {"echo": job.params["x"]}
+
+    job_queue.register_handler("echo", handler)
+
+    async def scenario():
+        db = FakeDB()
+        job = await job_queue.enqueue(db, "echo", "u1", params={"x": 7})
+        assert job["status"] == "queued" and not job["deduplicated"]
+        assert "params" not in job
+        await _drain()
+        return await job_queue.get_job(db, job["id"], "u1"), db
+
+    stored, db = asyncio.run(scenario())
+    assert stored["status"] == "succeeded"
+    assert stored["result"] == {"echo": 7}
+    assert stored["progress"]["pct"] == 100
+    # Inputs are dropped once the job finishes
+    assert "params" not in db[job_queue.JOBS_COLLECTION].docs[0]
+
+
+def test_idempotency_key_and_single_flight():
+    started = []
+
+    async def handler(job):
+        started.append(job.job_id)
+        return {}
+
+    job_queue.register_handler("once", handler)
+
+    async def scenario():
+        db = FakeDB()
+        first = await job_queue.enqueue(db, "once", "u1", idempotency_key="k1")
+        # Still queued -> single-flight returns the same job even without a key
+        second = await job_queue.enqueue(db, "once", "u1")
+        await _drain()
+        # Finished, but the same key still maps to the original job
+        third = await job_queue.enqueue(db, "once", "u1", idempotency_key="k1")
+        # Another user is independent
+        other = await job_queue.enqueue(db, "once", "u2", idempotency_key="k1")
+        await _drain()
+        return first, second, third, other
+
+    first, second, third, other = asyncio.run(scenario())
+    assert second["id"] == first["id"] and second["deduplicated"]
+    assert third["id"] == first["id"] and third["deduplicated"]
+    assert other["id"] != first["id"]
+    assert len(started) == 2
+
+
+def test_cancel_queued_job_never_runs():
+    ran = []
+
+    async def handler(job):
+        ran.append(job.job_id)
+        return {}
+
+    job_queue.register_handler("slow", handler)
+
+    async def scenario():
+        db = FakeDB()
+        job = await job_queue.enqueue(db, "slow", "u1")
+        cancelled = await job_queue.cancel_job(db, job["id"], "u1")
+        await _drain()
+        return cancelled
+
+    cancelled = asyncio.run(scenario())
+    assert cancelled["status"] == "cancelled"
+    assert ran == []
+
+
+def test_cooperative_cancel_and_failure():
+    gate = {}
+
+    async def cancellable(job):
+        gate["running"].set()
+        await gate["release"].wait()
+        await job.check_cancelled()
+        return {"finished": True}
+
+    async def broken(job):
+        raise ValueError("boom")
+
+    job_queue.register_handler("cancellable", cancellable)
+    job_queue.register_handler("broken", broken)
+
+    async def scenario():
+        gate["running"], gate["release"] = asyncio.Event(), asyncio.Event()
+        db = FakeDB()
+        job = await job_queue.enqueue(db, "cancellable", "u1")
+        failing = await job_queue.enqueue(db, "broken", "u1")
+        await gate["running"].wait()
+        await job_queue.cancel_job(db, job["id"], "u1")
+        gate["release"].set()
+        await _drain()
+        return await job_queue.get_job(db, job["id"]), await job_queue.get_job(db, failing["id"])
+
+    cancelled, failed = asyncio.run(scenario())
+    assert cancelled["status"] == "cancelled"
+    assert cancelled["result"] is None
+    assert failed["status"] == "failed"
+    assert failed["error"] == "boom"
+
+
+def test_unknown_job_type_rejected():
+    with pytest.raises(ValueError):
+        asyncio.run(job_queue.enqueue(FakeDB(), "nope", "u1"))
+
+
+def test_dead_worker_job_is_reaped():
+    async def handler(job):
+        return {"worker": job.job_id}
+
+    job_queue.register_handler("sweep", handler)
+    stale = (job_queue._now() - timedelta(seconds=job_queue.JOB_STALE_SECONDS + 1)).isoformat()
+
+    async def scenario():
+        db = FakeDB()
+        zombie = dict(job_queue._new_job_doc("sweep", "u1", {}, None), status="running",
+                      worker_id="old-host:1:dead", heartbeat_at=stale)
+        await db[job_queue.JOBS_COLLECTION].insert_one(zombie)
+        job = await job_queue.enqueue(db, "sweep", "u1")
+        await _drain()
+        # This process re-heartbeats only the jobs it is running
+        live = dict(job_queue._new_job_doc("sweep", "u2", {}, None), status="running", heartbeat_at=stale,
+                    worker_id=job_queue.WORKER_ID)
+        await db[job_queue.JOBS_COLLECTION].insert_one(live)
+        job_queue._tasks[live["id"]] = None
+        await job_queue._heartbeat_running_jobs(db)
+        job_queue._tasks.clear()
+        reaped = await job_queue.reap_stale_jobs(db)
+        return zombie, job, reaped, db
+
+    zombie, job, reaped, db = asyncio.run(scenario())
+    assert job["id"] != zombie["id"] and not job["deduplicated"]
+    docs = {d["id"]: d for d in db[job_queue.JOBS_COLLECTION].docs}
+    assert docs[zombie["id"]]["status"] == "failed"
+    assert docs[job["id"]]["status"] == "succeeded"
+    assert docs[job["id"]]["worker_id"] == job_queue.WORKER_ID
+    assert reaped == 0
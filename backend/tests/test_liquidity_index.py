@@ -0,0 +1,69 @@
+"""
+Unit Tests for the Liquidity Index
+==================================
+
+1. summarize_snapshot: OI totals by expiry bucket, median spread, price band
+2. rebuild_liquidity_index: ranks by score and drops symbols not in the run
+3. select_liquid_symbols: thresholds become one indexed query, most liquid first
+"""
+
+import asyncio
+
+# Add backend to path
+import sys
+sys.path.insert(0, '/app/backend')
+
+from services import liquidity_index
+from services.liquidity_index import rebuild_liquidity_index, select_liquid_symbols, summarize_snapshot
+from tests.conftest import FakeDB
+
+
+def _snapshot(symbol, run_id, price, avg_volume, short_calls, leaps_oi=0):
+    return {
+        "run_id": run_id, "symbol": symbol, "underlying_price": price, "avg_volume": avg_volume,
+        "option_chain": [
+            {"dte": 30, "calls": short_calls},
+            {"dte": 400, "calls": [{"bid": 20.0, "ask": 22.0, "openInterest": leaps_oi}]},
+        ],
+    }
+
+
+def test_summarize_snapshot():
+    row = summarize_snapshot(_snapshot("AAPL", "r1", 230.0, 5e7, [
+        {"bid": 1.00, "ask": 1.10, "openInterest": 1000},
+        {"bid": 2.00, "ask": 2.40, "openInterest": 3000},
+        {"bid": 0.00, "ask": 0.05, "openInterest": 500},
+    ], leaps_oi=700))
+    assert row["short_call_oi"] == 4500 and row["leaps_call_oi"] == 700 and row["call_oi_total"] == 5200
+    assert row["quoted_calls"] == 2
+    assert row["median_spread_pct"] == round((10 / 1.05 + 40 / 2.2) / 2, 2)
+    assert row["price_band"] == "200_500"
+
+
+def test_rebuild_ranks_and_prunes():
+    tight = [{"bid": 1.0, "ask": 1.02, "openInterest": 50_000}]
+    wide = [{"bid": 1.0, "ask": 1.5, "openInterest": 200}]
+    db = FakeDB(symbol_snapshot=[
+        _snapshot("AAA", "r2", 50.0, 2e7, tight),
+        _snapshot("BBB", "r2", 20.0, 3e5, wide),
+        _snapshot("CCC", "r1", 30.0, 1e7, tight),
+    ])
+    db[liquidity_index.LIQUIDITY_COLLECTION].docs.append({"symbol": "CCC", "run_id": "r1"})
+
+    result = asyncio.run(rebuild_liquidity_index(db, "r2"))
+    assert result == {"run_id": "r2", "symbols": 2, "removed": 1}
+    index = {d["symbol"]: d for d in db[liquidity_index.LIQUIDITY_COLLECTION].docs}
+    assert set(index) == {"AAA", "BBB"}
+    assert index["AAA"]["liquidity_rank"] == 1 and index["BBB"]["liquidity_rank"] == 2
+
+    selected = asyncio.run(select_liquid_symbols(db, min_avg_volume=1e6, min_short_call_oi=1000))
+    assert selected == ["AAA"]
+    assert asyncio.run(select_liquid_symbols(db)) == ["AAA", "BBB"]
+    assert asyncio.run(select_liquid_symbols(db, max_median_spread_pct=5, min_price=60)) == []
+
+
+def test_rebuild_with_empty_run_keeps_index():
+    db = FakeDB(symbol_snapshot=[])
+    db[liquidity_index.LIQUIDITY_COLLECTION].docs.append({"symbol": "AAA", "run_id": "r1"})
+    assert asyncio.run(rebuild_liquidity_index(db, "r9")) == {"run_id": "r9", "symbols": 0}
+    assert len(db[liquidity_index.LIQUIDITY_COLLECTION].docs) == 1
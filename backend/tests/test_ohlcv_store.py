@@ -0,0 +1,108 @@
+"""
+Unit Tests for the OHLCV Store
+==============================
+
+Runs sync_symbol against an in-memory collection with a stubbed Yahoo
+download:
+1. First use downloads full history; same session makes no Yahoo call
+2. Next session appends only the new bar (overlap download)
+3. Split / re-adjustment detected on the overlap triggers a rebuild
+4. Contiguous arrays / frame view and year bucketing
+"""
+
+import asyncio
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Add backend to path
+import sys
+sys.path.insert(0, '/app/backend')
+
+from services import ohlcv_store
+from services.ohlcv_store import OHLCVBars, overlap_matches, sync_symbol
+from tests.conftest import FakeDB
+
+
+def _make_bars(dates, closes):
+    closes = np.asarray(closes, dtype=float)
+    return OHLCVBars.from_columns(dates, closes, closes + 1, closes - 1, closes, np.full(len(dates), 1000.0))
+
+
+# Trading days Dec 2025 - Jan 2026 (weekdays only)
+ALL_DATES = [d.strftime("%Y-%m-%d") for d in pd.bdate_range("2025-12-01", "2026-01-30")]
+ALL_CLOSES = [100.0 + i for i in range(len(ALL_DATES))]
+
+
+@pytest.fixture
+def yahoo(monkeypatch):
+    """Stub Yahoo: serves ALL_DATES / closes; records each call."""
+    state = {"calls": [], "closes": list(ALL_CLOSES)}
+
+    def _download(symbol, period=None, start=None):
+        state["calls"].append(start or period)
+        bars = _make_bars(ALL_DATES, state["closes"])
+        return bars.after((pd.Timestamp(start) - pd.Timedelta(days=1)).strftime("%Y-%m-%d")) if start else bars
+
+    monkeypatch.setattr(ohlcv_store, "download_bars_sync", _download)
+    return state
+
+
+def test_initial_load_then_cached(yahoo):
+    db = FakeDB()
+
+    async def scenario():
+        first = await sync_symbol(db, "AAPL", lookback_bars=None, session="2026-01-20")
+        again = await sync_symbol(db, "AAPL", lookback_bars=None, session="2026-01-20")
+        return first, again
+
+    first, again = asyncio.run(scenario())
+    assert first.last_date == "2026-01-20"
+    assert again.dates == first.dates
+    np.testing.assert_array_equal(again.close, first.close)
+    assert yahoo["calls"] == [ohlcv_store.INITIAL_PERIOD]
+    # Bucketed by year
+    assert sorted(d["year"] for d in db[ohlcv_store.BARS_COLLECTION].docs) == [2025, 2026]
+
+
+def test_next_session_appends_one_bar(yahoo):
+    db = FakeDB()
+
+    async def scenario():
+        await sync_symbol(db, "AAPL", lookback_bars=None, session="2026-01-20")
+        return await sync_symbol(db, "AAPL", lookback_bars=None, session="2026-01-21")
+
+    bars = asyncio.run(scenario())
+    assert bars.last_date == "2026-01-21"
+    assert bars.dates == [d for d in ALL_DATES if d <= "2026-01-21"]
+    # Second call was an overlap download, not a full period
+    assert yahoo["calls"][1] not in (None, ohlcv_store.INITIAL_PERIOD)
+    meta = db[ohlcv_store.META_COLLECTION].docs[0]
+    assert meta["bars"] == len(bars) and meta["last_date"] == "2026-01-21"
+
+
+def test_readjusted_history_triggers_rebuild(yahoo):
+    db = FakeDB()
+
+    async def scenario():
+        await sync_symbol(db, "AAPL", lookback_bars=None, session="2026-01-20")
+        yahoo["closes"] = [c / 2 for c in ALL_CLOSES]  # 2:1 split re-adjusts history
+        return await sync_symbol(db, "AAPL", lookback_bars=None, session="2026-01-21")
+
+    bars = asyncio.run(scenario())
+    assert yahoo["calls"][-1] == ohlcv_store.INITIAL_PERIOD
+    assert bars.close[0] == pytest.approx(ALL_CLOSES[0] / 2)
+    stored = asyncio.run(ohlcv_store.load_bars(db, "AAPL", lookback_bars=None))
+    assert stored.close[0] == pytest.approx(ALL_CLOSES[0] / 2)
+
+
+def test_bars_helpers():
+    bars = _make_bars(ALL_DATES[:5], [1, 2, 3, 4, 5])
+    assert bars.close.flags["C_CONTIGUOUS"]
+    assert bars.tail(2).dates == ALL_DATES[3:5]
+    assert bars.after(ALL_DATES[2]).dates == ALL_DATES[3:5]
+    frame = bars.to_frame()
+    assert list(frame.columns) == ["Open", "High", "Low", "Close", "Volume"]
+    assert overlap_matches(bars, bars.tail(3))
+    assert not overlap_matches(bars, _make_bars(ALL_DATES[3:5], [8, 10]))
@@ -0,0 +1,135 @@
+"""
+Unit Tests for the Profile Sweep Engine
+=======================================
+
+1. Outcomes: OTM expiry is a hit, assignment gives back S_T - K, open expiries are skipped
+2. Vectorized replay matches a per-row loop (filters, best score per run/symbol)
+3. Process-pool grid evaluation matches in-process evaluation
+4. Grid building: inverted ranges dropped, unknown parameters rejected
+5. run_profile_sweep end to end over fake scan_runs / scan_results_cc / symbol_snapshot
+"""
+
+import asyncio
+import random
+from datetime import datetime, timezone
+
+import pytest
+
+# Add backend to path
+import sys
+sys.path.insert(0, '/app/backend')
+
+from services.profile_sweep import (
+    build_candidates, build_grid, evaluate_grid, evaluate_point, run_profile_sweep
+)
+from tests.conftest import FakeDB
+
+
+def _row(run, symbol, strike, expiry, premium, score=50, delta=0.3, dte=30, price=100.0, ivp=40, cap=1e10):
+    return {"run_id": run, "symbol": symbol, "stock_price": price, "strike": strike, "expiry": expiry,
+            "premium_bid": premium, "score": score, "delta": delta, "dte": dte,
+            "iv_percentile": ivp, "market_cap": cap}
+
+
+def _synthetic(n=3000, seed=1):
+    rng = random.Random(seed)
+    days = [f"2025-{m:02d}-{d:02d}" for m in range(1, 13) for d in (1, 15)]
+    symbols = [f"S{i}" for i in range(30)]
+    closes = {s: (days, [100 + rng.uniform(-15, 15) for _ in days]) for s in symbols}
+    rows = [
+        _row(f"r{rng.randrange(12)}", rng.choice(symbols), rng.choice([95, 100, 105, 110]),
+             rng.choice(days[:-1] + ["2026-06-19"]), round(rng.uniform(0.2, 4), 2),
+             score=rng.randrange(40, 60), delta=rng.choice([0.15, 0.25, 0.3, 0.4, 0.5]),
+             dte=rng.choice([7, 14, 30, 45]), ivp=rng.choice([None, 10, 30, 60, 90]),
+             cap=rng.choice([5e8, 2e9, 2e10]))
+        for _ in range(n)
+    ]
+    return rows, closes
+
+
+def _loop_replay(rows, closes, point):
+    best = {}
+    for row in rows:
+        days, prices = closes[row["symbol"]]
+        if days[-1] < row["expiry"]:
+            continue
+        ivp = row["iv_percentile"]
+        if not (point["delta_min"] <= row["delta"] <= point["delta_max"]
+                and point["dte_min"] <= row["dte"] <= point["dte_max"]
+                and row["premium_bid"] / row["stock_price"] >= point["premium_yield_min"]
+                and row["market_cap"] >= point["market_cap_min"]
+                and (ivp is None or point["iv_percentile_min"] <= ivp <= point["iv_percentile_max"])):
+            continue
+        key = (row["run_id"], row["symbol"])
+        if key not in best or row["score"] > best[key]["score"]:
+            best[key] = row
+    hits, realized = 0, []
+    for row in best.values():
+        days, prices = closes[row["symbol"]]
+        settle = [p for d, p in zip(days, prices) if d <= row["expiry"]][-1]
+        hits += settle <= row["strike"]
+        realized.append((row["premium_bid"] - max(0, settle - row["strike"])) / row["stock_price"] * 100)
+    return len(best), hits, sum(realized)
+
+
+POINT = {"delta_min": 0.2, "delta_max": 0.4, "dte_min": 7, "dte_max": 35, "premium_yield_min": 0.01,
+         "iv_percentile_min": 20, "iv_percentile_max": 70, "market_cap_min": 1e9}
+
+
+def test_outcomes():
+    closes = {"AAA": (["2025-01-10", "2025-01-17", "2025-01-24"], [100.0, 104.0, 90.0])}
+    c = build_candidates([
+        _row("r1", "AAA", 105, "2025-01-17", 2.0),        # settles 104 -> OTM
+        _row("r1", "AAA", 100, "2025-01-20", 3.0, score=40),  # settles 104 -> assigned
+        _row("r1", "AAA", 100, "2025-02-21", 3.0),        # after last snapshot -> open
+    ], closes)
+    assert len(c) == 2 and c.open_candidates == 1 and c.runs == 1
+    assert list(c.hit) == [True, False]
+    assert list(c.realized_pct) == pytest.approx([2.0, -1.0])
+
+
+def test_vectorized_replay_matches_loop():
+    rows, closes = _synthetic()
+    c = build_candidates(rows, closes)
+    for point in (POINT, {**POINT, "delta_max": 0.55, "iv_percentile_min": None, "iv_percentile_max": None,
+                          "premium_yield_min": 0, "market_cap_min": 0, "dte_min": 0, "dte_max": 60}):
+        trades, hits, total = _loop_replay(rows, closes, {**point, "iv_percentile_min": point["iv_percentile_min"] or 0,
+                                                          "iv_percentile_max": point["iv_percentile_max"] or 100})
+        result = evaluate_point(c, point)
+        assert result["trades"] == trades
+        assert result["hit_rate"] == round(hits / trades * 100, 2)
+        assert result["total_realized_pct"] == pytest.approx(total, abs=1e-3)
+
+
+def test_process_pool_matches_in_process():
+    rows, closes = _synthetic(n=1500, seed=2)
+    c = build_candidates(rows, closes)
+    grid = build_grid({"delta_max": [0.3, 0.4, 0.5], "dte_max": [14, 30, 45], "premium_yield_min": [0, 0.01, 0.02]}, POINT)
+    assert evaluate_grid(c, grid, max_workers=2, chunk_size=5) == evaluate_grid(c, grid, max_workers=1)
+
+
+def test_build_grid():
+    grid = build_grid({"delta_min": [0.2, 0.5], "delta_max": [0.3, 0.6]}, POINT)
+    assert [(p["delta_min"], p["delta_max"]) for p in grid] == [(0.2, 0.3), (0.2, 0.6), (0.5, 0.6)]
+    assert all(p["dte_max"] == 35 for p in grid)
+    with pytest.raises(ValueError):
+        build_grid({"rsi_min": [30]})
+
+
+def test_run_profile_sweep():
+    runs = [{"run_id": f"r{d}", "status": "COMPLETED", "as_of": datetime(2025, 1, d, 21, tzinfo=timezone.utc)}
+            for d in (3, 10, 17)]
+    results = [_row("r3", "AAA", 105, "2025-01-17", 2.0, delta=0.25),
+               _row("r3", "AAA", 102, "2025-01-17", 3.0, delta=0.45, score=70),
+               _row("r10", "AAA", 100, "2025-01-17", 1.5, delta=0.3)]
+    snapshots = [{"run_id": r["run_id"], "symbol": "AAA", "underlying_price": p}
+                 for r, p in zip(runs, (100.0, 101.0, 104.0))]
+    db = FakeDB(scan_runs=runs, scan_results_cc=results, symbol_snapshot=snapshots)
+
+    out = asyncio.run(run_profile_sweep(db, "2025-01-01", "2025-01-10", {"delta_max": [0.35, 0.5]},
+                                        base_profile="balanced", max_workers=1))
+    assert out["grid_points"] == 2 and out["candidates"] == 3 and out["runs"] == 2
+    best = out["top"][0]
+    # delta_max 0.35 keeps the 105 strike (r3) and the 100 strike (r10): +2.0 and 1.5 - 4.0
+    assert best["params"]["delta_max"] == 0.35 and best["trades"] == 2 and best["hit_rate"] == 50.0
+    assert set(out["baselines"]) == {"conservative", "balanced", "aggressive"}
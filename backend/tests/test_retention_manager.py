@@ -0,0 +1,168 @@
+"""
+Unit Tests for the Retention Manager
+====================================
+
+1. hot_run_ids keeps the newest N COMPLETED runs and anything newer
+2. apply_retention compacts warm runs (top-N results, columnar chains),
+   deletes expired and orphaned runs in chunks, reports reclaimed bytes
+3. dry_run writes nothing; a second pass only touches runs that changed tier
+4. symbol_snapshot never expires inside the backtest horizon; scan_results_cc
+   rows are trimmed, not dropped, so a profile sweep sees the same candidates
+"""
+
+import asyncio
+import copy
+from datetime import datetime, timedelta, timezone
+
+import bson
+
+# Add backend to path
+import sys
+sys.path.insert(0, '/app/backend')
+
+import services.retention_manager as retention
+from services.chain_codec import PACKED_FIELD, snapshot_chains
+from services.retention_manager import RetentionPolicy, apply_retention, hot_run_ids
+from tests.conftest import FakeCollection, FakeCursor, FakeDB, matches
+
+NOW = datetime(2026, 10, 17, 22, tzinfo=timezone.utc)
+
+
+class _Collection(FakeCollection):
+    """FakeCollection whose aggregate() answers the $bsonSize sum for a $match."""
+
+    def aggregate(self, pipeline):
+        query = pipeline[0]["$match"]
+        size = sum(len(bson.encode(d)) for d in self.docs if matches(d, query))
+        return FakeCursor([{"bytes": size}])
+
+
+class _DB(FakeDB):
+    collection_class = _Collection
+
+
+def _run(run_id, days_ago, status="COMPLETED"):
+    return {"run_id": run_id, "status": status, "as_of": NOW - timedelta(days=days_ago)}
+
+
+def _chain():
+    return [{"expiry": "2026-11-20", "dte": 33,
+             "calls": [{"strike": 100.0 + i, "bid": 1.5, "impliedVolatility": 0.3, "delta": 0.4,
+                        "openInterest": 100, "volume": 10, "contractSymbol": f"X{i}", "currency": "USD"}
+                       for i in range(40)],
+             "puts": []}]
+
+
+def _db():
+    db = _DB()
+    db["scan_runs"].docs = [_run("r0", 0), _run("r1", 1, "FAILED"), _run("r2", 2),
+                            _run("r3", 20), _run("r4", 60)]
+    db["symbol_snapshot"].docs = [
+        {"_id": f"{r}-{s}", "run_id": r, "symbol": s, "option_chain": _chain()}
+        for r in ("r0", "r2", "r3", "r4") for s in ("AAA", "BBB")
+    ] + [{"_id": "orphan", "run_id": "crashed", "as_of": NOW - timedelta(days=90), "option_chain": _chain()}]
+    db["scan_results_cc"].docs = [
+        {"_id": f"{r}-{i}", "run_id": r, "score": i} for r in ("r2", "r3", "r4") for i in range(5)
+    ]
+    return db
+
+
+POLICIES = (
+    RetentionPolicy("symbol_snapshot", "encode_chains", 45),
+    RetentionPolicy("scan_results_cc", "top_n", 45),
+)
+
+
+def test_hot_runs_keep_newest_completed():
+    runs = [_run("a", 0, "FAILED"), _run("b", 1), _run("c", 2, "FAILED"), _run("d", 3), _run("e", 4),
+            {"run_id": "undated", "status": "COMPLETED"}]
+    assert hot_run_ids(runs, hot_runs=2) == {"a", "b", "c", "d", "undated"}
+
+
+def test_apply_retention_tiers(monkeypatch):
+    monkeypatch.setattr(retention, "HOT_RUNS", 2)
+    monkeypatch.setattr(retention, "RESULTS_TOP_N", 2)
+    monkeypatch.setattr(retention, "DELETE_CHUNK", 2)
+    db = _db()
+    progress = []
+
+    async def report(pct, stage=None):
+        progress.append((pct, stage))
+
+    report_ = asyncio.run(apply_retention(db, POLICIES, now=NOW, progress=report))
+
+    snaps = {d["_id"]: d for d in db["symbol_snapshot"].docs}
+    # r0/r1/r2 hot, r3 warm -> columnar, r4 expired, orphan expired by its own as_of
+    assert "option_chain" in snaps["r0-AAA"] and "option_chain" in snaps["r2-AAA"]
+    assert PACKED_FIELD in snaps["r3-AAA"] and "option_chain" not in snaps["r3-AAA"]
+    chain, = snapshot_chains(snaps["r3-AAA"], ("strike", "delta"))
+    assert [c["strike"] for c in chain["calls"]] == [100.0 + i for i in range(40)]
+    assert not any(k.startswith("r4") or k == "orphan" for k in snaps)
+
+    results = db["scan_results_cc"].docs
+    assert sorted(d["score"] for d in results if d["run_id"] == "r2") == [0, 1, 2, 3, 4]
+    assert sorted(d["score"] for d in results if d["run_id"] == "r3") == [3, 4]
+    assert not any(d["run_id"] == "r4" for d in results)
+    deletes = [n for name, method, n in db.log if (name, method) == ("scan_results_cc", "delete_many")]
+    assert len(deletes) == 5  # 3 + 5 rows in chunks of 2
+
+    stats = report_["collections"]["symbol_snapshot"]
+    assert (stats["compacted_runs"], stats["expired_runs"], stats["orphan_runs"]) == (1, 1, 1)
+    assert stats["documents_rewritten"] == 2 and stats["documents_deleted"] == 3
+    assert report_["bytes_reclaimed"] > 0 and progress[-1] == (100, "done")
+    assert {r["run_id"]: r.get("retention") for r in db["scan_runs"].docs}["r3"] == {
+        "symbol_snapshot": "compacted", "scan_results_cc": "compacted"}
+
+    # Second pass: nothing changed tier
+    again = asyncio.run(apply_retention(db, POLICIES, now=NOW))
+    assert all(s["documents_deleted"] == s["documents_rewritten"] == 0 for s in again["collections"].values())
+
+
+def test_dry_run_writes_nothing(monkeypatch):
+    monkeypatch.setattr(retention, "HOT_RUNS", 2)
+    db = _db()
+    before = copy.deepcopy({name: coll.docs for name, coll in db.items()})
+
+    report = asyncio.run(apply_retention(db, POLICIES, dry_run=True, now=NOW))
+
+    assert {name: coll.docs for name, coll in db.items()} == before
+    assert report["collections"]["symbol_snapshot"]["documents_deleted"] == 3
+    assert report["bytes_reclaimed"] > 0
+
+
+def test_snapshot_policy_covers_backtest_horizon():
+    snapshot = next(p for p in retention.POLICIES if p.collection == "symbol_snapshot")
+    assert snapshot.expire_days >= retention.BACKTEST_HORIZON_DAYS
+    assert retention.policy_summary()["backtest_horizon_days"] == retention.BACKTEST_HORIZON_DAYS
+
+
+def test_sweep_candidates_survive_retention(monkeypatch):
+    from services.profile_sweep import load_candidates
+
+    monkeypatch.setattr(retention, "HOT_RUNS", 0)
+    days = (40, 30, 20, 10)
+    db = _DB()
+    db["scan_runs"].docs = [_run(f"d{d}", d) for d in days]
+    db["symbol_snapshot"].docs = [
+        {"_id": f"d{d}-{s}", "run_id": f"d{d}", "symbol": s, "underlying_price": 100.0 + d / 10 + i}
+        for d in days for i, s in enumerate(("AAA", "BBB"))
+    ]
+    expiry = (NOW - timedelta(days=15)).strftime("%Y-%m-%d")
+    db["scan_results_cc"].docs = [
+        {"_id": f"d{d}-{s}-{k}", "run_id": f"d{d}", "symbol": s, "stock_price": 100.0, "strike": 100.0 + k,
+         "expiry": expiry, "dte": 20, "delta": 0.3, "premium_bid": 1.0 + k / 10, "iv_percentile": 50,
+         "market_cap": 1e10, "score": 50 + k, "sector": "Tech", "analyst_rating": "Buy", "created_at": NOW}
+        for d in (40, 30) for s in ("AAA", "BBB") for k in range(150)
+    ]
+    start, end = (NOW - timedelta(days=45)).strftime("%Y-%m-%d"), NOW.strftime("%Y-%m-%d")
+    before = asyncio.run(load_candidates(db, start, end))
+
+    policies = tuple(p for p in retention.POLICIES if p.collection in ("symbol_snapshot", "scan_results_cc"))
+    report = asyncio.run(apply_retention(db, policies, now=NOW))
+
+    assert report["collections"]["scan_results_cc"]["documents_deleted"] == 0
+    assert report["collections"]["scan_results_cc"]["documents_rewritten"] == 600
+    assert all("sector" not in d for d in db["scan_results_cc"].docs)
+    after = asyncio.run(load_candidates(db, start, end))
+    assert len(after) == len(before) == 600
+    assert (after.realized_pct == before.realized_pct).all() and (after.score == before.score).all()
@@ -0,0 +1,174 @@
+"""
+Unit Tests for the Roll Engine
+==============================
+
+Tests:
+1. ChainTable parsing (puts dropped, DTE recompute, key fallbacks)
+2. score_roll_candidates gates and metrics
+3. Vectorized decision_engine.rank_call_chain parity with
+   rank_candidates(build_valid_call_candidates(...))
+4. ai_trade_manager._find_best_short_call on snapshot-shaped rows (BS delta
+   fallback, stored delta precedence, bid-only premium)
+"""
+
+import random
+from datetime import date, timedelta
+
+import pytest
+
+# Add backend to path
+import sys
+sys.path.insert(0, '/app/backend')
+
+from services.roll_engine import (
+    ChainTable,
+    RollPosition,
+    score_roll_candidates,
+    bs_call_delta_and_itm_prob,
+)
+from ai_wallet.decision_engine import (
+    evaluate_position_state,
+    build_valid_call_candidates,
+    rank_candidates,
+    rank_call_chain,
+)
+from services.ai_trade_manager import _find_best_short_call
+
+import numpy as np
+
+
+def _random_chain(cp: float, n: int, rng: random.Random) -> list:
+    calls = []
+    for _ in range(n):
+        bid = round(rng.uniform(0, cp * 0.06), 2)
+        calls.append({
+            "strike": round(cp * rng.uniform(0.8, 1.4), 1),
+            "expiry": "2026-11-%02d" % rng.randint(1, 28),
+            "dte": rng.randint(1, 60),
+            "bid": bid,
+            "ask": round(bid * rng.uniform(1.0, 1.6), 2) if rng.random() < 0.9 else 0,
+            "open_interest": rng.choice([0, 10, 60, 500, 5000]),
+            "volume": rng.randint(0, 500),
+            "implied_volatility": rng.uniform(0.1, 0.9),
+        })
+    return calls
+
+
+class TestChainTable:
+    def test_drops_puts_and_reads_aliases(self):
+        table = ChainTable.from_calls([
+            {"strike": 100, "expiry": "2026-11-20", "dte": 30, "bid": 1.0, "oi": 10, "iv": 0.3},
+            {"strike": 100, "expiry": "2026-11-20", "dte": 30, "bid": 1.0, "type": "put"},
+            {"strike": 105, "expiration_date": "2026-11-20T00:00:00", "option_type": "call", "bid": 0.5},
+        ])
+        assert len(table) == 2
+        assert table.oi[0] == 10
+        assert table.iv[0] == pytest.approx(0.3)
+        assert table.expiry[1] == "2026-11-20"
+
+    def test_dte_recomputed_from_today(self):
+        today = date(2026, 11, 1)
+        table = ChainTable.from_calls(
+            [{"strike": 100, "expiry": "2026-11-20", "dte": 99, "bid": 1.0},
+             {"strike": 100, "expiry": "bad", "bid": 1.0}],
+            today=today,
+        )
+        assert len(table) == 1
+        assert table.dte[0] == 19
+
+
+class TestScoreRollCandidates:
+    def _table(self):
+        return ChainTable.from_calls([
+            {"strike": 95, "expiry": "2026-11-20", "dte": 30, "bid": 7.0, "ask": 7.2},
+            {"strike": 105, "expiry": "2026-11-20", "dte": 30, "bid": 2.0, "ask": 2.1, "delta": 0.30},
+            {"strike": 110, "expiry": "2026-12-18", "dte": 58, "bid": 1.5, "ask": 1.6, "delta": 0.22},
+            {"strike": 120, "expiry": "2026-12-18", "dte": 58, "bid": 0.0, "ask": 0.1},
+        ])
+
+    def test_metrics(self):
+        position = RollPosition(current_price=100, short_strike=100, close_cost=0.5, break_even=96, contracts=2)
+        scored = score_roll_candidates(self._table(), position, min_dte=7, max_dte=60)
+        rows = {r["strike"]: r for r in scored.top(n=None)}
+        # ITM and zero-bid rows are gated out
+        assert set(rows) == {105.0, 110.0}
+        r = rows[105.0]
+        assert r["net_credit"] == pytest.approx(1.5)
+        assert r["total_credit"] == pytest.approx(300.0)
+        assert r["new_breakeven"] == pytest.approx(94.5)
+        assert r["delta"] == pytest.approx(0.30)
+        assert r["annualized_yield_pct"] == pytest.approx(2.0 / 100 * 365 / 30 * 100, rel=1e-3)
+        assert 0 < r["assignment_risk"] < 0.5
+
+    def test_no_debit_and_delta_band(self):
+        position = RollPosition(current_price=100, short_strike=100, close_cost=1.8, break_even=96)
+        scored = score_roll_candidates(self._table(), position, allow_debit=False, max_delta=0.25)
+        assert [r["strike"] for r in scored.top(n=None)] == []
+        scored = score_roll_candidates(self._table(), position, max_delta=0.25)
+        assert [r["strike"] for r in scored.top(n=None)] == [110.0]
+
+    def test_pmcc_requires_strike_above_breakeven(self):
+        position = RollPosition(current_price=100, short_strike=100, close_cost=0.5,
+                                break_even=108, strategy="pmcc", leaps_strike=80)
+        scored = score_roll_candidates(self._table(), position)
+        assert [r["strike"] for r in scored.top(n=None)] == [110.0]
+
+    def test_bs_delta_matches_scalar_service(self):
+        from services.greeks_service import calculate_greeks
+        strikes = np.array([90.0, 100.0, 115.0])
+        dte = np.array([10, 30, 90])
+        iv = np.array([0.25, 0.0, 0.6])
+        delta, _ = bs_call_delta_and_itm_prob(100.0, strikes, dte, iv, r=0.045)
+        for i in range(3):
+            ref = calculate_greeks(100.0, strikes[i], dte[i] / 365, iv[i], r=0.045)
+            assert delta[i] == pytest.approx(ref.delta, abs=1e-4)
+
+
+class TestDecisionEngineParity:
+    @pytest.mark.parametrize("seed", range(20))
+    def test_rank_call_chain_matches_scalar_path(self, seed):
+        rng = random.Random(seed)
+        for _ in range(10):
+            cp = rng.uniform(20, 300)
+            calls = _random_chain(cp, 80, rng)
+            state = evaluate_position_state(
+                {"entry_price": cp * rng.uniform(0.8, 2.0), "shares": 100, "dte": 0}, cp
+            )
+            expected = rank_candidates(build_valid_call_candidates(calls, state), state)
+            actual = rank_call_chain(calls, state)
+            assert [(c.strike, c.expiry, c.dte, c.score) for c in actual] == \
+                   [(c.strike, c.expiry, c.dte, c.score) for c in expected]
+
+    def test_empty_chain(self):
+        state = evaluate_position_state({"entry_price": 100, "shares": 100}, 100)
+        assert rank_call_chain([], state) == []
+
+
+class TestFindBestShortCall:
+    def test_snapshot_rows_without_type_or_delta(self):
+        expiry = (date.today() + timedelta(days=30)).strftime("%Y-%m-%d")
+        chain = [
+            {"strike": 105, "expiry": expiry, "bid": 2.5, "ask": 2.6, "implied_volatility": 0.35},
+            {"strike": 130, "expiry": expiry, "bid": 0.2, "ask": 0.3, "implied_volatility": 0.35},
+        ]
+        best = _find_best_short_call(chain, current_price=100, contracts=1, min_weekly_pct=0.3)
+        assert best is not None
+        assert best["strike"] == 105.0
+        assert best["dte"] == 30
+        assert best["total_credit"] == pytest.approx(250.0)
+
+    def test_stored_delta_takes_precedence(self):
+        expiry = (date.today() + timedelta(days=30)).strftime("%Y-%m-%d")
+        row = {"strike": 105, "expiry": expiry, "bid": 2.5, "ask": 2.6, "implied_volatility": 0.35}
+        assert _find_best_short_call([dict(row, delta=0.05)], 100, 1, min_weekly_pct=0.3) is None
+        assert _find_best_short_call([dict(row, delta=0.30)], 100, 1, min_weekly_pct=0.3)["delta"] == 0.30
+
+    def test_premium_is_bid_only(self):
+        expiry = (date.today() + timedelta(days=30)).strftime("%Y-%m-%d")
+        no_bid = {"strike": 105, "expiry": expiry, "ask": 2.6, "last": 2.55, "delta": 0.3}
+        assert _find_best_short_call([no_bid], 100, 1, min_weekly_pct=0.3) is None
+        best = _find_best_short_call([dict(no_bid, bid=2.4)], 100, 1, min_weekly_pct=0.3)
+        assert best["premium"] == 2.4
+
+    def test_none_when_nothing_qualifies(self):
+        assert _find_best_short_call([], 100, 1, min_weekly_pct=1.0) is None
@@ -0,0 +1,129 @@
+"""
+Unit Tests for the Run Registry
+===============================
+
+1. latest_run caches the latest COMPLETED run; concurrent misses share one lookup
+2. TTL expiry and publish() (pipeline-completion hook) refresh the pointer
+3. watch() invalidates on change-stream events and falls back to the TTL
+   when change streams are unavailable
+"""
+
+import asyncio
+
+# Add backend to path
+import sys
+sys.path.insert(0, '/app/backend')
+
+from pymongo.errors import OperationFailure
+
+from services.run_registry import RunRegistry
+from tests.conftest import FakeCollection, FakeDB
+
+
+class _Runs(FakeCollection):
+    """scan_runs with a query counter, a yield per lookup and a change stream."""
+
+    def __init__(self, runs, changes=None):
+        super().__init__(runs, name="scan_runs")
+        self.changes = changes
+        self.queries = 0
+
+    async def find_one(self, query, projection=None, sort=None):
+        self.queries += 1
+        await asyncio.sleep(0)
+        return await super().find_one(query, projection, sort)
+
+    def watch(self):
+        return _Stream(self.changes)
+
+
+class _Stream:
+    def __init__(self, changes):
+        self.changes = changes
+
+    async def __aenter__(self):
+        if self.changes is None:
+            raise OperationFailure("The $changeStream stage is only supported on replica sets", 40573)
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        change = await self.changes.get()
+        if change is None:
+            raise StopAsyncIteration
+        return change
+
+
+class _DB(FakeDB):
+    name = "cce"
+
+    def __init__(self, runs, changes=None):
+        super().__init__()
+        self["scan_runs"] = _Runs(runs, changes)
+
+
+def _run(run_id, completed_at, status="COMPLETED"):
+    return {"run_id": run_id, "status": status, "completed_at": completed_at}
+
+
+def test_latest_run_is_cached_and_single_flight():
+    db = _DB([_run("r1", "2026-10-15"), _run("r2", "2026-10-16"), _run("r3", "2026-10-17", "FAILED")])
+    registry = RunRegistry(ttl_seconds=300)
+
+    async def main():
+        burst = await asyncio.gather(*(registry.latest_run_id(db) for _ in range(20)))
+        run = await registry.latest_run(db)
+        run["run_id"] = "mutated"  # callers get copies
+        return burst, await registry.latest_run_id(db)
+
+    burst, again = asyncio.run(main())
+    assert set(burst) == {"r2"} and again == "r2"
+    assert db.scan_runs.queries == 1
+
+
+def test_ttl_and_publish_refresh():
+    db = _DB([_run("r1", "2026-10-15")])
+    registry = RunRegistry(ttl_seconds=0)
+    assert asyncio.run(registry.latest_run_id(db)) == "r1"
+    db.scan_runs.docs.append(_run("r2", "2026-10-16", "completed"))
+    assert asyncio.run(registry.latest_run_id(db)) == "r2"  # expired -> re-read
+
+    registry.ttl_seconds = 300
+    registry.publish({"_id": "x", **_run("r3", "2026-10-17")}, "cce")
+    registry.publish(_run("r4", "2026-10-18", "FAILED"), "cce")  # not a completed run
+    queries = db.scan_runs.queries
+    assert asyncio.run(registry.latest_run(db)) == _run("r3", "2026-10-17")
+    assert db.scan_runs.queries == queries
+
+
+def test_watch_invalidates_and_falls_back():
+    registry = RunRegistry(ttl_seconds=300)
+
+    async def main():
+        changes = asyncio.Queue()
+        db = _DB([_run("r1", "2026-10-15")], changes)
+        watcher = asyncio.create_task(registry.watch(db))
+        await asyncio.sleep(0)
+        assert registry.watching
+        first = await registry.latest_run_id(db)
+        db.scan_runs.docs.append(_run("r2", "2026-10-16"))
+        cached = await registry.latest_run_id(db)
+        await changes.put({"operationType": "insert"})
+        await asyncio.sleep(0)
+        refreshed = await registry.latest_run_id(db)
+        await changes.put(None)
+        await watcher
+        return first, cached, refreshed
+
+    assert asyncio.run(main()) == ("r1", "r1", "r2")
+    assert not registry.watching
+
+    # Standalone server: no change streams, registry keeps working on its TTL
+    standalone = RunRegistry(ttl_seconds=300)
+    asyncio.run(standalone.watch(_DB([])))
+    assert not standalone.watching
@@ -0,0 +1,105 @@
+"""
+Unit Tests for Process-Pool Scan Computation
+============================================
+
+1. map_chunks yields every chunk, in order, with a bounded number in flight
+2. evaluate_scan_symbol gives the same opportunities for legacy, compacted and
+   packed (columnar) chain inputs
+3. compute_scan_results: a 2-process pool and the single-worker path write the
+   same CC/PMCC rows, with enrichment merged in and IV history stored once per symbol
+"""
+
+import asyncio
+import copy
+
+# Add backend to path
+import sys
+sys.path.insert(0, '/app/backend')
+
+import services.eod_pipeline as eod_pipeline
+from scripts.bench_scan_compute import AS_OF, synthetic_snapshots
+from services.eod_pipeline import SCAN_LEGACY_CALL_FIELDS, compute_scan_results, evaluate_scan_symbol
+from services.scan_compute import compact_snapshot, map_chunks
+from tests.conftest import FakeDB
+
+
+def _double(chunk):
+    return [x * 2 for x in chunk]
+
+
+async def _aiter(items, pulled=None):
+    for item in items:
+        if pulled is not None:
+            pulled.append(item)
+        yield item
+
+
+def test_map_chunks_order_and_bound():
+    pulled = []
+
+    async def main():
+        out = []
+        async for chunk, results in map_chunks(_aiter(range(23), pulled), _double, chunk_size=5, max_in_flight=2):
+            # Reads run at most max_in_flight chunks ahead of what has been consumed
+            assert len(pulled) - sum(len(c) for c, _ in out) <= 2 * 5 + 1
+            out.append((chunk, results))
+        return out
+
+    out = asyncio.run(main())
+    assert [c for c, _ in out] == [list(range(i, min(i + 5, 23))) for i in range(0, 23, 5)]
+    assert [x for _, r in out for x in r] == [x * 2 for x in range(23)]
+
+
+def _strip(result):
+    result = copy.deepcopy(result)
+    for opp in result["cc"] + result["pmcc"]:
+        opp.pop("created_at")
+    return result
+
+
+def test_evaluate_matches_across_chain_formats():
+    legacy = synthetic_snapshots(6, seed=3)
+    packed = synthetic_snapshots(6, seed=3, packed=True)
+    for doc, packed_doc in zip(legacy, packed):
+        expected = _strip(evaluate_scan_symbol(doc, "r1", AS_OF))
+        assert expected["cc"] and expected["pmcc"]
+        compact = compact_snapshot(doc, SCAN_LEGACY_CALL_FIELDS)
+        assert _strip(evaluate_scan_symbol(compact, "r1", AS_OF)) == expected
+        assert compact_snapshot(packed_doc, SCAN_LEGACY_CALL_FIELDS) is packed_doc
+        assert _strip(evaluate_scan_symbol(packed_doc, "r1", AS_OF)) == expected
+
+    assert evaluate_scan_symbol(dict(legacy[0], underlying_price=0), "r1", AS_OF) is None
+
+
+def test_compute_scan_results_pool_matches_single_worker(monkeypatch):
+    history = []
+
+    async def quick(db, symbol):
+        return {"iv_rank": 42.0, "iv_percentile": 40.0, "iv_rank_source": "TEST", "iv_rank_confidence": "LOW"}
+
+    async def upsert(db, symbol, trading_date, iv, meta):
+        history.append(symbol)
+        return True
+
+    monkeypatch.setattr(eod_pipeline, "get_iv_metrics_quick", quick)
+    monkeypatch.setattr(eod_pipeline, "upsert_iv_history", upsert)
+    snapshots = [dict(d, run_id="r1") for d in synthetic_snapshots(7, seed=5)]
+    snapshots[2]["has_leaps"] = False
+    snapshots.append({"run_id": "r1", "symbol": "NOPRICE", "underlying_price": 0})
+
+    runs = {}
+    for workers, chunk in ((1, 8), (2, 3)):
+        db = FakeDB(symbol_snapshot=snapshots,
+                    symbol_enrichment=[{"symbol": "S0001", "analyst_rating_label": "Buy", "sector": "Tech"}])
+        count, pmcc = asyncio.run(compute_scan_results(db, "r1", AS_OF, max_workers=workers, chunk_size=chunk))
+        cc = [{k: v for k, v in r.items() if k != "created_at"} for r in db.scan_results_cc.docs]
+        runs[workers] = (count, cc, [(p["symbol"], p["score"], p["short_strike"]) for p in pmcc])
+
+    assert runs[1] == runs[2]
+    count, cc, pmcc = runs[2]
+    assert count == len(cc) > 0
+    assert [r["symbol"] for r in cc] == sorted(r["symbol"] for r in cc)  # snapshot order kept
+    assert all(r["iv_rank"] == 42.0 for r in cc)
+    assert {(r["analyst_rating"], r["sector"]) for r in cc if r["symbol"] == "S0001"} == {("Buy", "Tech")}
+    assert {s for s, _, _ in pmcc} == {f"S{i:04d}" for i in range(7)} - {"S0002"}
+    assert history == list(dict.fromkeys(r["symbol"] for r in cc)) * 2  # once per symbol per run
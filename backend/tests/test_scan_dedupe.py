@@ -0,0 +1,51 @@
+"""
+Unit Tests for the Single-Pass Scan Dedupe
+==========================================
+
+Parity of services/scan_dedupe.py against the previous per-dict loops
+(kept as legacy_* in scripts/bench_scan_dedupe.py):
+1. Cross-profile assignment, including fit ties and the 50-row cap
+2. One option per symbol with the score -> quality_score -> roi_pct tie-break
+3. Per-profile fit functions match the previous combined fit
+"""
+
+import pytest
+
+# Add backend to path
+import sys
+sys.path.insert(0, '/app/backend')
+
+from scripts.bench_scan_dedupe import (
+    legacy_assign_profiles, legacy_best_per_symbol, legacy_profile_fit, synthetic_night
+)
+from services.scan_dedupe import PROFILES, assign_profiles, best_per_symbol, profile_fit
+
+
+def _ids(by_profile):
+    return {p: [id(o) for o in opps] for p, opps in by_profile.items()}
+
+
+@pytest.mark.parametrize("n,symbols,seed", [(0, 1, 1), (30, 5, 2), (600, 40, 3), (10_000, 1_500, 4)])
+def test_assign_profiles_matches_legacy(n, symbols, seed):
+    night = synthetic_night(n, symbols, seed=seed)
+    assert _ids(assign_profiles(night)) == _ids(legacy_assign_profiles(night))
+
+
+@pytest.mark.parametrize("n,symbols,seed", [(1, 1, 5), (200, 10, 6), (5_000, 300, 7)])
+def test_best_per_symbol_matches_legacy(n, symbols, seed):
+    night = synthetic_night(n, symbols, seed=seed)
+    flat = [o for p in PROFILES for o in night[p]]
+    assert [id(o) for o in best_per_symbol(flat)] == [id(o) for o in legacy_best_per_symbol(flat)]
+
+
+def test_profile_fit_matches_legacy():
+    night = synthetic_night(500, 100, seed=8)
+    for opp in (o for p in PROFILES for o in night[p]):
+        for profile in PROFILES + ("unknown",):
+            assert profile_fit(opp, profile) == legacy_profile_fit(opp, profile)
+
+
+def test_missing_profiles_yield_empty_lists():
+    assert assign_profiles({}) == {p: [] for p in PROFILES}
+    only = assign_profiles({"balanced": [{"symbol": "A", "score": 60}]})
+    assert [o["symbol"] for o in only["balanced"]] == ["A"]
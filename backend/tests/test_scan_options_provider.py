@@ -0,0 +1,178 @@
+"""
+Unit Tests for the Snapshot Options Provider
+============================================
+
+Runs SnapshotOptionsProvider against in-memory collections:
+1. daily_snapshots for the date are used first, with a field projection
+2. Without them, the latest COMPLETED run's symbol_snapshot chains are converted
+   (docs without stored greeks are stamped once and written back)
+3. Live fallback only runs when enabled, and only for missing symbols
+4. resolve()/iter_partitions() stream symbol partitions with leg projections
+5. run_all_scans over small partitions stores the same results as one pass,
+   and profiles scored on a 2-process pool match the single-worker run
+"""
+
+import asyncio
+import copy
+from datetime import datetime, timezone
+
+# Add backend to path
+import sys
+sys.path.insert(0, '/app/backend')
+
+from services import scan_options_provider
+from services.greeks_service import stamp_chain_greeks
+from services.precomputed_scans import PrecomputedScanService
+from services.scan_options_provider import SnapshotOptionsProvider, chain_to_snapshot
+from tests.conftest import FakeDB
+
+
+CHAIN_DOC = {
+    "run_id": "run_2", "symbol": "AAPL", "underlying_price": 200.0,
+    "option_chain": [
+        {"expiry": "2026-11-20", "dte": 33,
+         "calls": [{"strike": 210.0, "bid": 2.5, "ask": 2.7, "volume": 100,
+                    "openInterest": 1500, "impliedVolatility": 0.28}],
+         "puts": [{"strike": 190.0, "bid": 1.0}]},
+        {"expiry": "2028-01-21", "dte": 460,
+         "calls": [{"strike": 150.0, "bid": 60.0, "ask": 62.0, "volume": 5,
+                    "openInterest": 300, "impliedVolatility": 0.30}]},
+        {"expiry": "2027-03-19", "dte": 152, "calls": [{"strike": 200.0, "bid": 9.0, "ask": 9.5}]},
+    ],
+}
+
+
+def test_daily_snapshots_preferred_with_projection():
+    db = FakeDB(daily_snapshots=[{"symbol": "AAPL", "snapshot_date": "2026-10-16", "short_calls": [{"strike": 210}]},
+                    {"symbol": "MSFT", "snapshot_date": "2026-10-15", "short_calls": []}],
+             runs=[{"run_id": "run_2", "status": "COMPLETED", "completed_at": "2026-10-16T21:00"}],
+             symbol_snapshot=[CHAIN_DOC])
+    provider = SnapshotOptionsProvider(db, live_fallback=False)
+
+    snaps = asyncio.run(provider.load("2026-10-16"))
+    assert list(snaps) == ["AAPL"] and provider.source == "daily_snapshots"
+    projection = db.daily_snapshots.finds[0][1]
+    assert projection["short_calls.bid"] == 1 and "short_calls" not in projection
+    assert db.symbol_snapshot.finds == []
+
+
+def test_falls_back_to_latest_completed_run():
+    db = FakeDB(scan_runs=[{"run_id": "run_1", "status": "COMPLETED", "completed_at": "2026-10-15T21:00"},
+                   {"run_id": "run_2", "status": "COMPLETED", "completed_at": "2026-10-16T21:00"},
+                   {"run_id": "run_3", "status": "RUNNING", "completed_at": "2026-10-17T21:00"}],
+             symbol_snapshot=[dict(copy.deepcopy(CHAIN_DOC), _id=1),
+                              dict(copy.deepcopy(CHAIN_DOC), _id=2, run_id="run_1", symbol="OLD")])
+    provider = SnapshotOptionsProvider(db, live_fallback=False)
+
+    snaps = asyncio.run(provider.load("2026-10-16"))
+    assert provider.source == "symbol_snapshot" and provider.run_id == "run_2"
+    assert list(snaps) == ["AAPL"]
+    projection = db.symbol_snapshot.finds[0][1]
+    assert "option_chain.puts" not in projection and projection["option_chain.calls.bid"] == 1
+
+    # The unstamped (pre-ingest-greeks) doc was stamped once and stored, not recomputed per read
+    assert snaps["AAPL"]["short_calls"][0]["delta"] > 0
+    stored = {d["symbol"]: d for d in db.symbol_snapshot.docs}
+    assert stored["AAPL"]["greeks_stamped"] and not stored["OLD"].get("greeks_stamped")
+    asyncio.run(provider.load("2026-10-16"))
+    assert [m for _, m, _ in db.log].count("bulk_write") == 1
+
+
+def test_chain_conversion_buckets_and_greeks():
+    doc = copy.deepcopy(CHAIN_DOC)
+    stamp_chain_greeks(doc["option_chain"], doc["underlying_price"])
+    snap = chain_to_snapshot(doc)
+    short, = snap["short_calls"]
+    leap, = snap["leaps_calls"]
+    assert (short["strike"], short["dte"], short["open_interest"], short["iv_pct"]) == (210.0, 33, 1500, 28.0)
+    assert 0.2 < short["delta"] < 0.5
+    assert leap["ask"] == 62.0 and leap["itm_pct"] == 25.0 and leap["delta"] > 0.8
+
+    # Greeks are read as stored, never recomputed
+    assert chain_to_snapshot(CHAIN_DOC)["short_calls"][0]["delta"] == 0
+
+
+class _LiveFetcher:
+    def __init__(self):
+        self.calls = []
+
+    async def fetch_options_for_scan(self, symbol, price, dte_min, dte_max, delta_min, delta_max):
+        self.calls.append(symbol)
+        return [{"strike": 105.0, "expiry": "2026-11-20", "dte": 33, "bid": 1.2, "ask": 1.3, "delta": 0.3}]
+
+    async def fetch_leaps_options(self, symbol, price, dte_min, dte_max, delta_min, delta_max, itm_pct):
+        return [{"strike": 80.0, "expiry": "2028-01-21", "dte": 460, "premium": 24.0, "delta": 0.85}]
+
+
+def test_live_fallback_is_flag_gated(monkeypatch):
+    fetcher = _LiveFetcher()
+    snaps = {"AAPL": {"symbol": "AAPL"}}
+
+    monkeypatch.delenv(scan_options_provider.LIVE_FALLBACK_ENV, raising=False)
+    off = SnapshotOptionsProvider(FakeDB(), live_fetcher=fetcher)
+    assert asyncio.run(off.fill_missing_live(snaps, ["AAPL", "XYZ"], {"XYZ": 100.0})) == 0
+
+    monkeypatch.setenv(scan_options_provider.LIVE_FALLBACK_ENV, "true")
+    on = SnapshotOptionsProvider(FakeDB(), live_fetcher=fetcher)
+    assert asyncio.run(on.fill_missing_live(snaps, ["AAPL", "XYZ", "NOPRICE"], {"XYZ": 100.0})) == 1
+    assert fetcher.calls == ["XYZ"]
+    assert snaps["XYZ"]["leaps_calls"][0]["ask"] == 24.0 and snaps["XYZ"]["live_fallback"] is True
+
+
+def _daily_doc(symbol, bid, snapshot_date="2026-10-16"):
+    return {"symbol": symbol, "snapshot_date": snapshot_date, "underlying_price": 100.0,
+            "short_calls": [{"strike": 105.0, "expiry": "2026-11-20", "dte": 33, "bid": bid, "ask": bid + 0.1,
+                             "delta": 0.3, "volume": 50, "open_interest": 900, "iv": 0.3, "iv_pct": 30.0}],
+            "leaps_calls": []}
+
+
+def test_partitions_stream_in_symbol_order_with_leg_projection():
+    db = FakeDB(daily_snapshots=[_daily_doc(s, 1.0) for s in ("A", "B", "C", "D", "E")])
+    provider = SnapshotOptionsProvider(db, live_fallback=False)
+
+    async def scenario():
+        symbols = await provider.resolve("2026-10-16")
+        return symbols, [list(p) async for p in provider.iter_partitions(["E", "A", "C", "B", "ZZZ"], 2)]
+
+    symbols, partitions = asyncio.run(scenario())
+    assert symbols == ["A", "B", "C", "D", "E"] and provider.source == "daily_snapshots"
+    assert partitions == [["E", "A"], ["C", "B"], []]
+    projection = db.daily_snapshots.finds[0][1]
+    assert projection["short_calls.bid"] == 1 and "leaps_calls.bid" not in projection
+
+
+def test_run_all_scans_partitioned_matches_single_pass(monkeypatch):
+    symbols = [f"S{i}" for i in range(7)]
+    features = {s: {"technical": {"close": 100.0, "sma50": 95.0, "sma200": 90.0, "rsi14": 50.0, "atr_pct": 0.02},
+                    "fundamental": {"market_cap": 50e9, "eps_ttm": 5.0, "roe": 0.2}, "is_etf": False}
+                for s in symbols}
+
+    class _Service(PrecomputedScanService):
+        def __init__(self, db):
+            super().__init__(db)
+            self.stored = {}
+
+        async def get_liquid_symbols(self):
+            return symbols
+
+        async def build_feature_table(self, symbols, as_of=None, refresh=False):
+            return features
+
+        async def store_scan_results(self, strategy, profile, opportunities):
+            self.stored[(strategy, profile)] = [(o["symbol"], o["score"]) for o in opportunities]
+
+    def run(partition_size, workers=1):
+        monkeypatch.setattr(scan_options_provider, "PARTITION_SIZE", partition_size)
+        today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+        db = FakeDB(daily_snapshots=[_daily_doc(s, 1.0 + i * 0.4, today) for i, s in enumerate(symbols)])
+        service = _Service(db)
+        service.options_provider = lambda: SnapshotOptionsProvider(db, live_fallback=False)
+        results = asyncio.run(service.run_all_scans(max_workers=workers))
+        return service.stored, results, len(db.daily_snapshots.finds)
+
+    streamed, streamed_results, reads = run(2)
+    single, single_results, _ = run(100)
+    pooled, pooled_results, _ = run(2, workers=2)
+    assert reads == 4
+    assert streamed == single == pooled and streamed_results == single_results == pooled_results
+    assert sum(len(v) for v in single.values()) == len(symbols)
@@ -0,0 +1,104 @@
+"""
+Unit Tests for the Precomputed Scan Store
+=========================================
+
+Runs publish_scan / read_scan against in-memory collections:
+1. Rows are stored per opportunity; the pointer swaps to the new scan_id
+2. Filter / sort / pagination with `total` counting matched rows
+3. Only the current and previous versions are kept
+4. Legacy pointer docs with embedded opportunities still page correctly
+"""
+
+import asyncio
+
+import pytest
+
+# Add backend to path
+import sys
+sys.path.insert(0, '/app/backend')
+
+from services import scan_store
+from services.scan_store import publish_scan, read_scan
+from tests.conftest import FakeDB
+
+
+def _opps(n, offset=0):
+    return [
+        {"symbol": f"S{i:02d}", "score": float(50 + (i * 7) % 40), "dte": 7 + (i % 5) * 7, "roi_pct": i / 10}
+        for i in range(offset, offset + n)
+    ]
+
+
+def test_publish_and_page():
+    db = FakeDB()
+
+    async def _run():
+        scan_id = await publish_scan(db, "covered_call", "balanced", _opps(30), metadata={"label": "Steady"})
+        rows = db[scan_store.ROWS_COLLECTION].docs
+        assert len(rows) == 30 and all(r["scan_id"] == scan_id for r in rows)
+        pointer = db[scan_store.POINTER_COLLECTION].docs[0]
+        assert pointer["scan_id"] == scan_id and pointer["count"] == 30 and pointer["label"] == "Steady"
+
+        page = await read_scan(db, "covered_call", "balanced", min_score=60, max_dte=21,
+                               sort_by="score", offset=0, limit=5)
+        expected = sorted(
+            [o for o in _opps(30) if o["score"] >= 60 and o["dte"] <= 21],
+            key=lambda o: -o["score"]
+        )
+        assert page["total"] == len(expected)
+        assert [r["score"] for r in page["opportunities"]] == [o["score"] for o in expected[:5]]
+        assert "scan_id" not in page["opportunities"][0]
+
+        second = await read_scan(db, "covered_call", "balanced", min_score=60, max_dte=21,
+                                 sort_by="score", offset=5, limit=5)
+        seen = {r["symbol"] for r in page["opportunities"]}
+        assert not seen & {r["symbol"] for r in second["opportunities"]}
+
+        only = await read_scan(db, "covered_call", "balanced", symbols=["s03"])
+        assert [r["symbol"] for r in only["opportunities"]] == ["S03"]
+
+    asyncio.run(_run())
+
+
+def test_swap_keeps_previous_version_only():
+    db = FakeDB()
+
+    async def _run():
+        first = await publish_scan(db, "pmcc", "aggressive", [{"symbol": "A", "score": 70, "short_dte": 30}])
+        second = await publish_scan(db, "pmcc", "aggressive", _opps(3))
+        third = await publish_scan(db, "pmcc", "aggressive", _opps(2, offset=10))
+
+        ids = {r["scan_id"] for r in db[scan_store.ROWS_COLLECTION].docs}
+        assert ids == {second, third} and first not in ids
+        pointer = await db[scan_store.POINTER_COLLECTION].find_one({"strategy": "pmcc"})
+        assert pointer["scan_id"] == third and pointer["previous_scan_id"] == second
+
+        pinned = await read_scan(db, "pmcc", "aggressive", scan_id=second)
+        assert pinned["total"] == 3 and pinned["scan_id"] == second
+
+    asyncio.run(_run())
+
+
+def test_pmcc_rows_get_short_leg_dte():
+    row = scan_store.to_row("x", "pmcc", "balanced", 0, {"symbol": "A", "short_dte": 35, "long_dte": 400})
+    assert row["dte"] == 35 and row["rank"] == 0
+
+
+def test_legacy_embedded_pointer_is_paged_in_memory():
+    db = FakeDB()
+    db[scan_store.POINTER_COLLECTION].docs.append(
+        {"strategy": "covered_call", "risk_profile": "conservative", "count": 30, "opportunities": _opps(30)}
+    )
+
+    async def _run():
+        page = await read_scan(db, "covered_call", "conservative", sort_by="dte", sort_dir=1, limit=4)
+        assert page["total"] == 30 and len(page["opportunities"]) == 4
+        assert all(r["dte"] == 7 for r in page["opportunities"])
+        assert [r["rank"] for r in page["opportunities"]] == [0, 5, 10, 15]
+
+    asyncio.run(_run())
+
+
+def test_unknown_sort_field_rejected():
+    with pytest.raises(ValueError):
+        asyncio.run(read_scan(FakeDB(), "covered_call", "balanced", sort_by="$where"))
@@ -0,0 +1,95 @@
+"""
+Unit Tests for the Snapshot Backtest
+====================================
+
+1. select_cc / select_pmcc pick the best-scoring contract under the EOD rules
+2. Replay: CC opened at BID, marked to the later mid, settled at min(S_T, K)
+3. Replay: PMCC short settled at intrinsic, LEAPS at max(last mark, intrinsic)
+4. Only the latest COMPLETED run of each day in range is replayed
+"""
+
+import asyncio
+from datetime import datetime, timezone
+
+import pytest
+
+# Add backend to path
+import sys
+sys.path.insert(0, '/app/backend')
+
+from services.snapshot_backtest import replay_days, run_snapshot_backtest, select_cc, select_pmcc
+from tests.conftest import FakeDB
+
+
+def _call(strike, bid, ask, oi=500, iv=0.3):
+    return {"strike": strike, "bid": bid, "ask": ask, "openInterest": oi, "impliedVolatility": iv}
+
+
+def _aaa(price, calls_by_expiry):
+    # CC-eligible, no LEAPS
+    return {"symbol": "AAA", "underlying_price": price, "market_cap": 1e10, "avg_volume": 1e6,
+            "has_leaps": False, "option_chain": [{"expiry": e, "calls": c} for e, c in calls_by_expiry.items()]}
+
+
+def _bbb(price, calls_by_expiry):
+    # PMCC only (volume below the CC floor)
+    return {"symbol": "BBB", "underlying_price": price, "market_cap": 1e10, "avg_volume": 1000,
+            "has_leaps": True, "option_chain": [{"expiry": e, "calls": c} for e, c in calls_by_expiry.items()]}
+
+
+DAY1 = [
+    _aaa(100.0, {"2025-01-31": [_call(105, 2.0, 2.1), _call(102, 0.1, 0.3)]}),
+    _bbb(100.0, {"2025-02-07": [_call(110, 1.0, 1.1, oi=200)], "2025-12-19": [_call(70, 31.0, 32.0, oi=100)]}),
+]
+DAY2 = [
+    _aaa(103.0, {"2025-01-31": [_call(105, 1.5, 1.6)]}),
+    _bbb(106.0, {"2025-02-07": [_call(110, 2.0, 2.1, oi=200)], "2025-12-19": [_call(70, 37.0, 38.0, oi=100)]}),
+]
+DAY3 = [_aaa(108.0, {}), _bbb(107.0, {})]
+DAY4 = [_aaa(109.0, {}), _bbb(112.0, {})]
+
+
+def _db(days):
+    db = FakeDB(scan_runs=[], symbol_snapshot=[])
+    for day, docs in days.items():
+        run_id = f"run-{day}"
+        db.scan_runs.docs.append({"run_id": run_id, "status": "COMPLETED",
+                                  "as_of": datetime.fromisoformat(day).replace(hour=21, tzinfo=timezone.utc),
+                                  "completed_at": f"{day}T21:30:00"})
+        db.symbol_snapshot.docs.extend(dict(d, run_id=run_id) for d in docs)
+    return db
+
+
+def test_selection():
+    cc = select_cc(DAY1[0], "2025-01-02")
+    assert (cc["strike"], cc["premium"], cc["dte"]) == (105, 2.0, 29)
+    assert select_cc(DAY1[1], "2025-01-02") is None  # below CC volume floor
+    assert select_pmcc(DAY1[0], "2025-01-02") is None  # no LEAPS
+    pmcc = select_pmcc(DAY1[1], "2025-01-02")
+    assert (pmcc["leap_strike"], pmcc["leap_cost"], pmcc["strike"], pmcc["premium"]) == (70, 32.0, 110, 1.0)
+
+
+def test_replay_equity_curves():
+    db = _db({"2025-01-02": DAY1, "2025-01-15": DAY2, "2025-01-31": DAY3, "2025-02-07": DAY4})
+    out = asyncio.run(run_snapshot_backtest(db, "2025-01-01", "2025-02-28", top_n=1, max_workers=1))
+    assert out["days"] == 4
+
+    cc = out["strategies"]["cc"]
+    # Day 1: bid 2.0 vs mid 2.05; day 2: shares +3, call 2.0 -> 1.55; day 3: assigned at 105
+    assert [p["equity"] for p in cc["curve"]] == pytest.approx([-5.0, 345.0, 700.0, 700.0])
+    assert cc["closed_trades"] == 1 and cc["win_rate"] == 100.0 and cc["avg_return_pct"] == 7.0
+
+    pmcc = out["strategies"]["pmcc"]
+    # Day 4: short settles at intrinsic 2.0, LEAPS at max(37.5 last mark, 42 intrinsic)
+    assert pmcc["curve"][-1]["realized"] == pytest.approx(900.0)
+    assert pmcc["curve"][0]["capital"] == pytest.approx(3100.0)
+    assert pmcc["closed_trades"] == 1 and pmcc["open_trades"] == 0
+    assert pmcc["stats"]["points"] == 4
+
+
+def test_replay_days_latest_run_per_day():
+    db = _db({"2025-01-02": DAY1, "2025-01-03": DAY1, "2025-03-01": DAY1})
+    db.scan_runs.docs.append({"run_id": "late", "status": "COMPLETED",
+                              "as_of": "2025-01-02T22:00:00", "completed_at": "2025-01-02T23:00:00"})
+    days = asyncio.run(replay_days(db, "2025-01-01", "2025-01-31"))
+    assert days == [{"day": "2025-01-02", "run_id": "late"}, {"day": "2025-01-03", "run_id": "run-2025-01-03"}]
@@ -0,0 +1,407 @@
+"""
+Unit Tests for the Snapshot Repository
+======================================
+
+Runs SnapshotRepository.get_chains against in-memory stores:
+1. Latest run from symbol_snapshot, same contracts for dict and columnar chains
+2. Requested fields are projected and dte_range slices the result
+3. Repeat reads are served from the LRU keyed by run; eviction at capacity;
+   a delta read of a doc without stored greeks stamps and stores it once
+4. Dates resolve across daily_snapshots / eod_options_chain / eod_market_snapshot,
+   on every call: later runs of the day and rewritten daily snapshots are seen
+5. dte_range / strike_band are sliced in Mongo ($filter) for dict and columnar chains
+6. SnapshotService / EODPriceContract scan reads slice calls and leave puts behind
+"""
+
+import asyncio
+
+# Add backend to path
+import sys
+sys.path.insert(0, '/app/backend')
+
+from services.chain_codec import PACKED_FIELD, encode_chains
+from services.eod_ingestion_service import EODPriceContract
+from services.greeks_service import GREEKS_STAMPED_FIELD
+from services.snapshot_repository import SnapshotRepository, slice_chain
+from services.snapshot_service import SnapshotService
+from tests.conftest import FakeCollection, FakeCursor, FakeDB, matches
+
+
+# ── Minimal aggregation evaluator for the operators the pipelines use ──
+_MISSING = object()
+
+
+def _path(doc, path):
+    for part in path.split("."):
+        if not isinstance(doc, dict) or part not in doc:
+            return _MISSING
+        doc = doc[part]
+    return doc
+
+
+def _cmp_key(value):
+    # BSON order: missing / null sort before numbers
+    return (0, 0) if value is _MISSING or value is None else (1, value)
+
+
+def _eval(expr, doc, env):
+    if isinstance(expr, str):
+        if expr == "$$REMOVE":
+            return _MISSING
+        if expr.startswith("$$"):
+            name, _, rest = expr[2:].partition(".")
+            return _path(env[name], rest) if rest else env[name]
+        if expr.startswith("$"):
+            return _path(doc, expr[1:])
+        return expr
+    if isinstance(expr, list):
+        return [_eval(e, doc, env) for e in expr]
+    if not isinstance(expr, dict):
+        return expr
+    if len(expr) == 1:
+        (op, arg), = expr.items()
+        if op in ("$filter", "$map"):
+            items = _eval(arg["input"], doc, env)
+            if items is _MISSING or items is None:
+                return None
+            out = []
+            for item in items:
+                scope = {**env, arg["as"]: item}
+                if op == "$filter":
+                    if _eval(arg["cond"], doc, scope):
+                        out.append(item)
+                else:
+                    out.append(_eval(arg["in"], doc, scope))
+            return out
+        if op == "$and":
+            return all(_eval(e, doc, env) for e in arg)
+        if op in ("$gte", "$lte", "$eq"):
+            a, b = (_eval(e, doc, env) for e in arg)
+            if op == "$eq":
+                return a == b
+            return _cmp_key(a) >= _cmp_key(b) if op == "$gte" else _cmp_key(a) <= _cmp_key(b)
+        if op == "$multiply":
+            a, b = (_eval(e, doc, env) for e in arg)
+            return a * b
+        if op == "$ifNull":
+            a = _eval(arg[0], doc, env)
+            return _eval(arg[1], doc, env) if a is _MISSING or a is None else a
+        if op == "$isArray":
+            return isinstance(_eval(arg, doc, env), list)
+        if op == "$cond":
+            return _eval(arg[1] if _eval(arg[0], doc, env) else arg[2], doc, env)
+    out = {}
+    for key, value in expr.items():
+        value = _eval(value, doc, env)
+        if value is not _MISSING:
+            out[key] = value
+    return out
+
+
+def _aggregate(docs, pipeline):
+    docs = [dict(d) for d in docs]
+    for stage in pipeline:
+        (op, arg), = stage.items()
+        if op == "$match":
+            docs = [d for d in docs if matches(d, arg)]
+        elif op == "$sort":
+            (key, direction), = arg.items()
+            docs.sort(key=lambda d: d.get(key), reverse=direction < 0)
+        elif op == "$limit":
+            docs = docs[:arg]
+        elif op == "$addFields":
+            docs = [{**d, **_eval(arg, d, {})} for d in docs]
+        elif op == "$project":
+            if all(v == 0 for v in arg.values()):
+                docs = [{k: v for k, v in d.items() if k not in arg} for d in docs]
+            else:
+                projected = []
+                for d in docs:
+                    row = {}
+                    for key, value in arg.items():
+                        if value == 1:
+                            if key in d:
+                                row[key] = d[key]
+                        elif value != 0:
+                            value = _eval(value, d, {})
+                            if value is not _MISSING:
+                                row[key] = value
+                    projected.append(row)
+                docs = projected
+    return docs
+
+
+class _Collection(FakeCollection):
+    """FakeCollection that runs aggregation pipelines through _aggregate."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.pipelines = []
+
+    def aggregate(self, pipeline):
+        self.pipelines.append(pipeline)
+        return FakeCursor(_aggregate(self.docs, pipeline))
+
+
+class _DB(FakeDB):
+    collection_class = _Collection
+
+
+CHAIN = [
+    {"expiry": "2026-11-20", "dte": 33,
+     "calls": [{"strike": 210.0, "bid": 2.5, "ask": 2.7, "openInterest": 1500, "impliedVolatility": 0.28,
+                "volume": 40}],
+     "puts": [{"strike": 190.0, "bid": 1.0, "ask": 1.2}]},
+    {"expiry": "2027-06-18", "dte": 243,
+     "calls": [{"strike": 150.0, "bid": 60.0, "ask": 62.0, "openInterest": 300, "impliedVolatility": 0.30}],
+     "puts": []},
+]
+
+
+def _db(columnar=False):
+    db = _DB()
+    db.scan_runs.docs = [{"run_id": "run_1", "status": "COMPLETED", "as_of": "2026-10-15T20:00", "completed_at": "1"},
+                         {"run_id": "run_2", "status": "COMPLETED", "as_of": "2026-10-16T20:00", "completed_at": "2"}]
+    doc = {"run_id": "run_2", "symbol": "AAPL", "underlying_price": 200.0, GREEKS_STAMPED_FIELD: True}
+    if columnar:
+        doc[PACKED_FIELD] = encode_chains(CHAIN, "none")
+    else:
+        doc["option_chain"] = CHAIN
+    db.symbol_snapshot.docs = [doc, {"run_id": "run_1", "symbol": "AAPL", "underlying_price": 190.0,
+                                     "option_chain": CHAIN[:1], GREEKS_STAMPED_FIELD: True}]
+    return db
+
+
+def test_latest_run_same_for_dict_and_columnar():
+    fields = ("strike", "bid", "open_interest", "iv")
+    plain = asyncio.run(SnapshotRepository(_db()).get_chains(["aapl", "MSFT"], fields=fields))
+    packed = asyncio.run(SnapshotRepository(_db(columnar=True)).get_chains(["AAPL"], fields=fields))
+
+    assert list(plain) == ["AAPL"] and plain["AAPL"]["key"] == "run_2"
+    assert plain == packed
+    call = plain["AAPL"]["calls"][0]
+    assert call == {"expiry": "2026-11-20", "dte": 33, "strike": 210.0, "bid": 2.5,
+                    "open_interest": 1500, "iv": 0.28}
+    assert plain["AAPL"]["puts"][0]["bid"] == 1.0
+
+
+def test_projection_and_dte_slice():
+    db = _db()
+    repo = SnapshotRepository(db)
+    asyncio.run(repo.get_chains(["AAPL"], "run_2", fields=("bid",), sides=("calls",)))
+    _, projection = db.symbol_snapshot.finds[0]
+    assert projection["option_chain.calls.bid"] == 1
+    assert not any("puts" in k or "ask" in k for k in projection)
+
+    chains = asyncio.run(repo.get_chains(["AAPL"], "run_2", fields=("bid",), dte_range=(180, 800),
+                                         sides=("calls",)))
+    assert [c["expiry"] for c in chains["AAPL"]["calls"]] == ["2027-06-18"]
+    assert chains["AAPL"]["puts"] == []
+
+
+def test_lru_keyed_by_run():
+    db = _db()
+    repo = SnapshotRepository(db, cache_size=1)
+
+    async def scenario():
+        await repo.get_chains(["AAPL"], "run_2")
+        await repo.get_chains(["AAPL"], "run_2", dte_range=(1, 60))
+        after_hit = len(db.symbol_snapshot.finds)
+        await repo.get_chains(["AAPL"], "run_1")   # evicts run_2
+        await repo.get_chains(["AAPL"], "run_2")
+        return after_hit
+
+    assert asyncio.run(scenario()) == 1
+    assert len(db.symbol_snapshot.finds) == 3
+    assert (repo.hits, repo.misses) == (1, 3)
+
+
+def test_unstamped_docs_are_stamped_and_stored_once():
+    db = _db()
+    db.symbol_snapshot.docs[0] = {"_id": 1, "run_id": "run_2", "symbol": "AAPL", "underlying_price": 200.0,
+                                  "option_chain": [dict(g, calls=[dict(c) for c in g["calls"]]) for g in CHAIN]}
+    repo = SnapshotRepository(db)
+
+    chains = asyncio.run(repo.get_chains(["AAPL"], "run_2", fields=("strike", "delta")))
+    assert [round(c["delta"], 2) > 0 for c in chains["AAPL"]["calls"]] == [True, True]
+    assert db.symbol_snapshot.docs[0][GREEKS_STAMPED_FIELD]
+
+    # Stored, so a fresh repository reads it without stamping again; delta-free reads never stamp
+    asyncio.run(SnapshotRepository(db).get_chains(["AAPL"], "run_2", fields=("strike", "delta")))
+    asyncio.run(SnapshotRepository(db).get_chains(["AAPL"], "run_1", fields=("strike",)))
+    assert [m for _, m, _ in db.log].count("bulk_write") == 1
+
+
+def test_dates_resolve_across_stores():
+    db = _DB()
+    db.daily_snapshots.docs = [{"symbol": "SPY", "snapshot_date": "2026-10-14", "underlying_price": 500.0,
+                                "short_calls": [{"strike": 505.0, "expiry": "2026-11-20", "dte": 37,
+                                                 "bid": 3.0, "delta": 0.4}],
+                                "leaps_calls": [{"strike": 400.0, "expiry": "2027-12-17", "dte": 429,
+                                                 "ask": 120.0, "delta": 0.9}]}]
+    db.eod_options_chain.docs = [
+        {"symbol": "SPY", "trade_date": "2026-10-15", "is_final": False, "stock_price": 1.0, "calls": []},
+        {"symbol": "KO", "trade_date": "2026-10-15", "is_final": True, "stock_price": 60.0,
+         "calls": [{"strike": 62.0, "expiry": "2026-11-20", "dte": 36, "bid": 0.8, "implied_volatility": 18.0}],
+         "puts": [{"strike": 58.0, "expiry": "2026-11-20", "dte": 36, "bid": 0.5}]}]
+    db.eod_market_snapshot.docs = [
+        {"symbol": "KO", "trade_date": "2026-10-13", "is_final": True, "underlying_price": 59.0,
+         "option_chain": [{"strike": 61.0, "expiry": "2026-11-20", "dte": 38, "type": "call", "bid": 0.9},
+                          {"strike": 57.0, "expiry": "2026-11-20", "dte": 38, "type": "put", "bid": 0.4}]}]
+    repo = SnapshotRepository(db)
+
+    async def scenario():
+        return (await repo.get_chains(["SPY"], "2026-10-14", fields=("strike", "delta")),
+                await repo.get_chains(["KO", "SPY"], "2026-10-15", fields=("strike", "iv")),
+                await repo.get_chains(["KO"], "2026-10-13", fields=("strike",)),
+                await repo.get_chains(["KO"], "2026-01-01"))
+
+    daily, eod, market, nothing = asyncio.run(scenario())
+    assert daily["SPY"]["source"] == "daily_snapshots"
+    assert [c["delta"] for c in daily["SPY"]["calls"]] == [0.4, 0.9]
+    assert list(eod) == ["KO"] and eod["KO"]["source"] == "eod_options_chain"
+    assert eod["KO"]["calls"][0]["iv"] == 0.18 and eod["KO"]["underlying_price"] == 60.0
+    assert [c["strike"] for c in market["KO"]["calls"]] == [61.0]
+    assert [c["strike"] for c in market["KO"]["puts"]] == [57.0]
+    assert nothing == {}
+
+
+def test_date_reads_are_not_cached():
+    db = _db()
+    repo = SnapshotRepository(db)
+
+    async def scenario():
+        first = await repo.get_chains(["AAPL"], "2026-10-16", fields=("strike",))
+        # A second COMPLETED run the same day replaces the first
+        db.scan_runs.docs.append({"run_id": "run_3", "status": "COMPLETED", "as_of": "2026-10-16T21:00",
+                                  "completed_at": "3"})
+        db.symbol_snapshot.docs.append({"run_id": "run_3", "symbol": "AAPL", "underlying_price": 205.0,
+                                        "option_chain": CHAIN[:1]})
+        later = await repo.get_chains(["AAPL"], "2026-10-16", fields=("strike",))
+        # daily_snapshots written after the first lookup take over the date, and rewrites are read
+        db.daily_snapshots.docs.append({"symbol": "AAPL", "snapshot_date": "2026-10-16", "underlying_price": 206.0,
+                                        "short_calls": [{"strike": 215.0, "expiry": "2026-11-20", "dte": 33}]})
+        daily = await repo.get_chains(["AAPL"], "2026-10-16", fields=("strike",))
+        db.daily_snapshots.docs[0]["short_calls"][0]["strike"] = 220.0
+        rewritten = await repo.get_chains(["AAPL"], "2026-10-16", fields=("strike",))
+        return first, later, daily, rewritten
+
+    first, later, daily, rewritten = asyncio.run(scenario())
+    assert (first["AAPL"]["key"], later["AAPL"]["key"]) == ("run_2", "run_3")
+    assert later["AAPL"]["underlying_price"] == 205.0
+    assert daily["AAPL"]["source"] == "daily_snapshots" and daily["AAPL"]["calls"][0]["strike"] == 215.0
+    assert rewritten["AAPL"]["calls"][0]["strike"] == 220.0
+
+
+SLICE_CHAIN = [
+    {"expiry": "2026-10-23", "dte": 6,
+     "calls": [{"strike": 200.0, "bid": 4.0}, {"strike": 205.0, "bid": 1.0}], "puts": []},
+    {"expiry": "2026-11-20", "dte": 34,
+     "calls": [{"strike": 150.0, "bid": 50.0}, {"strike": 205.0, "bid": 3.0}, {"strike": 220.0, "bid": 1.0},
+               {"strike": 260.0, "bid": 0.1}],
+     "puts": [{"strike": 190.0, "bid": 2.0}]},
+    {"expiry": "2027-06-18", "dte": 244, "calls": [{"strike": 210.0, "bid": 20.0}], "puts": []},
+]
+
+
+def _slice_db(columnar):
+    db = _DB()
+    doc = {"run_id": "run_9", "symbol": "MSFT", "underlying_price": 200.0}
+    if columnar:
+        doc[PACKED_FIELD] = encode_chains(SLICE_CHAIN, "none")
+    else:
+        doc["option_chain"] = SLICE_CHAIN
+    db.symbol_snapshot.docs = [doc]
+    return db
+
+
+def test_dte_and_strike_band_sliced_in_mongo():
+    results = []
+    for columnar in (False, True):
+        db = _slice_db(columnar)
+        repo = SnapshotRepository(db)
+        sliced = asyncio.run(repo.get_chains(["MSFT"], "run_9", fields=("strike", "bid"),
+                                             dte_range=(7, 45), strike_band=(1.0, 1.15)))
+        assert db.symbol_snapshot.finds == [] and len(db.symbol_snapshot.pipelines) == 1
+        # Same as reading everything and slicing in memory
+        full = asyncio.run(SnapshotRepository(_slice_db(columnar)).get_chains(["MSFT"], "run_9",
+                                                                              fields=("strike", "bid")))
+        assert sliced["MSFT"] == slice_chain(full["MSFT"], (7, 45), (1.0, 1.15))
+        results.append(sliced)
+
+    plain, packed = results
+    assert [(c["expiry"], c["strike"]) for c in plain["MSFT"]["calls"]] == [("2026-11-20", 205.0), ("2026-11-20", 220.0)]
+    assert plain == packed
+    assert plain["MSFT"]["puts"] == []
+
+
+def test_dict_chain_ships_only_the_slice():
+    db = _slice_db(columnar=False)
+    pipeline = None
+
+    async def scenario():
+        nonlocal pipeline
+        await SnapshotRepository(db).get_chains(["MSFT"], "run_9", fields=("bid",), sides=("calls",),
+                                                dte_range=(7, 45), strike_band=(1.0, 1.15))
+        pipeline = db.symbol_snapshot.pipelines[0]
+
+    asyncio.run(scenario())
+    shipped = _aggregate(db.symbol_snapshot.docs, pipeline)[0]
+    assert [g["expiry"] for g in shipped["option_chain"]] == ["2026-11-20"]
+    assert shipped["option_chain"][0]["calls"] == [{"strike": 205.0, "bid": 3.0}, {"strike": 220.0, "bid": 1.0}]
+    assert "puts" not in shipped["option_chain"][0]
+
+
+def _flat_calls():
+    calls = [
+        {"strike": 100.0, "dte": 30, "bid": 2.0, "ask": 2.1, "valid": True, "delta": 0.5, "open_interest": 900,
+         "delta_source": "BLACK_SCHOLES", "iv": 0.3, "expiry": "2026-11-20"},
+        {"strike": 110.0, "dte": 30, "bid": 0.5, "ask": 0.6, "valid": True, "delta": 0.2, "open_interest": 900,
+         "delta_source": "BLACK_SCHOLES", "iv": 0.3, "expiry": "2026-11-20"},
+        {"strike": 130.0, "dte": 30, "bid": 0.1, "ask": 0.2, "valid": True, "expiry": "2026-11-20"},
+        {"strike": 105.0, "dte": 90, "bid": 3.0, "ask": 3.2, "valid": True, "expiry": "2027-01-15"},
+        {"strike": 105.0, "dte": 30, "bid": 1.0, "ask": 1.1, "valid": False, "expiry": "2026-11-20"},
+        {"strike": 70.0, "dte": 500, "bid": 31.0, "ask": 31.5, "valid": True, "delta": 0.9, "open_interest": 800,
+         "iv": 0.25, "expiry": "2028-03-17"},
+    ]
+    return calls
+
+
+def test_snapshot_service_reads_sliced_calls():
+    db = _DB()
+    db.option_chain_snapshots.docs = [{
+        "symbol": "XYZ", "stock_price": 100.0, "completeness_flag": True, "data_age_hours": 1,
+        "date_validation_passed": True, "calls": _flat_calls(), "puts": [{"strike": 90.0, "dte": 30}],
+        GREEKS_STAMPED_FIELD: True,
+    }]
+    service = SnapshotService(db)
+
+    calls, error = asyncio.run(service.get_valid_calls_for_scan("xyz"))
+    assert error is None
+    assert [c["strike"] for c in calls] == [100.0, 110.0]
+    shipped = _aggregate(db.option_chain_snapshots.docs, db.option_chain_snapshots.pipelines[0])[0]
+    assert "puts" not in shipped and len(shipped["calls"]) == 2
+
+    meta, error = asyncio.run(service.get_option_chain_snapshot("XYZ", sides=()))
+    assert error is None and "calls" not in meta and "puts" not in meta
+
+
+def test_eod_contract_reads_sliced_calls():
+    db = _DB()
+    db.eod_options_chain.docs = [
+        {"symbol": "XYZ", "trade_date": "2026-10-15", "is_final": True, "stock_price": 100.0,
+         "calls": _flat_calls(), "puts": [{"strike": 90.0, "dte": 30}], GREEKS_STAMPED_FIELD: True},
+        {"symbol": "XYZ", "trade_date": "2026-10-16", "is_final": True, "stock_price": 100.0,
+         "calls": _flat_calls()[:1], "puts": [], GREEKS_STAMPED_FIELD: True},
+    ]
+    contract = EODPriceContract(db)
+
+    async def scenario():
+        return (await contract.get_valid_calls_for_scan("XYZ", "2026-10-15"),
+                await contract.get_valid_leaps_for_pmcc("XYZ", "2026-10-15"),
+                await contract.get_valid_calls_for_scan("XYZ"))
+
+    calls, leaps, latest = asyncio.run(scenario())
+    assert [c["strike"] for c in calls] == [100.0, 110.0]
+    assert [c["strike"] for c in leaps] == [70.0]
+    assert [c["strike"] for c in latest] == [100.0]
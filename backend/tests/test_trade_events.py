@@ -0,0 +1,136 @@
+"""
+Unit Tests for Simulator Trade Events
+=====================================
+
+Tests the pure parts of the append-only trade history:
+1. Compact mark events built from price-update $set documents
+2. State reducer (opened -> marks -> roll -> terminal)
+3. Drawdown and changed-field helpers
+4. Event pages keyed on (ts, _id) do not drop events sharing a ts
+"""
+
+import asyncio
+
+import pytest
+from bson import ObjectId
+
+# Add backend to path
+import sys
+sys.path.insert(0, '/app/backend')
+
+from services.trade_events import (
+    apply_event,
+    build_event,
+    build_mark_event,
+    build_opened_event,
+    changed_fields,
+    max_drawdown,
+    _empty_state,
+    get_events_page,
+)
+from tests.conftest import FakeDB
+
+
+TRADE = {
+    "id": "t1",
+    "user_id": "u1",
+    "symbol": "AAPL",
+    "strategy_type": "covered_call",
+    "contracts": 1,
+    "entry_underlying_price": 100.0,
+    "short_call_strike": 105.0,
+    "short_call_expiry": "2026-11-20",
+    "short_call_premium": 2.0,
+    "capital_deployed": 10000.0,
+    "premium_received": 200.0,
+    "created_at": "2026-10-01T20:00:00+00:00",
+}
+
+
+class TestEventConstruction:
+    def test_mark_event_uses_compact_keys_and_skips_none(self):
+        event = build_mark_event(TRADE, {
+            "current_underlying_price": 101.0,
+            "current_option_value": 1.5,
+            "unrealized_pnl": 150.0,
+            "total_pl": None,
+            "current_delta": 0.3,
+            "dte_remaining": 20,
+            "days_held": 5,
+        }, ts="2026-10-02T20:00:00+00:00")
+        assert event["type"] == "mark"
+        assert event["trade_id"] == "t1"
+        assert event["data"] == {"spot": 101.0, "opt": 1.5, "upnl": 150.0, "delta": 0.3, "dte": 20}
+
+    def test_opened_event_ts_is_trade_creation(self):
+        event = build_opened_event(TRADE)
+        assert event["ts"] == TRADE["created_at"]
+        assert event["data"]["short_call_strike"] == 105.0
+
+
+class TestReducer:
+    def test_full_lifecycle(self):
+        events = [
+            build_opened_event(TRADE),
+            build_event(TRADE, "mark", {"upnl": 100.0}, ts="2026-10-02"),
+            build_event(TRADE, "mark", {"upnl": 300.0, "pl": 250.0}, ts="2026-10-03"),
+            build_event(TRADE, "mark", {"upnl": 50.0}, ts="2026-10-04"),
+            build_event(TRADE, "roll", {"short_call_strike": 110.0, "premium_received": 380.0}, ts="2026-10-05"),
+            build_event(TRADE, "closed", {"final_pnl": 420.0}, ts="2026-10-06"),
+        ]
+        state = _empty_state()
+        for e in events:
+            apply_event(state, e)
+        assert state["marks"] == 3
+        assert state["peak_pnl"] == 250.0          # real-mark pl preferred over upnl
+        assert state["max_drawdown"] == 200.0
+        assert state["roll_count"] == 1
+        assert state["short_call_strike"] == 110.0
+        assert state["status"] == "closed"
+        assert state["realized_pnl"] == 420.0
+        assert state["through_ts"] == "2026-10-06"
+
+    def test_snapshot_then_tail_equals_full_replay(self):
+        events = [build_event(TRADE, "mark", {"upnl": float(v)}, ts=f"2026-10-{i + 1:02d}")
+                  for i, v in enumerate([10, 40, -20, 5, 60, 30])]
+        full = _empty_state()
+        for e in events:
+            apply_event(full, e)
+        head = _empty_state()
+        for e in events[:3]:
+            apply_event(head, e)
+        resumed = dict(head)
+        for e in events[3:]:
+            apply_event(resumed, e)
+        assert resumed == full
+
+
+class TestHelpers:
+    @pytest.mark.parametrize("values,expected", [
+        ([], 0.0),
+        ([1, 2, 3], 0.0),
+        ([10, 4, 12, 3, 8], 9.0),
+    ])
+    def test_max_drawdown(self, values, expected):
+        assert max_drawdown(values) == expected
+
+    def test_changed_fields(self):
+        trade = {"a": 1, "b": 2.0, "c": None}
+        assert changed_fields(trade, {"a": 1, "b": 2.5, "c": None, "d": 0}) == {"b": 2.5, "d": 0}
+
+
+class TestEventPages:
+    def test_page_boundary_inside_shared_ts(self):
+        ts = ["2026-10-01T20:00:00+00:00", "2026-10-02T20:00:00+00:00", "2026-10-02T20:00:00+00:00"]
+        events = [dict(build_event(TRADE, kind, {}, ts=t), _id=ObjectId(f"{i:024x}"))
+                  for i, (kind, t) in enumerate(zip(("opened", "mark", "expired"), ts))]
+        db = FakeDB(simulator_trade_events=events)
+
+        first = asyncio.run(get_events_page(db, "t1", limit=2))
+        assert [e["type"] for e in first["events"]] == ["opened", "mark"]
+        assert "_id" not in first["events"][0]
+        assert (first["next_after"], first["next_after_id"]) == (ts[1], str(events[1]["_id"]))
+
+        second = asyncio.run(get_events_page(db, "t1", first["next_after"], first["next_after_id"], limit=2))
+        assert [e["type"] for e in second["events"]] == ["expired"]
+        assert second["next_after"] is None and second["next_after_id"] is None
@@ -529,6 +529,18 @@ const Simulator = () => {
     }
   }, [analyticsStrategy, analyzerSymbol, analyticsTimeframe]);
 
+  // List rows carry a slim projection; load the full trade (action log etc.) for the dialog
+  const openTradeDetail = async (trade) => {
+    setSelectedTrade(trade);
+    setDetailOpen(true);
+    try {
+      const res = await simulatorApi.getTradeDetail(trade.id);
+      setSelectedTrade((current) => (current?.id === trade.id ? { ...trade, ...res.data } : current));
+    } catch (error) {
+      console.error('Error fetching trade detail:', error);
+    }
+  };
+
   const fetchTrades = async () => {
     setLoading(true);
     try {
@@ -1121,10 +1133,7 @@ const Simulator = () => {
                       <tr 
                         key={trade.id}
                         className="border-b border-zinc-800/50 hover:bg-zinc-800/30 cursor-pointer"
-                        onClick={() => {
-                          setSelectedTrade(trade);
-                          setDetailOpen(true);
-                        }}
+                        onClick={() => openTradeDetail(trade)}
                         data-testid={`simulator-row-${trade.symbol}`}
                       >
                         <td className="py-3 font-semibold text-white">